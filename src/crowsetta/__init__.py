@@ -1,4 +1,4 @@
-from . import data, interface, typing, validation
+from . import archive, audioinfo, data, interface, lazy, parsecache, pipeline, store, typing, validation
 from .__about__ import (
     __author__,
     __commit__,
@@ -12,6 +12,7 @@ from .__about__ import (
 )
 from .annotation import Annotation
 from .bbox import BBox
+from .lazy import LazyAnnotation
 from .segment import Segment
 from .sequence import Sequence
 from .transcriber import Transcriber
@@ -34,13 +35,20 @@ __all__ = [
     "__uri__",
     "__version__",
     "Annotation",
+    "archive",
+    "audioinfo",
     "BBox",
     "data",
     "formats",
     "interface",
+    "lazy",
+    "LazyAnnotation",
+    "parsecache",
+    "pipeline",
     "register_format",
     "Segment",
     "Sequence",
+    "store",
     "Transcriber",
     "typing",
     "validation",
@@ -0,0 +1,4 @@
+"""Run the command-line interface with ``python -m crowsetta``."""
+from .cli import main
+
+raise SystemExit(main())
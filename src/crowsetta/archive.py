@@ -0,0 +1,231 @@
+"""Module for loading annotation files directly from archives and compressed files,
+without extracting them to disk first.
+
+Datasets of annotations are often distributed as zip or tar archives
+of many small files. The members of an archive that are annotation files
+are represented by :class:`~crowsetta.archive.ArchiveMember` instances,
+that can be passed to the ``from_file`` method of any format class
+that accepts buffers (see :mod:`crowsetta.formats.source`),
+to :meth:`crowsetta.Transcriber.from_file`, and to
+:meth:`crowsetta.Transcriber.from_files`, in place of paths.
+:meth:`crowsetta.Transcriber.from_archive` loads all the members
+of an archive that are files in the format of the transcriber.
+
+Each thread that reads members of an archive keeps
+its own handle to the archive open, so that workers loading files
+concurrently read members without opening the archive for every file,
+and without sharing a file position.
+Reading members of a compressed tar archive, e.g. a .tar.gz file,
+requires decompressing the archive up to each member,
+so members are read fastest in the order they are stored in the archive,
+as :func:`~crowsetta.archive.list_members` returns them.
+
+Single files compressed with gzip, bzip2 or xz, i.e. files
+with the extensions '.gz', '.bz2' and '.xz', are decompressed transparently
+when they are loaded, whether they are paths or members of an archive.
+The name of the decompressed file is its name without that extension,
+e.g. 'bird1.TextGrid.gz' is loaded as 'bird1.TextGrid'.
+
+Examples
+--------
+>>> scribe = crowsetta.Transcriber(format='textgrid')
+>>> annots = scribe.from_archive('textgrids.zip', convert='to_annot', workers=8)  # doctest: +SKIP
+
+>>> members = crowsetta.archive.list_members('textgrids.tar.gz', ext='.TextGrid')  # doctest: +SKIP
+>>> textgrid = crowsetta.formats.seq.TextGrid.from_file(members[0])  # doctest: +SKIP
+"""
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import os
+import pathlib
+import tarfile
+import threading
+import zipfile
+from typing import List, Optional, Tuple, Union
+
+import attr
+
+from .typing import PathLike
+
+# modules that decompress single files, by extension
+COMPRESSIONS = {
+    ".gz": gzip,
+    ".bz2": bz2,
+    ".xz": lzma,
+}
+
+# handles to archives opened by the current thread, see ``_get_handle``
+_local = threading.local()
+
+
+@attr.define(frozen=True)
+class ArchiveMember:
+    """A file that is a member of a zip or tar archive.
+
+    Attributes
+    ----------
+    archive_path : pathlib.Path
+        Path to the archive.
+    name : str
+        Name of the member in the archive, e.g. 'bird1/day1.TextGrid'.
+    """
+
+    archive_path: pathlib.Path = attr.field(converter=pathlib.Path)
+    name: str
+
+    @property
+    def path(self) -> pathlib.Path:
+        """Path to the member, as if the archive were a directory,
+        used as the ``annot_path`` of annotations loaded from it."""
+        return self.archive_path / self.name
+
+
+def compression(name: PathLike) -> Optional[str]:
+    """Get the extension of a file compressed with one of
+    the compressions in :data:`~crowsetta.archive.COMPRESSIONS`,
+    or None if the file is not compressed."""
+    suffix = pathlib.PurePath(os.fsdecode(name)).suffix.lower()
+    if suffix in COMPRESSIONS:
+        return suffix
+    return None
+
+
+def decompress(data: bytes, name: PathLike) -> Tuple[bytes, pathlib.Path]:
+    """Decompress the bytes of a compressed file named ``name``,
+    and return them with the name of the decompressed file,
+    i.e. ``name`` without the compression extension.
+    If ``name`` does not have a compression extension,
+    ``data`` and ``name`` are returned unchanged."""
+    name = pathlib.Path(os.fsdecode(name))
+    suffix = compression(name)
+    if suffix is None:
+        return data, name
+    return COMPRESSIONS[suffix].decompress(data), name.with_suffix("")
+
+
+def open_archive(archive_path: PathLike) -> Union[zipfile.ZipFile, tarfile.TarFile]:
+    """Open a zip or tar archive, that may be compressed.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a zip or tar archive.
+    """
+    if zipfile.is_zipfile(archive_path):
+        return zipfile.ZipFile(archive_path)
+    try:
+        return tarfile.open(archive_path, mode="r:*")
+    except tarfile.ReadError as e:
+        raise ValueError(f"Not a zip or tar archive: {archive_path}") from e
+
+
+def _handles() -> dict:
+    """Get the handles to archives opened by the current thread in this process.
+
+    A process forked from a process with open handles, e.g. a worker
+    in a process pool, inherits them, with the file positions of the parent,
+    so they are not used; each process opens its own handles."""
+    if getattr(_local, "pid", None) != os.getpid():
+        # don't close handles inherited from a parent process; just stop using them
+        _local.handles = {}
+        _local.pid = os.getpid()
+    return _local.handles
+
+
+def _get_handle(archive_path: pathlib.Path) -> Union[zipfile.ZipFile, tarfile.TarFile]:
+    """Get the handle to an archive for the current thread,
+    opening the archive if this thread has not opened it already,
+    or if it has changed since it was opened."""
+    handles = _handles()
+    stat_result = os.stat(archive_path)
+    file_id = (stat_result.st_size, stat_result.st_mtime_ns)
+    key = os.path.abspath(archive_path)
+    if key in handles:
+        handle_file_id, handle = handles[key]
+        if handle_file_id == file_id:
+            return handle
+        handle.close()
+        del handles[key]
+    handle = open_archive(archive_path)
+    handles[key] = (file_id, handle)
+    return handle
+
+
+def close_handles() -> None:
+    """Close the handles to archives opened by the current thread.
+
+    Handles are closed automatically when a thread exits,
+    so this only needs to be called to release archives
+    opened in a thread that keeps running, e.g. the main thread.
+    """
+    handles = _handles()
+    while handles:
+        _, (_, handle) = handles.popitem()
+        handle.close()
+
+
+def list_members(archive_path: PathLike, ext: Optional[Union[str, tuple]] = None) -> List[ArchiveMember]:
+    """List the files in an archive.
+
+    Parameters
+    ----------
+    archive_path : str, pathlib.Path
+        Path to a zip or tar archive, that may be compressed.
+    ext : str, tuple, optional
+        Extension or tuple of extensions, e.g. the ``ext`` of a format class.
+        If specified, only files with one of these extensions are listed,
+        including files compressed with one of
+        :data:`~crowsetta.archive.COMPRESSIONS`,
+        e.g. both 'bird1.TextGrid' and 'bird1.TextGrid.gz' for '.TextGrid'.
+        Default is None, in which case all files are listed.
+
+    Returns
+    -------
+    members : list
+        Of :class:`~crowsetta.archive.ArchiveMember`,
+        in the order they are stored in the archive.
+    """
+    if isinstance(ext, str):
+        ext = (ext,)
+    handle = _get_handle(pathlib.Path(archive_path))
+    if isinstance(handle, zipfile.ZipFile):
+        names = [info.filename for info in handle.infolist() if not info.is_dir()]
+    else:
+        names = [info.name for info in handle.getmembers() if info.isfile()]
+
+    members = []
+    for name in names:
+        # skip metadata that macOS adds to zip archives
+        if name.startswith("__MACOSX/"):
+            continue
+        if ext is not None:
+            decompressed_name = name[: -len(compression(name))] if compression(name) else name
+            if not decompressed_name.endswith(ext):
+                continue
+        members.append(ArchiveMember(archive_path, name))
+    return members
+
+
+def read_member(member: ArchiveMember) -> bytes:
+    """Read all the bytes of a member of an archive,
+    with the handle to the archive for the current thread.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the archive does not have a member named ``member.name``.
+    """
+    handle = _get_handle(member.archive_path)
+    try:
+        if isinstance(handle, zipfile.ZipFile):
+            return handle.read(member.name)
+        fp = handle.extractfile(member.name)
+    except KeyError as e:
+        raise FileNotFoundError(f"No member named '{member.name}' in archive: {member.archive_path}") from e
+    if fp is None:
+        raise FileNotFoundError(f"Member '{member.name}' of archive is not a file: {member.archive_path}")
+    with fp:
+        return fp.read()
@@ -0,0 +1,309 @@
+"""Module with a process-wide cache of information about audio files,
+that annotation formats use to get sampling rates.
+
+Formats whose annotations are in units of samples,
+like :class:`crowsetta.formats.seq.Timit`
+and :class:`crowsetta.formats.seq.BirdsongRec`,
+need the sampling rate of the audio files they annotate
+to convert onsets and offsets to seconds.
+Opening every audio file to read its header with :func:`soundfile.info`,
+each time annotations are converted, is slow on network-mounted storage.
+The function :func:`crowsetta.audioinfo.info` caches the sampling rate,
+number of frames, and number of channels of each audio file,
+keyed by the absolute path to the file, its size, and its modification time,
+so that the header is read again only when a file changes.
+The cache keeps the most recently used entries,
+up to :data:`~crowsetta.audioinfo.DEFAULT_MAX_ENTRIES` by default,
+a bound that can be changed with :func:`crowsetta.audioinfo.set_max_entries`,
+and all entries can be removed with :func:`crowsetta.audioinfo.clear_cache`.
+
+The cache can also be saved to disk, so that it persists across processes,
+by calling :func:`crowsetta.audioinfo.enable_persistent_cache`.
+To read headers for many files at once, use
+:func:`crowsetta.audioinfo.prefetch`,
+that reads them concurrently in a pool of threads.
+
+Examples
+--------
+>>> example = crowsetta.data.get('birdsong-recognition-dataset')  # doctest: +SKIP
+>>> wav_paths = sorted(example.annot_path.parent.glob('Wave/*.wav'))  # doctest: +SKIP
+>>> infos = crowsetta.audioinfo.prefetch(wav_paths)  # doctest: +SKIP
+>>> crowsetta.audioinfo.info(wav_paths[0]).samplerate  # doctest: +SKIP
+32000
+"""
+from __future__ import annotations
+
+import collections
+import os
+import pathlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+import attr
+
+from .data.data import APP_DIRS
+from .typing import PathLike
+
+PERSISTENT_CACHE_FILENAME = "audio-info.sqlite3"
+# default maximum number of entries in the in-memory cache; each is a few hundred bytes
+DEFAULT_MAX_ENTRIES = 65536
+
+# maps absolute path -> (size, modification time in nanoseconds, AudioInfo),
+# in order from least to most recently used
+_CACHE: "collections.OrderedDict[str, Tuple[int, int, AudioInfo]]" = collections.OrderedDict()
+_MAX_ENTRIES: Optional[int] = DEFAULT_MAX_ENTRIES
+_LOCK = threading.RLock()
+_CONNECTION: Optional[sqlite3.Connection] = None
+
+
+@attr.define(frozen=True)
+class AudioInfo:
+    """Class that represents information about an audio file,
+    read from its header.
+
+    Attributes
+    ----------
+    samplerate : int
+        Sampling rate, in Hz.
+    frames : int
+        Number of frames, i.e. samples per channel.
+    channels : int
+        Number of channels.
+    """
+
+    samplerate: int
+    frames: int
+    channels: int
+
+    @property
+    def duration(self) -> float:
+        """Duration of the audio file, in seconds."""
+        return self.frames / self.samplerate
+
+
+def _stat(audio_path: PathLike) -> Tuple[str, int, int]:
+    """Get the key for the cache: absolute path, size, and modification time"""
+    path = os.path.abspath(os.fsdecode(audio_path))
+    stat_result = os.stat(path)
+    return path, stat_result.st_size, stat_result.st_mtime_ns
+
+
+def _add(path: str, entry: Tuple[int, int, AudioInfo]) -> None:
+    """Add an entry to the in-memory cache, removing the least recently used entries
+    if there are more than the maximum. Must be called with ``_LOCK`` held."""
+    _CACHE[path] = entry
+    _CACHE.move_to_end(path)
+    while _MAX_ENTRIES is not None and len(_CACHE) > _MAX_ENTRIES:
+        _CACHE.popitem(last=False)
+
+
+def _get_persistent(path: str) -> Optional[Tuple[int, int, AudioInfo]]:
+    """Get an entry from the persistent cache, if it is enabled,
+    e.g. for an entry that was removed from the in-memory cache.
+    Must be called with ``_LOCK`` held."""
+    if _CONNECTION is None:
+        return None
+    row = _CONNECTION.execute(
+        "SELECT size, mtime_ns, samplerate, frames, channels FROM audio_info WHERE path = ?", (path,)
+    ).fetchone()
+    if row is None:
+        return None
+    size, mtime_ns, samplerate, frames, channels = row
+    return size, mtime_ns, AudioInfo(samplerate=samplerate, frames=frames, channels=channels)
+
+
+def _info(audio_path: PathLike) -> Tuple[Tuple[str, int, int], AudioInfo, bool]:
+    """Get info for an audio file from the cache, or read its header
+    and add it to the in-memory cache.
+    Returns the key, the info, and whether the header was read."""
+    key = _stat(audio_path)
+    path, size, mtime_ns = key
+    with _LOCK:
+        cached = _CACHE.get(path)
+        if cached is None:
+            cached = _get_persistent(path)
+        if cached is not None and cached[:2] == (size, mtime_ns):
+            _add(path, cached)
+            return key, cached[2], False
+
+    # import here, so that importing crowsetta does not load libsndfile
+    import soundfile
+
+    sf_info = soundfile.info(path)
+    audio_info = AudioInfo(samplerate=sf_info.samplerate, frames=sf_info.frames, channels=sf_info.channels)
+    with _LOCK:
+        _add(path, (size, mtime_ns, audio_info))
+    return key, audio_info, True
+
+
+def _persist(entries: List[Tuple[Tuple[str, int, int], AudioInfo]]) -> None:
+    """Save entries to the persistent cache, if it is enabled"""
+    with _LOCK:
+        if _CONNECTION is None or not entries:
+            return
+        with _CONNECTION:
+            _CONNECTION.executemany(
+                "INSERT OR REPLACE INTO audio_info VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (path, size, mtime_ns, audio_info.samplerate, audio_info.frames, audio_info.channels)
+                    for (path, size, mtime_ns), audio_info in entries
+                ],
+            )
+
+
+def info(audio_path: PathLike) -> AudioInfo:
+    """Get information about an audio file.
+
+    The header of the file is read with :func:`soundfile.info`
+    the first time this function is called with ``audio_path``,
+    and the result is cached. The header is read again
+    only if the size or modification time of the file changes.
+
+    Parameters
+    ----------
+    audio_path : str, pathlib.Path
+        Path to an audio file.
+
+    Returns
+    -------
+    audio_info : crowsetta.audioinfo.AudioInfo
+        With attributes ``samplerate``, ``frames``, and ``channels``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If ``audio_path`` does not exist.
+    soundfile.LibsndfileError
+        If the header of ``audio_path`` cannot be read.
+    """
+    key, audio_info, is_new = _info(audio_path)
+    if is_new:
+        _persist([(key, audio_info)])
+    return audio_info
+
+
+def prefetch(audio_paths: Iterable[PathLike], max_workers: Optional[int] = None) -> List[Optional[AudioInfo]]:
+    """Get information about many audio files at once,
+    reading the headers of any files that are not already cached
+    concurrently, in a pool of threads.
+
+    Later calls to :func:`crowsetta.audioinfo.info`
+    with any of the same paths will then get the information from the cache.
+
+    Parameters
+    ----------
+    audio_paths : iterable
+        Of paths to audio files.
+    max_workers : int, optional
+        Maximum number of threads used to read headers.
+        Default is None, in which case
+        the default for :class:`concurrent.futures.ThreadPoolExecutor` is used.
+
+    Returns
+    -------
+    audio_infos : list
+        Of :class:`crowsetta.audioinfo.AudioInfo`,
+        one for each path in ``audio_paths``, in the same order.
+        The element for any file that does not exist
+        or whose header cannot be read is None.
+    """
+
+    def _info_or_none(audio_path):
+        try:
+            return _info(audio_path)
+        except (OSError, RuntimeError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_info_or_none, audio_paths))
+    _persist([(key, audio_info) for key, audio_info, is_new in filter(None, results) if is_new])
+    return [result[1] if result is not None else None for result in results]
+
+
+def set_max_entries(max_entries: Optional[int] = DEFAULT_MAX_ENTRIES) -> None:
+    """Set the maximum number of entries in the in-memory cache.
+
+    When there are more entries, the least recently used are removed.
+    Entries removed from the in-memory cache stay in the persistent cache, if it is enabled.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of entries. Default is
+        :data:`~crowsetta.audioinfo.DEFAULT_MAX_ENTRIES`.
+        If None, the number of entries is not bounded.
+    """
+    global _MAX_ENTRIES
+
+    if max_entries is not None and max_entries < 1:
+        raise ValueError(f"``max_entries`` must be a positive integer or None, but was: {max_entries}")
+    with _LOCK:
+        _MAX_ENTRIES = max_entries
+        while _MAX_ENTRIES is not None and len(_CACHE) > _MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+
+
+def clear_cache() -> None:
+    """Remove all entries from the in-memory cache.
+
+    Does not remove anything from the persistent cache, if it is enabled.
+    """
+    with _LOCK:
+        _CACHE.clear()
+
+
+def enable_persistent_cache(cache_path: Optional[PathLike] = None) -> pathlib.Path:
+    """Save the cache to disk, so that it persists across processes.
+
+    Entries already saved at ``cache_path`` are used
+    for files that are not in the in-memory cache,
+    and any headers read from then on are saved there.
+    The cache is an SQLite database, so it can safely be
+    shared by multiple processes.
+
+    Parameters
+    ----------
+    cache_path : str, pathlib.Path, optional
+        Path to the file where the cache is saved.
+        Default is None, in which case it is saved
+        in the user cache directory for crowsetta,
+        ``crowsetta.data.data.APP_DIRS.user_cache_dir``.
+
+    Returns
+    -------
+    cache_path : pathlib.Path
+        Path to the file where the cache is saved.
+    """
+    global _CONNECTION
+
+    if cache_path is None:
+        cache_path = pathlib.Path(APP_DIRS.user_cache_dir) / PERSISTENT_CACHE_FILENAME
+    cache_path = pathlib.Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with _LOCK:
+        disable_persistent_cache()
+        connection = sqlite3.connect(cache_path, timeout=30.0, check_same_thread=False)
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS audio_info ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                "samplerate INTEGER, frames INTEGER, channels INTEGER)"
+            )
+        _CONNECTION = connection
+    return cache_path
+
+
+def disable_persistent_cache() -> None:
+    """Stop saving the cache to disk.
+
+    Entries already in the cache stay in memory.
+    """
+    global _CONNECTION
+
+    with _LOCK:
+        if _CONNECTION is not None:
+            _CONNECTION.close()
+            _CONNECTION = None
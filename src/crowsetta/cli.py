@@ -0,0 +1,570 @@
+"""Command-line interface for :mod:`crowsetta`.
+
+Installing :mod:`crowsetta` adds a ``crowsetta`` command,
+that can also be run with ``python -m crowsetta``.
+
+The ``convert`` sub-command converts many annotation files
+from one format to another, loading, converting, and writing files
+concurrently in worker processes:
+
+.. code-block:: console
+
+   $ crowsetta convert ./gy6or6/032312 --from notmat --to generic-seq --output-dir ./csv --workers 8
+   $ crowsetta convert './raven/**/*.txt' --from raven --to aud-bbox --from-option annot_col=Species
+
+Each input file is loaded with the ``from_file`` method of the source format,
+converted with ``to_annot``, and the resulting annotations
+are made into the destination format with its ``from_annot`` method,
+then saved with ``to_file``. Formats that both declare array adapters
+are converted column by column instead, see :mod:`crowsetta.formats.adapters`.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import glob
+import json
+import os
+import pathlib
+import sys
+import time
+from typing import Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from . import transcriber
+
+# formats that can hold the annotations from one input file in one output file, even if there are several
+MULTI_ANNOT_FORMATS = ("generic-bbox", "generic-seq", "jsonl")
+
+
+class ConvertResult(NamedTuple):
+    """Result of converting one annotation file,
+    returned by the workers that convert files.
+
+    Attributes
+    ----------
+    annot_path : pathlib.Path
+        Path to the input file.
+    output_paths : list
+        Paths to the files that were written.
+    n_annots : int
+        Number of annotations converted.
+    error : str, None
+        Description of the error raised while converting the file,
+        or None if it was converted.
+    """
+
+    annot_path: pathlib.Path
+    output_paths: List[pathlib.Path]
+    n_annots: int = 0
+    error: Optional[str] = None
+
+
+def _numbered_path(output_path: pathlib.Path, ext: str, index: int) -> pathlib.Path:
+    """Path for one of several annotations from the same input file,
+    e.g. 'bird1.0.txt', 'bird1.1.txt'"""
+    stem = output_path.name[: -len(ext)] if ext else output_path.stem
+    return output_path.with_name(f"{stem}.{index}{ext}")
+
+
+def _write(format_obj, output_path: pathlib.Path) -> None:
+    """Write a file to a temporary path first and then rename it,
+    so that an interrupted conversion never leaves behind a partial file
+    that would be considered up to date"""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # keep the extension, since ``to_file`` methods validate it
+    tmp_path = output_path.with_name(f"~{output_path.name}")
+    try:
+        format_obj.to_file(tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _convert_file(
+    annot_path: pathlib.Path,
+    output_path: pathlib.Path,
+    from_format: str,
+    to_format: str,
+    from_kwargs: dict,
+    to_kwargs: dict,
+) -> ConvertResult:
+    """Convert one annotation file from one format to another"""
+    # avoid circular imports
+    from . import formats
+
+    if from_format == "auto":
+        from_format = formats.detect(annot_path)
+    from_class, to_class = formats.by_name(from_format), formats.by_name(to_format)
+    format_obj = from_class.from_file(annot_path, **from_kwargs)
+    if formats.adapters.can_convert(from_class, to_class):
+        # convert columns directly, without making an Annotation
+        _write(formats.adapters.convert(format_obj, to_class, **to_kwargs), output_path)
+        return ConvertResult(annot_path=annot_path, output_paths=[output_path], n_annots=1)
+
+    annots = format_obj.to_annot()
+    if not isinstance(annots, list):
+        annots = [annots]
+    if not annots:
+        raise ValueError("file has no annotations")
+
+    if to_format in MULTI_ANNOT_FORMATS:
+        format_objs = [to_class.from_annot(annots, **to_kwargs)]
+    else:
+        format_objs = [to_class.from_annot(annot, **to_kwargs) for annot in annots]
+
+    if len(format_objs) == 1:
+        output_paths = [output_path]
+    else:
+        ext = formats.FORMATS.ext(to_format)[0]
+        output_paths = [_numbered_path(output_path, ext, index) for index in range(len(format_objs))]
+    for format_obj, path in zip(format_objs, output_paths):
+        _write(format_obj, path)
+    return ConvertResult(annot_path=annot_path, output_paths=output_paths, n_annots=len(annots))
+
+
+def _convert_chunk(tasks: list, from_format: str, to_format: str, from_kwargs: dict, to_kwargs: dict) -> list:
+    """Convert a chunk of annotation files.
+
+    Helper function called by :func:`convert`,
+    defined at the module level so that it can be sent to worker processes.
+    Errors are caught and returned for each file,
+    so that one invalid file does not stop the rest of the chunk.
+    """
+    results = []
+    for annot_path, output_path in tasks:
+        try:
+            result = _convert_file(annot_path, output_path, from_format, to_format, from_kwargs, to_kwargs)
+        except Exception as e:
+            result = ConvertResult(annot_path=annot_path, output_paths=[], error=f"{type(e).__name__}: {e}")
+        results.append(result)
+    return results
+
+
+def _strip_ext(name: str, exts: Tuple[str, ...]) -> str:
+    """Remove the longest extension in ``exts`` that ``name`` ends with,
+    or the last suffix if it ends with none of them"""
+    for ext in sorted(exts, key=len, reverse=True):
+        if ext and name.lower().endswith(ext.lower()) and len(name) > len(ext):
+            return name[: -len(ext)]
+    return os.path.splitext(name)[0]
+
+
+def find_files(
+    inputs: List[str], exts: Tuple[str, ...], recursive: bool = False, pattern: Optional[str] = None
+) -> List[Tuple[pathlib.Path, pathlib.Path]]:
+    """Find annotation files to convert.
+
+    Parameters
+    ----------
+    inputs : list
+        Of :class:`str`, each a path to a file, a directory, or a glob pattern.
+    exts : tuple
+        Extensions of files in the source format, used to find files in directories.
+    recursive : bool
+        If True, search directories recursively. Default is False.
+    pattern : str, optional
+        Glob pattern used to find files in directories,
+        instead of matching ``exts``.
+
+    Returns
+    -------
+    files : list
+        Of tuples ``(annot_path, root)``, where ``root`` is
+        the directory that the structure of outputs is relative to:
+        the input directory for files found in a directory,
+        and otherwise the directory of the file.
+    """
+    files = []
+    for input_ in inputs:
+        path = pathlib.Path(input_)
+        if path.is_dir():
+            if pattern is not None:
+                paths = path.rglob(pattern) if recursive else path.glob(pattern)
+            else:
+                walk = path.rglob("*") if recursive else path.iterdir()
+                paths = (
+                    path_ for path_ in walk if any(path_.name.lower().endswith(ext.lower()) for ext in exts if ext)
+                )
+            files.extend((path_, path) for path_ in sorted(paths) if path_.is_file())
+        elif path.is_file():
+            files.append((path, path.parent))
+        else:
+            matches = sorted(glob.glob(input_, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No files found that match: {input_}")
+            files.extend(
+                (pathlib.Path(match), pathlib.Path(match).parent) for match in matches if os.path.isfile(match)
+            )
+    # the same file can be found by more than one input
+    unique = {}
+    for annot_path, root in files:
+        unique.setdefault(annot_path.resolve(), (annot_path, root))
+    return list(unique.values())
+
+
+def output_path_for(
+    annot_path: pathlib.Path,
+    root: pathlib.Path,
+    from_exts: Tuple[str, ...],
+    to_ext: str,
+    output_dir: Optional[pathlib.Path] = None,
+) -> pathlib.Path:
+    """Get the path of the file that an annotation file is converted to.
+
+    The extension of the source format is replaced with ``to_ext``.
+    The file is saved next to the input, or if ``output_dir`` is specified,
+    in the same location relative to ``output_dir``
+    as the input is relative to ``root``.
+    """
+    name = _strip_ext(annot_path.name, from_exts) + to_ext
+    if output_dir is None:
+        return annot_path.with_name(name)
+    return output_dir / annot_path.parent.relative_to(root) / name
+
+
+def is_up_to_date(annot_path: pathlib.Path, output_path: pathlib.Path, to_ext: str) -> bool:
+    """Determine whether the output for an annotation file
+    is newer than the file, so it does not need to be converted again.
+
+    When several annotations were converted from one file,
+    the outputs are numbered, and the first one is checked.
+    """
+    for path in (output_path, _numbered_path(output_path, to_ext, 0)):
+        if path.exists():
+            return path.stat().st_mtime >= annot_path.stat().st_mtime
+    return False
+
+
+class Progress:
+    """Report progress and throughput of a conversion.
+
+    Progress is written to ``stream``, by default :data:`sys.stderr`,
+    on one line that is updated in place
+    when ``stream`` is a terminal, and otherwise
+    on a new line at most once every ``interval`` seconds.
+    """
+
+    def __init__(self, total: int, stream: Optional[TextIO] = None, interval: float = 0.5, quiet: bool = False):
+        self.total = total
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = interval
+        self.quiet = quiet
+        self.n_done = 0
+        self.n_files = 0
+        self.n_annots = 0
+        self.n_errors = 0
+        self.start = time.perf_counter()
+        self._last_report = self.start
+        self._isatty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        # whether the progress line on a terminal needs to be ended before writing other lines
+        self._line_open = False
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def _rate(self) -> float:
+        elapsed = self.elapsed
+        return self.n_done / elapsed if elapsed > 0 else 0.0
+
+    def update(self, result: ConvertResult) -> None:
+        self.n_done += 1
+        if result.error is None:
+            self.n_files += 1
+            self.n_annots += result.n_annots
+        else:
+            self.n_errors += 1
+            self.message(f"error: {result.annot_path}: {result.error}")
+        now = time.perf_counter()
+        if not self.quiet and (now - self._last_report >= self.interval or self.n_done == self.total):
+            self._last_report = now
+            line = (
+                f"{self.n_done}/{self.total} files, {self._rate():.1f} files/s"
+                + (f", {self.n_errors} errors" if self.n_errors else "")
+            )
+            if self._isatty:
+                print(f"\r{line}", end="", file=self.stream, flush=True)
+                self._line_open = True
+            else:
+                print(line, file=self.stream)
+
+    def _end_line(self) -> None:
+        if self._line_open:
+            print(file=self.stream)
+            self._line_open = False
+
+    def message(self, text: str) -> None:
+        """Write a message on its own line, after any progress line.
+        Messages are written even when ``quiet`` is True."""
+        self._end_line()
+        print(text, file=self.stream)
+
+    def summary(self, n_skipped: int = 0) -> None:
+        if self.quiet:
+            return
+        self._end_line()
+        elapsed = self.elapsed
+        summary = (
+            f"converted {self.n_files} files ({self.n_annots} annotations) "
+            f"in {elapsed:.2f} s, {self._rate():.1f} files/s"
+        )
+        if n_skipped:
+            summary += f"; skipped {n_skipped} up to date"
+        if self.n_errors:
+            summary += f"; {self.n_errors} failed"
+        print(summary, file=self.stream)
+
+
+def convert(
+    tasks: List[Tuple[pathlib.Path, pathlib.Path]],
+    from_format: str,
+    to_format: str,
+    from_kwargs: Optional[dict] = None,
+    to_kwargs: Optional[dict] = None,
+    workers: int = 1,
+    executor: str = "process",
+    chunksize: int = 4,
+) -> Iterator[ConvertResult]:
+    """Convert annotation files concurrently,
+    and return an iterator over the results, in the same order as ``tasks``.
+
+    Parameters
+    ----------
+    tasks : list
+        Of tuples ``(annot_path, output_path)``.
+    from_format : str
+        Name of the source format, or 'auto' to detect the format of each file.
+    to_format : str
+        Name of the destination format.
+    from_kwargs : dict, optional
+        Keyword arguments passed to the ``from_file`` method of the source format.
+    to_kwargs : dict, optional
+        Keyword arguments passed to the ``from_annot`` method of the destination format.
+    workers : int
+        Number of workers. If 1, files are converted in the current process.
+    executor : str
+        Either 'process' or 'thread'. Default is 'process'.
+    chunksize : int
+        Number of files converted by a worker in each task.
+
+    Returns
+    -------
+    results : iterator
+        Of :class:`ConvertResult`, one for each task.
+        Only a few chunks are converted ahead of the results
+        that have been consumed, as for
+        :meth:`crowsetta.Transcriber.iter_from_files`.
+    """
+    convert_chunk = functools.partial(
+        _convert_chunk,
+        from_format=from_format,
+        to_format=to_format,
+        from_kwargs=from_kwargs or {},
+        to_kwargs=to_kwargs or {},
+    )
+    return transcriber._imap_chunks(convert_chunk, tasks, workers, executor, chunksize)
+
+
+def _parse_option(text: str) -> Tuple[str, object]:
+    """Parse a 'KEY=VALUE' option, where the value is parsed as JSON
+    if possible, e.g. 'round_times=false', and otherwise is a string"""
+    key, sep, value = text.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"option must be KEY=VALUE, but was: {text}")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return key.strip(), value
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, but was: {text}")
+    return value
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="crowsetta", description="Work with annotation formats for animal vocalizations and bioacoustics data."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser(
+        "convert",
+        help="convert annotation files from one format to another",
+        description="Convert annotation files from one format to another, in parallel.",
+    )
+    convert_parser.add_argument(
+        "inputs", nargs="+", help="annotation files, directories containing them, or glob patterns"
+    )
+    convert_parser.add_argument(
+        "--from",
+        dest="from_format",
+        required=True,
+        help="name of the source format, or 'auto' to detect the format of each file",
+    )
+    convert_parser.add_argument("--to", dest="to_format", required=True, help="name of the destination format")
+    convert_parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=pathlib.Path,
+        help="directory where converted files are saved; default is next to each input file",
+    )
+    convert_parser.add_argument(
+        "-r", "--recursive", action="store_true", help="search input directories recursively"
+    )
+    convert_parser.add_argument(
+        "--pattern", help="glob pattern for files in input directories; default matches the source format extensions"
+    )
+    convert_parser.add_argument(
+        "--from-option",
+        dest="from_options",
+        action="append",
+        type=_parse_option,
+        default=[],
+        metavar="KEY=VALUE",
+        help="keyword argument for loading files in the source format, e.g. annot_col=Species; can be repeated",
+    )
+    convert_parser.add_argument(
+        "--to-option",
+        dest="to_options",
+        action="append",
+        type=_parse_option,
+        default=[],
+        metavar="KEY=VALUE",
+        help="keyword argument for making the destination format from annotations; can be repeated",
+    )
+    convert_parser.add_argument(
+        "-j", "--workers", type=_positive_int, default=None, help="number of workers; default is the number of CPUs"
+    )
+    convert_parser.add_argument(
+        "--executor", choices=("process", "thread"), default="process", help="kind of workers; default is 'process'"
+    )
+    convert_parser.add_argument(
+        "--chunksize", type=_positive_int, default=4, help="number of files converted by a worker in each task"
+    )
+    convert_parser.add_argument(
+        "--on-error",
+        choices=("stop", "skip"),
+        default="stop",
+        help="whether to stop at the first file that cannot be converted, or skip it and continue; default is 'stop'",
+    )
+    convert_parser.add_argument(
+        "--max-errors",
+        type=_positive_int,
+        default=None,
+        help="with --on-error skip, stop after this many files cannot be converted",
+    )
+    convert_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip files whose converted outputs already exist and are newer than the input",
+    )
+    convert_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="only report errors, not progress and summary"
+    )
+    return parser
+
+
+def _run_convert(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """Run the ``convert`` sub-command, and return the exit status"""
+    from . import formats
+
+    names = formats.as_list()
+    if args.from_format != "auto" and args.from_format not in names:
+        parser.error(f"unknown source format '{args.from_format}', must be 'auto' or one of: {names}")
+    if args.to_format not in names:
+        parser.error(f"unknown destination format '{args.to_format}', must be one of: {names}")
+    to_class = formats.by_name(args.to_format)
+    if not (hasattr(to_class, "from_annot") and hasattr(to_class, "to_file")):
+        writable = [name for name in names if hasattr(formats.by_name(name), "from_annot")]
+        parser.error(
+            f"cannot convert annotations to '{args.to_format}' format, "
+            f"since it cannot be made from annotations. Formats that can are: {writable}"
+        )
+
+    if args.from_format == "auto":
+        from_exts = tuple(ext for name in names for ext in formats.FORMATS.ext(name))
+    else:
+        from_exts = formats.FORMATS.ext(args.from_format)
+    to_ext = formats.FORMATS.ext(args.to_format)[0]
+
+    try:
+        files = find_files(args.inputs, from_exts, recursive=args.recursive, pattern=args.pattern)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if not files:
+        parser.error(f"no annotation files found in: {args.inputs}")
+
+    tasks = [
+        (annot_path, output_path_for(annot_path, root, from_exts, to_ext, args.output_dir))
+        for annot_path, root in files
+    ]
+    # check before converting anything that no file would overwrite an input or another output
+    input_paths = {annot_path.resolve() for annot_path, _ in tasks}
+    output_paths = {}
+    for annot_path, output_path in tasks:
+        resolved = output_path.resolve()
+        if resolved in input_paths:
+            parser.error(
+                f"converting {annot_path} would overwrite an input file: {output_path}; use --output-dir"
+            )
+        if resolved in output_paths:
+            parser.error(f"{annot_path} and {output_paths[resolved]} would both be converted to {output_path}")
+        output_paths[resolved] = annot_path
+
+    n_skipped = 0
+    if args.incremental:
+        n_tasks = len(tasks)
+        tasks = [task for task in tasks if not is_up_to_date(*task, to_ext)]
+        n_skipped = n_tasks - len(tasks)
+
+    progress = Progress(len(tasks), quiet=args.quiet)
+    results = convert(
+        tasks,
+        args.from_format,
+        args.to_format,
+        from_kwargs=dict(args.from_options),
+        to_kwargs=dict(args.to_options),
+        workers=args.workers or os.cpu_count() or 1,
+        executor=args.executor,
+        chunksize=args.chunksize,
+    )
+    # close the iterator when stopping early, so that pending chunks are cancelled
+    with contextlib.closing(results):
+        for result in results:
+            progress.update(result)
+            if result.error is not None:
+                if args.on_error == "stop":
+                    progress.message("stopping, because --on-error is 'stop'")
+                    break
+                if args.max_errors is not None and progress.n_errors >= args.max_errors:
+                    progress.message(f"stopping, because {progress.n_errors} files could not be converted")
+                    break
+    progress.summary(n_skipped)
+    return 1 if progress.n_errors else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command-line interface.
+
+    Parameters
+    ----------
+    argv : list, optional
+        Of :class:`str`, command-line arguments.
+        Default is None, in which case ``sys.argv[1:]`` is used.
+
+    Returns
+    -------
+    status : int
+        Exit status: 0 if all files were converted, 1 if any could not be.
+    """
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if args.command == "convert":
+        return _run_convert(parser, args)
+    parser.error(f"unknown command: {args.command}")  # pragma: no cover
@@ -1,22 +1,64 @@
+"""Annotation formats that crowsetta can load and save.
+
+The classes that represent formats are in the sub-packages
+:mod:`crowsetta.formats.bbox` and :mod:`crowsetta.formats.seq`,
+except for the 'jsonl' format, that can hold both kinds of annotations,
+in the module :mod:`crowsetta.formats.jsonl`.
+These sub-packages, and the modules for each format, are only imported
+when they are first accessed, e.g. as ``crowsetta.formats.seq.NotMat``
+or with :func:`crowsetta.formats.by_name`,
+so that importing :mod:`crowsetta` does not import the dependencies
+of every format, like :mod:`pandas` and :mod:`pandera`.
+
+Formats provided by other packages are found through
+the entry point group ``crowsetta.formats``;
+see :mod:`crowsetta.formats.registry`.
+"""
 from __future__ import annotations
 
-import inspect
-from typing import Type
+import importlib
+from typing import List, Tuple, Type
 
 from .. import interface
-from . import bbox, seq
-
-FORMATS = {}
-for module in (bbox, seq):
-    for attr_name in dir(module):
-        attr = getattr(module, attr_name)
-        if inspect.isclass(attr):
-            if issubclass(attr, interface.seq.SeqLike) or issubclass(attr, interface.bbox.BBoxLike):
-                # note we use the class-level ``name`` attribute, a string, as keys in the dictionary
-                FORMATS[attr.name] = attr
-
-
-__all__ = ["bbox", "FORMATS", "seq"]
+from . import adapters, delimited, registry, sniff, source
+
+# maps shorthand name -> class that represents the format, imported when it is first accessed
+FORMATS = registry.FormatRegistry(
+    {
+        "aud-bbox": registry.FormatSpec("crowsetta.formats.bbox.audbbox", "AudBBox", (".txt",)),
+        "raven": registry.FormatSpec("crowsetta.formats.bbox.raven", "Raven", (".txt",)),
+        "generic-bbox": registry.FormatSpec("crowsetta.formats.bbox.generic", "GenericBBox", (".csv", ".parquet")),
+        "aud-seq": registry.FormatSpec("crowsetta.formats.seq.audseq", "AudSeq", (".txt",)),
+        "birdsong-recognition-dataset": registry.FormatSpec(
+            "crowsetta.formats.seq.birdsongrec", "BirdsongRec", (".xml",)
+        ),
+        "generic-seq": registry.FormatSpec("crowsetta.formats.seq.generic", "GenericSeq", (".csv",)),
+        "notmat": registry.FormatSpec("crowsetta.formats.seq.notmat", "NotMat", (".not.mat",)),
+        "simple-seq": registry.FormatSpec("crowsetta.formats.seq.simple", "SimpleSeq", (".csv", ".txt")),
+        "yarden": registry.FormatSpec("crowsetta.formats.seq.yarden", "SongAnnotationGUI", (".mat",)),
+        "textgrid": registry.FormatSpec("crowsetta.formats.seq.textgrid.textgrid", "TextGrid", (".TextGrid",)),
+        "timit": registry.FormatSpec("crowsetta.formats.seq.timit", "Timit", (".phn", ".PHN", ".wrd", ".WRD")),
+        "jsonl": registry.FormatSpec("crowsetta.formats.jsonl", "JsonLines", (".jsonl",)),
+    },
+    # formats provided by plugins, see crowsetta.formats.registry
+    entry_point_group=registry.ENTRY_POINT_GROUP,
+)
+
+# sub-packages, and modules that define formats, imported when they are first accessed
+_SUBPACKAGES = ("bbox", "jsonl", "seq")
+
+__all__ = ["adapters", "bbox", "delimited", "FORMATS", "jsonl", "registry", "seq", "sniff", "source"]
+
+
+def __getattr__(name: str):
+    # import sub-packages when they are first accessed
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SUBPACKAGES))
 
 
 def by_name(name: str) -> Type:
@@ -58,7 +100,7 @@ def as_list() -> list[str]:
     --------
     >>> import crowsetta
     >>> crowsetta.formats.as_list()
-    ['aud-bbox', 'aud-seq', 'birdsong-recognition-dataset', 'generic-seq', 'notmat', 'raven', 'simple-seq', 'textgrid', 'timit', 'yarden']  # noqa
+    ['aud-bbox', 'aud-seq', 'birdsong-recognition-dataset', 'generic-bbox', 'generic-seq', 'jsonl', 'notmat', 'raven', 'simple-seq', 'textgrid', 'timit', 'yarden']  # noqa
     """
     return sorted(FORMATS.keys())
 
@@ -87,8 +129,114 @@ def register_format(format_class: Type) -> Type:
         The same class, unchanged.
         This decorator only adds the class
         to :data:`crowsetta.formats.FORMATS`.
+
+    Notes
+    -----
+    A package that provides formats can instead declare them
+    as entry points in the group ``crowsetta.formats``,
+    so that they are available without being imported first.
+    See :mod:`crowsetta.formats.registry`.
+
+    If the class defines a class method ``sniff``,
+    then :func:`crowsetta.formats.detect` can detect
+    files in the format. See :mod:`crowsetta.formats.sniff`.
     """
     if not issubclass(format_class, interface.seq.SeqLike) and not issubclass(format_class, interface.bbox.BBoxLike):
         raise TypeError(f"format class must be subclass of SeqLike or BBoxLike, but was not: {format_class}")
     FORMATS[format_class.name] = format_class
     return format_class
+
+
+def detect_all(annot_path: source.AnnotPathOrBuffer) -> List[Tuple[str, float]]:
+    """Get the annotation formats that a file could be in,
+    ranked by confidence.
+
+    Only the first few hundred bytes of the file are read,
+    or for a .mat file the names of the variables in it,
+    and each format whose extension matches the file
+    and that defines a class method ``sniff``
+    returns its confidence that the file is in that format.
+    For bytes and file objects without a name,
+    the extension is unknown and every format is sniffed.
+    See :mod:`crowsetta.formats.sniff`.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path, file object
+        Path to an annotation file,
+        or the bytes or a file object of the file,
+        see :mod:`crowsetta.formats.source`.
+
+    Returns
+    -------
+    candidates : list
+        Of ``(name, confidence)`` tuples,
+        where ``name`` is the shorthand name of a format
+        and ``confidence`` is a float between 0. and 1.,
+        sorted from most to least confident.
+        Formats with a confidence of 0. are not included.
+
+    Examples
+    --------
+    >>> import crowsetta
+    >>> example = crowsetta.data.get('simple-seq')
+    >>> crowsetta.formats.detect_all(example.annot_path)
+    [('simple-seq', 0.2)]
+    """
+    file_head = sniff.FileHead(annot_path)
+    annot_path_str = str(file_head.annot_path)
+    candidates = []
+    for name in FORMATS:
+        # check the extension first, so that we only import the formats that could match
+        if file_head.has_name and not any(annot_path_str.endswith(ext) for ext in FORMATS.ext(name)):
+            continue
+        sniff_method = getattr(FORMATS[name], "sniff", None)
+        if sniff_method is None:
+            continue
+        confidence = sniff_method(file_head)
+        if confidence > 0.0:
+            candidates.append((name, confidence))
+    return sorted(candidates, key=lambda candidate: candidate[1], reverse=True)
+
+
+def detect(annot_path: source.AnnotPathOrBuffer) -> str:
+    """Detect the annotation format of a file.
+
+    Only the first few hundred bytes of the file are read,
+    or for a .mat file the names of the variables in it.
+    See :func:`crowsetta.formats.detect_all`.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path, file object
+        Path to an annotation file,
+        or the bytes or a file object of the file,
+        see :mod:`crowsetta.formats.source`.
+
+    Returns
+    -------
+    name : str
+        Shorthand name of the format
+        that the file is most likely to be in,
+        e.g. 'aud-seq'.
+
+    Raises
+    ------
+    ValueError
+        If the file is not in any format that can be detected.
+
+    Examples
+    --------
+    >>> import crowsetta
+    >>> example = crowsetta.data.get('raven')
+    >>> crowsetta.formats.detect(example.annot_path)
+    'raven'
+    """
+    candidates = detect_all(annot_path)
+    if not candidates:
+        raise ValueError(
+            f"Could not detect the annotation format of file: {source.as_source(annot_path).path}\n"
+            "Please specify the format by name. Valid format names:\n"
+            f"{as_list()}"
+        )
+    return candidates[0][0]
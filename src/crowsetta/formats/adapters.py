@@ -0,0 +1,359 @@
+"""Module with array-level adapters,
+that convert between annotation formats
+without making :class:`crowsetta.Annotation` instances.
+
+Converting through :class:`crowsetta.Annotation` makes a Python object
+for every segment or bounding box, with :class:`crowsetta.Segment`
+or :class:`crowsetta.BBox`, and then converts those objects
+back to arrays. For formats that store annotations as columns,
+converting from one to the other is really just renaming columns,
+and sometimes changing units. A format class can declare how
+its columns map to the fields of annotations with a class variable
+``ARRAY_ADAPTER``, an instance of
+:class:`~crowsetta.formats.adapters.ArrayAdapter`, e.g. for
+:class:`~crowsetta.formats.seq.Timit`, whose times are in samples:
+
+.. code-block:: python
+
+   ARRAY_ADAPTER: ClassVar[ArrayAdapter] = ArrayAdapter(
+       kind="seq",
+       columns=(
+           Column("begin_samples", "onsets_s", unit="samples"),
+           Column("end_samples", "offsets_s", unit="samples"),
+           Column("text", "labels"),
+       ),
+       notated_path="audio_path",
+   )
+
+Then :func:`crowsetta.formats.adapters.convert` converts
+between any two formats of the same kind that declare adapters
+with vectorized operations on whole columns.
+"""
+from __future__ import annotations
+
+import inspect
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from ..typing import PathLike
+
+# units of times in a format, and the factor that converts them to seconds;
+# times in samples are converted with a sampling rate instead
+SECONDS = "s"
+MILLISECONDS = "ms"
+SAMPLES = "samples"
+TIME_UNITS = {SECONDS: 1.0, MILLISECONDS: 1e-3}
+
+# names of the fields of annotations, that columns map to, for each kind of format.
+# Times are in seconds and frequencies in Hz.
+FIELDS = {
+    "seq": ("onsets_s", "offsets_s", "labels"),
+    "bbox": ("onsets_s", "offsets_s", "low_freqs_hz", "high_freqs_hz", "labels"),
+}
+
+
+class Column(NamedTuple):
+    """How one column of a format maps to a field of annotations.
+
+    Attributes
+    ----------
+    name : str
+        Name of the attribute of a format instance
+        that holds the column, or if the format stores
+        annotations in a :class:`pandas.DataFrame`,
+        the name of the column in the DataFrame.
+    field : str
+        Name of the field of annotations, one of
+        :data:`~crowsetta.formats.adapters.FIELDS`,
+        e.g. 'onsets_s' or 'labels'.
+    unit : str, optional
+        Unit of times in the column: 's', 'ms', or 'samples'.
+        Default is None, for columns that are not times
+        or that are already in the units of ``field``.
+    """
+
+    name: str
+    field: str
+    unit: Optional[str] = None
+
+
+class ArrayAdapter(NamedTuple):
+    """Declares how a format that stores annotations as columns
+    maps to the fields of annotations.
+
+    Attributes
+    ----------
+    kind : str
+        Either 'seq' or 'bbox'.
+        Only formats of the same kind can be converted with adapters.
+    columns : tuple
+        Of :class:`~crowsetta.formats.adapters.Column`,
+        one for each field of annotations of this kind.
+        When making an instance from arrays,
+        columns of a DataFrame are in this order.
+    frame : str, optional
+        Name of the attribute that holds a :class:`pandas.DataFrame`
+        with the columns. Default is None,
+        in which case each column is an attribute.
+    notated_path : str
+        Name of the attribute with the path to the file
+        that is annotated. Default is 'notated_path'.
+    defaults : mapping, optional
+        Default values of other arguments needed to make an instance,
+        e.g. the name of the label column for Raven.
+    """
+
+    kind: str
+    columns: Tuple[Column, ...]
+    frame: Optional[str] = None
+    notated_path: str = "notated_path"
+    defaults: Optional[Mapping] = None
+
+
+def get_adapter(format_class: Type) -> Optional[ArrayAdapter]:
+    """Get the :class:`~crowsetta.formats.adapters.ArrayAdapter`
+    that a format class declares, or None if it does not declare one."""
+    return getattr(format_class, "ARRAY_ADAPTER", None)
+
+
+def can_convert(from_class: Type, to_class: Type) -> bool:
+    """Determine whether an instance of one format class can be converted
+    to another with :func:`~crowsetta.formats.adapters.convert`
+    without making :class:`crowsetta.Annotation` instances,
+    i.e., whether both declare adapters of the same kind."""
+    from_adapter, to_adapter = get_adapter(from_class), get_adapter(to_class)
+    return from_adapter is not None and to_adapter is not None and from_adapter.kind == to_adapter.kind
+
+
+def _get_samplerate(samplerate: Optional[int], notated_path: Optional[PathLike]) -> int:
+    """Get the sampling rate used to convert times in samples,
+    from the audio file if it was not specified"""
+    if samplerate is not None:
+        return samplerate
+    if notated_path is not None:
+        # avoid circular imports
+        from .. import audioinfo
+
+        try:
+            return audioinfo.info(notated_path).samplerate
+        except Exception as e:
+            raise ValueError(
+                f"Could not get the sampling rate of the audio file: {notated_path}, "
+                "needed to convert times in samples. Please specify ``samplerate``."
+            ) from e
+    raise ValueError("A ``samplerate`` is needed to convert times in samples, but none was specified")
+
+
+def _labels_array(values) -> np.ndarray:
+    values = np.asarray(values)
+    return values if values.dtype.kind == "U" else values.astype(str)
+
+
+def to_arrays(format_obj, samplerate: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Get the fields of annotations from an instance of a format
+    that declares an :class:`~crowsetta.formats.adapters.ArrayAdapter`,
+    as arrays, converting units with vectorized operations.
+
+    Parameters
+    ----------
+    format_obj
+        An instance of a format class that declares an adapter.
+    samplerate : int, optional
+        Sampling rate used to convert times in samples to seconds.
+        Default is None, in which case it is read
+        from the annotated audio file, if needed.
+
+    Returns
+    -------
+    arrays : dict
+        Mapping the name of each field to a :class:`numpy.ndarray`.
+        Times are in seconds, and are not rounded.
+    """
+    adapter = get_adapter(type(format_obj))
+    if adapter is None:
+        raise TypeError(f"Format class does not declare an ARRAY_ADAPTER: {type(format_obj)}")
+    source = getattr(format_obj, adapter.frame) if adapter.frame is not None else None
+    arrays = {}
+    for column in adapter.columns:
+        if source is not None:
+            values = source[column.name].to_numpy()
+        else:
+            values = np.asarray(getattr(format_obj, column.name))
+        if column.field == "labels":
+            values = _labels_array(values)
+        elif column.unit == SAMPLES:
+            samplerate = _get_samplerate(samplerate, getattr(format_obj, adapter.notated_path, None))
+            values = values / samplerate
+        elif column.unit is not None and column.unit != SECONDS:
+            values = values * TIME_UNITS[column.unit]
+        arrays[column.field] = values
+    return arrays
+
+
+def from_arrays(
+    format_class: Type,
+    arrays: Mapping[str, np.ndarray],
+    annot_path: PathLike,
+    notated_path: Optional[PathLike] = None,
+    samplerate: Optional[int] = None,
+    **kwargs,
+):
+    """Make an instance of a format that declares an
+    :class:`~crowsetta.formats.adapters.ArrayAdapter`
+    from the fields of annotations, as arrays.
+
+    Parameters
+    ----------
+    format_class : class
+        A format class that declares an adapter.
+    arrays : mapping
+        Mapping the name of each field to an array,
+        as returned by :func:`~crowsetta.formats.adapters.to_arrays`.
+    annot_path : str, pathlib.Path
+        Path to the file that annotations were loaded from.
+    notated_path : str, pathlib.Path, optional
+        Path to the file that is annotated, e.g. an audio file.
+    samplerate : int, optional
+        Sampling rate used to convert times in seconds to samples.
+    **kwargs
+        Other arguments used to make the instance,
+        that take precedence over the ``defaults`` of the adapter.
+
+    Returns
+    -------
+    format_obj
+        An instance of ``format_class``.
+    """
+    adapter = get_adapter(format_class)
+    if adapter is None:
+        raise TypeError(f"Format class does not declare an ARRAY_ADAPTER: {format_class}")
+    missing = [field for field in FIELDS[adapter.kind] if field not in arrays]
+    if missing:
+        raise ValueError(f"Cannot make '{format_class.name}' annotations, arrays are missing fields: {missing}")
+    columns = {}
+    for column in adapter.columns:
+        values = arrays[column.field]
+        if column.unit == SAMPLES:
+            samplerate = _get_samplerate(samplerate, notated_path)
+            values = np.rint(values * samplerate).astype(int)
+        elif column.unit is not None and column.unit != SECONDS:
+            values = values / TIME_UNITS[column.unit]
+        columns[column.name] = values
+
+    if adapter.frame is not None:
+        # only import pandas for the formats that use it
+        import pandas as pd
+
+        for column in adapter.columns:
+            if column.field == "labels":
+                columns[column.name] = pd.array(columns[column.name], dtype=pd.StringDtype())
+        columns = {adapter.frame: pd.DataFrame(columns)}
+
+    init_kwargs = dict(adapter.defaults or {})
+    init_kwargs.update(kwargs)
+    return format_class(**columns, annot_path=annot_path, **{adapter.notated_path: notated_path}, **init_kwargs)
+
+
+def convert(
+    format_obj,
+    to_format: Union[str, Type],
+    samplerate: Optional[int] = None,
+    round_times: bool = True,
+    decimals: int = 3,
+    **kwargs,
+):
+    """Convert an instance of one annotation format to another.
+
+    If both formats declare an :class:`~crowsetta.formats.adapters.ArrayAdapter`
+    of the same kind, annotations are converted as whole columns,
+    without making a Python object for each segment or bounding box.
+    Otherwise, they are converted through :class:`crowsetta.Annotation`,
+    with the ``to_annot`` method of the instance and the ``from_annot``
+    class method of the format it is converted to.
+
+    Parameters
+    ----------
+    format_obj
+        An instance of a format class, e.g. loaded with its ``from_file`` method.
+    to_format : str, class
+        Shorthand name of the format to convert to, e.g. 'aud-bbox',
+        or the class that represents it.
+    samplerate : int, optional
+        Sampling rate used to convert times in samples,
+        for formats like 'timit'. Default is None, in which case
+        it is read from the annotated audio file, if needed.
+    round_times : bool
+        If True, round times in seconds of sequence-like formats,
+        like their ``to_annot`` methods do. Default is True.
+    decimals : int
+        Number of decimals places to round times to.
+        Only meaningful if round_times is True.
+        Default is 3, so that times are rounded to milliseconds.
+    **kwargs
+        Other arguments used to make the instance of ``to_format``,
+        e.g. ``annot_col`` for 'raven'.
+
+    Returns
+    -------
+    converted
+        An instance of the class for ``to_format``.
+
+    Examples
+    --------
+    >>> example = crowsetta.data.get('raven')
+    >>> raven = crowsetta.formats.bbox.Raven.from_file(example.annot_path, annot_col='Species')
+    >>> audbbox = crowsetta.formats.adapters.convert(raven, 'aud-bbox')
+    >>> audbbox.to_file('raven.txt')  # doctest: +SKIP
+
+    Notes
+    -----
+    Times are rounded the same way whether or not annotations are converted
+    with adapters, so the result is the same either way:
+    times in seconds from sequence-like formats are rounded,
+    like the ``to_annot`` methods of those formats do by default,
+    while times from bounding box-like formats are not.
+    Times converted to samples are computed from times that are not rounded.
+    Columns that do not need to be converted are not copied,
+    so the converted instance can share arrays with ``format_obj``.
+    """
+    if isinstance(to_format, str):
+        # avoid circular imports
+        from . import by_name
+
+        to_class = by_name(to_format)
+    else:
+        to_class = to_format
+
+    if can_convert(type(format_obj), to_class):
+        from_adapter = get_adapter(type(format_obj))
+        notated_path = getattr(format_obj, from_adapter.notated_path, None)
+        arrays = to_arrays(format_obj, samplerate=samplerate)
+        # only sequence-like formats round times when converting to annotations
+        if round_times and from_adapter.kind == "seq":
+            arrays = dict(arrays)
+            for column in get_adapter(to_class).columns:
+                if column.field in ("onsets_s", "offsets_s") and column.unit != SAMPLES:
+                    arrays[column.field] = np.around(arrays[column.field], decimals=decimals)
+        return from_arrays(
+            to_class,
+            arrays,
+            annot_path=format_obj.annot_path,
+            notated_path=notated_path,
+            samplerate=samplerate,
+            **kwargs,
+        )
+
+    if not hasattr(to_class, "from_annot"):
+        raise ValueError(f"Cannot convert to '{to_class.name}' format, since it cannot be made from annotations")
+    to_annot_kwargs = {}
+    to_annot_params = inspect.signature(format_obj.to_annot).parameters
+    if "round_times" in to_annot_params:
+        to_annot_kwargs.update(round_times=round_times, decimals=decimals)
+    if samplerate is not None:
+        # e.g. for 'timit', that needs the sampling rate to convert times
+        to_annot_kwargs["samplerate"] = samplerate
+    annot = format_obj.to_annot(**to_annot_kwargs)
+    if isinstance(annot, list) and len(annot) == 1:
+        annot = annot[0]
+    return to_class.from_annot(annot, **kwargs)
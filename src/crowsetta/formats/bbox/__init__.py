@@ -1,7 +1,36 @@
-from .audbbox import AudBBox
-from .raven import Raven
+"""Bounding box-like annotation formats.
+
+The module for each format is only imported
+when its class is first accessed.
+"""
+import importlib
+from typing import List
+
+# maps class name -> module that defines it
+_CLASSES = {
+    "AudBBox": "audbbox",
+    "GenericBBox": "generic",
+    "Raven": "raven",
+}
 
 __all__ = [
     "AudBBox",
+    "GenericBBox",
     "Raven",
 ]
+
+
+def __getattr__(name: str):
+    if name in _CLASSES:
+        return getattr(importlib.import_module(f"{__name__}.{_CLASSES[name]}"), name)
+    # import sub-modules when they are first accessed, e.g. ``crowsetta.formats.seq.matv73``
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_CLASSES))
@@ -4,19 +4,97 @@ https://manual.audacityteam.org/man/importing_and_exporting_labels.html#Extended
 """
 from __future__ import annotations
 
+import itertools
 import pathlib
-from typing import ClassVar, List, Optional
+from typing import ClassVar, Final, List, Optional, TextIO
 
 import attr
+import numpy as np
 import pandas as pd
 import pandera
 from pandera.typing import Series
 
 import crowsetta
+from crowsetta.formats.adapters import ArrayAdapter, Column
+from crowsetta.formats.source import AnnotPathOrBuffer
 from crowsetta.typing import PathLike
 
 
-def txt_to_records(aud_txt_path: PathLike) -> list[dict]:
+COLUMNS: Final = ("begin_time_s", "end_time_s", "label", "low_freq_hz", "high_freq_hz")
+
+BLOCK_SIZE: Final = 8192
+
+ROW1_TEMPLATE: Final = "{!r}\t{!r}\t{}\n"
+ROW2_TEMPLATE: Final = "\\\t{!r}\t{!r}\n"
+
+
+def _split_rows(lines: list[str], n_fields: int) -> list[str]:
+    """Split lines on tabs into a flat :class:`list` of fields,
+    with ``n_fields`` fields for each line, so that
+    field ``i`` of every line is ``fields[i::n_fields]``.
+
+    All lines are joined and split at once,
+    which works when every line has exactly ``n_fields`` fields.
+    If any line has a different number of fields, we fall back to splitting
+    line by line and keeping only the first ``n_fields``."""
+    if not lines:
+        return []
+    if set(map(str.count, lines, itertools.repeat("\t"))) == {n_fields - 1}:
+        fields = "\t".join(lines).split("\t")
+    else:
+        fields = []
+        for line in lines:
+            line_fields = line.split("\t")
+            if len(line_fields) < n_fields:
+                raise ValueError(f"Expected {n_fields} fields separated by tabs in line, but found: {line!r}")
+            fields.extend(line_fields[:n_fields])
+    return fields
+
+
+def txt_to_columns(aud_txt_path: AnnotPathOrBuffer) -> dict[str, np.ndarray]:
+    """Load a txt file in Audacity extended label track format
+    into columns for a :type:`pandas.DataFrame`.
+
+    Returns a :class:`dict` mapping column names to :class:`numpy.ndarray`,
+    that can be made into a :class:`~pandas.DataFrame`
+    by calling :class:`pandas.DataFrame`.
+
+    Parameters
+    ----------
+    aud_txt_path : str, pathlib.Path, file object
+        Path to a txt file, or a binary file object,
+        see :mod:`crowsetta.formats.source`.
+
+    Returns
+    -------
+    columns : dict
+        With keys 'begin_time_s', 'end_time_s', 'label',
+        'low_freq_hz', and 'high_freq_hz'.
+
+    Notes
+    -----
+    Each label is saved as two lines: the first has the begin time,
+    end time, and label, and the second has a backslash, the low frequency,
+    and the high frequency. The file is read and split into lines once;
+    the first and second lines of all labels are then split into fields
+    together, and each column is converted to an array in a single call.
+    """
+    with crowsetta.formats.source.as_source(aud_txt_path).open_text() as fp:
+        lines = fp.read().splitlines()
+    # drop last line if there's an odd number, as iterating over pairs of lines would
+    n_lines = len(lines) - len(lines) % 2
+    row1s = _split_rows(lines[0:n_lines:2], 3)
+    row2s = _split_rows(lines[1:n_lines:2], 3)
+    return {
+        "begin_time_s": np.array(row1s[0::3], dtype=float),
+        "end_time_s": np.array(row1s[1::3], dtype=float),
+        "label": np.array(row1s[2::3], dtype=str),
+        "low_freq_hz": np.array(row2s[1::3], dtype=float),
+        "high_freq_hz": np.array(row2s[2::3], dtype=float),
+    }
+
+
+def txt_to_records(aud_txt_path: AnnotPathOrBuffer) -> list[dict]:
     """Load a txt file in Audacity extended label track format
     into records for a :type:`pandas.DataFrame`.
 
@@ -25,7 +103,9 @@ def txt_to_records(aud_txt_path: PathLike) -> list[dict]:
 
     Parameters
     ----------
-    aud_txt_path : str, pathlib.Path
+    aud_txt_path : str, pathlib.Path, file object
+        Path to a txt file, or a binary file object,
+        see :mod:`crowsetta.formats.source`.
 
     Returns
     -------
@@ -38,23 +118,26 @@ def txt_to_records(aud_txt_path: PathLike) -> list[dict]:
     We work with Audacity txt files this way, instead of
     loading with :func:`pandas.read_csv` then munging, so that we can
     be sure that we can round-trip data without corrupting it.
+    To load columns instead of records, which is faster,
+    use :func:`crowsetta.formats.bbox.audbbox.txt_to_columns`.
     """
-    with pathlib.Path(aud_txt_path).open("r") as fp:
-        lines = fp.read().splitlines()
-    lines = [line.split("\t") for line in lines]
-
-    records = []
-    # next line: iterate over lines in groups of 2
-    for row1, row2 in zip(*[iter(lines)] * 2):
-        record = {
-            "begin_time_s": float(row1[0]),
-            "end_time_s": float(row1[1]),
-            "label": str(row1[2]),
-            "low_freq_hz": float(row2[1]),
-            "high_freq_hz": float(row2[2]),
-        }
-        records.append(record)
-    return records
+    columns = txt_to_columns(aud_txt_path)
+    return [dict(zip(COLUMNS, row)) for row in zip(*(columns[column].tolist() for column in COLUMNS))]
+
+
+def _format_lines(df: pd.DataFrame, start: int, stop: int) -> list[str]:
+    """Format rows ``start`` to ``stop`` of a validated :type:`pandas.DataFrame`
+    as pairs of lines in Audacity extended label track format"""
+    begin_times, end_times, low_freqs, high_freqs = (
+        df[column].values[start:stop].astype(float).tolist()
+        for column in ("begin_time_s", "end_time_s", "low_freq_hz", "high_freq_hz")
+    )
+    labels = df["label"].values[start:stop].tolist()
+    lines = [""] * (2 * len(begin_times))
+    # ``repr`` of a float is the shortest representation that round-trips, the same as ``str``
+    lines[0::2] = map(ROW1_TEMPLATE.format, begin_times, end_times, labels)
+    lines[1::2] = map(ROW2_TEMPLATE.format, low_freqs, high_freqs)
+    return lines
 
 
 def df_to_lines(df: pd.DataFrame) -> list[str]:
@@ -86,14 +169,30 @@ def df_to_lines(df: pd.DataFrame) -> list[str]:
     without corrupting it.
     """
     df = AudBBoxSchema.validate(df)
+    return _format_lines(df, 0, len(df))
 
-    lines = []
-    for record in df.itertuples():
-        row1 = f"{float(record.begin_time_s)}\t{float(record.end_time_s)}\t{record.label}\n"
-        row2 = f"\\\t{float(record.low_freq_hz)}\t{float(record.high_freq_hz)}\n"
-        lines.extend((row1, row2))
 
-    return lines
+def write_fp(fp: TextIO, df: pd.DataFrame, block_size: int = BLOCK_SIZE) -> None:
+    """Write a :type:`pandas.DataFrame` to an open text stream
+    in Audacity extended label track format.
+
+    Labels are formatted in blocks, and each block
+    is written as soon as it is formatted, so that
+    the lines for all labels are never held in memory at once.
+
+    Parameters
+    ----------
+    fp : TextIO
+        Python text stream, opened for writing.
+    df : pandas.DataFrame
+        With contents of a txt file in Audacity extended label track format.
+    block_size : int
+        Number of labels that are formatted
+        and then written together. Default is 8192.
+    """
+    df = AudBBoxSchema.validate(df)
+    for block_start in range(0, len(df), block_size):
+        fp.write("".join(_format_lines(df, block_start, block_start + block_size)))
 
 
 class AudBBoxSchema(pandera.SchemaModel):
@@ -146,43 +245,136 @@ class AudBBox:
 
     name: ClassVar[str] = "aud-bbox"
     ext: ClassVar[str] = ".txt"
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
+
+    ARRAY_ADAPTER: ClassVar[ArrayAdapter] = ArrayAdapter(
+        kind="bbox",
+        columns=(
+            Column("begin_time_s", "onsets_s"),
+            Column("end_time_s", "offsets_s"),
+            Column("label", "labels"),
+            Column("low_freq_hz", "low_freqs_hz"),
+            Column("high_freq_hz", "high_freqs_hz"),
+        ),
+        frame="df",
+        notated_path="audio_path",
+    )
 
     df: pd.DataFrame
     annot_path: pathlib.Path
     audio_path: Optional[pathlib.Path] = attr.field(default=None, converter=attr.converters.optional(pathlib.Path))
 
     @classmethod
-    def from_file(cls, annot_path: PathLike, audio_path: Optional[PathLike] = None) -> "Self":  # noqa: F821
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'aud-bbox' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format have pairs of lines,
+        where the second line starts with a backslash.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        rows = file_head.rows("\t")
+        if len(rows) < 2 or not all(len(row) == 3 for row in rows):
+            return sniff.NOT
+        if all(
+            (row[0] == "\\" if ind % 2 else sniff.is_number(row[0]))
+            and sniff.is_number(row[1])
+            and (sniff.is_number(row[2]) if ind % 2 else True)
+            for ind, row in enumerate(rows)
+        ):
+            return sniff.CERTAIN
+        return sniff.NOT
+
+    @classmethod
+    def from_file(
+        cls, annot_path: AnnotPathOrBuffer, audio_path: Optional[PathLike] = None, validate_ext: bool = True
+    ) -> "Self":  # noqa: F821
         """Load annotations from an Audacity annotation file with bounding boxes,
         created by exporting a Selection Table.
 
         Parameters
         ----------
-        annot_path : str, pathlib.Path
-            Path to a txt file exported from Audacity bbox.
+        annot_path : str, pathlib.Path, bytes, file object
+            Path to a txt file exported from Audacity bbox,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
         audio_path : str, pathlib.Path
             Path to audio file that the Audacity bbox txt file annotates.
             Optional, defaults to None.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has the extension '.txt'. Default is True.
+            Set to False to load a file with another extension.
 
         Examples
         --------
         >>> example = crowsetta.data.get('aud-bbox')
         >>> audbbox = crowsetta.formats.bbox.AudBBox.from_file(example.annot_path)
         """
-        annot_path = pathlib.Path(annot_path)
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
-        records = crowsetta.formats.bbox.audbbox.txt_to_records(annot_path)
-        df = pd.DataFrame.from_records(records)
+        source = crowsetta.formats.source.as_source(annot_path)
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(source.path, extension=cls.ext)
+        columns = crowsetta.formats.bbox.audbbox.txt_to_columns(source)
+        df = pd.DataFrame(columns)
         if len(df) < 1:
             raise ValueError(f"Cannot load annotations, " f"there are no rows in Audacity txt file:\n{df}")
         df = crowsetta.formats.bbox.audbbox.AudBBoxSchema.validate(df)
 
         return cls(
             df=df,
-            annot_path=annot_path,
+            annot_path=source.path,
             audio_path=audio_path,
         )
 
+    @classmethod
+    def from_annot(cls, annot: crowsetta.Annotation) -> "Self":  # noqa: F821
+        """Make an Audacity label track with bounding boxes from a :class:`crowsetta.Annotation`
+        with bounding boxes.
+
+        Parameters
+        ----------
+        annot : crowsetta.Annotation
+            With a ``bboxes`` attribute.
+
+        Returns
+        -------
+        audbbox : crowsetta.formats.bbox.AudBBox
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('raven')
+        >>> annot = crowsetta.formats.bbox.Raven.from_file(example.annot_path).to_annot()
+        >>> audbbox = crowsetta.formats.bbox.AudBBox.from_annot(annot)
+        >>> audbbox.to_file('labels.txt')  # doctest: +SKIP
+        """
+        bboxes = getattr(annot, "bboxes", None)
+        if bboxes is None:
+            raise ValueError(
+                f"Can only convert an Annotation with a ``bboxes`` attribute to '{cls.name}' format, "
+                f"but annotation has: {annot}"
+            )
+        df = pd.DataFrame(
+            {
+                "begin_time_s": np.array([bbox.onset for bbox in bboxes], dtype=float),
+                "end_time_s": np.array([bbox.offset for bbox in bboxes], dtype=float),
+                "label": [bbox.label for bbox in bboxes],
+                "low_freq_hz": np.array([bbox.low_freq for bbox in bboxes], dtype=float),
+                "high_freq_hz": np.array([bbox.high_freq for bbox in bboxes], dtype=float),
+            }
+        )
+        df = AudBBoxSchema.validate(df)
+        return cls(df=df, annot_path=annot.annot_path, audio_path=annot.notated_path)
+
     def to_bbox(self) -> List[crowsetta.BBox]:
         """Convert this Audacity extended label track annotation
         to a :class:`list` of :class:`crowsetta.Bbox`.
@@ -239,6 +431,5 @@ class AudBBox:
              Must have extension '.txt'
         """
         crowsetta.validation.validate_ext(annot_path, extension=self.ext)
-        lines = df_to_lines(self.df)
         with pathlib.Path(annot_path).open("w") as fp:
-            fp.writelines(lines)
+            write_fp(fp, self.df)
@@ -0,0 +1,309 @@
+"""
+Generic bounding box format,
+meant to be an abstraction of
+any bounding box-like format.
+
+Consists of a table with one row for each bounding box,
+and columns that say which :class:`crowsetta.Annotation`
+each bounding box belongs to, so that annotations from many files,
+e.g. Raven and Audacity files, can be pooled into one file.
+
+Annotations are kept as columns in a :class:`pandas.DataFrame`,
+that is read and written whole, and each annotation is a slice of the columns,
+so :class:`crowsetta.BBox` instances are only made when annotations
+are converted with :meth:`~crowsetta.formats.bbox.GenericBBox.to_annot`
+or :meth:`~crowsetta.formats.bbox.GenericBBox.to_bbox`.
+Tables can be saved as csv files, or as Parquet files,
+if the optional dependency :mod:`pyarrow` is installed,
+e.g. with ``pip install crowsetta[parquet]``.
+"""
+from typing import ClassVar, List, Optional, Tuple, Union
+
+import attr
+import numpy as np
+import pandas as pd
+import pandera
+from pandera.typing import Series
+
+import crowsetta
+from crowsetta.formats.source import AnnotPathOrBuffer
+from crowsetta.typing import PathLike
+
+# columns of the table, in order
+COLUMNS = (
+    "onset_s",
+    "offset_s",
+    "low_freq_hz",
+    "high_freq_hz",
+    "label",
+    "notated_path",
+    "annot_path",
+    "annotation",
+)
+
+
+class GenericBBoxSchema(pandera.SchemaModel):
+    """A :class:`pandera.SchemaModel` that validates
+    :type:`pandas.DataFrame`s
+    loaded from a file in the ``'generic-bbox'`` annotation format.
+    """
+
+    onset_s: Series[float] = pandera.Field(coerce=True)
+    offset_s: Series[float] = pandera.Field(coerce=True)
+    low_freq_hz: Series[float] = pandera.Field(coerce=True)
+    high_freq_hz: Series[float] = pandera.Field(coerce=True)
+    label: Series[pd.StringDtype] = pandera.Field(coerce=True)
+    # annotations without a ``notated_path`` have an empty value
+    notated_path: Series[pd.StringDtype] = pandera.Field(coerce=True, nullable=True)
+    annot_path: Series[pd.StringDtype] = pandera.Field(coerce=True)
+    annotation: Series[int] = pandera.Field(coerce=True, ge=0)
+
+    class Config:
+        ordered = True
+        strict = True
+
+
+def _read_parquet_or_raise(annot_path: AnnotPathOrBuffer) -> pd.DataFrame:
+    try:
+        return pd.read_parquet(crowsetta.formats.source.path_or_buffer(annot_path))
+    except ImportError as e:
+        raise ImportError(
+            "Reading 'generic-bbox' annotations from Parquet files requires the package pyarrow. "
+            "Please install it, e.g. with `pip install crowsetta[parquet]`."
+        ) from e
+
+
+@crowsetta.interface.BBoxLike.register
+@attr.define
+class GenericBBox:
+    """Class that represents annotations from a generic format,
+    meant to be an abstraction of
+    any bounding box-like format.
+
+    A table with one row for each bounding box,
+    with columns 'onset_s', 'offset_s', 'low_freq_hz', 'high_freq_hz' and 'label',
+    and the columns 'notated_path', 'annot_path' and 'annotation'
+    that say which :class:`crowsetta.Annotation` each bounding box belongs to.
+    'annotation' is the index of the annotation, and the rows of each
+    annotation are contiguous, in the order of this index.
+
+    Other formats that convert to :class:`~crowsetta.Annotation`s
+    with ``bboxes`` can be converted to this format.
+
+    Attributes
+    ----------
+    name: str
+        Shorthand name for annotation format: ``'generic-bbox'``
+    ext: tuple
+        Extensions of files in annotation format: ``('.csv', '.parquet')``
+    df : pandas.DataFrame
+        The table of bounding boxes.
+
+    Examples
+    --------
+    Pool annotations from many Raven files into one file
+
+    >>> ravens = [crowsetta.formats.bbox.Raven.from_file(path, annot_col='Species') for path in raven_paths]
+    >>> generic = crowsetta.formats.bbox.GenericBBox.from_annot([raven.to_annot() for raven in ravens])
+    >>> generic.to_file('ravens.csv')  # doctest: +SKIP
+    """
+
+    name: ClassVar[str] = "generic-bbox"
+    ext: ClassVar[Tuple[str, ...]] = (".csv", ".parquet")
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
+
+    df: pd.DataFrame
+
+    @classmethod
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'generic-bbox' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format are csv files with a header
+        that has the names of the required columns,
+        or Parquet files.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        if file_head.head.startswith(b"PAR1"):
+            return sniff.LIKELY
+        if not file_head.lines:
+            return sniff.NOT
+        header = [column.strip() for column in file_head.lines[0].split(",")]
+        if all(column in header for column in COLUMNS):
+            return sniff.CERTAIN
+        return sniff.NOT
+
+    @classmethod
+    def from_file(cls, annot_path: AnnotPathOrBuffer, validate_ext: bool = True) -> "Self":  # noqa: F821
+        """Load annotations in 'generic-bbox' format from a csv or Parquet file.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path, bytes, file object
+            Path to a csv or Parquet file containing annotations
+            saved in the ``'generic-bbox'`` format,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has one of the extensions {'.csv', '.parquet'}.
+            Default is True.
+            Set to False to load a csv file with another extension.
+
+        Examples
+        --------
+        >>> generic = crowsetta.formats.bbox.GenericBBox.from_file('ravens.csv')  # doctest: +SKIP
+        """
+        source = crowsetta.formats.source.as_source(annot_path)
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(source.path, extension=cls.ext)
+        if source.path.name.endswith(".parquet"):
+            df = _read_parquet_or_raise(source)
+        else:
+            # read strings as they are, so that e.g. a label 'NA' is not a missing value
+            df = pd.read_csv(
+                crowsetta.formats.source.path_or_buffer(source),
+                dtype={"label": str, "notated_path": str, "annot_path": str},
+                keep_default_na=False,
+            )
+            if "notated_path" in df.columns:
+                df["notated_path"] = df["notated_path"].replace("", None)
+        df = GenericBBoxSchema.validate(df)
+        if np.any(np.diff(df["annotation"].values) < 0):
+            raise ValueError("Rows for each annotation in a 'generic-bbox' file must be contiguous, in order")
+        return cls(df=df)
+
+    @classmethod
+    def from_annot(
+        cls, annot: Union[crowsetta.Annotation, List[crowsetta.Annotation]]
+    ) -> "Self":  # noqa: F821
+        """Make a 'generic-bbox' annotation from one or more
+        bounding box-like :class:`crowsetta.Annotation` instances.
+
+        Parameters
+        ----------
+        annot : crowsetta.Annotation, list
+            A :class:`crowsetta.Annotation` with a ``bboxes`` attribute,
+            or a :class:`list` of them.
+
+        Returns
+        -------
+        generic : crowsetta.formats.bbox.GenericBBox
+        """
+        annots = [annot] if isinstance(annot, crowsetta.Annotation) else list(annot)
+        for annot_ in annots:
+            if hasattr(annot_, "seq"):
+                raise ValueError(
+                    "Can only convert Annotations with a ``bboxes`` attribute to 'generic-bbox' format, "
+                    f"but annotation has: {annot_}"
+                )
+        bboxes = [getattr(annot_, "bboxes", []) for annot_ in annots]
+        n_bboxes = np.array([len(bboxes_) for bboxes_ in bboxes], dtype=int)
+        all_bboxes = [bbox for bboxes_ in bboxes for bbox in bboxes_]
+        notated_paths = np.array(
+            [str(annot_.notated_path) if annot_.notated_path is not None else None for annot_ in annots], dtype=object
+        )
+        columns = {
+            "onset_s": np.array([bbox.onset for bbox in all_bboxes], dtype=float),
+            "offset_s": np.array([bbox.offset for bbox in all_bboxes], dtype=float),
+            "low_freq_hz": np.array([bbox.low_freq for bbox in all_bboxes], dtype=float),
+            "high_freq_hz": np.array([bbox.high_freq for bbox in all_bboxes], dtype=float),
+            "label": [str(bbox.label) for bbox in all_bboxes],
+            # repeat the values for each annotation once for each of its bounding boxes
+            "notated_path": np.repeat(notated_paths, n_bboxes),
+            "annot_path": np.repeat(np.array([str(annot_.annot_path) for annot_ in annots], dtype=object), n_bboxes),
+            "annotation": np.repeat(np.arange(len(annots)), n_bboxes),
+        }
+        df = GenericBBoxSchema.validate(pd.DataFrame(columns, columns=list(COLUMNS)))
+        return cls(df=df)
+
+    def _slices(self) -> List[Tuple[int, int]]:
+        """Get the start and stop of the rows for each annotation"""
+        codes = self.df["annotation"].values
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], bounds)).tolist()
+        stops = np.concatenate((bounds, [len(codes)])).tolist()
+        return list(zip(starts, stops)) if len(codes) else []
+
+    def to_bbox(self) -> List[List[crowsetta.BBox]]:
+        """Return a :class:`list` with a :class:`list` of
+        :class:`crowsetta.BBox` instances for every annotation.
+
+        Examples
+        --------
+        >>> generic = crowsetta.formats.bbox.GenericBBox.from_file('ravens.csv')  # doctest: +SKIP
+        >>> bboxes = generic.to_bbox()  # doctest: +SKIP
+        """
+        arrays = [
+            self.df[column].values for column in ("onset_s", "offset_s", "low_freq_hz", "high_freq_hz", "label")
+        ]
+        return [
+            [
+                crowsetta.BBox(onset=onset, offset=offset, low_freq=low_freq, high_freq=high_freq, label=str(label))
+                for onset, offset, low_freq, high_freq, label in zip(*(array[start:stop] for array in arrays))
+            ]
+            for start, stop in self._slices()
+        ]
+
+    def to_annot(self) -> List[crowsetta.Annotation]:
+        """Return a :class:`list` of :class:`crowsetta.Annotation` instances,
+        one for every annotation in the table.
+
+        Examples
+        --------
+        >>> generic = crowsetta.formats.bbox.GenericBBox.from_file('ravens.csv')  # doctest: +SKIP
+        >>> annots = generic.to_annot()  # doctest: +SKIP
+        """
+        annot_paths = self.df["annot_path"].values
+        notated_paths = self.df["notated_path"].values
+        annots = []
+        for (start, _), bboxes in zip(self._slices(), self.to_bbox()):
+            notated_path = notated_paths[start]
+            annots.append(
+                crowsetta.Annotation(
+                    annot_path=annot_paths[start],
+                    notated_path=notated_path if not pd.isna(notated_path) else None,
+                    bboxes=bboxes,
+                )
+            )
+        return annots
+
+    def to_df(self) -> pd.DataFrame:
+        """Return the table of bounding boxes, as a :type:`pandas.DataFrame`."""
+        return self.df
+
+    def to_file(self, annot_path: PathLike, parquet_kwargs: Optional[dict] = None) -> None:
+        """Write these annotations to a csv or Parquet file
+        in ``'generic-bbox'`` format.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path
+            Path including filename of the file to write to,
+            with extension '.csv' or '.parquet'.
+            Will be created (or overwritten if it exists already).
+        parquet_kwargs : dict, optional
+            Keyword arguments passed to :meth:`pandas.DataFrame.to_parquet`,
+            e.g. ``{'compression': 'zstd'}``.
+        """
+        crowsetta.validation.validate_ext(annot_path, extension=self.ext)
+        if str(annot_path).endswith(".parquet"):
+            try:
+                self.df.to_parquet(annot_path, index=False, **(parquet_kwargs or {}))
+            except ImportError as e:
+                raise ImportError(
+                    "Writing 'generic-bbox' annotations to Parquet files requires the package pyarrow. "
+                    "Please install it, e.g. with `pip install crowsetta[parquet]`."
+                ) from e
+        else:
+            self.df.to_csv(annot_path, index=False)
@@ -6,14 +6,18 @@ https://github.com/kitzeslab/opensoundscape/blob/master/opensoundscape/annotatio
 under MIT license
 """
 import pathlib
-from typing import ClassVar, List, Optional
+import warnings
+from typing import ClassVar, List, Optional, Sequence, Union
 
 import attr
+import numpy as np
 import pandas as pd
 import pandera
 from pandera.typing import Series
 
 import crowsetta
+from crowsetta.formats.adapters import ArrayAdapter, Column
+from crowsetta.formats.source import AnnotPathOrBuffer, AnnotSource
 from crowsetta.typing import PathLike
 
 
@@ -56,49 +60,162 @@ class Raven:
         Path to Raven txt file from which annotations were loaded.
     audio_path : str. pathlib.Path
         Path to audio file that the Raven txt file annotates.
+
+    Notes
+    -----
+    Selection tables exported from Raven can have
+    dozens of measurement columns, e.g. 'Peak Freq (Hz)'.
+    By default :meth:`~crowsetta.formats.bbox.Raven.from_file` only reads the
+    begin and end times, low and high frequencies, and annotation column,
+    plus any columns specified with ``usecols``.
+    The full table with every column can be accessed
+    with the :attr:`~crowsetta.formats.bbox.Raven.full_df` property;
+    it is read from ``annot_path`` the first time it is accessed.
+
+    Selection tables that span multiple audio files
+    have 'Begin File' and 'File Offset (s)' columns,
+    that are also loaded when they are present.
+    These tables can be converted to one annotation per audio file
+    by calling :meth:`~crowsetta.formats.bbox.Raven.to_annot`
+    with ``by_file=True``.
     """
 
     name: ClassVar[str] = "raven"
     ext: ClassVar[str] = (".txt",)
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
     COLUMNS_MAP: ClassVar[dict] = {
         "Begin Time (s)": "begin_time_s",
         "End Time (s)": "end_time_s",
         "Low Freq (Hz)": "low_freq_hz",
         "High Freq (Hz)": "high_freq_hz",
     }
+    BEGIN_FILE_COL: ClassVar[str] = "Begin File"
+    FILE_OFFSET_COL: ClassVar[str] = "File Offset (s)"
+    ARRAY_ADAPTER: ClassVar[ArrayAdapter] = ArrayAdapter(
+        kind="bbox",
+        columns=(
+            Column("begin_time_s", "onsets_s"),
+            Column("end_time_s", "offsets_s"),
+            Column("low_freq_hz", "low_freqs_hz"),
+            Column("high_freq_hz", "high_freqs_hz"),
+            Column("annotation", "labels"),
+        ),
+        frame="df",
+        notated_path="audio_path",
+        defaults={"annot_col": "Annotation"},
+    )
 
     df: pd.DataFrame
     annot_path: pathlib.Path
     annot_col: str
     audio_path: Optional[pathlib.Path] = attr.field(default=None, converter=attr.converters.optional(pathlib.Path))
+    # source of the file that ``df`` was loaded from with only some columns, set by ``from_file``;
+    # ``full_df`` is read from this source the first time it is accessed
+    _full_df_source: Optional[AnnotSource] = attr.field(default=None, init=False, eq=False, repr=False)
+    _full_df: Optional[pd.DataFrame] = attr.field(default=None, init=False, eq=False, repr=False)
+
+    @classmethod
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'raven' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format have a tab-separated header
+        with the names of columns that Raven uses.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        if not file_head.lines:
+            return sniff.NOT
+        header = file_head.lines[0].rstrip("\r\n").split("\t")
+        if all(column in header for column in cls.COLUMNS_MAP):
+            return sniff.CERTAIN
+        return sniff.NOT
 
     @classmethod
     def from_file(
-        cls, annot_path: PathLike, annot_col: str = "Annotation", audio_path: Optional[PathLike] = None
+        cls,
+        annot_path: AnnotPathOrBuffer,
+        annot_col: str = "Annotation",
+        audio_path: Optional[PathLike] = None,
+        usecols: Optional[Sequence[str]] = None,
+        validate_ext: bool = True,
     ) -> "Self":  # noqa: F821
         """Load annotations from a Raven annotation file,
         created by exporting a Selection Table.
 
         Parameters
         ----------
-        annot_path : str, pathlib.Path
-            Path to a txt file exported from Raven.
+        annot_path : str, pathlib.Path, bytes, file object
+            Path to a txt file exported from Raven,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
         annot_col : str
             Name of column that contains annotations.
         audio_path : str, pathlib.Path
             Path to audio file that the Raven txt file annotates.
             Optional, defaults to None.
+        usecols : list, optional
+            Names of other columns in the table to load,
+            e.g. ``['Selection', 'Peak Freq (Hz)']``.
+            Default is None, in which case only the columns needed
+            for annotations are loaded: begin and end times,
+            low and high frequencies, ``annot_col``,
+            and 'Begin File' and 'File Offset (s)' if they are in the table.
+            The full table can always be accessed with
+            :attr:`~crowsetta.formats.bbox.Raven.full_df`.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has the extension '.txt'. Default is True.
+            Set to False to load a file with another extension.
 
         Examples
         --------
         >>> example = crowsetta.data.get('raven')
         >>> raven = crowsetta.formats.bbox.Raven.from_file(example.annot_path)
+        >>> raven = crowsetta.formats.bbox.Raven.from_file(example.annot_path, usecols=['Selection'])
+
+        Notes
+        -----
+        So that :attr:`~crowsetta.formats.bbox.Raven.full_df` can be read
+        when it is first accessed, the instance keeps the source of the table.
+        For a path, that is just the path. For a file object,
+        the bytes of the file are kept in memory as long as the instance,
+        since the file object could be closed before then.
+        Bytes, and file objects that are :class:`io.BytesIO` made from bytes,
+        are kept without copying them.
         """
-        annot_path = pathlib.Path(annot_path)
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
+        source = crowsetta.formats.source.as_source(annot_path)
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(source.path, extension=cls.ext)
 
-        #  assume file is space-separated with no header
-        df = pd.read_csv(annot_path, sep="\t")
+        if usecols is None:
+            usecols = []
+        elif isinstance(usecols, str):
+            usecols = [usecols]
+        dtype = {column: float for column in cls.COLUMNS_MAP}
+        dtype[annot_col] = str
+        dtype[cls.BEGIN_FILE_COL] = str
+        dtype[cls.FILE_OFFSET_COL] = float
+        columns_to_load = (
+            set(cls.COLUMNS_MAP) | {annot_col, cls.BEGIN_FILE_COL, cls.FILE_OFFSET_COL} | set(usecols)
+        )
+        # use a callable for usecols so that missing columns are reported by validation, as they would be
+        # if we loaded every column. Pandas keeps the order of columns in the file
+        df = pd.read_csv(
+            crowsetta.formats.source.path_or_buffer(source),
+            sep="\t",
+            usecols=lambda column: column in columns_to_load,
+            dtype=dtype,
+        )
         if len(df) < 1:
             raise ValueError(f"Cannot load annotations, " f"there are no rows in Raven txt file:\n{df}")
         columns_map = dict(cls.COLUMNS_MAP)  # copy
@@ -106,12 +223,95 @@ class Raven:
         df.rename(columns=columns_map, inplace=True)
         df = RavenSchema.validate(df)
 
-        return cls(
+        raven = cls(
             df=df,
-            annot_path=annot_path,
+            annot_path=source.path,
             annot_col=annot_col,
             audio_path=audio_path,
         )
+        # keep the bytes of a file object, so ``full_df`` can be read after it is closed.
+        # This does not copy bytes that are already in memory, see ``AnnotSource.in_memory``
+        raven._full_df_source = source.in_memory()
+        return raven
+
+    @classmethod
+    def from_annot(cls, annot: crowsetta.Annotation, annot_col: str = "Annotation") -> "Self":  # noqa: F821
+        """Make a Raven Selection Table from a :class:`crowsetta.Annotation`
+        with bounding boxes.
+
+        Parameters
+        ----------
+        annot : crowsetta.Annotation
+            With a ``bboxes`` attribute.
+        annot_col : str
+            Name of the column in the Selection Table
+            that labels will be written to. Default is "Annotation".
+
+        Returns
+        -------
+        raven : crowsetta.formats.bbox.Raven
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('aud-bbox')
+        >>> annot = crowsetta.formats.bbox.AudBBox.from_file(example.annot_path).to_annot()
+        >>> raven = crowsetta.formats.bbox.Raven.from_annot(annot)
+        >>> raven.to_file('selections.txt')  # doctest: +SKIP
+        """
+        bboxes = getattr(annot, "bboxes", None)
+        if bboxes is None:
+            raise ValueError(
+                f"Can only convert an Annotation with a ``bboxes`` attribute to '{cls.name}' format, "
+                f"but annotation has: {annot}"
+            )
+        df = pd.DataFrame(
+            {
+                "begin_time_s": np.array([bbox.onset for bbox in bboxes], dtype=float),
+                "end_time_s": np.array([bbox.offset for bbox in bboxes], dtype=float),
+                "low_freq_hz": np.array([bbox.low_freq for bbox in bboxes], dtype=float),
+                "high_freq_hz": np.array([bbox.high_freq for bbox in bboxes], dtype=float),
+                "annotation": [bbox.label for bbox in bboxes],
+            }
+        )
+        df = RavenSchema.validate(df)
+        return cls(df=df, annot_path=annot.annot_path, annot_col=annot_col, audio_path=annot.notated_path)
+
+    @property
+    def full_df(self) -> pd.DataFrame:
+        """The full Selection Table, with every column,
+        and with the names of columns as they are in the txt file.
+
+        For instances created with :meth:`~crowsetta.formats.bbox.Raven.from_file`,
+        the table is read from ``annot_path`` the first time this property is accessed,
+        and then cached. For other instances, this is :attr:`df`,
+        with columns renamed to the names used in txt files.
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('raven')
+        >>> raven = crowsetta.formats.bbox.Raven.from_file(example.annot_path)
+        >>> peak_freqs = raven.full_df['Peak Freq (Hz)']  # doctest: +SKIP
+        """
+        if self._full_df_source is None:
+            return self._df_out()
+        if self._full_df is None:
+            self._full_df = pd.read_csv(crowsetta.formats.source.path_or_buffer(self._full_df_source), sep="\t")
+        return self._full_df
+
+    def _df_out(self) -> pd.DataFrame:
+        """Get :attr:`df` with columns renamed to the names used in txt files"""
+        columns_map = {v: k for k, v in self.COLUMNS_MAP.items()}  # copy
+        columns_map.update({"annotation": self.annot_col})
+        return self.df.rename(columns=columns_map)
+
+    @staticmethod
+    def _arrays_to_bbox(
+        onsets: np.ndarray, offsets: np.ndarray, low_freqs: np.ndarray, high_freqs: np.ndarray, labels: np.ndarray
+    ) -> List[crowsetta.BBox]:
+        return [
+            crowsetta.BBox(onset=onset, offset=offset, low_freq=low_freq, high_freq=high_freq, label=label)
+            for onset, offset, low_freq, high_freq, label in zip(onsets, offsets, low_freqs, high_freqs, labels)
+        ]
 
     def to_bbox(self) -> List[crowsetta.BBox]:
         """Convert this Raven annotation to a
@@ -128,26 +328,45 @@ class Raven:
         >>> raven = crowsetta.formats.bbox.Raven.from_file(example.annot_path)
         >>> bboxes = raven.to_bbox()
         """
-        bboxes = []
-        for begin_time, end_time, low_freq, high_freq, label in zip(
+        return self._arrays_to_bbox(
             self.df.begin_time_s.values,
             self.df.end_time_s.values,
             self.df.low_freq_hz.values,
             self.df.high_freq_hz.values,
             self.df["annotation"].values,
-        ):
-            bboxes.append(
-                crowsetta.BBox(onset=begin_time, offset=end_time, low_freq=low_freq, high_freq=high_freq, label=label)
-            )
-        return bboxes
+        )
 
-    def to_annot(self) -> crowsetta.Annotation:
+    def to_annot(
+        self, by_file: bool = False, audio_dir: Optional[PathLike] = None
+    ) -> Union[crowsetta.Annotation, List[crowsetta.Annotation]]:
         """Convert this Raven annotation to a
         :class:`crowsetta.Annotation`.
 
+        Parameters
+        ----------
+        by_file : bool
+            If True, return one :class:`crowsetta.Annotation`
+            for each audio file in a Selection Table that spans
+            multiple files, using the 'Begin File' and 'File Offset (s)'
+            columns. The onset and offset of each bounding box are then
+            relative to the start of the file where the selection begins.
+            Default is False, in which case one :class:`crowsetta.Annotation`
+            is returned for the whole table.
+        audio_dir : str, pathlib.Path, optional
+            Directory that contains the audio files
+            named in the 'Begin File' column.
+            Only used when ``by_file`` is True.
+            The ``notated_path`` of each annotation is
+            the name of the file in this directory.
+            Default is None, in which case
+            ``notated_path`` is just the name of the file.
+
         Returns
         -------
-        annot : crowsetta.Annotation
+        annot : crowsetta.Annotation, list
+            A :class:`crowsetta.Annotation`, or, if ``by_file`` is True,
+            a :class:`list` of them, one for each audio file,
+            in the order that files first appear in the table.
 
         Examples
         --------
@@ -155,12 +374,60 @@ class Raven:
         >>> raven = crowsetta.formats.bbox.Raven.from_file(example.annot_path)
         >>> annot = raven.to_annot()
         """
-        bboxes = self.to_bbox()
-        return crowsetta.Annotation(annot_path=self.annot_path, notated_path=self.audio_path, bboxes=bboxes)
+        if not by_file:
+            bboxes = self.to_bbox()
+            return crowsetta.Annotation(annot_path=self.annot_path, notated_path=self.audio_path, bboxes=bboxes)
+
+        missing = [col for col in (self.BEGIN_FILE_COL, self.FILE_OFFSET_COL) if col not in self.df.columns]
+        if missing:
+            raise ValueError(
+                f"Cannot convert to one annotation per file, Raven table is missing columns: {missing}. "
+                f"Columns in table are: {list(self.df.columns)}"
+            )
+        # codes are numbered in the order that files first appear
+        codes, begin_files = pd.factorize(self.df[self.BEGIN_FILE_COL], sort=False)
+        if np.any(codes < 0):
+            raise ValueError(f"Raven table has rows with no value for '{self.BEGIN_FILE_COL}'")
+        onsets = self.df[self.FILE_OFFSET_COL].values
+        offsets = onsets + (self.df.end_time_s.values - self.df.begin_time_s.values)
+        arrays = [
+            onsets,
+            offsets,
+            self.df.low_freq_hz.values,
+            self.df.high_freq_hz.values,
+            self.df["annotation"].values,
+        ]
+        # rows for each file are usually contiguous, since tables are sorted by time,
+        # and then each file's rows are slices (views) of the columns. If not, sort once so that they are
+        if np.count_nonzero(np.diff(codes)) + 1 > len(begin_files):
+            order = np.argsort(codes, kind="stable")
+            codes = codes[order]
+            arrays = [array[order] for array in arrays]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], bounds)).tolist()
+        stops = np.concatenate((bounds, [len(codes)])).tolist()
+
+        audio_dir = pathlib.Path(audio_dir) if audio_dir is not None else None
+        annots = []
+        for begin_file, start, stop in zip(begin_files, starts, stops):
+            notated_path = audio_dir / begin_file if audio_dir is not None else pathlib.Path(begin_file)
+            bboxes = self._arrays_to_bbox(*(array[start:stop] for array in arrays))
+            annots.append(crowsetta.Annotation(annot_path=self.annot_path, notated_path=notated_path, bboxes=bboxes))
+        return annots
 
     def to_file(self, annot_path: PathLike) -> None:
         """Make a txt file that can be read by Raven
-        from this annotation
+        from this annotation.
+
+        For instances created with :meth:`~crowsetta.formats.bbox.Raven.from_file`,
+        every column in the original Selection Table is written,
+        including columns that were not loaded into :attr:`df`.
+        Rows of :attr:`df` are matched to rows of the Selection Table
+        by the index of :attr:`df`, so rows can be sorted or removed,
+        but the index should not be reset.
+        If the index no longer matches rows of the Selection Table,
+        e.g. because rows were added, a warning is raised,
+        and only the columns in :attr:`df` are written.
 
         Parameters
         ----------
@@ -170,7 +437,24 @@ class Raven:
         """
         crowsetta.validation.validate_ext(annot_path, extension=self.ext)
 
-        columns_map = {v: k for k, v in self.COLUMNS_MAP.items()}  # copy
-        columns_map.update({"annotation": self.annot_col})
-        df_out = self.df.rename(columns=columns_map)
+        df_out = self._df_out()
+        if self._full_df_source is not None:
+            # write every column in the Selection Table, not just the ones that were loaded,
+            # using values from ``df`` for columns that were loaded, in case they were changed
+            full_df = self.full_df
+            if df_out.index.is_unique and df_out.index.isin(full_df.index).all():
+                # match rows by index, not by position, in case rows of ``df`` were sorted or removed
+                full_df = full_df.loc[df_out.index].copy()
+                for column in df_out.columns:
+                    full_df[column] = df_out[column].to_numpy()
+                df_out = full_df
+            else:
+                not_loaded = [column for column in full_df.columns if column not in df_out.columns]
+                warnings.warn(
+                    f"The index of ``df`` no longer matches rows of the Selection Table loaded from "
+                    f"{self.annot_path}, so columns that were not loaded into ``df`` "
+                    f"cannot be written and will be dropped: {not_loaded}",
+                    UserWarning,
+                    stacklevel=2,
+                )
         df_out.to_csv(annot_path, sep="\t", index=False)
@@ -0,0 +1,199 @@
+"""Module with functions for reading small delimited text files,
+e.g. csv or tab-separated txt files, directly into :mod:`numpy` arrays.
+
+Annotation formats like :class:`crowsetta.formats.seq.AudSeq`,
+:class:`crowsetta.formats.seq.Timit`, and :class:`crowsetta.formats.seq.SimpleSeq`
+typically have one file per annotated audio file,
+with tens or hundreds of lines.
+For files that size, the fixed cost of creating a :class:`pandas.DataFrame`
+and validating it with :mod:`pandera` is much larger
+than the cost of parsing the file.
+The functions in this module parse the file with the :mod:`csv` module
+and convert columns with :mod:`numpy`,
+checking the same things that validation would:
+that every row has the same number of columns,
+that times are numbers, and that no values are missing.
+Any of these checks that fails raises a :class:`ValueError`,
+so that the calling format can fall back to loading the file
+with :mod:`pandas` and validating it with :mod:`pandera`,
+to raise the same errors it always has for invalid files.
+"""
+from __future__ import annotations
+
+import csv
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .source import AnnotPathOrBuffer, as_source
+
+# strings that :func:`pandas.read_csv` reads as missing values by default
+NA_VALUES = frozenset(
+    (
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    )
+)
+
+# strings that :func:`pandas.read_csv` reads as booleans by default
+BOOL_VALUES = frozenset(("True", "TRUE", "true", "False", "FALSE", "false"))
+
+# integers that :func:`pandas.read_csv` reads as 64-bit integers,
+# without whitespace, that can be converted with :class:`int`
+INT_RE = re.compile(r"[+-]?[0-9]{1,18}")
+
+
+def read_columns(
+    annot_path: AnnotPathOrBuffer,
+    delimiter: str = ",",
+    header: bool = False,
+    n_columns: Optional[int] = None,
+    encoding: str = "utf-8",
+) -> Tuple[Optional[List[str]], List[Tuple[str, ...]]]:
+    """Read a delimited text file into columns of strings.
+
+    Rows are parsed with :func:`csv.reader`, so values can be quoted,
+    as they can be in files read by :func:`pandas.read_csv`.
+    Blank lines are skipped, as they are by :func:`pandas.read_csv`.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path, file object
+        Path to a delimited text file,
+        or a binary file object, see :mod:`crowsetta.formats.source`.
+    delimiter : str
+        Delimiter between columns. Default is ','.
+    header : bool
+        If True, the first row is a header with column names.
+        Default is False.
+    n_columns : int, optional
+        Expected number of columns. Default is None,
+        in which case the number of columns is the length
+        of the first row.
+    encoding : str
+        Encoding of the file. Default is 'utf-8'.
+
+    Returns
+    -------
+    column_names : list, None
+        Names of columns from the header,
+        or None if ``header`` is False.
+    columns : list
+        Of :class:`tuple`, one for each column,
+        with the values in each row of that column, as strings.
+
+    Raises
+    ------
+    ValueError
+        If the file has no rows, if any row has a different number of columns,
+        or if the names of columns in the header are not unique.
+    """
+    source = as_source(annot_path)
+    with source.open_text(encoding=encoding, newline="") as fp:
+        rows = [row for row in csv.reader(fp, delimiter=delimiter) if row]
+    if not rows:
+        raise ValueError(f"File has no rows: {source.path}")
+
+    column_names = None
+    if header:
+        column_names, rows = rows[0], rows[1:]
+        if len(set(column_names)) != len(column_names):
+            raise ValueError(f"Names of columns in header are not unique: {column_names}")
+
+    if n_columns is None:
+        n_columns = len(column_names) if column_names is not None else len(rows[0])
+    if column_names is not None and len(column_names) != n_columns:
+        raise ValueError(f"Expected {n_columns} columns in header but found {len(column_names)}: {column_names}")
+    if any(len(row) != n_columns for row in rows):
+        raise ValueError(f"Not every row in file has {n_columns} columns: {source.path}")
+
+    if rows:
+        columns = list(zip(*rows))
+    else:
+        columns = [() for _ in range(n_columns)]
+    return column_names, columns
+
+
+def to_float_array(column: Sequence[str]) -> np.ndarray:
+    """Convert a column of strings to an array of floats.
+
+    Raises
+    ------
+    ValueError
+        If any value is not a number, or is missing (an empty string or 'nan').
+    """
+    arr = np.array(column, dtype=float)
+    if np.any(np.isnan(arr)):
+        raise ValueError("Column has missing values")
+    return arr
+
+
+def to_int_array(column: Sequence[str]) -> np.ndarray:
+    """Convert a column of strings to an array of integers.
+
+    Raises
+    ------
+    ValueError
+        If any value is not an integer, or is missing (an empty string).
+    """
+    return np.array(column, dtype=int)
+
+
+def to_str_array(column: Sequence[str]) -> np.ndarray:
+    """Convert a column of strings to an array of strings,
+    the same strings that :func:`pandas.read_csv` would give
+    after the column is coerced to strings by validation.
+
+    :func:`pandas.read_csv` reads a column where every value is a number
+    as numbers, so e.g. labels '01' and '2' become '1' and '2'.
+    Columns of integers are converted the same way here;
+    columns of other numbers, e.g. '01' and '2.50',
+    that :mod:`pandas` would convert to '1.0' and '2.5',
+    and columns of booleans, raise an error,
+    so that the file is loaded with :mod:`pandas` instead.
+    Any other column is returned as written.
+
+    Raises
+    ------
+    ValueError
+        If any value is missing, i.e. is one of
+        :data:`~crowsetta.formats.delimited.NA_VALUES`,
+        the strings that :func:`pandas.read_csv` reads as missing values,
+        like an empty string or 'NA',
+        or if :func:`pandas.read_csv` would read the column
+        as floats or booleans.
+    """
+    if not NA_VALUES.isdisjoint(column):
+        raise ValueError("Column has missing values")
+    if all(INT_RE.fullmatch(value) for value in column):
+        return np.array([str(int(value)) for value in column], dtype=str)
+    if BOOL_VALUES.issuperset(column) or all(_is_float(value) for value in column):
+        raise ValueError("Column would be read as numbers or booleans")
+    return np.array(column, dtype=str)
+
+
+def _is_float(value: str) -> bool:
+    """Determine whether a string can be converted to a float"""
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
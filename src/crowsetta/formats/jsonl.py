@@ -0,0 +1,547 @@
+"""Module with the 'jsonl' format, JSON Lines files
+with one :class:`crowsetta.Annotation` per line,
+for passing annotations between programs as a stream.
+
+Each line is a JSON object that describes itself:
+the ``annot_path`` and ``notated_path`` of the annotation,
+and either a ``seq`` or a ``bboxes`` object with one array for each
+field, instead of one object per segment or bounding box,
+e.g. (shown here on several lines, but written on one):
+
+.. code-block:: json
+
+   {"annot_path": "bird1.csv", "notated_path": "bird1.wav",
+    "seq": {"labels": ["a", "b"], "onsets_s": [0.5, 1.0], "offsets_s": [0.75, 1.25],
+            "onset_samples": null, "offset_samples": null}}
+
+and for bounding boxes:
+
+.. code-block:: json
+
+   {"annot_path": "bird2.csv", "notated_path": "bird2.wav",
+    "bboxes": {"onsets_s": [1.0], "offsets_s": [2.0], "low_freqs_hz": [3000.0],
+               "high_freqs_hz": [10000.0], "labels": ["a"]}}
+
+The ``seq`` of an annotation with more than one sequence is a list of these objects.
+
+Because every line stands alone, annotations can be read and written
+one at a time, with the generators :func:`~crowsetta.formats.jsonl.iter_annots`
+and :func:`~crowsetta.formats.jsonl.write_annots`,
+without holding a whole file in memory.
+Appending annotations to a file only writes their lines,
+and :func:`~crowsetta.formats.jsonl.tail` reads the last annotations
+in a file by reading backwards from its end, so both take time
+proportional to the annotations written or read, not to the size of the file.
+A stream that was cut off while it was being written,
+e.g. by a process that was killed, ends with a partial line
+that is skipped when the file is read.
+
+JSON is encoded and decoded with :mod:`orjson` if it is installed,
+e.g. with ``pip install crowsetta[jsonl]``, that is several times faster
+than :mod:`json` in the standard library, and otherwise with :mod:`json`.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+from typing import BinaryIO, Callable, ClassVar, Iterable, Iterator, List, Optional, Tuple, Union
+
+import attr
+import numpy as np
+
+import crowsetta
+from crowsetta.formats.source import AnnotPathOrBuffer
+from crowsetta.typing import PathLike
+
+# names of JSON backends, in order of preference
+JSON_BACKENDS = ("orjson", "json")
+
+SEQ_FIELDS = ("labels", "onsets_s", "offsets_s", "onset_samples", "offset_samples")
+BBOX_FIELDS = ("onsets_s", "offsets_s", "low_freqs_hz", "high_freqs_hz", "labels")
+# attributes of :class:`crowsetta.BBox` for each field in ``BBOX_FIELDS``
+_BBOX_ATTRS = ("onset", "offset", "low_freq", "high_freq", "label")
+
+# number of bytes read at a time when reading a file backwards
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def get_backend(json_backend: Optional[str] = None) -> Tuple[Callable[[bytes], object], Callable[[object], bytes]]:
+    """Get the functions that decode and encode JSON.
+
+    Parameters
+    ----------
+    json_backend : str, optional
+        Name of the backend, one of {'orjson', 'json'}.
+        Default is None, in which case :mod:`orjson`
+        is used if it is installed, and otherwise :mod:`json`.
+
+    Returns
+    -------
+    loads : callable
+        That decodes the bytes of a JSON object.
+    dumps : callable
+        That encodes an object as compact JSON bytes, without a newline.
+    """
+    if json_backend is None:
+        try:
+            return get_backend("orjson")
+        except ImportError:
+            return get_backend("json")
+
+    if json_backend == "orjson":
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "The 'orjson' backend for JSON requires the package orjson. "
+                "Please install it, e.g. with `pip install crowsetta[jsonl]`, "
+                "or use the 'json' backend."
+            ) from e
+        return orjson.loads, orjson.dumps
+    elif json_backend == "json":
+
+        def dumps(obj: object) -> bytes:
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        return json.loads, dumps
+    raise ValueError(f"``json_backend`` must be one of {JSON_BACKENDS}, but was: {json_backend}")
+
+
+def _tolist(array: Optional[np.ndarray]) -> Optional[list]:
+    """Convert an array to a list that can be encoded as JSON,
+    or None if it is None or has no values, like the arrays of
+    :meth:`crowsetta.Sequence.as_dict` for units that were not specified."""
+    if array is None:
+        return None
+    values = np.asarray(array).tolist()
+    if values and all(value is None for value in values):
+        return None
+    return values
+
+
+def annot_to_dict(annot: crowsetta.Annotation) -> dict:
+    """Convert a :class:`crowsetta.Annotation` to a :class:`dict`
+    that can be encoded as one line of a JSON Lines file."""
+    annot_dict = {
+        "annot_path": str(annot.annot_path),
+        "notated_path": str(annot.notated_path) if annot.notated_path is not None else None,
+    }
+    if hasattr(annot, "seq"):
+        seqs = annot.seq if isinstance(annot.seq, list) else [annot.seq]
+        seq_dicts = [{field: _tolist(getattr(seq, field)) for field in SEQ_FIELDS} for seq in seqs]
+        annot_dict["seq"] = seq_dicts if isinstance(annot.seq, list) else seq_dicts[0]
+    else:
+        bboxes = getattr(annot, "bboxes", [])
+        annot_dict["bboxes"] = {
+            field: [(str if field == "labels" else float)(getattr(bbox, bbox_attr)) for bbox in bboxes]
+            for field, bbox_attr in zip(BBOX_FIELDS, _BBOX_ATTRS)
+        }
+    return annot_dict
+
+
+def _seq_from_dict(seq_dict: dict) -> crowsetta.Sequence:
+    """Make a :class:`crowsetta.Sequence` from the arrays for one ``seq`` in a line"""
+    kwargs = {"labels": np.asarray(seq_dict["labels"], dtype=str)}
+    for field in ("onsets_s", "offsets_s", "onset_samples", "offset_samples"):
+        if seq_dict.get(field) is not None:
+            kwargs[field] = np.asarray(seq_dict[field], dtype=int if field.endswith("samples") else float)
+    return crowsetta.Sequence.from_keyword(**kwargs)
+
+
+def annot_from_dict(annot_dict: dict) -> crowsetta.Annotation:
+    """Make a :class:`crowsetta.Annotation` from a :class:`dict`
+    decoded from one line of a JSON Lines file.
+
+    Raises
+    ------
+    ValueError
+        If the :class:`dict` has neither a 'seq' nor a 'bboxes' key.
+    """
+    annot_path, notated_path = annot_dict["annot_path"], annot_dict.get("notated_path")
+    if "seq" in annot_dict:
+        seq = annot_dict["seq"]
+        if isinstance(seq, list):
+            seq = [_seq_from_dict(seq_dict) for seq_dict in seq]
+        else:
+            seq = _seq_from_dict(seq)
+        return crowsetta.Annotation(annot_path=annot_path, notated_path=notated_path, seq=seq)
+    elif "bboxes" in annot_dict:
+        columns = [annot_dict["bboxes"][field] for field in BBOX_FIELDS]
+        bboxes = [
+            crowsetta.BBox(onset=onset, offset=offset, low_freq=low_freq, high_freq=high_freq, label=str(label))
+            for onset, offset, low_freq, high_freq, label in zip(*columns)
+        ]
+        return crowsetta.Annotation(annot_path=annot_path, notated_path=notated_path, bboxes=bboxes)
+    raise ValueError(f"Annotation must have a 'seq' or 'bboxes', but had keys: {sorted(annot_dict)}")
+
+
+def iter_lines(annots: Iterable[crowsetta.Annotation], json_backend: Optional[str] = None) -> Iterator[bytes]:
+    """Generator that encodes annotations as lines of a JSON Lines file.
+
+    Parameters
+    ----------
+    annots : iterable
+        Of :class:`crowsetta.Annotation`. Can be any iterable, including a generator.
+    json_backend : str, optional
+        Name of the JSON backend, see :func:`~crowsetta.formats.jsonl.get_backend`.
+
+    Yields
+    ------
+    line : bytes
+        One line for each annotation, ending with a newline.
+    """
+    _, dumps = get_backend(json_backend)
+    for annot in annots:
+        yield dumps(annot_to_dict(annot)) + b"\n"
+
+
+def _parse_line(
+    line: bytes, loads: Callable, annot_path: pathlib.Path, line_number: Optional[int] = None
+) -> crowsetta.Annotation:
+    """Load the annotation in one line, raising an error that says where the line is if it is not valid"""
+    try:
+        return annot_from_dict(loads(line))
+    except (ValueError, KeyError, TypeError) as e:
+        where = f"line {line_number}" if line_number is not None else "a line"
+        raise ValueError(f"Could not load annotation from {where} of file: {annot_path}\n{e}") from e
+
+
+def iter_annots(
+    annot_path: AnnotPathOrBuffer, json_backend: Optional[str] = None, strict: bool = False
+) -> Iterator[crowsetta.Annotation]:
+    """Generator that loads annotations from a JSON Lines file, one line at a time.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path, bytes, file object
+        Path to a .jsonl file, or the bytes or a file object of the file,
+        see :mod:`crowsetta.formats.source`.
+    json_backend : str, optional
+        Name of the JSON backend, see :func:`~crowsetta.formats.jsonl.get_backend`.
+    strict : bool
+        If True, raise an error if the last line of the file
+        is a partial line, cut off while the file was being written.
+        Default is False, in which case a partial last line is skipped.
+        Other lines that are not valid always raise an error.
+
+    Yields
+    ------
+    annot : crowsetta.Annotation
+        One for each line in the file. Blank lines are skipped.
+    """
+    loads, _ = get_backend(json_backend)
+    source = crowsetta.formats.source.as_source(annot_path)
+    with source.open_binary() as fp:
+        for line_number, line in enumerate(fp, start=1):
+            if not line.strip():
+                continue
+            if not line.endswith(b"\n"):
+                # the last line; if it can't be parsed, the stream was cut off while it was being written
+                try:
+                    annot = annot_from_dict(loads(line))
+                except (ValueError, KeyError, TypeError):
+                    if strict:
+                        raise ValueError(f"Last line of file is a partial line: {source.path}") from None
+                    return
+                yield annot
+                return
+            yield _parse_line(line, loads, source.path, line_number)
+
+
+def _end_last_line(annot_path: PathLike, json_backend: Optional[str] = None) -> None:
+    """Make a file end with a whole line before lines are appended to it.
+
+    A last line without a newline that is a valid annotation is ended with a newline.
+    A last line that is not valid was cut off while it was being written,
+    and is removed by truncating the file after the line before it,
+    so that it does not become a line in the middle of the file,
+    that :func:`~crowsetta.formats.jsonl.iter_annots` would raise an error for.
+    """
+    loads, _ = get_backend(json_backend)
+    with open(annot_path, "r+b") as fp:
+        end = fp.seek(0, os.SEEK_END)
+        position = end
+        data = b""
+        # read blocks backwards from the end, until the newline before the last line
+        while position > 0 and b"\n" not in data:
+            block_size = min(_TAIL_BLOCK_SIZE, position)
+            position -= block_size
+            fp.seek(position)
+            data = fp.read(block_size) + data
+        if not data or data.endswith(b"\n"):
+            return
+        line_start = position + data.rfind(b"\n") + 1
+        last = data[line_start - position:]
+        if last.strip():
+            try:
+                annot_from_dict(loads(last))
+            except (ValueError, KeyError, TypeError):
+                fp.truncate(line_start)
+                return
+        fp.seek(end)
+        fp.write(b"\n")
+
+
+def write_annots(
+    annots: Iterable[crowsetta.Annotation],
+    annot_path: Union[PathLike, BinaryIO],
+    append: bool = False,
+    json_backend: Optional[str] = None,
+) -> int:
+    """Write annotations to a JSON Lines file, one line at a time.
+
+    Parameters
+    ----------
+    annots : iterable
+        Of :class:`crowsetta.Annotation`. Can be any iterable,
+        including a generator, that is consumed as lines are written.
+    annot_path : str, pathlib.Path, file object
+        Path to a .jsonl file, or a binary file object
+        that lines are written to, and that is not closed.
+    append : bool
+        If True, append lines to the end of the file, if it exists.
+        A partial last line, cut off while the file was being written,
+        is removed before appending.
+        Default is False, in which case the file is overwritten.
+        Ignored for file objects, that are written at their current position.
+    json_backend : str, optional
+        Name of the JSON backend, see :func:`~crowsetta.formats.jsonl.get_backend`.
+
+    Returns
+    -------
+    n_annots : int
+        Number of annotations written.
+    """
+    lines = iter_lines(annots, json_backend)
+    n_annots = 0
+    if hasattr(annot_path, "write"):
+        for line in lines:
+            annot_path.write(line)
+            n_annots += 1
+        return n_annots
+
+    if append and os.path.exists(annot_path):
+        _end_last_line(annot_path, json_backend)
+    with open(annot_path, "ab" if append else "wb") as fp:
+        for line in lines:
+            fp.write(line)
+            n_annots += 1
+    return n_annots
+
+
+def tail(annot_path: PathLike, n: int = 1, json_backend: Optional[str] = None) -> List[crowsetta.Annotation]:
+    """Load the last ``n`` annotations in a JSON Lines file,
+    by reading the file backwards from its end,
+    without reading the rest of the file.
+
+    A partial last line, cut off while the file was being written, is skipped.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path
+        Path to a .jsonl file.
+    n : int
+        Number of annotations to load. Default is 1.
+    json_backend : str, optional
+        Name of the JSON backend, see :func:`~crowsetta.formats.jsonl.get_backend`.
+
+    Returns
+    -------
+    annots : list
+        The last ``n`` annotations in the file, in the order they are in the file,
+        or all the annotations if the file has fewer than ``n``.
+    """
+    if n < 1:
+        raise ValueError(f"``n`` must be a positive integer, but was: {n}")
+    loads, _ = get_backend(json_backend)
+    with open(annot_path, "rb") as fp:
+        position = fp.seek(0, os.SEEK_END)
+        data = b""
+        # read blocks until there are ``n`` whole lines after the first newline,
+        # since the first line read may start in the middle of a line
+        while position > 0 and data.count(b"\n") < n + 1:
+            block_size = min(_TAIL_BLOCK_SIZE, position)
+            position -= block_size
+            fp.seek(position)
+            data = fp.read(block_size) + data
+
+    lines = data.split(b"\n")
+    if position > 0:
+        lines = lines[1:]
+    annots = []
+    last = lines.pop()
+    if last.strip():
+        # a last line without a newline may have been cut off while it was being written
+        try:
+            annots.append(annot_from_dict(loads(last)))
+        except (ValueError, KeyError, TypeError):
+            pass
+    n_lines = n - len(annots)
+    lines = [line for line in lines if line.strip()]
+    lines = lines[max(len(lines) - n_lines, 0):] if n_lines > 0 else []
+    return [_parse_line(line, loads, annot_path) for line in lines] + annots
+
+
+@crowsetta.interface.SeqLike.register
+@crowsetta.interface.BBoxLike.register
+@attr.define
+class JsonLines:
+    """Class that represents annotations in JSON Lines files,
+    with one :class:`crowsetta.Annotation` per line.
+
+    Annotations can be sequence-like or bounding box-like,
+    and a file can have both. See :mod:`crowsetta.formats.jsonl`
+    for a description of the format, and for functions that read
+    and write files one annotation at a time.
+
+    Attributes
+    ----------
+    name: str
+        Shorthand name for annotation format: ``'jsonl'``
+    ext: str
+        Extension of files in annotation format: ``'.jsonl'``
+    annots : list
+        A :class:`list` of :class:`crowsetta.Annotation` instances.
+
+    Examples
+    --------
+    >>> example = crowsetta.data.get('notmat')
+    >>> annot = crowsetta.formats.seq.NotMat.from_file(example.annot_path).to_annot()
+    >>> jsonl = crowsetta.formats.jsonl.JsonLines.from_annot(annot)
+    >>> jsonl.to_file('annotations.jsonl')  # doctest: +SKIP
+    >>> jsonl.to_file('annotations.jsonl', append=True)  # doctest: +SKIP
+    """
+
+    name: ClassVar[str] = "jsonl"
+    ext: ClassVar[str] = ".jsonl"
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
+
+    annots: List[crowsetta.Annotation]
+
+    @classmethod
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'jsonl' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Lines in files written by crowsetta
+        start with the ``annot_path`` of the annotation.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        if file_head.text is None or not file_head.text.lstrip().startswith("{"):
+            return sniff.NOT
+        if '"annot_path"' in file_head.text:
+            return sniff.CERTAIN
+        return sniff.POSSIBLE
+
+    @classmethod
+    def from_file(
+        cls,
+        annot_path: AnnotPathOrBuffer,
+        strict: bool = False,
+        json_backend: Optional[str] = None,
+        validate_ext: bool = True,
+    ) -> "Self":  # noqa: F821
+        """Load annotations from a JSON Lines file.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path, bytes, file object
+            Path to a .jsonl file,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
+        strict : bool
+            If True, raise an error if the last line of the file
+            is a partial line. Default is False, in which case it is skipped.
+        json_backend : str, optional
+            Name of the JSON backend, one of {'orjson', 'json'}.
+            Default is None, in which case :mod:`orjson` is used if it is installed.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has the extension '.jsonl'. Default is True.
+            Set to False to load a file with another extension.
+
+        Examples
+        --------
+        >>> jsonl = crowsetta.formats.jsonl.JsonLines.from_file('annotations.jsonl')  # doctest: +SKIP
+        """
+        source = crowsetta.formats.source.as_source(annot_path)
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(source.path, extension=cls.ext)
+        return cls(annots=list(iter_annots(source, json_backend=json_backend, strict=strict)))
+
+    @classmethod
+    def from_annot(
+        cls, annot: Union[crowsetta.Annotation, List[crowsetta.Annotation]]
+    ) -> "Self":  # noqa: F821
+        """Make a 'jsonl' annotation from one or more :class:`crowsetta.Annotation` instances.
+
+        Parameters
+        ----------
+        annot : crowsetta.Annotation, list
+            A :class:`crowsetta.Annotation`, or a :class:`list` of them.
+
+        Returns
+        -------
+        jsonl : crowsetta.formats.jsonl.JsonLines
+        """
+        annots = [annot] if isinstance(annot, crowsetta.Annotation) else list(annot)
+        return cls(annots=annots)
+
+    def to_annot(self) -> List[crowsetta.Annotation]:
+        """Returns this set of :class:`crowsetta.Annotation` instances
+        as a :class:`list`."""
+        return self.annots
+
+    def to_seq(self) -> List[crowsetta.Sequence]:
+        """Return a :class:`list` with the ``seq`` of every annotation.
+
+        Raises
+        ------
+        ValueError
+            If any annotation does not have a ``seq``.
+        """
+        for annot in self.annots:
+            if not hasattr(annot, "seq"):
+                raise ValueError(f"Cannot convert to sequences, annotation does not have a ``seq``: {annot}")
+        return [annot.seq for annot in self.annots]
+
+    def to_bbox(self) -> List[List[crowsetta.BBox]]:
+        """Return a :class:`list` with the ``bboxes`` of every annotation.
+
+        Raises
+        ------
+        ValueError
+            If any annotation has a ``seq`` instead of ``bboxes``.
+        """
+        for annot in self.annots:
+            if hasattr(annot, "seq"):
+                raise ValueError(f"Cannot convert to bounding boxes, annotation has a ``seq``: {annot}")
+        return [getattr(annot, "bboxes", []) for annot in self.annots]
+
+    def to_file(self, annot_path: PathLike, append: bool = False, json_backend: Optional[str] = None) -> None:
+        """Write these annotations to a JSON Lines file.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path
+            Path including filename of the .jsonl file to write to.
+        append : bool
+            If True, append these annotations to the end of the file, if it exists.
+            Default is False, in which case the file is overwritten.
+        json_backend : str, optional
+            Name of the JSON backend, one of {'orjson', 'json'}.
+            Default is None, in which case :mod:`orjson` is used if it is installed.
+        """
+        crowsetta.validation.validate_ext(annot_path, extension=self.ext)
+        write_annots(self.annots, annot_path, append=append, json_backend=json_backend)
@@ -0,0 +1,216 @@
+"""Module with the registry of annotation formats,
+that maps shorthand names of formats to the classes that represent them.
+
+The built-in formats are registered by the names of the modules
+and classes that define them, so that a module is only imported
+when its class is first accessed, e.g. with :func:`crowsetta.formats.by_name`.
+Many format modules depend on :mod:`pandas` and :mod:`pandera`,
+that take much longer to import than :mod:`crowsetta` itself,
+so a program that only uses one format does not import the others,
+or their dependencies.
+
+Formats can also be provided by other packages, as plugins,
+through the entry point group ``crowsetta.formats``.
+The name of each entry point is the shorthand name of the format,
+and it refers to the class, e.g. in ``pyproject.toml``:
+
+.. code-block:: toml
+
+   [project.entry-points."crowsetta.formats"]
+   batlab = "crowsetta_batlab.batlab:Batlab"
+
+Entry points are read the first time the registry needs
+names that are not already registered,
+e.g. to list all formats with :func:`crowsetta.formats.as_list`,
+and a plugin module is only imported when its format is first accessed.
+"""
+from __future__ import annotations
+
+import collections.abc
+import importlib
+import warnings
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple, Type, Union
+
+ENTRY_POINT_GROUP = "crowsetta.formats"
+
+
+class FormatSpec(NamedTuple):
+    """Specification of a format that is registered
+    without importing the module that defines it.
+
+    Attributes
+    ----------
+    module : str
+        Absolute name of the module that defines the class,
+        e.g. 'crowsetta.formats.seq.notmat'.
+    class_name : str
+        Name of the class in ``module``, e.g. 'NotMat'.
+    ext : tuple, None
+        Extensions of files in the format,
+        the same as the class variable ``ext``,
+        so that formats can be matched to files
+        without importing their modules.
+        None if the extensions are not known
+        until the class is imported, as for plugins.
+    """
+
+    module: str
+    class_name: str
+    ext: Optional[Tuple[str, ...]] = None
+
+    def load(self) -> Type:
+        """Import the module and get the class."""
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+
+def entry_point_specs(group: str = ENTRY_POINT_GROUP) -> Dict[str, FormatSpec]:
+    """Get specifications of formats provided by plugins,
+    from entry points, without importing any plugin modules.
+
+    Parameters
+    ----------
+    group : str
+        Name of entry point group. Default is 'crowsetta.formats'.
+
+    Returns
+    -------
+    specs : dict
+        Mapping the name of each entry point
+        to a :class:`~crowsetta.formats.registry.FormatSpec`.
+    """
+    # import here, since it takes longer than importing crowsetta without it
+    import importlib.metadata
+
+    try:
+        entry_points = importlib.metadata.entry_points(group=group)
+    except TypeError:
+        # Python < 3.10 does not support selecting a group
+        entry_points = importlib.metadata.entry_points().get(group, [])
+    specs = {}
+    for entry_point in entry_points:
+        module, _, class_name = entry_point.value.partition(":")
+        if not class_name:
+            warnings.warn(
+                f"Skipping entry point '{entry_point.name}' in group '{group}', "
+                f"that does not refer to a class with 'module:ClassName': {entry_point.value}"
+            )
+            continue
+        specs[entry_point.name] = FormatSpec(module.strip(), class_name.strip())
+    return specs
+
+
+class FormatRegistry(collections.abc.MutableMapping):
+    """A :class:`dict`-like mapping from shorthand names of formats
+    to the classes that represent them,
+    where classes can be registered with a
+    :class:`~crowsetta.formats.registry.FormatSpec`
+    so that their modules are only imported when they are accessed.
+
+    Getting the names of formats, or checking whether a name is registered,
+    never imports a module.
+
+    Parameters
+    ----------
+    specs : dict
+        Maps names of formats to
+        :class:`~crowsetta.formats.registry.FormatSpec`.
+    entry_point_group : str, optional
+        Name of an entry point group from which formats provided by plugins are added,
+        the first time that a name is not found or that all names are needed.
+        Formats that are already registered with the same name take precedence.
+        Default is None, in which case no entry points are read.
+    """
+
+    def __init__(self, specs: Dict[str, FormatSpec], entry_point_group: Optional[str] = None):
+        # maps name -> class, or -> ``FormatSpec`` for a class that has not been imported yet
+        self._formats: Dict[str, Union[Type, FormatSpec]] = dict(specs)
+        self.entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+
+    def _discover(self) -> None:
+        """Add formats from entry points, if they have not been added already"""
+        if self._discovered:
+            return
+        self._discovered = True
+        for name, spec in entry_point_specs(self.entry_point_group).items():
+            registered = self._formats.get(name)
+            if registered is None:
+                self._formats[name] = spec
+            elif getattr(registered, "__module__", None) != spec.module:
+                # don't warn when the plugin module was already imported and registered its own class
+                warnings.warn(
+                    f"Format '{name}' from entry point '{spec.module}:{spec.class_name}' "
+                    "was not added, because a format with the same name is already registered"
+                )
+
+    def __getitem__(self, name: str) -> Type:
+        if name not in self._formats:
+            self._discover()
+        format_class = self._formats[name]
+        if isinstance(format_class, FormatSpec):
+            try:
+                format_class = format_class.load()
+            except (ImportError, AttributeError) as e:
+                raise ImportError(
+                    f"Could not load class for format '{name}' from "
+                    f"'{format_class.module}:{format_class.class_name}': {e}"
+                ) from e
+            # importing may have registered the class already, e.g. with a decorator
+            self._formats[name] = format_class
+        return format_class
+
+    def __setitem__(self, name: str, format_class: Type) -> None:
+        self._formats[name] = format_class
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self._formats:
+            self._discover()
+        del self._formats[name]
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(list(self._formats))
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._formats)
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self._formats:
+            self._discover()
+        return name in self._formats
+
+    def __repr__(self):
+        return f"{type(self).__name__}({sorted(self._formats)})"
+
+    def is_loaded(self, name: str) -> bool:
+        """Determine whether the class for a format has been imported."""
+        if name not in self._formats:
+            self._discover()
+        return not isinstance(self._formats[name], FormatSpec)
+
+    def ext(self, name: str) -> Tuple[str, ...]:
+        """Get the extensions of files in a format,
+        without importing the module that defines it
+        if the extensions are registered with the format.
+
+        Parameters
+        ----------
+        name : str
+            Shorthand name of a format.
+
+        Returns
+        -------
+        ext : tuple
+            Of :class:`str`, extensions of files in the format.
+        """
+        if name not in self._formats:
+            self._discover()
+        format_class = self._formats[name]
+        if isinstance(format_class, FormatSpec):
+            if format_class.ext is not None:
+                return format_class.ext
+            # e.g. a plugin, that we have to import to get extensions
+            format_class = self[name]
+        ext = format_class.ext
+        return (ext,) if isinstance(ext, str) else tuple(ext)
@@ -1,11 +1,22 @@
-from .audseq import AudSeq
-from .birdsongrec import BirdsongRec
-from .generic import GenericSeq
-from .notmat import NotMat
-from .simple import SimpleSeq
-from .textgrid import TextGrid
-from .timit import Timit
-from .yarden import SongAnnotationGUI
+"""Sequence-like annotation formats.
+
+The module for each format is only imported
+when its class is first accessed.
+"""
+import importlib
+from typing import List
+
+# maps class name -> module that defines it
+_CLASSES = {
+    "AudSeq": "audseq",
+    "BirdsongRec": "birdsongrec",
+    "GenericSeq": "generic",
+    "NotMat": "notmat",
+    "SimpleSeq": "simple",
+    "SongAnnotationGUI": "yarden",
+    "TextGrid": "textgrid",
+    "Timit": "timit",
+}
 
 __all__ = [
     "AudSeq",
@@ -17,3 +28,19 @@ __all__ = [
     "TextGrid",
     "Timit",
 ]
+
+
+def __getattr__(name: str):
+    if name in _CLASSES:
+        return getattr(importlib.import_module(f"{__name__}.{_CLASSES[name]}"), name)
+    # import sub-modules when they are first accessed, e.g. ``crowsetta.formats.seq.matv73``
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_CLASSES))
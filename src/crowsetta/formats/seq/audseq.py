@@ -12,6 +12,8 @@ import pandera
 from pandera.typing import Series
 
 import crowsetta
+from crowsetta.formats.adapters import ArrayAdapter, Column
+from crowsetta.formats.source import AnnotPathOrBuffer
 from crowsetta.typing import PathLike
 
 
@@ -76,6 +78,12 @@ class AudSeq:
 
     name: ClassVar[str] = "aud-seq"
     ext: ClassVar[str] = ".txt"
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
+
+    ARRAY_ADAPTER: ClassVar[ArrayAdapter] = ArrayAdapter(
+        kind="seq",
+        columns=(Column("start_times", "onsets_s"), Column("end_times", "offsets_s"), Column("labels", "labels")),
+    )
 
     start_times: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
     end_times: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
@@ -83,44 +91,132 @@ class AudSeq:
     annot_path: pathlib.Path
     notated_path: Optional[pathlib.Path] = attr.field(default=None, converter=attr.converters.optional(pathlib.Path))
 
+    @classmethod
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'aud-seq' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format have no header,
+        and three tab-separated columns: onset, offset, and label.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        rows = file_head.rows("\t")
+        if rows and all(len(row) == 3 and sniff.is_number(row[0]) and sniff.is_number(row[1]) for row in rows):
+            return sniff.LIKELY
+        return sniff.NOT
+
     @classmethod
     def from_file(
         cls,
-        annot_path: PathLike,
+        annot_path: AnnotPathOrBuffer,
         notated_path: Optional[PathLike] = None,
+        validate_ext: bool = True,
     ) -> "Self":  # noqa: F821
         """Load annotations from a file.
 
         Parameters
         ----------
-        annot_path : str, pathlib.Path
+        annot_path : str, pathlib.Path, bytes, file object
             Path to an annotation file,
-            with '.txt' extension.
+            with '.txt' extension,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
         notated_path : str, pathlib.Path
             Path to file that ``annot_path`` annotates.
             E.g., an audio file, or an array file
             that contains a spectrogram generated from audio.
             Optional, default is None.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has the extension '.txt'. Default is True.
+            Set to False to load a file with another extension.
 
         Examples
         --------
         >>> example = crowsetta.data.get('aud-seq')
         >>> audseq = crowsetta.formats.seq.AudSeq.from_file(example.annot_path)
+
+        Notes
+        -----
+        The file is parsed directly into :mod:`numpy` arrays
+        with the functions in :mod:`crowsetta.formats.delimited`.
+        Only if that fails is it loaded with :mod:`pandas`
+        and validated with
+        :class:`~crowsetta.formats.seq.audseq.AudSeqSchema`,
+        so that invalid files raise the same errors.
         """
-        annot_path = pathlib.Path(annot_path)
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
-        df = pd.read_csv(annot_path, sep="\t", header=None)
-        df.columns = ["start_time", "end_time", "label"]
-        df = AudSeqSchema.validate(df)
+        source = crowsetta.formats.source.as_source(annot_path)
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(source.path, extension=cls.ext)
+        try:
+            _, (start_times, end_times, labels) = crowsetta.formats.delimited.read_columns(
+                source, delimiter="\t", n_columns=3
+            )
+            start_times = crowsetta.formats.delimited.to_float_array(start_times)
+            end_times = crowsetta.formats.delimited.to_float_array(end_times)
+            labels = crowsetta.formats.delimited.to_str_array(labels)
+        except ValueError:
+            # fall back to pandas, so that invalid files raise the same errors as validation does
+            df = pd.read_csv(crowsetta.formats.source.path_or_buffer(source), sep="\t", header=None)
+            df.columns = ["start_time", "end_time", "label"]
+            df = AudSeqSchema.validate(df)
+            start_times, end_times, labels = df["start_time"].values, df["end_time"].values, df["label"].values
 
         return cls(
-            start_times=df["start_time"].values,
-            end_times=df["end_time"].values,
-            labels=df["label"].values,
-            annot_path=annot_path,
+            start_times=start_times,
+            end_times=end_times,
+            labels=labels,
+            annot_path=source.path,
             notated_path=notated_path,
         )
 
+    @classmethod
+    def from_annot(cls, annot: crowsetta.Annotation) -> "Self":  # noqa: F821
+        """Make an Audacity label track from a sequence-like :class:`crowsetta.Annotation`.
+
+        Parameters
+        ----------
+        annot : crowsetta.Annotation
+            With a ``seq`` attribute that is a single :class:`crowsetta.Sequence`,
+            with onsets and offsets in seconds.
+
+        Returns
+        -------
+        audseq : crowsetta.formats.seq.AudSeq
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('notmat')
+        >>> annot = crowsetta.formats.seq.NotMat.from_file(example.annot_path).to_annot()
+        >>> audseq = crowsetta.formats.seq.AudSeq.from_annot(annot)
+        >>> audseq.to_file('notmat.txt')  # doctest: +SKIP
+        """
+        seq = getattr(annot, "seq", None)
+        if not isinstance(seq, crowsetta.Sequence):
+            raise ValueError(
+                f"Can only convert an Annotation with a ``seq`` attribute that is a single Sequence "
+                f"to '{cls.name}' format, but annotation has: {annot}"
+            )
+        if seq.onsets_s is None:
+            raise ValueError(f"Can only convert a Sequence with onsets and offsets in seconds to '{cls.name}' format")
+        return cls(
+            start_times=seq.onsets_s,
+            end_times=seq.offsets_s,
+            labels=seq.labels,
+            annot_path=annot.annot_path,
+            notated_path=annot.notated_path,
+        )
+
     def to_seq(self, round_times: bool = True, decimals: int = 3) -> crowsetta.Sequence:
         """Convert this annotation to a :class:`crowsetta.Sequence`.
 
@@ -8,19 +8,217 @@ Koumura T, Okanoya K (2016) Automatic Recognition of Element Classes and
 Boundaries in the Birdsong with Variable Sequences. PLoS ONE 11(7): e0159188.
 doi:10.1371/journal.pone.0159188
 """
+from __future__ import annotations
+
+import array
+import collections.abc
 import pathlib
 import warnings
-from typing import ClassVar, List, Optional
+import xml.etree.ElementTree as ET
+from typing import ClassVar, List, Optional, Union
 
 import attr
 import birdsongrec
 import numpy as np
-import soundfile
 
 import crowsetta
+from crowsetta.formats.source import AnnotPathOrBuffer
 from crowsetta.typing import PathLike
 
 
+@attr.define
+class SequenceArrays(collections.abc.Sequence):
+    """Class that represents all the sequences in an
+    Annotation.xml file from the BirdsongRecognition dataset
+    as flat arrays, instead of as one object per sequence and per syllable.
+
+    Acts as a read-only :class:`list` of :class:`birdsongrec.Sequence`
+    instances, that are created only when they are accessed.
+
+    Attributes
+    ----------
+    wav_files : numpy.ndarray
+        Names of the .wav files, one for each sequence.
+    positions : numpy.ndarray
+        Starting sample number of each sequence within its .wav file.
+    lengths : numpy.ndarray
+        Duration of each sequence, in number of samples.
+    note_positions : numpy.ndarray
+        Starting sample number of every note (syllable),
+        from all sequences concatenated, relative to the start of its sequence,
+        or relative to the start of the .wav file, if sequences were concatenated into songs.
+    note_lengths : numpy.ndarray
+        Duration of every note, in number of samples.
+    note_labels : numpy.ndarray
+        Label of every note, as a string.
+    note_bounds : numpy.ndarray
+        Indices into the ``note_`` arrays where the notes for each sequence
+        start and stop, of length ``len(wav_files) + 1``.
+        Notes for sequence ``i`` are ``note_bounds[i]:note_bounds[i + 1]``.
+    """
+
+    wav_files: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
+    positions: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
+    lengths: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
+    note_positions: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
+    note_lengths: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
+    note_labels: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
+    note_bounds: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
+
+    def __len__(self):
+        return len(self.wav_files)
+
+    def __getitem__(self, ind):
+        if isinstance(ind, slice):
+            return [self[ind_] for ind_ in range(*ind.indices(len(self)))]
+        # handles negative indices, and raises an IndexError when out of range
+        ind = range(len(self))[ind]
+        start, stop = self.note_bounds[ind], self.note_bounds[ind + 1]
+        syls = [
+            birdsongrec.Syllable(position=position, length=length, label=label)
+            for position, length, label in zip(
+                self.note_positions[start:stop].tolist(),
+                self.note_lengths[start:stop].tolist(),
+                self.note_labels[start:stop].tolist(),
+            )
+        ]
+        return birdsongrec.Sequence(
+            wav_file=str(self.wav_files[ind]),
+            position=int(self.positions[ind]),
+            length=int(self.lengths[ind]),
+            syl_list=syls,
+        )
+
+    @classmethod
+    def from_sequences(cls, sequences: List[birdsongrec.Sequence]) -> "Self":  # noqa: F821
+        """Convert a :class:`list` of :class:`birdsongrec.Sequence` instances
+        to flat arrays.
+
+        Parameters
+        ----------
+        sequences : list
+            Of :class:`birdsongrec.Sequence` instances.
+
+        Returns
+        -------
+        sequence_arrays : crowsetta.formats.seq.birdsongrec.SequenceArrays
+        """
+        num_syls = [len(seq.syls) for seq in sequences]
+        return cls(
+            wav_files=np.array([seq.wav_file for seq in sequences], dtype=str),
+            positions=np.array([seq.position for seq in sequences], dtype=int),
+            lengths=np.array([seq.length for seq in sequences], dtype=int),
+            note_positions=np.array([syl.position for seq in sequences for syl in seq.syls], dtype=int),
+            note_lengths=np.array([syl.length for seq in sequences for syl in seq.syls], dtype=int),
+            note_labels=np.array([syl.label for seq in sequences for syl in seq.syls], dtype=str),
+            note_bounds=np.concatenate(([0], np.cumsum(num_syls, dtype=int))),
+        )
+
+    def concat_into_songs(self) -> "Self":  # noqa: F821
+        """Concatenate consecutive sequences from the same .wav file,
+        so that there is one sequence per song (.wav file).
+
+        Gives the same result as the ``concat_seqs_into_songs`` argument
+        of :func:`birdsongrec.parse_xml`: the positions of notes
+        become relative to the start of the .wav file,
+        and the position of each song is the position of its first sequence.
+
+        Returns
+        -------
+        sequence_arrays : crowsetta.formats.seq.birdsongrec.SequenceArrays
+        """
+        num_notes = np.diff(self.note_bounds)
+        note_positions = self.note_positions + np.repeat(self.positions, num_notes)
+        if len(self) == 0:
+            return attr.evolve(self, note_positions=note_positions)
+        # start a new song wherever the .wav file changes
+        song_starts = np.flatnonzero(np.concatenate(([True], self.wav_files[1:] != self.wav_files[:-1])))
+        return attr.evolve(
+            self,
+            wav_files=self.wav_files[song_starts],
+            positions=self.positions[song_starts],
+            lengths=np.add.reduceat(self.lengths, song_starts),
+            note_positions=note_positions,
+            note_bounds=np.concatenate((self.note_bounds[song_starts], self.note_bounds[-1:])),
+        )
+
+
+def _child_text(elem: ET.Element, tag: str) -> str:
+    child = elem.find(tag)
+    if child is None:
+        raise ValueError(f"Element '{elem.tag}' in BirdsongRecognition .xml file has no child '{tag}'")
+    return child.text
+
+
+def parse_xml(annot_path: AnnotPathOrBuffer, concat_seqs_into_songs: bool = True) -> SequenceArrays:
+    """Parse an Annotation.xml file from the BirdsongRecognition dataset
+    into flat arrays.
+
+    Gives the same result as :func:`birdsongrec.parse_xml`,
+    but the file is streamed with :func:`xml.etree.ElementTree.iterparse`,
+    and each element is cleared once it has been parsed,
+    so that memory use stays flat no matter how large the file is.
+    The values are collected into flat arrays instead of
+    one Python object per sequence and per syllable.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path, file object
+        Path to an .xml file from the BirdsongRecognition dataset,
+        or a binary file object, see :mod:`crowsetta.formats.source`.
+    concat_seqs_into_songs : bool
+        If True, concatenate sequences from ``annot_path``, so that
+        one sequence = one song / .wav file. Default is True.
+
+    Returns
+    -------
+    sequence_arrays : crowsetta.formats.seq.birdsongrec.SequenceArrays
+    """
+    # values are collected in arrays of machine integers,
+    # and strings are stored once each, with integer codes for each element,
+    # so memory use is a few bytes per element instead of one Python object per element
+    positions, lengths, num_notes = array.array("q"), array.array("q"), array.array("q")
+    note_positions, note_lengths = array.array("q"), array.array("q")
+    wav_file_codes, note_label_codes = array.array("q"), array.array("q")
+    wav_files, note_labels = {}, {}
+    num_notes_this_seq = 0
+
+    context = ET.iterparse(crowsetta.formats.source.path_or_buffer(annot_path), events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event != "end":
+            continue
+        if elem.tag == "Note":
+            note_positions.append(int(_child_text(elem, "Position")))
+            note_lengths.append(int(_child_text(elem, "Length")))
+            note_label_codes.append(note_labels.setdefault(_child_text(elem, "Label"), len(note_labels)))
+            num_notes_this_seq += 1
+        elif elem.tag == "Sequence":
+            wav_file_codes.append(wav_files.setdefault(_child_text(elem, "WaveFileName"), len(wav_files)))
+            positions.append(int(_child_text(elem, "Position")))
+            lengths.append(int(_child_text(elem, "Length")))
+            num_notes.append(num_notes_this_seq)
+            num_notes_this_seq = 0
+            # sequences are children of the root, so this frees the one just parsed
+            root.clear()
+
+    # dicts are ordered by insertion, so the codes are the indices of the strings
+    wav_files = np.array(list(wav_files), dtype=str)
+    note_labels = np.array(list(note_labels), dtype=str)
+    sequence_arrays = SequenceArrays(
+        wav_files=wav_files[np.frombuffer(wav_file_codes, dtype=np.int64)],
+        positions=np.frombuffer(positions, dtype=np.int64).astype(int, copy=False),
+        lengths=np.frombuffer(lengths, dtype=np.int64).astype(int, copy=False),
+        note_positions=np.frombuffer(note_positions, dtype=np.int64).astype(int, copy=False),
+        note_lengths=np.frombuffer(note_lengths, dtype=np.int64).astype(int, copy=False),
+        note_labels=note_labels[np.frombuffer(note_label_codes, dtype=np.int64)],
+        note_bounds=np.concatenate(([0], np.cumsum(np.frombuffer(num_notes, dtype=np.int64)))).astype(int),
+    )
+    if concat_seqs_into_songs:
+        sequence_arrays = sequence_arrays.concat_into_songs()
+    return sequence_arrays
+
+
 @crowsetta.interface.SeqLike.register
 @attr.define
 class BirdsongRec:
@@ -34,8 +232,12 @@ class BirdsongRec:
         Shorthand name for annotation format: ``'birdsong-recognition-dataset'``.
     ext: str
         Extension of files in annotation format: ``'.xml'``.
-    sequences: list
+    sequences: list, crowsetta.formats.seq.birdsongrec.SequenceArrays
         List of :class:`birdsongrec.Sequence` instances.
+        When loaded with :meth:`BirdsongRec.from_file`,
+        a :class:`~crowsetta.formats.seq.birdsongrec.SequenceArrays`,
+        that holds the annotations in flat arrays
+        and acts as a read-only list of :class:`birdsongrec.Sequence` instances.
     annot_path: pathlib.Path
         Path to file from which annotations were loaded.
         Typically with filename 'Annotation.xml'.
@@ -61,10 +263,12 @@ class BirdsongRec:
 
     Notes
     -----
-    This class uses the Python package ``birdsong-recognition-dataset``
-    to load the annotations.
+    This class loads the annotations with
+    :func:`crowsetta.formats.seq.birdsongrec.parse_xml`,
+    that streams the .xml file into flat arrays.
+    It gives the same result as the Python package ``birdsong-recognition-dataset``,
     https://github.com/NickleDave/birdsong-recognition-dataset
-    That package creates Python objects from .xml files that obey
+    that creates Python objects from .xml files that obey
     this XML schema document:
     https://github.com/NickleDave/birdsong-recognition-dataset/blob/main/doc/xsd/AnnotationSchema.xsd
 
@@ -84,22 +288,51 @@ class BirdsongRec:
 
     name: ClassVar[str] = "birdsong-recognition-dataset"
     ext: ClassVar[str] = ".xml"
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
 
-    sequences: List[birdsongrec.Sequence]
+    sequences: Union[List[birdsongrec.Sequence], SequenceArrays]
     annot_path: pathlib.Path = attr.field(converter=pathlib.Path)
     wav_path: Optional[pathlib.Path] = attr.field(default=None, converter=attr.converters.optional(pathlib.Path))
 
+    @classmethod
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'birdsong-recognition-dataset' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format are XML files with a root element ``<Sequences>``.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        if file_head.text is not None and "<Sequences>" in file_head.text:
+            return sniff.CERTAIN
+        return sniff.NOT
+
     @classmethod
     def from_file(
-        cls, annot_path: PathLike, wav_path: Optional[PathLike] = None, concat_seqs_into_songs: bool = True
+        cls,
+        annot_path: AnnotPathOrBuffer,
+        wav_path: Optional[PathLike] = None,
+        concat_seqs_into_songs: bool = True,
+        validate_ext: bool = True,
     ) -> "Self":  # noqa: F821
         """Load BirdsongRecognition annotations from an .xml file.
 
         Parameters
         ----------
-        annot_path : str, pathlib.Path
+        annot_path : str, pathlib.Path, bytes, file object
             Path to xml file from BirdsongRecognition dataset
-            that contains annotations.
+            that contains annotations,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
         wav_path : str, pathlib.Path
             Path in which wav files listed in Annotation.xml file are found.
             Defaults to a directory ``Wave`` that is located in the parent directory of
@@ -118,6 +351,10 @@ class BirdsongRec:
         concat_seqs_into_songs : bool
             If True, concatenate sequences from ``annot_path``, so that
             one sequence = one song / .wav file. Default is True.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has the extension '.xml'. Default is True.
+            Set to False to load a file with another extension.
 
         Examples
         --------
@@ -128,9 +365,11 @@ class BirdsongRec:
            https://doi.org/10.6084/m9.figshare.3470165.v1
            https://figshare.com/articles/BirdsongRecognition/3470165
         """
-        annot_path = pathlib.Path(annot_path)
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
-        if not annot_path.exists():
+        source = crowsetta.formats.source.as_source(annot_path)
+        annot_path = source.path
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
+        if source.is_path and not annot_path.exists():
             raise FileNotFoundError(f"annot_path not found: {annot_path}")
 
         if wav_path is None:
@@ -138,10 +377,8 @@ class BirdsongRec:
         else:
             wav_path = pathlib.Path(wav_path)
 
-        # `birdsong-recongition-dataset` has a 'Sequence' class
-        # but it is different from a `crowsetta.Sequence`
-        birdsongrec_seqs = birdsongrec.parse_xml(annot_path, concat_seqs_into_songs=concat_seqs_into_songs)
-        return cls(sequences=birdsongrec_seqs, annot_path=annot_path, wav_path=wav_path)
+        sequence_arrays = parse_xml(source, concat_seqs_into_songs=concat_seqs_into_songs)
+        return cls(sequences=sequence_arrays, annot_path=annot_path, wav_path=wav_path)
 
     def to_seq(
         self, round_times: bool = True, decimals: int = 3, samplerate: Optional[int] = None
@@ -197,49 +434,61 @@ class BirdsongRec:
 
         >>> birdsongrec = crowsetta.formats.BirdsongRec.from_file(annot_path, wav_path='./actually/wavs/are/here')  # doctest: +SKIP # noqa:  E501
         """
-        seqs = []
-        for birdsongrec_seq in self.sequences:
-            onset_samples = np.array([syl.position for syl in birdsongrec_seq.syls])
-            offset_samples = np.array([syl.position + syl.length for syl in birdsongrec_seq.syls])
-            labels = np.array(
-                # NOTE we convert syl.label to string so dtype is consistent across formats
-                # and to adhere to schema for `'generic-seq'`
-                [str(syl.label) for syl in birdsongrec_seq.syls]
-            )
-            wav_filename = self.wav_path / birdsongrec_seq.wav_file
-
-            if samplerate is None:
-                try:
-                    samplerate_this_wav = soundfile.info(wav_filename).samplerate
-                except RuntimeError:
+        if isinstance(self.sequences, SequenceArrays):
+            sequence_arrays = self.sequences
+        else:
+            # `birdsong-recongition-dataset` has a 'Sequence' class
+            # but it is different from a `crowsetta.Sequence`
+            sequence_arrays = SequenceArrays.from_sequences(self.sequences)
+
+        onset_samples = sequence_arrays.note_positions
+        offset_samples = sequence_arrays.note_positions + sequence_arrays.note_lengths
+        # NOTE labels are strings so dtype is consistent across formats
+        # and to adhere to schema for `'generic-seq'`
+        labels = sequence_arrays.note_labels
+        bounds = sequence_arrays.note_bounds.tolist()
+
+        if samplerate is None:
+            # read headers of each .wav file once, concurrently,
+            # then convert all notes from samples to seconds at once,
+            # using the sampling rate of the .wav file for each note's sequence
+            wav_files, seq_wav_inds = np.unique(sequence_arrays.wav_files, return_inverse=True)
+            audio_infos = crowsetta.audioinfo.prefetch([self.wav_path / wav_file for wav_file in wav_files])
+            wav_samplerates = np.empty(len(wav_files), dtype=float)
+            for wav_ind, (wav_file, audio_info) in enumerate(zip(wav_files, audio_infos)):
+                if audio_info is None:
                     warnings.warn(
-                        f"wav file not found: {wav_filename}."
+                        f"wav file not found: {self.wav_path / wav_file}."
                         f"Could not determine sampling rate to convert onsets and offsets to seconds. "
                         f"To use a fixed sampling rate for all files, pass in a value for the `samplerate` "
                         f"argument. Be aware that this may not be the correct sampling rate for all files.",
                         UserWarning,
                         stacklevel=2,
                     )
-                    samplerate_this_wav = None
-            else:
-                samplerate_this_wav = samplerate
-
-            if samplerate_this_wav:
-                onsets_s = onset_samples / samplerate_this_wav
-                offsets_s = offset_samples / samplerate_this_wav
-                if round_times:
-                    onsets_s = np.round(onsets_s, decimals=decimals)
-                    offsets_s = np.round(offsets_s, decimals=decimals)
-            else:
-                onsets_s = None
-                offsets_s = None
+                    wav_samplerates[wav_ind] = np.nan
+                else:
+                    wav_samplerates[wav_ind] = audio_info.samplerate
+            seq_samplerates = wav_samplerates[seq_wav_inds]
+            note_samplerates = np.repeat(seq_samplerates, np.diff(sequence_arrays.note_bounds))
+        else:
+            seq_samplerates = np.full(len(sequence_arrays), samplerate, dtype=float)
+            note_samplerates = samplerate
+
+        onsets_s = onset_samples / note_samplerates
+        offsets_s = offset_samples / note_samplerates
+        if round_times:
+            onsets_s = np.round(onsets_s, decimals=decimals)
+            offsets_s = np.round(offsets_s, decimals=decimals)
 
+        seqs = []
+        for seq_ind, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            has_samplerate = not np.isnan(seq_samplerates[seq_ind])
             seq = crowsetta.Sequence.from_keyword(
-                onset_samples=onset_samples,
-                offset_samples=offset_samples,
-                onsets_s=onsets_s,
-                offsets_s=offsets_s,
-                labels=labels,
+                onset_samples=onset_samples[start:stop],
+                offset_samples=offset_samples[start:stop],
+                onsets_s=onsets_s[start:stop] if has_samplerate else None,
+                offsets_s=offsets_s[start:stop] if has_samplerate else None,
+                labels=labels[start:stop],
             )
             seqs.append(seq)
         return seqs
@@ -299,7 +548,11 @@ class BirdsongRec:
         >>> birdsongrec = crowsetta.formats.BirdsongRec.from_file(annot_path, wav_path='./actually/wavs/are/here')  # doctest: +SKIP # noqa: E501
         """
         seqs = self.to_seq(round_times=round_times, decimals=decimals, samplerate=samplerate)
-        wav_filenames = [self.wav_path / birdsongrec_seq.wav_file for birdsongrec_seq in self.sequences]
+        if isinstance(self.sequences, SequenceArrays):
+            wav_files = self.sequences.wav_files.tolist()
+        else:
+            wav_files = [birdsongrec_seq.wav_file for birdsongrec_seq in self.sequences]
+        wav_filenames = [self.wav_path / wav_file for wav_file in wav_files]
         annot_list = []
         for seq, wav_filename in zip(seqs, wav_filenames):
             annot_list.append(crowsetta.Annotation(seq=seq, annot_path=self.annot_path, notated_path=wav_filename))
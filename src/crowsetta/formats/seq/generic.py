@@ -25,6 +25,7 @@ import pandera
 from pandera.typing import Series
 
 import crowsetta
+from crowsetta.formats.source import AnnotPathOrBuffer
 from crowsetta.typing import PathLike
 
 ONSET_OFFSET_COLS_ERR = """For onset times and offset times,
@@ -210,23 +211,24 @@ def annot2csv(
     df.to_csv(csv_path, index=False)
 
 
-def csv2annot(csv_path: PathLike) -> List[crowsetta.Annotation]:
+def csv2annot(csv_path: AnnotPathOrBuffer) -> List[crowsetta.Annotation]:
     """Loads a comma-separated values (csv) file containing annotations
     for song files, returns contents as a
     :class:`list` of :class:`crowsetta.Annotation` instances.
 
     Parameters
     ----------
-    csv_path : str, pathlib.Path
+    csv_path : str, pathlib.Path, file object
         Path to csv file containing annotations
-        saved in the ``'generic-seq'`` format.
+        saved in the ``'generic-seq'`` format,
+        or a binary file object, see :mod:`crowsetta.formats.source`.
 
     Returns
     -------
     annot_list : list
         A :class:`list` of :class:`crowsetta.Annotation` instances.
     """
-    df = pd.read_csv(csv_path)
+    df = pd.read_csv(crowsetta.formats.source.path_or_buffer(csv_path))
     df = GenericSeqSchema.validate(df)
 
     annot_list = []
@@ -308,18 +310,47 @@ class GenericSeq:
 
     name: ClassVar[str] = "generic-seq"
     ext: ClassVar[str] = ".csv"
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
 
     annots: List[crowsetta.Annotation]
 
     @classmethod
-    def from_file(cls, annot_path: PathLike) -> "Self":  # noqa: F821
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'generic-seq' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format are csv files with a header
+        that has the names of the required columns.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        if not file_head.lines:
+            return sniff.NOT
+        header = [column.strip() for column in file_head.lines[0].split(",")]
+        if all(column in header for column in ("label", "notated_path", "annot_path", "sequence", "annotation")):
+            return sniff.CERTAIN
+        return sniff.NOT
+
+    @classmethod
+    def from_file(cls, annot_path: AnnotPathOrBuffer) -> "Self":  # noqa: F821
         """Load annotations in 'generic-seq' format from a csv file.
 
         Parameters
         ----------
-        annot_path : str, pathlib.Path
+        annot_path : str, pathlib.Path, bytes, file object
             Path to csv file containing annotations
-            saved in the ``'generic-seq'`` format.
+            saved in the ``'generic-seq'`` format,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
 
         Examples
         --------
@@ -328,6 +359,39 @@ class GenericSeq:
         annots = csv2annot(csv_path=annot_path)
         return cls(annots=annots)
 
+    @classmethod
+    def from_annot(
+        cls, annot: Union[crowsetta.Annotation, List[crowsetta.Annotation]]
+    ) -> "Self":  # noqa: F821
+        """Make a 'generic-seq' annotation from one or more
+        sequence-like :class:`crowsetta.Annotation` instances.
+
+        Parameters
+        ----------
+        annot : crowsetta.Annotation, list
+            A :class:`crowsetta.Annotation` with a ``seq`` attribute,
+            or a :class:`list` of them.
+
+        Returns
+        -------
+        generic : crowsetta.formats.seq.GenericSeq
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('notmat')
+        >>> annot = crowsetta.formats.seq.NotMat.from_file(example.annot_path).to_annot()
+        >>> generic = crowsetta.formats.seq.GenericSeq.from_annot(annot)
+        >>> generic.to_file('notmat.csv')  # doctest: +SKIP
+        """
+        annots = [annot] if isinstance(annot, crowsetta.Annotation) else list(annot)
+        for annot_ in annots:
+            if not hasattr(annot_, "seq"):
+                raise ValueError(
+                    "Can only convert Annotations with a ``seq`` attribute to 'generic-seq' format, "
+                    f"but annotation has: {annot_}"
+                )
+        return cls(annots=annots)
+
     def to_seq(self) -> List[crowsetta.Sequence]:
         """Return a :class:`list` of :class:`crowsetta.Sequence` instances,
         one for every annotation.
@@ -0,0 +1,344 @@
+"""Module with functions and classes for reading
+MATLAB v7.3 .mat files.
+
+MATLAB v7.3 files are HDF5 files that
+:func:`scipy.io.loadmat` cannot read.
+This module reads them with :mod:`h5py`,
+an optional dependency of crowsetta
+that can be installed with ``pip install crowsetta[mat73]``.
+
+The file is opened without reading any variables.
+Numeric and character arrays are read when they are accessed,
+while cell arrays and structs are returned as lazy containers,
+so that only the elements and fields that are needed
+are ever read from disk.
+Lazy containers keep the file open while they are used.
+:func:`~crowsetta.formats.seq.matv73.read_all` reads a variable
+with everything in it, so it can be used after the file is closed,
+and lazy containers are read this way when they are pickled,
+e.g. to send them to another process.
+The values that are read are converted the same way that
+:func:`scipy.io.loadmat` does with ``squeeze_me=True``:
+arrays are squeezed, arrays with one element become scalars,
+and character arrays become :class:`str`.
+"""
+from __future__ import annotations
+
+import collections.abc
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from crowsetta.formats.source import AnnotPathOrBuffer, as_source, path_or_buffer
+
+MATLAB_CLASS_ATTR = "MATLAB_class"
+MATLAB_EMPTY_ATTR = "MATLAB_empty"
+MAT_HEADER_SIZE = 128
+
+
+def _import_h5py():
+    """Import :mod:`h5py`, raising an informative error
+    if it is not installed"""
+    try:
+        import h5py
+    except ImportError as e:
+        raise ImportError(
+            "Reading MATLAB v7.3 .mat files requires the package h5py. "
+            "Please install it, e.g. with `pip install crowsetta[mat73]`."
+        ) from e
+    return h5py
+
+
+def is_matv73(mat_path: AnnotPathOrBuffer) -> bool:
+    """Determine whether a .mat file is a MATLAB v7.3 file.
+
+    Parameters
+    ----------
+    mat_path : str, pathlib.Path, file object
+        Path to a .mat file, or a binary file object,
+        see :mod:`crowsetta.formats.source`.
+
+    Returns
+    -------
+    is_matv73 : bool
+        True if the file is a MATLAB v7.3 file, that is an HDF5 file.
+        False if it is any other version, or not a .mat file at all.
+    """
+    with as_source(mat_path).open_binary() as fp:
+        header = fp.read(MAT_HEADER_SIZE)
+    # v7.3 files start with the same 128-byte header as v5 files,
+    # that ends with the version, 0x0200, and an endian indicator
+    return header[-4:] in (b"\x00\x02IM", b"\x02\x00MI") and len(header) == MAT_HEADER_SIZE
+
+
+def open_file(mat_path: AnnotPathOrBuffer):
+    """Open a MATLAB v7.3 .mat file for reading,
+    without reading any of the variables in it.
+
+    Parameters
+    ----------
+    mat_path : str, pathlib.Path, file object
+        Path to a MATLAB v7.3 .mat file, or a binary file object,
+        see :mod:`crowsetta.formats.source`.
+
+    Returns
+    -------
+    mat_file : h5py.File
+        The open file. Variables in the file can be
+        read with :func:`~crowsetta.formats.seq.matv73.read`,
+        e.g., ``read(mat_file['onsets'])``.
+    """
+    h5py = _import_h5py()
+    return h5py.File(path_or_buffer(mat_path), "r")
+
+
+def _matlab_class(obj) -> Union[str, None]:
+    matlab_class = obj.attrs.get(MATLAB_CLASS_ATTR)
+    if isinstance(matlab_class, bytes):
+        matlab_class = matlab_class.decode()
+    return matlab_class
+
+
+def read_array(dataset, matlab_class: Union[str, None] = None) -> Any:
+    """Read a numeric, logical or character array
+    from a dataset in a MATLAB v7.3 file.
+
+    Parameters
+    ----------
+    dataset : h5py.Dataset
+    matlab_class : str, optional
+        The MATLAB class of the array, e.g. 'double' or 'char'.
+        Default is None, in which case it is read
+        from the attributes of ``dataset``.
+
+    Returns
+    -------
+    value : numpy.ndarray, int, float, bool, str
+        The array, squeezed. Arrays with one element
+        are returned as Python scalars, and character arrays
+        with one row are returned as a :class:`str`.
+    """
+    if matlab_class is None:
+        matlab_class = _matlab_class(dataset)
+    # empty arrays are saved as an array of their dimensions with dtype uint64;
+    # only check for the attribute then, since reading attributes is slow
+    if dataset.dtype == np.uint64 and dataset.attrs.get(MATLAB_EMPTY_ATTR, 0):
+        return "" if matlab_class == "char" else np.array([])
+
+    # MATLAB arrays are column-major, so dimensions are reversed in the file
+    arr = np.asarray(dataset[()]).T
+    if matlab_class == "char":
+        strs = [row.astype("<u2").tobytes().decode("utf-16-le") for row in np.atleast_2d(arr)]
+        return strs[0] if len(strs) == 1 else np.array(strs)
+    if matlab_class == "logical":
+        arr = arr.astype(bool)
+    arr = np.squeeze(arr)
+    if arr.ndim == 0:
+        return arr.item()
+    return arr
+
+
+def read(obj) -> Any:
+    """Read a variable from a MATLAB v7.3 file.
+
+    Parameters
+    ----------
+    obj : h5py.Dataset, h5py.Group
+        A variable in a file opened with
+        :func:`~crowsetta.formats.seq.matv73.open_file`,
+        or an element of a cell array or a field of a struct.
+
+    Returns
+    -------
+    value
+        A :class:`~crowsetta.formats.seq.matv73.CellArray`
+        for a cell array, a :class:`~crowsetta.formats.seq.matv73.Struct`
+        for a struct, a :class:`~crowsetta.formats.seq.matv73.StructArray`
+        for a struct array, and otherwise
+        the value returned by :func:`~crowsetta.formats.seq.matv73.read_array`.
+    """
+    h5py = _import_h5py()
+    if isinstance(obj, h5py.Group):
+        if StructArray.is_struct_array(obj):
+            return StructArray(obj)
+        return Struct(obj)
+    matlab_class = _matlab_class(obj)
+    if matlab_class == "cell":
+        return CellArray(obj)
+    return read_array(obj, matlab_class)
+
+
+def read_all(obj) -> Any:
+    """Read a variable from a MATLAB v7.3 file,
+    including all the elements of cell arrays and fields of structs,
+    so that nothing in the value that is returned refers to the file.
+
+    Use this instead of :func:`~crowsetta.formats.seq.matv73.read`
+    when the value must still be usable after the file is closed,
+    or must be pickled, e.g. to send it to another process.
+
+    Parameters
+    ----------
+    obj : h5py.Dataset, h5py.Group
+        A variable in a file opened with
+        :func:`~crowsetta.formats.seq.matv73.open_file`,
+        or an element of a cell array or a field of a struct.
+
+    Returns
+    -------
+    value
+        A :class:`numpy.ndarray` with ``dtype=object`` for a cell array
+        or a struct array, a :class:`dict` for a struct, and otherwise
+        the value returned by :func:`~crowsetta.formats.seq.matv73.read_array`.
+    """
+    return _read_all(read(obj))
+
+
+def _read_all(value: Any) -> Any:
+    """Recursively replace lazy containers with the values they contain"""
+    if isinstance(value, _LazyArray):
+        # fill an empty array, so that numpy does not try to
+        # make a multi-dimensional array from elements that are arrays
+        arr = np.empty(len(value), dtype=object)
+        for ind in range(len(value)):
+            arr[ind] = _read_all(value[ind])
+        return arr
+    if isinstance(value, Struct):
+        return {field: _read_all(value[field]) for field in value}
+    return value
+
+
+class _LazyArray(collections.abc.Sequence):
+    """Base class for lazily read MATLAB arrays
+    whose elements are read through object references.
+
+    Elements are indexed with MATLAB's linear (column-major) order.
+    Indexing with an :class:`int` reads one element;
+    indexing with a :class:`slice` or a sequence of :class:`int`
+    returns a :class:`list` of elements, read in order.
+    """
+
+    def __len__(self):
+        return self._size
+
+    def _get_one(self, ind: int) -> Any:
+        raise NotImplementedError
+
+    def __reduce__(self):
+        # h5py objects cannot be pickled, so pickle every element, read as a numpy array
+        return _read_all(self).__reduce__()
+
+    def __getitem__(self, ind):
+        if isinstance(ind, slice):
+            return [self._get_one(ind_) for ind_ in range(*ind.indices(len(self)))]
+        if isinstance(ind, (collections.abc.Sequence, np.ndarray)):
+            return [self[int(ind_)] for ind_ in ind]
+        ind = int(ind)
+        if ind < 0:
+            ind += len(self)
+        if not 0 <= ind < len(self):
+            raise IndexError(f"index {ind} is out of range for {type(self).__name__} with length {len(self)}")
+        return self._get_one(ind)
+
+
+class CellArray(_LazyArray):
+    """A cell array in a MATLAB v7.3 file.
+
+    Each element is read with
+    :func:`~crowsetta.formats.seq.matv73.read`
+    only when it is accessed.
+    """
+
+    def __init__(self, dataset):
+        self._dataset = dataset
+        self._file = dataset.file
+        # references are 8 bytes each, so we read all of them up front;
+        # C-order in the file is MATLAB's column-major order
+        self._refs = np.asarray(dataset[()]).ravel()
+        self._size = self._refs.size
+
+    def _get_one(self, ind: int) -> Any:
+        return read(self._file[self._refs[ind]])
+
+    def __repr__(self):
+        return f"CellArray(name={self._dataset.name!r}, size={len(self)})"
+
+
+class Struct(collections.abc.Mapping):
+    """A struct in a MATLAB v7.3 file,
+    that acts as a read-only :class:`dict`
+    mapping field names to values.
+
+    Each field is read with
+    :func:`~crowsetta.formats.seq.matv73.read`
+    only when it is accessed.
+    """
+
+    def __init__(self, group, ind: Union[int, None] = None, struct_array: Optional[StructArray] = None):
+        self._group = group
+        # if not None, this is element ``ind`` of ``struct_array``
+        self._ind = ind
+        self._struct_array = struct_array
+
+    def __getitem__(self, field: str) -> Any:
+        if self._ind is not None:
+            ref = self._struct_array._field_refs(field)[self._ind]
+            return read(self._group.file[ref])
+        return read(self._group[field])
+
+    def __reduce__(self):
+        # h5py objects cannot be pickled, so pickle every field, read as a dict
+        return dict, (_read_all(self),)
+
+    def __iter__(self):
+        return iter(self._group.keys())
+
+    def __len__(self):
+        return len(self._group)
+
+    def __repr__(self):
+        return f"Struct(name={self._group.name!r}, fields={list(self)})"
+
+
+class StructArray(_LazyArray):
+    """A struct array in a MATLAB v7.3 file.
+
+    Each element is a :class:`~crowsetta.formats.seq.matv73.Struct`
+    whose fields are read only when they are accessed.
+    """
+
+    def __init__(self, group):
+        self._group = group
+        first_field = next(iter(group.values()))
+        self._size = first_field.size
+        # maps field name -> references to the value of the field for each element
+        self._refs: Dict[str, np.ndarray] = {}
+
+    def _field_refs(self, field: str) -> np.ndarray:
+        """Get the references for a field, read from the file
+        the first time that the field of any element is accessed"""
+        refs = self._refs.get(field)
+        if refs is None:
+            refs = self._refs[field] = np.asarray(self._group[field][()]).ravel()
+        return refs
+
+    @staticmethod
+    def is_struct_array(group) -> bool:
+        """Determine whether a group in a MATLAB v7.3 file is a struct array,
+        that is, whether all its fields are arrays of references
+        that are not themselves cell arrays."""
+        h5py = _import_h5py()
+        if len(group) == 0:
+            return False
+        return all(
+            isinstance(obj, h5py.Dataset)
+            and h5py.check_dtype(ref=obj.dtype) is h5py.Reference
+            and _matlab_class(obj) is None
+            for obj in group.values()
+        )
+
+    def _get_one(self, ind: int) -> Struct:
+        return Struct(self._group, ind, struct_array=self)
+
+    def __repr__(self):
+        return f"StructArray(name={self._group.name!r}, size={len(self)})"
@@ -2,16 +2,81 @@
 produced by evsonganaly GUI.
 """
 import pathlib
-from typing import ClassVar, Dict, Optional
+from typing import ClassVar, Dict, Final, Optional, Sequence
 
 import attr
-import evfuncs
 import numpy as np
 import scipy.io
 
 import crowsetta
+from crowsetta.formats.adapters import ArrayAdapter, Column
+from crowsetta.formats.source import AnnotPathOrBuffer
 from crowsetta.typing import PathLike
 
+from . import matv73
+
+ANNOT_VARS: Final = ("onsets", "offsets", "labels")
+
+
+def load_notmat(annot_path: AnnotPathOrBuffer, other_vars: Optional[Sequence[str]] = None) -> dict:
+    """Load only the variables needed for annotations
+    from a .not.mat file.
+
+    Similar to :func:`evfuncs.load_notmat`,
+    but uses the ``variable_names`` argument to :func:`scipy.io.loadmat`
+    so that only ``onsets``, ``offsets``, and ``labels``
+    (plus any ``other_vars``) are read.
+    The data for any other variables in the file,
+    e.g. large arrays added with the ``other_vars`` argument
+    to :meth:`crowsetta.formats.seq.NotMat.to_file`,
+    is skipped over instead of being read and decoded.
+
+    MATLAB v7.3 .mat files, that are HDF5 files, can also be loaded
+    if the optional dependency :mod:`h5py` is installed,
+    e.g. with ``pip install crowsetta[mat73]``.
+    In that case only the datasets for the same variables are read.
+    See :mod:`crowsetta.formats.seq.matv73`.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path, file object
+        Path to a .not.mat file saved by the evsonganaly GUI,
+        or a binary file object, see :mod:`crowsetta.formats.source`.
+    other_vars : sequence
+        Names of other variables to load, e.g. ``('Fs', 'fname')``.
+        Default is None, in which case only ``onsets``,
+        ``offsets``, and ``labels`` are loaded.
+
+    Returns
+    -------
+    notmat_dict : dict
+        Mapping variable names to the variables loaded
+        from the .not.mat file.
+        Note that, as in the file,
+        onsets and offsets are in units of milliseconds.
+    """
+    variable_names = list(ANNOT_VARS)
+    if other_vars is not None:
+        variable_names.extend(var for var in other_vars if var not in variable_names)
+    source = crowsetta.formats.source.as_source(annot_path)
+    if matv73.is_matv73(source):
+        with matv73.open_file(source) as annot_file:
+            notmat_dict = {var: matv73.read_array(annot_file[var]) for var in variable_names if var in annot_file}
+    else:
+        notmat_dict = scipy.io.loadmat(
+            crowsetta.formats.source.path_or_buffer(source), squeeze_me=True, variable_names=variable_names
+        )
+
+    missing_vars = [var for var in variable_names if var not in notmat_dict]
+    if missing_vars:
+        raise ValueError(f"Variables not found in .not.mat file {source.path}: {missing_vars}")
+
+    # ensure that onsets and offsets are always arrays, not scalar
+    for key in ("onsets", "offsets"):
+        # ``squeeze_me`` makes a single onset or offset a ``float``
+        notmat_dict[key] = np.atleast_1d(notmat_dict[key])
+    return notmat_dict
+
 
 @crowsetta.interface.SeqLike.register
 @attr.define
@@ -37,48 +102,125 @@ class NotMat:
         annotations were loaded.
     audio_path : str, pathlib.Path
         Path to audio file that ``annot_path`` annotates.
+    other_vars : dict
+        Other variables loaded from the .not.mat file,
+        when their names are passed to ``from_file``,
+        e.g. ``{'Fs': 32000.0, 'fname': 'bird0.cbin'}``.
+        Optional, default is None.
 
     Notes
     -----
-    This class uses the Python package ``evfuncs``
-    to load the annotations.
+    This class loads only the variables it needs from .not.mat files;
+    see :func:`crowsetta.formats.seq.notmat.load_notmat`.
+    The files are the same ones loaded by the Python package ``evfuncs``:
     https://github.com/NickleDave/evfuncs
     """
 
     name: ClassVar[str] = "notmat"
     ext: ClassVar[str] = ".not.mat"
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
+
+    # onsets and offsets are converted from ms to s when they are loaded
+    ARRAY_ADAPTER: ClassVar[ArrayAdapter] = ArrayAdapter(
+        kind="seq",
+        columns=(Column("onsets", "onsets_s"), Column("offsets", "offsets_s"), Column("labels", "labels")),
+        notated_path="audio_path",
+    )
 
     onsets: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
     offsets: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
     labels: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
     annot_path: pathlib.Path
     audio_path: pathlib.Path
+    other_vars: Optional[Dict] = attr.field(default=None, eq=False)
+
+    @classmethod
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'notmat' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format are .mat files with the variables
+        ``onsets``, ``offsets``, and ``labels``.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        mat_variables = file_head.mat_variables
+        if mat_variables is None:
+            # e.g., a MATLAB v7.3 file when h5py is not installed; all we know is the extension
+            return sniff.POSSIBLE if file_head.head.startswith(b"MATLAB") else sniff.NOT
+        if all(var in mat_variables for var in ANNOT_VARS):
+            return sniff.CERTAIN
+        return sniff.NOT
 
     @classmethod
-    def from_file(cls, annot_path: PathLike) -> "Self":  # noqa: F821
+    def from_file(
+        cls,
+        annot_path: AnnotPathOrBuffer,
+        other_vars: Optional[Sequence[str]] = None,
+        validate_ext: bool = True,
+    ) -> "Self":  # noqa: F821
         """load annotations from .not.mat file
 
         Parameters
         ----------
-        annot_path: str, pathlib.Path
-            Path to a .not.mat file saved by the evsonganaly GUI.
+        annot_path: str, pathlib.Path, bytes, file object
+            Path to a .not.mat file saved by the evsonganaly GUI,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
+        other_vars : sequence
+            Names of other variables to load from the file,
+            e.g. ``('Fs', 'fname')``. These are added to the
+            ``other_vars`` attribute. Default is None,
+            in which case only the variables needed for
+            annotations are loaded.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has the extension '.not.mat'. Default is True.
+            Set to False to load a file with another extension.
 
         Examples
         --------
         >>> example = crowsetta.data.get('notmat')
         >>> notmat = crowsetta.formats.seq.NotMat.from_file(example.annot_path)
+
+        Load the sampling rate as well
+
+        >>> notmat = crowsetta.formats.seq.NotMat.from_file(example.annot_path, other_vars=('Fs',))
+        >>> notmat.other_vars
+        {'Fs': 32000}
         """
-        annot_path = pathlib.Path(annot_path)
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
-        notmat_dict = evfuncs.load_notmat(annot_path)
+        source = crowsetta.formats.source.as_source(annot_path)
+        annot_path = source.path
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
+        notmat_dict = load_notmat(source, other_vars)
         # in .not.mat files saved by evsonganaly,
         # onsets and offsets are in units of ms, have to convert to s
         onsets = notmat_dict["onsets"] / 1000
         offsets = notmat_dict["offsets"] / 1000
         labels = np.asarray(list(notmat_dict["labels"]))
 
+        if other_vars is not None:
+            other_vars = {var: notmat_dict[var] for var in other_vars}
+
         audio_path = annot_path.parent / annot_path.name.replace(".not.mat", "")
-        return cls(annot_path=annot_path, onsets=onsets, offsets=offsets, labels=labels, audio_path=audio_path)
+        return cls(
+            annot_path=annot_path,
+            onsets=onsets,
+            offsets=offsets,
+            labels=labels,
+            audio_path=audio_path,
+            other_vars=other_vars,
+        )
 
     def to_seq(self, round_times: bool = True, decimals: int = 3) -> crowsetta.Sequence:
         """Convert this .not.mat annotation to a :class:`crowsetta.Sequence`.
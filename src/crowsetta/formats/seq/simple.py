@@ -27,6 +27,8 @@ import pandera
 from pandera.typing import Series
 
 import crowsetta
+from crowsetta.formats.adapters import ArrayAdapter, Column
+from crowsetta.formats.source import AnnotPathOrBuffer
 from crowsetta.typing import PathLike
 
 
@@ -49,6 +51,28 @@ class SimpleSeqSchema(pandera.SchemaModel):
         strict = True
 
 
+def _read_columns(annot_path: AnnotPathOrBuffer, columns_map: Optional[Mapping] = None) -> tuple:
+    """Read a csv file in the 'simple-seq' format,
+    with the default arguments to :func:`pandas.read_csv`,
+    directly into :mod:`numpy` arrays.
+
+    Raises a :class:`ValueError` if the file cannot be read this way.
+    """
+    column_names, columns = crowsetta.formats.delimited.read_columns(annot_path, delimiter=",", header=True)
+    if columns_map:
+        if any(column_name not in columns_map for column_name in column_names):
+            raise ValueError(f"Not all columns in header are in columns_map: {column_names}")
+        column_names = [columns_map[column_name] for column_name in column_names]
+    columns = dict(zip(column_names, columns))
+    if not all(column_name in columns for column_name in ("onset_s", "offset_s", "label")):
+        raise ValueError(f"Header does not have all of 'onset_s', 'offset_s', and 'label': {column_names}")
+    return (
+        crowsetta.formats.delimited.to_float_array(columns["onset_s"]),
+        crowsetta.formats.delimited.to_float_array(columns["offset_s"]),
+        crowsetta.formats.delimited.to_str_array(columns["label"]),
+    )
+
+
 @crowsetta.interface.SeqLike.register
 @attr.define
 class SimpleSeq:
@@ -96,6 +120,12 @@ class SimpleSeq:
 
     name: ClassVar[str] = "simple-seq"
     ext: ClassVar[str] = (".csv", ".txt")
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
+
+    ARRAY_ADAPTER: ClassVar[ArrayAdapter] = ArrayAdapter(
+        kind="seq",
+        columns=(Column("onsets_s", "onsets_s"), Column("offsets_s", "offsets_s"), Column("labels", "labels")),
+    )
 
     onsets_s: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
     offsets_s: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
@@ -103,13 +133,48 @@ class SimpleSeq:
     annot_path: pathlib.Path
     notated_path: Optional[pathlib.Path] = attr.field(default=None, converter=attr.converters.optional(pathlib.Path))
 
+    @classmethod
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'simple-seq' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format have a header, and at least three columns.
+        Confidence is highest when the names of columns are the standardized names,
+        'onset_s', 'offset_s', and 'label', that do not need to be mapped
+        with the ``columns_map`` argument to
+        :meth:`~crowsetta.formats.seq.SimpleSeq.from_file`.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        rows = [[field.strip() for field in row] for row in file_head.rows(",")]
+        if not rows or len(rows[0]) < 3 or any(len(row) != len(rows[0]) for row in rows):
+            return sniff.NOT
+        header = rows[0]
+        if all(column in header for column in ("onset_s", "offset_s", "label")):
+            return sniff.LIKELY
+        if not any(sniff.is_number(column) for column in header) and all(
+            sum(sniff.is_number(field) for field in row) >= 2 for row in rows[1:]
+        ):
+            return sniff.POSSIBLE
+        return sniff.NOT
+
     @classmethod
     def from_file(
         cls,
-        annot_path: PathLike,
+        annot_path: AnnotPathOrBuffer,
         notated_path: Optional[PathLike] = None,
         columns_map: Optional[Mapping] = None,
         read_csv_kwargs: Optional[Mapping] = None,
+        validate_ext: bool = True,
     ) -> "Self":  # noqa: F821
         """Load annotations from a file
         in the 'simple-seq' format.
@@ -132,9 +197,11 @@ class SimpleSeq:
 
         Parameters
         ----------
-        annot_path : str, pathlib.Path
+        annot_path : str, pathlib.Path, bytes, file object
             Path to an annotation file,
-            with one of the extensions {'.csv', '.txt'}.
+            with one of the extensions {'.csv', '.txt'},
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
         notated_path : str, pathlib.Path
             Path to file that ``annot_path`` annotates.
             E.g., an audio file, or an array file
@@ -152,6 +219,11 @@ class SimpleSeq:
             :func:`pandas.read_csv`. Default is None,
             in which case all defaults for
             :func:`pandas.read_csv` will be used.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has one of the extensions {'.csv', '.txt'}.
+            Default is True.
+            Set to False to load a file with another extension.
 
         Examples
         --------
@@ -161,26 +233,84 @@ class SimpleSeq:
         >>>                                                                 'stop_seconds': 'offset_s',
         >>>                                                                 'name': 'label'},
         >>>                                                    read_csv_kwargs={'index_col': 0})
+
+        Notes
+        -----
+        When ``read_csv_kwargs`` is None, the file is parsed directly
+        into :mod:`numpy` arrays with the functions in
+        :mod:`crowsetta.formats.delimited`.
+        Only if that fails is it loaded with :mod:`pandas`
+        and validated with
+        :class:`~crowsetta.formats.seq.simple.SimpleSeqSchema`,
+        so that invalid files raise the same errors.
         """
-        annot_path = pathlib.Path(annot_path)
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
+        source = crowsetta.formats.source.as_source(annot_path)
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(source.path, extension=cls.ext)
+
+        columns = None
+        if not read_csv_kwargs:
+            try:
+                columns = _read_columns(source, columns_map)
+            except ValueError:
+                # fall back to pandas, so that invalid files raise the same errors as validation does
+                pass
+        if columns is None:
+            if read_csv_kwargs:
+                df = pd.read_csv(crowsetta.formats.source.path_or_buffer(source), **read_csv_kwargs)
+            else:
+                df = pd.read_csv(crowsetta.formats.source.path_or_buffer(source))
+
+            if columns_map:
+                df.columns = [columns_map[column_name] for column_name in df.columns]
+            df = df[["onset_s", "offset_s", "label"]]  # put in correct order
+            df = SimpleSeqSchema.validate(df)
+            columns = df["onset_s"].values, df["offset_s"].values, df["label"].values
+        onsets_s, offsets_s, labels = columns
 
-        if read_csv_kwargs:
-            df = pd.read_csv(annot_path, **read_csv_kwargs)
-        else:
-            df = pd.read_csv(annot_path)
+        return cls(
+            onsets_s=onsets_s,
+            offsets_s=offsets_s,
+            labels=labels,
+            annot_path=source.path,
+            notated_path=notated_path,
+        )
 
-        if columns_map:
-            df.columns = [columns_map[column_name] for column_name in df.columns]
-        df = df[["onset_s", "offset_s", "label"]]  # put in correct order
-        df = SimpleSeqSchema.validate(df)
+    @classmethod
+    def from_annot(cls, annot: crowsetta.Annotation) -> "Self":  # noqa: F821
+        """Make a 'simple-seq' annotation from a sequence-like :class:`crowsetta.Annotation`.
 
+        Parameters
+        ----------
+        annot : crowsetta.Annotation
+            With a ``seq`` attribute that is a single :class:`crowsetta.Sequence`,
+            with onsets and offsets in seconds.
+
+        Returns
+        -------
+        simple : crowsetta.formats.seq.SimpleSeq
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('notmat')
+        >>> annot = crowsetta.formats.seq.NotMat.from_file(example.annot_path).to_annot()
+        >>> simple = crowsetta.formats.seq.SimpleSeq.from_annot(annot)
+        >>> simple.to_file('notmat.csv')  # doctest: +SKIP
+        """
+        seq = getattr(annot, "seq", None)
+        if not isinstance(seq, crowsetta.Sequence):
+            raise ValueError(
+                f"Can only convert an Annotation with a ``seq`` attribute that is a single Sequence "
+                f"to '{cls.name}' format, but annotation has: {annot}"
+            )
+        if seq.onsets_s is None:
+            raise ValueError(f"Can only convert a Sequence with onsets and offsets in seconds to '{cls.name}' format")
         return cls(
-            onsets_s=df["onset_s"].values,
-            offsets_s=df["offset_s"].values,
-            labels=df["label"].values,
-            annot_path=annot_path,
-            notated_path=notated_path,
+            onsets_s=seq.onsets_s,
+            offsets_s=seq.offsets_s,
+            labels=seq.labels,
+            annot_path=annot.annot_path,
+            notated_path=annot.notated_path,
         )
 
     def to_seq(self, round_times: bool = True, decimals: int = 3) -> crowsetta.Sequence:
@@ -83,6 +83,14 @@ class IntervalTier:
         # (2) we use this to check for overlap
         self.intervals = sorted(self.intervals, key=lambda interval: interval.xmin)
 
+        # once intervals are sorted by xmin, there is an overlap somewhere
+        # if and only if some interval ends after the *next* interval starts,
+        # so we can skip the quadratic check below for valid tiers
+        xmins = np.array([interval.xmin for interval in self.intervals], dtype=float)
+        xmaxs = np.array([interval.xmax for interval in self.intervals], dtype=float)
+        if np.all(xmaxs[:-1] <= xmins[1:]):
+            return
+
         xmax_lt_all_xmin = []
         for ind in range(len(self.intervals) - 1):
             xmax_lt_all_xmin.append(
@@ -20,10 +20,10 @@ but note that both of these have a GPL license.
 """
 from __future__ import annotations
 
-import pathlib
 import re
 from typing import Final, TextIO
 
+from ...source import AnnotPathOrBuffer, as_source
 from .classes import Interval, IntervalTier, Point, PointTier
 
 FLOAT_PAT: Final = re.compile(r"([\d.]+)\s*$", flags=re.UNICODE)
@@ -121,8 +121,9 @@ def get_str_from_next_line(fp: TextIO) -> str:
     -------
     val : str
     """
-    # don't need to cast here
-    return search_next_line(fp, pat=STR_PAT)
+    # don't need to cast here, but Praat escapes double quotes
+    # inside a string by doubling them, so we undo that
+    return search_next_line(fp, pat=STR_PAT).replace('""', '"')
 
 
 INTERVAL_TIER: Final = "IntervalTier"
@@ -219,7 +220,7 @@ def parse_fp(fp: TextIO, keep_empty: bool = False) -> dict:
     return tg
 
 
-def parse(textgrid_path: str | pathlib.Path, keep_empty: bool = False) -> dict:
+def parse(textgrid_path: AnnotPathOrBuffer, keep_empty: bool = False) -> dict:
     """Parse a TextGrid file, loading it into a :class:`dict`.
 
     This function is used by
@@ -229,8 +230,9 @@ def parse(textgrid_path: str | pathlib.Path, keep_empty: bool = False) -> dict:
 
     Parameters
     ----------
-    textgrid_path : str, pathlib.Path
-        The path to a TextGrid file.
+    textgrid_path : str, pathlib.Path, file object
+        The path to a TextGrid file,
+        or a binary file object, see :mod:`crowsetta.formats.source`.
     keep_empty : bool
         If True, keep intervals in
         interval tiers that have empty labels
@@ -242,11 +244,11 @@ def parse(textgrid_path: str | pathlib.Path, keep_empty: bool = False) -> dict:
     textgrid_raw : dict
         A dict with keys 'xmin', 'xmax', and 'tiers'.
     """
-    textgrid_path = pathlib.Path(textgrid_path)
+    source = as_source(textgrid_path)
     try:
-        with textgrid_path.open("r", encoding="utf-16") as fp:
+        with source.open_text(encoding="utf-16") as fp:
             textgrid_raw = parse_fp(fp, keep_empty)
     except (UnicodeError, UnicodeDecodeError):
-        with textgrid_path.open("r", encoding="utf-8") as fp:
+        with source.open_text(encoding="utf-8") as fp:
             textgrid_raw = parse_fp(fp, keep_empty)
     return textgrid_raw
@@ -9,10 +9,12 @@ import attr
 import numpy as np
 
 import crowsetta
+from crowsetta.formats.source import AnnotPathOrBuffer
 from crowsetta.typing import PathLike
 
-from .classes import IntervalTier, PointTier
+from .classes import Interval, IntervalTier, PointTier
 from .parse import parse
+from .write import write
 
 
 @crowsetta.interface.SeqLike.register
@@ -168,6 +170,7 @@ class TextGrid:
 
     name: ClassVar[str] = "textgrid"
     ext: ClassVar[str] = ".TextGrid"
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
 
     tiers: list[Union[IntervalTier, PointTier]] = attr.field(repr=reprlib.repr)
     xmin: float
@@ -175,20 +178,49 @@ class TextGrid:
     annot_path: pathlib.Path
     audio_path: Optional[pathlib.Path] = attr.field(default=None, converter=attr.converters.optional(pathlib.Path))
 
+    @classmethod
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'textgrid' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format start with a header
+        that says the file type is 'ooTextFile' and the object class is 'TextGrid'.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        if file_head.text is None:
+            return sniff.NOT
+        text = file_head.text.lstrip()
+        if text.startswith('File type = "ooTextFile"') and 'Object class = "TextGrid"' in text:
+            return sniff.CERTAIN
+        return sniff.NOT
+
     @classmethod
     def from_file(
         cls,
-        annot_path: PathLike,
+        annot_path: AnnotPathOrBuffer,
         audio_path: Optional[PathLike] = None,
         keep_empty: bool = False,
+        validate_ext: bool = True,
     ) -> "Self":  # noqa: F821
         """Load annotations from a TextGrid file
         in the format used by Praat.
 
         Parameters
         ----------
-        annot_path : str, pathlib.Path
-            The path to a TextGrid file from which annotations were loaded.
+        annot_path : str, pathlib.Path, bytes, file object
+            The path to a TextGrid file from which annotations were loaded,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
         audio_path : str, pathlib.Path
             The path to the audio file that ``annot_path`` annotates.
             Optional, default is None.
@@ -197,6 +229,10 @@ class TextGrid:
             interval tiers that have empty labels
             (i.e., the empty string "").
             Default is False.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has the extension '.TextGrid'. Default is True.
+            Set to False to load a file with another extension.
 
         Examples
         --------
@@ -212,10 +248,12 @@ class TextGrid:
         --------
         :class:`crowsetta.formats.seq.textgrid.TextGrid`
         """
-        annot_path = pathlib.Path(annot_path)
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
+        source = crowsetta.formats.source.as_source(annot_path)
+        annot_path = source.path
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
 
-        tg_dict = parse(annot_path, keep_empty)
+        tg_dict = parse(source, keep_empty)
 
         return cls(
             tiers=tg_dict["tiers"],
@@ -225,6 +263,131 @@ class TextGrid:
             audio_path=audio_path,
         )
 
+    @classmethod
+    def from_seq(
+        cls,
+        seq: crowsetta.Sequence | list[crowsetta.Sequence],
+        annot_path: PathLike,
+        audio_path: Optional[PathLike] = None,
+        tier_names: list[str] | None = None,
+        xmin: float = 0.0,
+        xmax: float | None = None,
+    ) -> "Self":  # noqa: F821
+        """Make a TextGrid from one or more :class:`crowsetta.Sequence` instances,
+        with one :class:`~crowsetta.formats.seq.textgrid.classes.IntervalTier`
+        for each :class:`~crowsetta.Sequence`.
+
+        The :class:`~crowsetta.Sequence` instances
+        must have onset and offset times in seconds.
+
+        Parameters
+        ----------
+        seq : crowsetta.Sequence, list
+            A :class:`crowsetta.Sequence` or a :class:`list` of them.
+        annot_path : str, pathlib.Path
+            The path to the TextGrid file that these annotations
+            will be saved in.
+        audio_path : str, pathlib.Path
+            The path to the audio file that ``annot_path`` annotates.
+            Optional, default is None.
+        tier_names : list
+            Names of the interval tiers, one for each sequence.
+            Default is None, in which case tiers are named
+            "tier1", "tier2", etc.
+        xmin : float
+            Start time in seconds of the TextGrid. Default is 0.0.
+        xmax : float
+            End time in seconds of the TextGrid.
+            Default is None, in which case the latest offset
+            across all sequences is used.
+
+        Returns
+        -------
+        textgrid : crowsetta.formats.seq.TextGrid
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('notmat')
+        >>> annot = crowsetta.formats.seq.NotMat.from_file(example.annot_path).to_annot()
+        >>> textgrid = crowsetta.formats.seq.TextGrid.from_seq(annot.seq, annot_path='notmat.TextGrid')
+        """
+        if isinstance(seq, crowsetta.Sequence):
+            seq = [seq]
+        if tier_names is None:
+            tier_names = [f"tier{tier_num}" for tier_num in range(1, len(seq) + 1)]
+        if len(tier_names) != len(seq):
+            raise ValueError(
+                f"Number of tier names ({len(tier_names)}) does not equal number of sequences ({len(seq)})"
+            )
+        for seq_ in seq:
+            if seq_.onsets_s is None or np.all(seq_.onsets_s == None):  # noqa: E711
+                raise ValueError(
+                    "Cannot convert a Sequence without onset and offset times in seconds to a TextGrid tier"
+                )
+
+        if xmax is None:
+            xmax = max([float(np.max(seq_.offsets_s)) if len(seq_.offsets_s) else xmin for seq_ in seq])
+
+        tiers = []
+        for tier_name, seq_ in zip(tier_names, seq):
+            intervals = [
+                Interval(xmin=onset_s, xmax=offset_s, text=label)
+                for onset_s, offset_s, label in zip(
+                    seq_.onsets_s.astype(float).tolist(), seq_.offsets_s.astype(float).tolist(), seq_.labels.tolist()
+                )
+            ]
+            tiers.append(IntervalTier(name=tier_name, xmin=xmin, xmax=xmax, intervals=intervals))
+
+        return cls(tiers=tiers, xmin=xmin, xmax=xmax, annot_path=pathlib.Path(annot_path), audio_path=audio_path)
+
+    @classmethod
+    def from_annot(
+        cls,
+        annot: crowsetta.Annotation,
+        tier_names: list[str] | None = None,
+        xmin: float = 0.0,
+        xmax: float | None = None,
+    ) -> "Self":  # noqa: F821
+        """Make a TextGrid from a sequence-like :class:`crowsetta.Annotation`.
+
+        Parameters
+        ----------
+        annot : crowsetta.Annotation
+            With a ``seq`` attribute that is a :class:`crowsetta.Sequence`
+            or a :class:`list` of them. Each sequence becomes an interval tier.
+        tier_names : list
+            Names of the interval tiers, one for each sequence.
+            Default is None, in which case tiers are named
+            "tier1", "tier2", etc.
+        xmin : float
+            Start time in seconds of the TextGrid. Default is 0.0.
+        xmax : float
+            End time in seconds of the TextGrid.
+            Default is None, in which case the latest offset
+            across all sequences is used.
+
+        Returns
+        -------
+        textgrid : crowsetta.formats.seq.TextGrid
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('notmat')
+        >>> annot = crowsetta.formats.seq.NotMat.from_file(example.annot_path).to_annot()
+        >>> textgrid = crowsetta.formats.seq.TextGrid.from_annot(annot)
+        >>> textgrid.to_file('notmat.TextGrid')  # doctest: +SKIP
+        """
+        if not hasattr(annot, "seq"):
+            raise ValueError("Can only convert an Annotation with a ``seq`` attribute to a TextGrid")
+        return cls.from_seq(
+            annot.seq,
+            annot_path=annot.annot_path,
+            audio_path=annot.notated_path,
+            tier_names=tier_names,
+            xmin=xmin,
+            xmax=xmax,
+        )
+
     def __len__(self):
         return len(self.tiers)
 
@@ -408,3 +571,39 @@ class TextGrid:
         seq = self.to_seq(tier=tier, round_times=round_times, decimals=decimals)
 
         return crowsetta.Annotation(annot_path=self.annot_path, notated_path=self.audio_path, seq=seq)
+
+    def to_file(self, annot_path: PathLike, short: bool = False, encoding: str = "utf-8") -> None:
+        """Save this TextGrid to a text file
+        that can be read by Praat.
+
+        Gaps between intervals in interval tiers,
+        e.g. where empty intervals were removed when loading
+        with ``keep_empty=False``, are filled with
+        intervals whose text is the empty string,
+        because Praat requires intervals to cover the whole tier.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path
+            Path including filename where file should be saved.
+            Must have extension '.TextGrid'.
+        short : bool
+            If True, save in the "short" text format.
+            Default is False, in which case the default ("long")
+            text format is used.
+        encoding : str
+            Either 'utf-8' or 'utf-16'. Default is 'utf-8'.
+
+        Examples
+        --------
+        >>> example = crowsetta.data.get('textgrid')
+        >>> textgrid = crowsetta.formats.seq.TextGrid.from_file(example.annot_path)
+        >>> textgrid.to_file('./AVO-maea-basic.short.TextGrid', short=True)  # doctest: +SKIP
+        """
+        crowsetta.validation.validate_ext(annot_path, extension=self.ext)
+        tg_dict = {
+            "xmin": self.xmin,
+            "xmax": self.xmax,
+            "tiers": self.tiers,
+        }
+        write(tg_dict, annot_path, short=short, encoding=encoding)
@@ -0,0 +1,290 @@
+"""Functions for writing TextGrid files.
+
+The functions in this module are the inverse of those in
+:mod:`crowsetta.formats.seq.textgrid.parse`:
+:func:`~crowsetta.formats.seq.textgrid.write.write`
+takes a :class:`dict` with the same keys that
+:func:`~crowsetta.formats.seq.textgrid.parse.parse` returns,
+and saves it as a TextGrid file in either the default ("long")
+text format or the "short" text format, as described in
+https://www.fon.hum.uva.nl/praat/manual/TextGrid_file_formats.html
+
+Times are written with the shortest decimal representation
+that converts back to exactly the same :class:`float`,
+so that a file written by this module and then loaded
+by :func:`~crowsetta.formats.seq.textgrid.parse.parse`
+gives back exactly the same values.
+Entries in tiers are formatted in blocks
+and each block is written to the file as soon as it is formatted,
+so that large tiers are never held in memory as a single string.
+"""
+from __future__ import annotations
+
+import pathlib
+from typing import Final, TextIO
+
+import numpy as np
+import numpy.typing as npt
+
+from .classes import IntervalTier, PointTier
+from .parse import INTERVAL_TIER, POINT_TIER
+
+BLOCK_SIZE: Final = 8192
+
+HEADER: Final = 'File type = "ooTextFile"\nObject class = "TextGrid"\n\n'
+
+LONG_TG_TEMPLATE: Final = "xmin = %s \nxmax = %s \ntiers? <exists> \nsize = %d \nitem []: \n"
+LONG_TIER_TEMPLATE: Final = (
+    '    item [%d]:\n        class = "%s" \n        name = "%s" \n'
+    "        xmin = %s \n        xmax = %s \n        %s: size = %d \n"
+)
+LONG_INTERVAL_TEMPLATE: Final = (
+    '        intervals [%d]:\n            xmin = %s \n            xmax = %s \n            text = "%s" \n'
+)
+LONG_POINT_TEMPLATE: Final = '        points [%d]:\n            number = %s \n            mark = "%s" \n'
+
+SHORT_TG_TEMPLATE: Final = "%s\n%s\n<exists>\n%d\n"
+SHORT_TIER_TEMPLATE: Final = '"%s"\n"%s"\n%s\n%s\n%d\n'
+SHORT_INTERVAL_TEMPLATE: Final = '%s\n%s\n"%s"\n'
+SHORT_POINT_TEMPLATE: Final = '%s\n"%s"\n'
+
+
+def format_floats(vals: npt.ArrayLike) -> list[str]:
+    """Format times as strings the way Praat writes them.
+
+    Uses the shortest decimal representation that
+    converts back to exactly the same :class:`float`,
+    drops a trailing ``.0`` from whole numbers,
+    and never uses scientific notation
+    (that the parser would not recognize).
+
+    Parameters
+    ----------
+    vals : numpy.ndarray
+        Times, in seconds.
+
+    Returns
+    -------
+    val_strs : list
+        Of :class:`str`.
+    """
+    vals = np.atleast_1d(np.asarray(vals, dtype=float))
+    if not np.all(np.isfinite(vals)):
+        raise ValueError(f"Cannot write times that are not finite numbers to a TextGrid: {vals[~np.isfinite(vals)]}")
+    # ``repr`` gives the shortest string that round-trips; it is called from C by ``map``
+    val_strs = list(map(repr, vals.tolist()))
+    # ``repr`` switches to scientific notation outside of this range
+    abs_vals = np.abs(vals)
+    is_sci = (abs_vals != 0.0) & ((abs_vals < 1e-4) | (abs_vals >= 1e16))
+    is_whole = ~is_sci & (vals == np.floor(vals))
+    for ind in np.flatnonzero(is_whole).tolist():
+        val_strs[ind] = val_strs[ind][:-2]
+    for ind in np.flatnonzero(is_sci).tolist():
+        val_strs[ind] = np.format_float_positional(vals[ind], trim="-")
+    return val_strs
+
+
+def format_float(val: float) -> str:
+    """Format a single time as a string the way Praat writes them.
+
+    See :func:`~crowsetta.formats.seq.textgrid.write.format_floats`.
+
+    Parameters
+    ----------
+    val : float
+
+    Returns
+    -------
+    val_str : str
+    """
+    return format_floats(val)[0]
+
+
+def escape_strs(strs: npt.ArrayLike) -> list[str]:
+    """Escape strings so they can be written inside double quotes
+    in a TextGrid, by doubling any double quotes as Praat does.
+
+    Parameters
+    ----------
+    strs : numpy.ndarray
+
+    Returns
+    -------
+    escaped : list
+        Of :class:`str`.
+    """
+    escaped = []
+    for str_ in strs:
+        str_ = str(str_)
+        if "\n" in str_ or "\r" in str_:
+            raise ValueError(f"Cannot write text with a line break to a TextGrid: {str_!r}")
+        escaped.append(str_.replace('"', '""'))
+    return escaped
+
+
+def fill_gaps(
+    xmin: float, xmax: float, starts: npt.NDArray, ends: npt.NDArray, texts: npt.NDArray
+) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    """Fill gaps between intervals in an interval tier
+    with intervals whose text is the empty string.
+
+    Praat requires that the intervals in an interval tier
+    cover the whole tier, from its ``xmin`` to its ``xmax``.
+    Interval tiers loaded with ``keep_empty=False``
+    (the default) will have gaps where empty intervals were removed,
+    and this function puts them back before writing.
+
+    Parameters
+    ----------
+    xmin : float
+        Start time of interval tier, in seconds.
+    xmax : float
+        End time of interval tier, in seconds.
+    starts : numpy.ndarray
+        Start times of intervals, in seconds, sorted.
+    ends : numpy.ndarray
+        End times of intervals, in seconds.
+    texts : numpy.ndarray
+        Text of intervals.
+
+    Returns
+    -------
+    starts, ends, texts : numpy.ndarray
+        With empty intervals inserted into any gaps.
+    """
+    n_intervals = len(starts)
+    # gap ``i`` is the gap just before interval ``i``; gap ``n_intervals`` is after the last interval
+    gap_starts = np.concatenate(([xmin], ends))
+    gap_ends = np.concatenate((starts, [xmax]))
+
+    all_starts = np.empty(2 * n_intervals + 1, dtype=float)
+    all_starts[0::2] = gap_starts
+    all_starts[1::2] = starts
+    all_ends = np.empty(2 * n_intervals + 1, dtype=float)
+    all_ends[0::2] = gap_ends
+    all_ends[1::2] = ends
+    all_texts = np.empty(2 * n_intervals + 1, dtype=object)
+    all_texts[0::2] = ""
+    all_texts[1::2] = texts
+
+    keep = np.ones(2 * n_intervals + 1, dtype=bool)
+    keep[0::2] = gap_ends > gap_starts
+    return all_starts[keep], all_ends[keep], all_texts[keep]
+
+
+def tier_to_arrays(tier: IntervalTier | PointTier, fill: bool = True) -> tuple[str, list[npt.NDArray]]:
+    """Convert a tier to arrays, one for each value
+    that is written for an entry in the tier.
+
+    Parameters
+    ----------
+    tier : IntervalTier, PointTier
+    fill : bool
+        If True, fill gaps in an interval tier with empty intervals.
+        See :func:`~crowsetta.formats.seq.textgrid.write.fill_gaps`.
+        Default is True.
+
+    Returns
+    -------
+    tier_type : str
+        The class of the tier as written in a TextGrid, e.g. "IntervalTier".
+    arrays : list
+        A :class:`list` of :class:`numpy.ndarray`:
+        xmin, xmax and text for intervals, number and mark for points.
+    """
+    if isinstance(tier, IntervalTier):
+        starts = np.array([interval.xmin for interval in tier.intervals], dtype=float)
+        ends = np.array([interval.xmax for interval in tier.intervals], dtype=float)
+        texts = np.array([interval.text for interval in tier.intervals], dtype=object)
+        if fill:
+            starts, ends, texts = fill_gaps(tier.xmin, tier.xmax, starts, ends, texts)
+        return INTERVAL_TIER, [starts, ends, texts]
+    elif isinstance(tier, PointTier):
+        numbers = np.array([point.number for point in tier.points], dtype=float)
+        marks = np.array([point.mark for point in tier.points], dtype=object)
+        return POINT_TIER, [numbers, marks]
+    else:
+        raise TypeError(f"Tier must be an IntervalTier or a PointTier, but type was: {type(tier)}")
+
+
+def write_fp(fp: TextIO, tg: dict, short: bool = False, block_size: int = BLOCK_SIZE) -> None:
+    """Write a TextGrid to an open text stream.
+
+    Helper function called by
+    :func:`~crowsetta.formats.seq.textgrid.write.write`.
+
+    Parameters
+    ----------
+    fp : TextIO
+        Python text stream, opened for writing.
+    tg : dict
+        A TextGrid as a :class:`dict` with keys
+        'xmin', 'xmax', and 'tiers', like the one
+        returned by :func:`~crowsetta.formats.seq.textgrid.parse.parse`.
+    short : bool
+        If True, write the "short" text format.
+        Default is False, in which case the default ("long")
+        text format is written.
+    block_size : int
+        Number of entries in a tier that are formatted
+        and then written together. Default is 8192.
+    """
+    tiers = tg["tiers"]
+    fp.write(HEADER)
+    if short:
+        fp.write(SHORT_TG_TEMPLATE % (format_float(tg["xmin"]), format_float(tg["xmax"]), len(tiers)))
+    else:
+        fp.write(LONG_TG_TEMPLATE % (format_float(tg["xmin"]), format_float(tg["xmax"]), len(tiers)))
+
+    for tier_num, tier in enumerate(tiers, start=1):
+        tier_type, arrays = tier_to_arrays(tier)
+        n_entries = len(arrays[0])
+        name = tier.name.replace('"', '""')
+        tier_xmin, tier_xmax = format_float(tier.xmin), format_float(tier.xmax)
+        if short:
+            fp.write(SHORT_TIER_TEMPLATE % (tier_type, name, tier_xmin, tier_xmax, n_entries))
+            template = SHORT_INTERVAL_TEMPLATE if tier_type == INTERVAL_TIER else SHORT_POINT_TEMPLATE
+        else:
+            entries_name = "intervals" if tier_type == INTERVAL_TIER else "points"
+            fp.write(LONG_TIER_TEMPLATE % (tier_num, tier_type, name, tier_xmin, tier_xmax, entries_name, n_entries))
+            template = LONG_INTERVAL_TEMPLATE if tier_type == INTERVAL_TIER else LONG_POINT_TEMPLATE
+
+        for block_start in range(0, n_entries, block_size):
+            block_stop = min(block_start + block_size, n_entries)
+            # last array is always text or mark, the others are times
+            columns = [format_floats(array[block_start:block_stop]) for array in arrays[:-1]]
+            columns.append(escape_strs(arrays[-1][block_start:block_stop]))
+            if not short:
+                # the long format numbers each entry, starting from 1
+                columns.insert(0, range(block_start + 1, block_stop + 1))
+            fp.write("".join([template % row for row in zip(*columns)]))
+
+
+def write(tg: dict, textgrid_path: str | pathlib.Path, short: bool = False, encoding: str = "utf-8") -> None:
+    """Write a TextGrid file from a :class:`dict`.
+
+    This function is used by
+    :meth:`crowsetta.formats.seq.TextGrid.to_file`.
+    It is the inverse of
+    :func:`~crowsetta.formats.seq.textgrid.parse.parse`.
+
+    Parameters
+    ----------
+    tg : dict
+        A TextGrid as a :class:`dict` with keys
+        'xmin', 'xmax', and 'tiers'.
+    textgrid_path : str, pathlib.Path
+        The path where the TextGrid file should be saved.
+    short : bool
+        If True, write the "short" text format.
+        Default is False, in which case the default ("long")
+        text format is written.
+    encoding : str
+        Either 'utf-8' or 'utf-16', the two encodings
+        that Praat uses for text files. Default is 'utf-8'.
+    """
+    if encoding not in ("utf-8", "utf-16"):
+        raise ValueError(f"encoding must be one of {{'utf-8', 'utf-16'}} but was: {encoding}")
+    textgrid_path = pathlib.Path(textgrid_path)
+    with textgrid_path.open("w", encoding=encoding, newline="\n") as fp:
+        write_fp(fp, tg, short)
@@ -12,10 +12,11 @@ import attr
 import numpy as np
 import pandas as pd
 import pandera
-import soundfile
 from pandera.typing import Series
 
 import crowsetta
+from crowsetta.formats.adapters import ArrayAdapter, Column
+from crowsetta.formats.source import AnnotPathOrBuffer
 from crowsetta.typing import PathLike
 
 
@@ -74,6 +75,17 @@ class Timit:
 
     name: ClassVar[str] = "timit"
     ext: ClassVar[str] = (".phn", ".PHN", ".wrd", ".WRD")
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
+
+    ARRAY_ADAPTER: ClassVar[ArrayAdapter] = ArrayAdapter(
+        kind="seq",
+        columns=(
+            Column("begin_samples", "onsets_s", unit="samples"),
+            Column("end_samples", "offsets_s", unit="samples"),
+            Column("text", "labels"),
+        ),
+        notated_path="audio_path",
+    )
 
     begin_samples: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
     end_samples: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
@@ -82,19 +94,52 @@ class Timit:
     audio_path: Optional[pathlib.Path] = attr.field(default=None, converter=attr.converters.optional(pathlib.Path))
 
     @classmethod
-    def from_file(cls, annot_path: PathLike, audio_path: Optional[PathLike] = None) -> "Self":  # noqa: F821
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'timit' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format have three columns separated by spaces:
+        onset and offset in samples, and label.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        rows = file_head.rows()
+        if rows and all(len(row) == 3 and sniff.is_integer(row[0]) and sniff.is_integer(row[1]) for row in rows):
+            return sniff.LIKELY
+        return sniff.NOT
+
+    @classmethod
+    def from_file(
+        cls, annot_path: AnnotPathOrBuffer, audio_path: Optional[PathLike] = None, validate_ext: bool = True
+    ) -> "Self":  # noqa: F821
         """Load annotations from a TIMIT[1]_ transcription file.
 
         Parameters
         ----------
-        annot_path : str, pathlib.Path
+        annot_path : str, pathlib.Path, bytes, file object
             Path to a TIMIT transcription file,
-            with one of the extensions {'.phn', '.PHN', '.wrd', '.WRD'}.
+            with one of the extensions {'.phn', '.PHN', '.wrd', '.WRD'},
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
         audio_path : str, pathlib.Path
             Optional, defaults to ``annot_path`` with the extension
             changed to '.wav' or '.WAV'. Both extensions are checked
             and if either file exists, that one is used. Otherwise,
             defaults to '.wav' in lowercase.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has one of the extensions {'.phn', '.PHN', '.wrd', '.WRD'}.
+            Default is True.
+            Set to False to load a file with another extension.
 
         Examples
         --------
@@ -106,20 +151,39 @@ class Timit:
         Versions of the dataset exist with the extensions
         in capital letters. Some platforms may not have case-sensitive paths.
 
+        The file is parsed directly into :mod:`numpy` arrays
+        with the functions in :mod:`crowsetta.formats.delimited`.
+        Only if that fails is it loaded with :mod:`pandas`
+        and validated with
+        :class:`~crowsetta.formats.seq.timit.TimitTranscriptSchema`,
+        so that invalid files raise the same errors.
+
         References
         ----------
         .. [1] Garofolo, John S., et al. TIMIT Acoustic-Phonetic Continuous Speech Corpus LDC93S1.
            Web Download. Philadelphia: Linguistic Data Consortium, 1993.
         """
-        annot_path = pathlib.Path(annot_path)
+        source = crowsetta.formats.source.as_source(annot_path)
+        annot_path = source.path
         # note multiple extensions, both all-uppercase and all-lowercase `.phn` exist,
         # depending on which version of TIMIT dataset you have
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
 
         #  assume file is space-separated with no header
-        df = pd.read_csv(annot_path, sep=" ", header=None)
-        df.columns = ["begin_sample", "end_sample", "text"]
-        df = TimitTranscriptSchema.validate(df)
+        try:
+            _, (begin_samples, end_samples, text) = crowsetta.formats.delimited.read_columns(
+                source, delimiter=" ", n_columns=3
+            )
+            begin_samples = crowsetta.formats.delimited.to_int_array(begin_samples)
+            end_samples = crowsetta.formats.delimited.to_int_array(end_samples)
+            text = crowsetta.formats.delimited.to_str_array(text)
+        except ValueError:
+            # fall back to pandas, so that invalid files raise the same errors as validation does
+            df = pd.read_csv(crowsetta.formats.source.path_or_buffer(source), sep=" ", header=None)
+            df.columns = ["begin_sample", "end_sample", "text"]
+            df = TimitTranscriptSchema.validate(df)
+            begin_samples, end_samples, text = df["begin_sample"].values, df["end_sample"].values, df["text"].values
 
         if audio_path is None:
             for ext in (".wav", ".WAV"):
@@ -132,9 +196,9 @@ class Timit:
 
         return cls(
             annot_path=annot_path,
-            begin_samples=df["begin_sample"].values,
-            end_samples=df["end_sample"].values,
-            text=df["text"].values,
+            begin_samples=begin_samples,
+            end_samples=end_samples,
+            text=text,
             audio_path=audio_path,
         )
 
@@ -186,8 +250,8 @@ class Timit:
 
         if samplerate is None:
             try:
-                samplerate = soundfile.info(self.audio_path).samplerate
-            except RuntimeError:
+                samplerate = crowsetta.audioinfo.info(self.audio_path).samplerate
+            except (OSError, RuntimeError):
                 warnings.warn(
                     f"wav file not found: {self.audio_path}."
                     f"Could not determine sampling rate to convert onsets and offsets to seconds. "
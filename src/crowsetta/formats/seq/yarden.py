@@ -4,14 +4,17 @@ https://github.com/yardencsGitHub/BirdSongBout/tree/master/helpers/GUI
 """
 import os
 import pathlib
-from typing import ClassVar, List
+from typing import ClassVar, Dict, List, Optional, Sequence, Tuple, Union
 
 import attr
 import numpy as np
 import scipy.io
 
 import crowsetta
-from crowsetta.typing import PathLike
+from crowsetta.formats.source import AnnotPathOrBuffer
+from crowsetta.sequence import _sequence_from_arrays
+
+from . import matv73
 
 
 def _cast_to_arr(val):
@@ -28,6 +31,76 @@ def _cast_to_arr(val):
         raise TypeError(f"Type {type(val)} not recognized when converting annotations to arrays.")
 
 
+def _get_field(annotation, field: str):
+    """helper function that gets the value of a field from an annotation record"""
+    val = annotation[field]
+    if isinstance(val, np.ndarray) and val.ndim == 0:
+        # below, .tolist() does not actually create a list,
+        # instead gets ndarray out of a zero-length ndarray of dtype=object.
+        # This is just weirdness that results from loading complicated data
+        # structure in .mat file.
+        return val.tolist()
+    return val
+
+
+def annotations_to_arrays(
+    annotations: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Convert records from the ``elements`` struct array
+    in a .mat file created by SongAnnotationGUI
+    into flat arrays, where the segments from all songs
+    are concatenated.
+
+    Conversion of onset and offset times from seconds to samples
+    is done for all segments in a single pass with :mod:`numpy`.
+
+    Parameters
+    ----------
+    annotations : numpy.ndarray, list
+        A :mod:`numpy` record array where each record is an annotation,
+        e.g., :attr:`SongAnnotationGUI.annotations` or a subset of it,
+        or a :class:`list` of records read from a MATLAB v7.3 file.
+
+    Returns
+    -------
+    onsets_s : numpy.ndarray
+        Onset times of all segments, in seconds.
+    offsets_s : numpy.ndarray
+        Offset times of all segments, in seconds.
+    onset_samples : numpy.ndarray
+        Onset times of all segments, in samples.
+    offset_samples : numpy.ndarray
+        Offset times of all segments, in samples.
+    labels : numpy.ndarray
+        Labels of all segments, as strings.
+    bounds : numpy.ndarray
+        Indices into the other arrays where the segments
+        for each record start and stop, of length ``len(annotations) + 1``.
+        Segments for record ``i`` are ``bounds[i]:bounds[i + 1]``.
+    """
+    onsets_s = [_cast_to_arr(_get_field(annotation, "segFileStartTimes")) for annotation in annotations]
+    offsets_s = [_cast_to_arr(_get_field(annotation, "segFileEndTimes")) for annotation in annotations]
+    # convert labels to string one record at a time, so that integer labels
+    # are not cast to float by concatenating them with float labels from another record
+    labels = [_cast_to_arr(_get_field(annotation, "segType")).astype(str) for annotation in annotations]
+    samp_freqs = np.array([_get_field(annotation, "fs") for annotation in annotations], dtype=float)
+
+    lengths = np.array([len(onsets_s_) for onsets_s_ in onsets_s], dtype=int)
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    if len(annotations) > 0:
+        onsets_s = np.concatenate(onsets_s).astype(float)
+        offsets_s = np.concatenate(offsets_s).astype(float)
+        labels = np.concatenate(labels)
+    else:
+        onsets_s, offsets_s, labels = np.array([], dtype=float), np.array([], dtype=float), np.array([], dtype=str)
+
+    # one sampling rate for every segment, then convert all at once
+    seg_samp_freqs = np.repeat(samp_freqs, lengths)
+    onset_samples = np.round(onsets_s * seg_samp_freqs).astype(int)
+    offset_samples = np.round(offsets_s * seg_samp_freqs).astype(int)
+    return onsets_s, offsets_s, onset_samples, offset_samples, labels, bounds
+
+
 VALID_AUDIO_FORMATS = ["wav"]
 
 
@@ -67,51 +140,143 @@ class SongAnnotationGUI:
         Shorthand name for annotation format: ``'yarden'``.
     ext: str
         Extension of files in annotation format: ``'.mat'``.
-    annotations : numpy.ndarray
+    annotations : numpy.ndarray, crowsetta.formats.seq.matv73.CellArray
         A :mod:`numpy` record array where each record is an annotation.
-    audio_paths : numpy.ndarray
+        For MATLAB v7.3 files, a lazy array whose records are read
+        from the file only when they are accessed, either a
+        :class:`~crowsetta.formats.seq.matv73.CellArray` or a
+        :class:`~crowsetta.formats.seq.matv73.StructArray`.
+    audio_paths : numpy.ndarray, crowsetta.formats.seq.matv73.CellArray
         A :mod:`numpy` array where each element is a path to an audio file.
+        For MATLAB v7.3 files, a lazy
+        :class:`~crowsetta.formats.seq.matv73.CellArray`.
         Same length as ``annotations``. Each element in ``annotations``
         is the annotation for the corresponding path in ``audio_paths``.
     annot_path : str, pathlib.Path
         Path to mat file from which annotations were loaded.
+
+    Notes
+    -----
+    Annotations are decoded lazily: :meth:`SongAnnotationGUI.to_seq`
+    and :meth:`SongAnnotationGUI.to_annot` accept an ``indices``
+    argument, so that only the songs that are needed
+    are converted. The arrays of each song are cached after it is decoded,
+    so converting the same song again does not decode it again.
     """
 
     name: ClassVar[str] = "yarden"
     ext: ClassVar[str] = ".mat"
+    ACCEPTS_BUFFERS: ClassVar[bool] = True
 
     annotations: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
     audio_paths: np.ndarray = attr.field(eq=attr.cmp_using(eq=np.array_equal))
     annot_path: pathlib.Path = attr.field(converter=pathlib.Path)
+    # arrays of each decoded song, that are copied to make a new Sequence every time it is converted
+    _seqs: Dict[Tuple[int, bool, Optional[int]], Tuple[np.ndarray, ...]] = attr.field(
+        factory=dict, init=False, eq=False, repr=False
+    )
 
     @classmethod
-    def from_file(cls, annot_path: PathLike) -> "Self":  # noqa: F821
+    def sniff(cls, file_head: "crowsetta.formats.sniff.FileHead") -> float:
+        """Get confidence that a file is in the 'yarden' format,
+        used by :func:`crowsetta.formats.detect`.
+
+        Files in this format are .mat files with the variables
+        ``keys`` and ``elements``.
+
+        Parameters
+        ----------
+        file_head : crowsetta.formats.sniff.FileHead
+            The start of the file.
+
+        Returns
+        -------
+        confidence : float
+            Between 0. and 1.
+        """
+        sniff = crowsetta.formats.sniff
+        mat_variables = file_head.mat_variables
+        if mat_variables is not None and all(var in mat_variables for var in ("keys", "elements")):
+            return sniff.CERTAIN
+        return sniff.NOT
+
+    @classmethod
+    def from_file(cls, annot_path: AnnotPathOrBuffer, validate_ext: bool = True) -> "Self":  # noqa: F821
         """Load annotations from mat files
         created by SongAnnotationGUI:
         https://github.com/yardencsGitHub/BirdSongBout/tree/master/helpers/GUI
 
         Parameters
         ----------
-        annot_path: str, pathlib.Path
-            Path to .mat file with annotations.
+        annot_path: str, pathlib.Path, bytes, file object
+            Path to .mat file with annotations,
+            or the bytes or a file object of the file,
+            see :mod:`crowsetta.formats.source`.
+        validate_ext : bool
+            If True, check that the name of ``annot_path``
+            has the extension '.mat'. Default is True.
+            Set to False to load a file with another extension.
+
+        Notes
+        -----
+        MATLAB v7.3 .mat files, that are HDF5 files, can be loaded
+        if the optional dependency :mod:`h5py` is installed,
+        e.g. with ``pip install crowsetta[mat73]``.
+        The file is kept open without reading any variables;
+        each filename and annotation is read when it is converted
+        with :meth:`~SongAnnotationGUI.to_seq` or :meth:`~SongAnnotationGUI.to_annot`.
+        The file stays open as long as the instance, or the lazy arrays
+        in its ``annotations`` and ``audio_paths`` attributes, are used.
+        When an instance is pickled, e.g. to send it from a worker process
+        or to save it in a :class:`~crowsetta.parsecache.ParseCache`,
+        all filenames and annotations are read, and pickled as :mod:`numpy` arrays.
+        See :mod:`crowsetta.formats.seq.matv73`.
         """
-        annot_path = pathlib.Path(annot_path)
-        crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
+        source = crowsetta.formats.source.as_source(annot_path)
+        annot_path = source.path
+        if validate_ext and source.has_name:
+            crowsetta.validation.validate_ext(annot_path, extension=cls.ext)
 
         # annotation structure loads as a Python dictionary with two keys
         # one maps to a list of filenames,
         # and the other to a Numpy record array,
         # where each element is the annotation
         # corresponding to the filename at the same index in the list.
-        annot_mat = scipy.io.loadmat(annot_path, squeeze_me=True)
-        audio_paths = annot_mat["keys"]
-        annotations = annot_mat["elements"]
+        if matv73.is_matv73(source):
+            # for MATLAB v7.3 files, nothing is read now;
+            # each filename and annotation is read from the file when it is accessed,
+            # so copy the bytes of a file object, that could be closed before then
+            annot_file = matv73.open_file(source.in_memory())
+            audio_paths = matv73.read(annot_file["keys"])
+            annotations = matv73.read(annot_file["elements"])
+        else:
+            annot_mat = scipy.io.loadmat(crowsetta.formats.source.path_or_buffer(source), squeeze_me=True)
+            audio_paths = annot_mat["keys"]
+            annotations = annot_mat["elements"]
         if len(audio_paths) != len(annotations):
             raise ValueError(f"list of filenames and list of annotations in {annot_path} do not have the same length")
 
         return cls(annotations=annotations, audio_paths=audio_paths, annot_path=annot_path)
 
-    def to_seq(self, round_times: bool = True, decimals: int = 3) -> List[crowsetta.Sequence]:
+    def _to_indices(self, indices: Optional[Union[int, Sequence[int], slice]]) -> List[int]:
+        """Convert ``indices`` argument of :meth:`to_seq` and :meth:`to_annot`
+        to a :class:`list` of non-negative :class:`int`"""
+        all_indices = np.arange(len(self.annotations))
+        if indices is None:
+            return all_indices.tolist()
+        if isinstance(indices, slice):
+            return all_indices[indices].tolist()
+        indices = np.atleast_1d(np.asarray(indices))
+        if not np.issubdtype(indices.dtype, np.integer):
+            raise TypeError(f"indices must be integers or a slice, but dtype was: {indices.dtype}")
+        return all_indices[indices].tolist()
+
+    def to_seq(
+        self,
+        round_times: bool = True,
+        decimals: int = 3,
+        indices: Optional[Union[int, Sequence[int], slice]] = None,
+    ) -> List[crowsetta.Sequence]:
         """Convert this set of annotations to a :class:`list` of
         :class:`crowsetta.Sequence` instances.
 
@@ -127,12 +292,16 @@ class SongAnnotationGUI:
             Number of decimals places to round floating point numbers to.
             Only meaningful if round_times is True.
             Default is 3, so that times are rounded to milliseconds.
+        indices : int, list, slice, optional
+            Indices of songs in ``annotations`` to convert.
+            Default is None, in which case all songs are converted.
 
         Returns
         -------
         seqs : list
             A :class:`list` of :class:`~crowsetta.Sequence` instances,
-            one for each element in ``annotations``.
+            one for each element in ``annotations``,
+            or for each element in ``indices`` if specified.
 
         Notes
         -----
@@ -141,36 +310,55 @@ class SongAnnotationGUI:
         due to floating point error, e.g. when loading annotation files
         and then sending them to a csv file,
         the result should be the same on Windows and Linux.
-        """
-        seqs = []
-        for annotation in self.annotations:
-            # below, .tolist() does not actually create a list,
-            # instead gets ndarray out of a zero-length ndarray of dtype=object.
-            # This is just weirdness that results from loading complicated data
-            # structure in .mat file.
-            seq_dict = {}
-            seq_dict["onsets_s"] = annotation["segFileStartTimes"].tolist()
-            seq_dict["offsets_s"] = annotation["segFileEndTimes"].tolist()
-            seq_dict["labels"] = annotation["segType"].tolist()
-            # cast all to numpy arrays
-            seq_dict = dict((k, _cast_to_arr(seq_dict[k])) for k in ["onsets_s", "offsets_s", "labels"])
-            # after casting 'labels' to array, convert all values to string
-            seq_dict["labels"] = np.asarray([str(label) for label in seq_dict["labels"]])
-
-            samp_freq = annotation["fs"].tolist()
-            seq_dict["onset_samples"] = np.round(seq_dict["onsets_s"] * samp_freq).astype(int)
-            seq_dict["offset_samples"] = np.round(seq_dict["offsets_s"] * samp_freq).astype(int)
 
+        Only the songs that have not already been converted
+        with the same ``round_times`` and ``decimals``
+        are decoded, all at once,
+        by :func:`~crowsetta.formats.seq.yarden.annotations_to_arrays`.
+        The arrays of the other songs are cached, and each call
+        returns new :class:`~crowsetta.Sequence` instances made from copies of them,
+        without validating them again, so that changing
+        a :class:`~crowsetta.Sequence` that was returned does not change the cache.
+        """
+        indices = self._to_indices(indices)
+        cache_decimals = decimals if round_times else None
+        to_decode = sorted({ind for ind in indices if (ind, round_times, cache_decimals) not in self._seqs})
+
+        if to_decode:
+            onsets_s, offsets_s, onset_samples, offset_samples, labels, bounds = annotations_to_arrays(
+                self.annotations[to_decode]
+            )
             if round_times:
-                seq_dict["onsets_s"] = np.around(seq_dict["onsets_s"], decimals=decimals)
-                seq_dict["offsets_s"] = np.around(seq_dict["offsets_s"], decimals=decimals)
-
-            seq = crowsetta.Sequence.from_dict(seq_dict)
-            seqs.append(seq)
-
-        return seqs
-
-    def to_annot(self, round_times: bool = True, decimals: int = 3) -> List[crowsetta.Annotation]:
+                onsets_s = np.around(onsets_s, decimals=decimals)
+                offsets_s = np.around(offsets_s, decimals=decimals)
+            for ind, start, stop in zip(to_decode, bounds[:-1].tolist(), bounds[1:].tolist()):
+                # validate the arrays once, by making a Sequence from them
+                seq = crowsetta.Sequence.from_keyword(
+                    labels=labels[start:stop],
+                    onsets_s=onsets_s[start:stop],
+                    offsets_s=offsets_s[start:stop],
+                    onset_samples=onset_samples[start:stop],
+                    offset_samples=offset_samples[start:stop],
+                )
+                self._seqs[(ind, round_times, cache_decimals)] = (
+                    seq.labels,
+                    seq.onsets_s,
+                    seq.offsets_s,
+                    seq.onset_samples,
+                    seq.offset_samples,
+                )
+
+        return [
+            _sequence_from_arrays(*(array.copy() for array in self._seqs[(ind, round_times, cache_decimals)]))
+            for ind in indices
+        ]
+
+    def to_annot(
+        self,
+        round_times: bool = True,
+        decimals: int = 3,
+        indices: Optional[Union[int, Sequence[int], slice]] = None,
+    ) -> List[crowsetta.Annotation]:
         """Convert this annotation to a :class:`crowsetta.Annotation`.
 
         Parameters
@@ -182,6 +370,9 @@ class SongAnnotationGUI:
             Number of decimals places to round floating point numbers to.
             Only meaningful if round_times is True.
             Default is 3, so that times are rounded to milliseconds.
+        indices : int, list, slice, optional
+            Indices of songs in ``annotations`` to convert.
+            Default is None, in which case all songs are converted.
 
         Returns
         -------
@@ -196,8 +387,9 @@ class SongAnnotationGUI:
         and then sending them to a csv file,
         the result should be the same on Windows and Linux.
         """
-        seqs = self.to_seq(round_times=round_times, decimals=decimals)
+        indices = self._to_indices(indices)
+        seqs = self.to_seq(round_times=round_times, decimals=decimals, indices=indices)
         annots = []
-        for audio_path, seq in zip(self.audio_paths, seqs):
+        for audio_path, seq in zip(self.audio_paths[indices], seqs):
             annots.append(crowsetta.Annotation(annot_path=self.annot_path, notated_path=audio_path, seq=seq))
         return annots
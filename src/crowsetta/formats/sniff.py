@@ -0,0 +1,177 @@
+"""Module with functions and classes for detecting
+the format of an annotation file from its content.
+
+Several formats share file extensions:
+:class:`~crowsetta.formats.seq.AudSeq`, :class:`~crowsetta.formats.bbox.AudBBox`,
+and :class:`~crowsetta.formats.bbox.Raven` are all '.txt' files,
+and :class:`~crowsetta.formats.seq.NotMat` and :class:`~crowsetta.formats.seq.SongAnnotationGUI`
+are both '.mat' files.
+To tell them apart without trying to load a file with every format,
+:func:`crowsetta.formats.detect` reads only the first few hundred bytes
+of the file, or for a .mat file the names of the variables it contains,
+into a :class:`~crowsetta.formats.sniff.FileHead`.
+Then each format whose extension matches the file
+"sniffs" the :class:`~crowsetta.formats.sniff.FileHead`,
+by returning a confidence between 0. and 1.
+that the file is in that format.
+
+Formats take part in detection by defining a class method ``sniff``
+that accepts a :class:`~crowsetta.formats.sniff.FileHead`
+and returns a :class:`float`.
+A format registered with :func:`crowsetta.formats.register_format`
+that defines this method can be detected just like the built-in formats.
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import functools
+import re
+from typing import FrozenSet, List, Optional
+
+from .source import AnnotPathOrBuffer, as_source, path_or_buffer
+
+# number of bytes read from the start of a file
+SNIFF_SIZE = 512
+
+# confidences that sniffers return, from most to least certain
+CERTAIN = 1.0
+LIKELY = 0.8
+POSSIBLE = 0.2
+NOT = 0.0
+
+_NUMBER = re.compile(r"[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?")
+_INTEGER = re.compile(r"[-+]?\d+")
+
+
+def is_number(value: str) -> bool:
+    """Determine whether a string is a decimal number, like '0.5' or '1e-3'"""
+    return _NUMBER.fullmatch(value.strip()) is not None
+
+
+def is_integer(value: str) -> bool:
+    """Determine whether a string is an integer, like '8529'"""
+    return _INTEGER.fullmatch(value.strip()) is not None
+
+
+def _decode(head: bytes) -> Optional[str]:
+    """Decode the start of a file as text,
+    or return None if it is not text"""
+    for bom, encoding in ((codecs.BOM_UTF16_LE, "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16-be")):
+        if head.startswith(bom):
+            # the last character may be cut off, so we ignore errors
+            return head[len(bom):].decode(encoding, errors="ignore")
+    if b"\x00" in head:
+        return None
+    try:
+        # the last character may be cut off in the middle of a multi-byte sequence
+        return head.decode("utf-8-sig", errors="strict")
+    except UnicodeDecodeError as e:
+        if e.start < len(head) - 3:
+            return None
+        return head[: e.start].decode("utf-8-sig")
+
+
+class FileHead:
+    """The start of a file, used to detect the format of the file.
+
+    Formats detect whether a file is in that format
+    with a class method ``sniff`` that accepts a :class:`FileHead`.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path, file object
+        Path to the file, or the bytes or a file object of the file,
+        see :mod:`crowsetta.formats.source`.
+    sniff_size : int
+        Number of bytes read from the start of the file.
+
+    Attributes
+    ----------
+    annot_path : pathlib.Path
+        Path to the file.
+    has_name : bool
+        False for bytes and file objects without a name,
+        whose extension is unknown.
+    head : bytes
+        Up to the first ``SNIFF_SIZE`` bytes of the file.
+    truncated : bool
+        True if the file is longer than ``head``.
+    """
+
+    def __init__(self, annot_path: AnnotPathOrBuffer, sniff_size: int = SNIFF_SIZE):
+        self._source = as_source(annot_path)
+        self.annot_path = self._source.path
+        self.has_name = self._source.has_name
+        with self._source.open_binary() as fp:
+            # read one more byte, to know if the file is longer
+            head = fp.read(sniff_size + 1)
+        self.truncated = len(head) > sniff_size
+        self.head = head[:sniff_size]
+
+    def __repr__(self):
+        return f"crowsetta.formats.sniff.FileHead(annot_path={self.annot_path!r}, truncated={self.truncated})"
+
+    @functools.cached_property
+    def text(self) -> Optional[str]:
+        """The start of the file decoded as text,
+        or None if the file is not text.
+        UTF-8 and UTF-16 with a byte order mark are recognized."""
+        return _decode(self.head)
+
+    @functools.cached_property
+    def lines(self) -> List[str]:
+        """Lines of text in the start of the file that are not blank,
+        without the last line if it may be cut off.
+        Empty if the file is not text."""
+        if self.text is None:
+            return []
+        lines = self.text.splitlines()
+        if self.truncated and lines:
+            lines = lines[:-1]
+        return [line for line in lines if line.strip()]
+
+    @functools.cached_property
+    def mat_variables(self) -> Optional[FrozenSet[str]]:
+        """Names of variables in a .mat file,
+        or None if the file is not a .mat file.
+
+        Only the headers of variables are read,
+        with :func:`scipy.io.whosmat`.
+        For MATLAB v7.3 files, that are HDF5 files,
+        the names are read with :mod:`h5py` if it is installed,
+        and otherwise this is None.
+        """
+        import scipy.io
+
+        from .seq import matv73
+
+        try:
+            if matv73.is_matv73(self._source):
+                try:
+                    with matv73.open_file(self._source) as mat_file:
+                        return frozenset(mat_file.keys())
+                except ImportError:
+                    return None
+            return frozenset(name for name, _, _ in scipy.io.whosmat(path_or_buffer(self._source)))
+        except (OSError, ValueError, TypeError, IndexError, NotImplementedError):
+            return None
+
+    def rows(self, delimiter: Optional[str] = None) -> List[List[str]]:
+        """Split :attr:`lines` into fields.
+
+        Parameters
+        ----------
+        delimiter : str, optional
+            Delimiter between fields. If specified, lines are split
+            with :func:`csv.reader`, so fields can be quoted.
+            Default is None, in which case fields are separated by any whitespace.
+
+        Returns
+        -------
+        rows : list
+            Of :class:`list` of :class:`str`, one for each line.
+        """
+        if delimiter is None:
+            return [line.split() for line in self.lines]
+        return list(csv.reader(self.lines, delimiter=delimiter))
@@ -0,0 +1,221 @@
+"""Module with a class that represents the source of an annotation file,
+either a path, bytes, or a file object that was already opened,
+so that format classes can load annotations from in-memory buffers,
+e.g. bytes that were read ahead of time by
+:meth:`crowsetta.Transcriber.iter_from_files`,
+without writing them to a temporary file.
+
+Format classes whose ``from_file`` method accepts bytes and file objects
+as well as paths declare it with a class variable
+``ACCEPTS_BUFFERS = True``. Files in other formats,
+e.g. formats registered with :func:`crowsetta.formats.register_format`
+that only accept paths, are always loaded from their paths.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import pathlib
+from typing import BinaryIO, Iterator, Optional, TextIO, Union
+
+from .. import archive
+from ..typing import PathLike
+
+AnnotPathOrBuffer = Union[
+    PathLike, bytes, bytearray, memoryview, BinaryIO, TextIO, archive.ArchiveMember, "AnnotSource"
+]
+
+BYTES_TYPES = (bytes, bytearray, memoryview)
+
+# name of bytes and file objects that have no name;
+# the extension of a source with this name is not validated
+UNNAMED = "<unnamed>"
+
+
+class AnnotSource:
+    """The source of an annotation file:
+    either a path, bytes, or a file object, like :class:`io.BytesIO`.
+
+    Format classes use this class to read from any kind of source
+    in the same way. Every source has a name, the path of the file,
+    that is used to validate its extension and as the ``annot_path``
+    of the loaded annotations. For file objects, this is their ``name``
+    attribute, unless ``name`` is specified. Bytes and file objects
+    without a name are given the placeholder name ``"<unnamed>"``,
+    and their extension is not validated.
+
+    Bytes, :class:`bytearray` and :class:`memoryview` objects
+    are wrapped in a :class:`io.BytesIO`. Text file objects are read
+    into memory and encoded as UTF-8, and so are binary file objects
+    that are not seekable. Members of archives are read into memory,
+    and so are files compressed with gzip, bzip2 or xz,
+    that are decompressed, see :mod:`crowsetta.archive`.
+    Each time a file object is opened with
+    :meth:`~crowsetta.formats.source.AnnotSource.open_binary` or
+    :meth:`~crowsetta.formats.source.AnnotSource.open_text`,
+    it is read from the position it was at when this instance was made,
+    so a file can be read more than once, e.g. by a parser
+    that falls back to :mod:`pandas` when a faster parser fails.
+
+    Parameters
+    ----------
+    annot_path : str, pathlib.Path, bytes, memoryview, file object, crowsetta.archive.ArchiveMember
+        Path to an annotation file, the bytes of a file,
+        a binary or text file object, or a member of an archive.
+    name : str, pathlib.Path, optional
+        Name of the file, e.g. the name of a member of an archive
+        that the bytes were read from. Without a name, the extension
+        of bytes, and of file objects without a ``name`` attribute,
+        cannot be validated, and they cannot be decompressed.
+        Cannot be specified for a path.
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        Path to the annotation file, or the name of the bytes or file object,
+        without the extension of a compressed file.
+    buffer : file object, None
+        The binary file object, or None if the source is a path.
+    has_name : bool
+        False if the source is bytes or a file object without a name,
+        in which case ``path`` is the placeholder ``"<unnamed>"``.
+
+    Examples
+    --------
+    >>> with zipfile.ZipFile('annotations.zip') as zip_file:  # doctest: +SKIP
+    ...     data = zip_file.read('bird1.TextGrid')
+    >>> source = crowsetta.formats.source.AnnotSource(data, name='bird1.TextGrid')  # doctest: +SKIP
+    >>> textgrid = crowsetta.formats.seq.TextGrid.from_file(source)  # doctest: +SKIP
+    """
+
+    def __init__(self, annot_path: AnnotPathOrBuffer, name: Optional[PathLike] = None):
+        if isinstance(annot_path, AnnotSource):
+            self.path, self.buffer, self._start = annot_path.path, annot_path.buffer, annot_path._start
+            self.has_name = annot_path.has_name
+            if name is not None:
+                self.path, self.has_name = pathlib.Path(os.fsdecode(name)), True
+            return
+        if isinstance(annot_path, archive.ArchiveMember):
+            if name is None:
+                name = annot_path.path
+            annot_path = archive.read_member(annot_path)
+        elif isinstance(annot_path, (str, os.PathLike)):
+            if name is not None:
+                raise ValueError(f"``name`` can only be specified for bytes or a file object, not a path: {annot_path}")
+            if archive.compression(annot_path) is None:
+                self.path, self.buffer, self._start = pathlib.Path(annot_path), None, 0
+                self.has_name = True
+                return
+            # a compressed file is decompressed into memory, below
+            name = annot_path
+            with open(annot_path, "rb") as fp:
+                annot_path = fp.read()
+
+        if isinstance(annot_path, BYTES_TYPES):
+            buffer = io.BytesIO(annot_path)
+        elif hasattr(annot_path, "read"):
+            if name is None:
+                name = getattr(annot_path, "name", None)
+            buffer = annot_path
+            if isinstance(buffer, io.TextIOBase):
+                buffer = io.BytesIO(buffer.read().encode("utf-8"))
+            elif not (hasattr(buffer, "seekable") and buffer.seekable()):
+                data = buffer.read()
+                buffer = io.BytesIO(data.encode("utf-8") if isinstance(data, str) else data)
+        else:
+            raise TypeError(
+                "Source of annotations must be a path, bytes, or a file object, "
+                f"but type was {type(annot_path)}: {annot_path!r}"
+            )
+        self.has_name = isinstance(name, (str, bytes, os.PathLike))
+        if not self.has_name:
+            # e.g. bytes, or a file object whose ``name`` is a file descriptor
+            name = UNNAMED
+        elif archive.compression(name) is not None:
+            data, name = archive.decompress(buffer.read(), name)
+            buffer = io.BytesIO(data)
+        self.path = pathlib.Path(os.fsdecode(name))
+        self.buffer = buffer
+        self._start = buffer.tell()
+
+    def __repr__(self):
+        kind = "path" if self.buffer is None else "buffer"
+        return f"{type(self).__name__}({kind}={str(self.path)!r})"
+
+    @property
+    def is_path(self) -> bool:
+        """True if the source is a path, that format classes can open themselves"""
+        return self.buffer is None
+
+    @contextlib.contextmanager
+    def open_binary(self) -> Iterator[BinaryIO]:
+        """Open the source to read bytes.
+
+        The file is closed afterwards if the source is a path.
+        A file object is not closed.
+        """
+        if self.buffer is None:
+            with open(self.path, "rb") as fp:
+                yield fp
+        else:
+            self.buffer.seek(self._start)
+            yield self.buffer
+
+    @contextlib.contextmanager
+    def open_text(self, encoding: str = "utf-8", newline: Optional[str] = None) -> Iterator[TextIO]:
+        """Open the source to read text, with the same arguments as :func:`open`."""
+        if self.buffer is None:
+            with open(self.path, "r", encoding=encoding, newline=newline) as fp:
+                yield fp
+        else:
+            self.buffer.seek(self._start)
+            fp = io.TextIOWrapper(self.buffer, encoding=encoding, newline=newline)
+            try:
+                yield fp
+            finally:
+                # don't close the buffer when the wrapper is garbage collected
+                fp.detach()
+
+    def read_bytes(self) -> bytes:
+        """Read all the bytes of the source."""
+        with self.open_binary() as fp:
+            return fp.read()
+
+    def in_memory(self) -> "AnnotSource":
+        """Get a source that can still be read after a file object is closed.
+
+        Returns this instance if the source is a path.
+        Otherwise, the bytes of the file object are read
+        into a new :class:`io.BytesIO`. For bytes, and an :class:`io.BytesIO`
+        made from bytes that was not written to, CPython returns the same bytes
+        when they are read, without copying them.
+        """
+        if self.buffer is None:
+            return self
+        return AnnotSource(self.read_bytes(), name=self.path if self.has_name else None)
+
+
+def as_source(annot_path: AnnotPathOrBuffer) -> AnnotSource:
+    """Get an :class:`~crowsetta.formats.source.AnnotSource`
+    for a path, bytes, or file object, or return it unchanged if it already is one."""
+    if isinstance(annot_path, AnnotSource):
+        return annot_path
+    return AnnotSource(annot_path)
+
+
+def accepts_buffers(format_class) -> bool:
+    """Determine whether the ``from_file`` method of a format class
+    accepts a binary file object, as well as a path"""
+    return getattr(format_class, "ACCEPTS_BUFFERS", False)
+
+
+def path_or_buffer(annot_path: AnnotPathOrBuffer) -> Union[pathlib.Path, BinaryIO]:
+    """Get a path, or a binary file object positioned at the start of the source,
+    to pass to functions that accept either, like :func:`pandas.read_csv`
+    or :func:`scipy.io.loadmat`."""
+    source = as_source(annot_path)
+    if source.buffer is None:
+        return source.path
+    source.buffer.seek(source._start)
+    return source.buffer
@@ -0,0 +1,241 @@
+"""Module with lazy annotations, :class:`~crowsetta.lazy.LazyAnnotation`,
+that only parse their annotation file when the annotations are first used.
+
+Enumerating a corpus of annotation files, e.g. to count files,
+or to find the files that annotate some audio files,
+should not require parsing every file.
+A :class:`~crowsetta.lazy.LazyAnnotation` records the path to a file,
+its format, and the arguments used to load it,
+and has metadata about the file that is cheap to get, its size and modification time,
+without parsing it. The file is parsed the first time
+the ``seq`` or ``bboxes`` attribute is accessed,
+or the ``notated_path`` attribute, if it was not specified,
+and the loaded :class:`crowsetta.Annotation` is kept,
+so each file is only parsed once.
+
+Lazy annotations are made for many files at once with
+:meth:`crowsetta.Transcriber.lazy_from_files`.
+After filtering them, the files that are left can be parsed concurrently
+with :func:`crowsetta.lazy.load`, instead of one at a time
+when each lazy annotation is first used.
+
+Examples
+--------
+>>> scribe = crowsetta.Transcriber(format='notmat')
+>>> lazy_annots = scribe.lazy_from_files(notmat_paths)  # doctest: +SKIP
+>>> recent = [lazy_annot for lazy_annot in lazy_annots if lazy_annot.mtime > cutoff]  # doctest: +SKIP
+>>> crowsetta.lazy.load(recent, workers=8)  # doctest: +SKIP
+>>> seqs = [lazy_annot.seq for lazy_annot in recent]  # doctest: +SKIP
+"""
+from __future__ import annotations
+
+import functools
+import os
+import pathlib
+from typing import Iterable, List, Optional, Union
+
+from .annotation import Annotation
+from .transcriber import Transcriber
+from .typing import PathLike
+
+# attributes that are only available after the file is parsed
+_LOADED_ATTRS = ("seq", "bboxes")
+
+
+class LazyAnnotation(Annotation):
+    """An annotation for a single file, that is only parsed
+    when its annotations are first used.
+
+    A :class:`~crowsetta.lazy.LazyAnnotation` can be used
+    anywhere a :class:`crowsetta.Annotation` is used.
+    The file is parsed the first time that the ``seq`` or ``bboxes`` attribute
+    is accessed, or ``notated_path`` if it was not specified,
+    including when two annotations are compared,
+    and the loaded :class:`crowsetta.Annotation` is kept.
+
+    Attributes
+    ----------
+    annot_path : pathlib.Path
+        Path to the annotation file.
+    scribe : crowsetta.Transcriber
+        Used to load the file, with ``convert='to_annot'``.
+    args : tuple
+        Positional arguments passed to the ``from_file`` method of the format.
+    kwargs : dict
+        Keyword arguments passed to the ``from_file`` method of the format.
+
+    Examples
+    --------
+    >>> lazy_annot = crowsetta.LazyAnnotation('bird1.TextGrid', format='textgrid')  # doctest: +SKIP
+    >>> lazy_annot.size  # doctest: +SKIP
+    2048
+    >>> lazy_annot.loaded  # doctest: +SKIP
+    False
+    >>> lazy_annot.seq  # doctest: +SKIP
+    <Sequence with 12 segments>
+    >>> lazy_annot.loaded  # doctest: +SKIP
+    True
+    """
+
+    def __init__(
+        self,
+        annot_path: PathLike,
+        format: "Union[str, type, Transcriber]",
+        notated_path: Optional[PathLike] = None,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+    ):
+        """Initialize a new :class:`~crowsetta.lazy.LazyAnnotation` instance.
+
+        The file is not parsed, and not even opened.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path
+            Path to the annotation file.
+        format : str, class, crowsetta.Transcriber
+            Format of the file, any ``format`` accepted by :class:`crowsetta.Transcriber`,
+            including 'auto', or a :class:`crowsetta.Transcriber` used to load the file,
+            e.g. to use its caches.
+        notated_path : str, pathlib.Path, optional
+            Path to the file that ``annot_path`` annotates,
+            if it is known without parsing the annotation file.
+            Default is None, in which case the ``notated_path``
+            of the loaded annotation is used.
+        args : tuple
+            Positional arguments passed to the ``from_file`` method of the format.
+        kwargs : dict, optional
+            Keyword arguments passed to the ``from_file`` method of the format,
+            e.g. ``{'annot_col': 'Species'}`` for the 'raven' format.
+        """
+        # don't call ``Annotation.__init__``; ``seq`` or ``bboxes`` are set when the file is loaded
+        self.annot_path = pathlib.Path(annot_path)
+        self.scribe = format if isinstance(format, Transcriber) else Transcriber(format=format)
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs) if kwargs is not None else {}
+        self._notated_path = pathlib.Path(notated_path) if notated_path is not None else None
+        self._annot: Optional[Annotation] = None
+
+    @property
+    def format(self) -> "Union[str, type]":
+        """Format of the annotation file, the ``format`` of ``scribe``."""
+        return self.scribe.format
+
+    @functools.cached_property
+    def _stat(self) -> os.stat_result:
+        return os.stat(self.annot_path)
+
+    @property
+    def size(self) -> int:
+        """Size of the annotation file, in bytes.
+        Read from the file system the first time it is accessed, without parsing the file."""
+        return self._stat.st_size
+
+    @property
+    def mtime(self) -> float:
+        """Time the annotation file was last modified, in seconds since the epoch.
+        Read from the file system the first time it is accessed, without parsing the file."""
+        return self._stat.st_mtime
+
+    @property
+    def loaded(self) -> bool:
+        """True if the annotation file has been parsed."""
+        return self._annot is not None
+
+    @property
+    def notated_path(self) -> Optional[pathlib.Path]:
+        """Path to the file that ``annot_path`` annotates.
+        If it was not specified when this lazy annotation was made,
+        the annotation file is parsed to get it."""
+        if self._notated_path is not None:
+            return self._notated_path
+        return self.load().notated_path
+
+    def load(self) -> Annotation:
+        """Parse the annotation file, if it has not been parsed already,
+        and return the loaded :class:`crowsetta.Annotation`.
+
+        Raises
+        ------
+        ValueError
+            If loading the file does not return one :class:`crowsetta.Annotation`,
+            e.g. for formats with annotations of many files in one file, like 'generic-seq'.
+        """
+        if self._annot is None:
+            annot = self.scribe.from_file(self.annot_path, *self.args, convert="to_annot", **self.kwargs)
+            self._set_annot(annot)
+        return self._annot
+
+    def _set_annot(self, annot: Annotation) -> None:
+        """Keep the :class:`crowsetta.Annotation` loaded from the file"""
+        if not isinstance(annot, Annotation):
+            raise ValueError(
+                "A LazyAnnotation can only load formats with one annotation per file, "
+                f"but loading {self.annot_path} with format '{self.format}' returned: {type(annot)}"
+            )
+        self._annot = annot
+        # set the loaded attributes on this instance, so they are found without calling ``__getattr__``
+        for name in _LOADED_ATTRS:
+            if hasattr(annot, name):
+                setattr(self, name, getattr(annot, name))
+
+    def __getattr__(self, name: str):
+        # only called when normal lookup fails, i.e. for ``seq`` and ``bboxes`` before the file is loaded
+        if name in _LOADED_ATTRS and self.__dict__.get("_annot") is None and "scribe" in self.__dict__:
+            self.load()
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __repr__(self):
+        if self._annot is not None:
+            return f"Lazy{self._annot!r}"
+        return f"LazyAnnotation(annot_path={self.annot_path!r}, format={self.format!r}, loaded=False)"
+
+
+def load(lazy_annots: Iterable[LazyAnnotation], **kwargs) -> List[LazyAnnotation]:
+    """Parse the files of lazy annotations that have not been loaded yet,
+    in batches, with :meth:`crowsetta.Transcriber.from_files`.
+
+    Lazy annotations are loaded together if they have the same ``scribe``,
+    ``args`` and ``kwargs``, e.g. if they were made with one call to
+    :meth:`crowsetta.Transcriber.lazy_from_files`.
+
+    Parameters
+    ----------
+    lazy_annots : iterable
+        Of :class:`~crowsetta.lazy.LazyAnnotation`.
+    **kwargs
+        Passed to :meth:`crowsetta.Transcriber.from_files`,
+        e.g. ``workers``, ``executor`` and ``chunksize``.
+
+    Returns
+    -------
+    lazy_annots : list
+        The same lazy annotations, that are now all loaded.
+    """
+    lazy_annots = list(lazy_annots)
+    # batches of lazy annotations that are loaded the same way
+    batches: List[List[LazyAnnotation]] = []
+    for lazy_annot in lazy_annots:
+        if lazy_annot.loaded:
+            continue
+        for batch in batches:
+            if (
+                batch[0].scribe is lazy_annot.scribe
+                and batch[0].args == lazy_annot.args
+                and batch[0].kwargs == lazy_annot.kwargs
+            ):
+                batch.append(lazy_annot)
+                break
+        else:
+            batches.append([lazy_annot])
+
+    for batch in batches:
+        first = batch[0]
+        annots = first.scribe.from_files(
+            [lazy_annot.annot_path for lazy_annot in batch], *first.args, convert="to_annot", **kwargs, **first.kwargs
+        )
+        for lazy_annot, annot in zip(batch, annots):
+            lazy_annot._set_annot(annot)
+    return lazy_annots
@@ -0,0 +1,598 @@
+"""Module with caches of parsed annotation files,
+used by :class:`crowsetta.Transcriber`:
+a persistent on-disk cache, :class:`~crowsetta.parsecache.ParseCache`,
+and an in-memory cache, :class:`~crowsetta.parsecache.MemoryCache`.
+
+Pipelines often load the same annotation files many times,
+e.g. each time an analysis is re-run, and each time
+every file is parsed again from scratch.
+A :class:`~crowsetta.parsecache.ParseCache` saves the result of
+parsing each file, i.e., the instance of the class that represents
+the annotation format returned by its ``from_file`` method,
+so that loading an unchanged file again only requires reading the result
+from the cache, without parsing the file at all.
+
+Results are keyed by the absolute path to the file, its size and modification time,
+the name of the format, the arguments passed to ``from_file``,
+and the version of crowsetta, so that a file is parsed again whenever
+it changes, or whenever it is loaded in a different way.
+Results are saved as compressed pickles in an SQLite database,
+that can safely be shared by multiple processes.
+The total size of the results is bounded;
+when it grows larger than the maximum, the least recently used results are removed.
+The time each result was last used is only updated about once a minute,
+so results used within the same minute may be removed in any order.
+
+The cache is opt-in. To use it, pass ``cache=True`` when making a
+:class:`~crowsetta.Transcriber`, to use the default directory
+in the user cache directory for crowsetta, or pass the path to another directory,
+or a :class:`~crowsetta.parsecache.ParseCache` instance.
+
+Applications that load the same files over and over in one process,
+e.g. a web service that shows annotations on every request,
+can also keep the most recently used results in memory with a
+:class:`~crowsetta.parsecache.MemoryCache`, by passing ``memory_cache=True``
+when making a :class:`~crowsetta.Transcriber`.
+Loading a file that is in the memory cache only requires
+getting the modification time of the file, looking up the result in a :class:`dict`,
+and unpickling a copy of it, so that results can be modified.
+
+Examples
+--------
+>>> scribe = crowsetta.Transcriber(format='notmat', cache=True)  # doctest: +SKIP
+>>> notmat = scribe.from_file('gy6or6_baseline_230312_0808.138.cbin.not.mat')  # doctest: +SKIP
+>>> scribe = crowsetta.Transcriber(format='notmat', memory_cache=True)  # doctest: +SKIP
+>>> annot = scribe.from_file('gy6or6_baseline_230312_0808.138.cbin.not.mat', convert='to_annot')  # doctest: +SKIP
+"""
+from __future__ import annotations
+
+import collections
+import hashlib
+import os
+import pathlib
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, NamedTuple, Optional
+
+from . import archive
+from .__about__ import __version__
+from .data.data import APP_DIRS
+from .typing import PathLike
+
+PARSE_CACHE_DIRNAME = "parse-cache"
+PARSE_CACHE_FILENAME = "parse-cache.sqlite3"
+DEFAULT_MAX_SIZE = 2**30  # 1 GiB
+# when evicting, remove results until the total size is this fraction of the maximum,
+# so that we do not have to evict again after every new result
+EVICT_TO_FRACTION = 0.9
+COMPRESS_LEVEL = 1
+# the time a result was last accessed is only updated when it is older than this many seconds,
+# so that getting a result from the cache usually only reads from the database, without writing to it
+LAST_ACCESS_RESOLUTION = 60.0
+DEFAULT_MAX_ENTRIES = 128
+
+
+# instances of ParseCache made when unpickling in this process, keyed by (cache_dir, max_size)
+_INSTANCES: dict = {}
+_INSTANCES_LOCK = threading.Lock()
+
+
+def default_cache_dir() -> pathlib.Path:
+    """Get the default directory for the parse cache,
+    in the user cache directory for crowsetta,
+    ``crowsetta.data.data.APP_DIRS.user_cache_dir``."""
+    return pathlib.Path(APP_DIRS.user_cache_dir) / PARSE_CACHE_DIRNAME
+
+
+def is_path(annot_path: Any) -> bool:
+    """Determine whether ``annot_path`` is a path, or a member of an archive,
+    that results of parsing it can be cached for.
+
+    Sources of annotations that are not paths, e.g. bytes or file objects,
+    see :mod:`crowsetta.formats.source`, are always parsed."""
+    return isinstance(annot_path, (str, os.PathLike, archive.ArchiveMember))
+
+
+class ParseCache:
+    """A persistent on-disk cache of parsed annotation files.
+
+    Attributes
+    ----------
+    cache_dir : pathlib.Path
+        Directory where the cache is saved.
+    max_size : int
+        Maximum total size of results in the cache, in bytes.
+        When the total size is larger, the least recently used results are removed.
+
+    Examples
+    --------
+    >>> cache = crowsetta.parsecache.ParseCache(max_size=100 * 2**20)  # doctest: +SKIP
+    >>> scribe = crowsetta.Transcriber(format='textgrid', cache=cache)  # doctest: +SKIP
+    """
+
+    def __init__(self, cache_dir: Optional[PathLike] = None, max_size: int = DEFAULT_MAX_SIZE):
+        """Initialize a new :class:`~crowsetta.parsecache.ParseCache` instance.
+
+        Parameters
+        ----------
+        cache_dir : str, pathlib.Path, optional
+            Directory where the cache is saved.
+            Created if it does not exist.
+            Default is None, in which case the directory returned by
+            :func:`~crowsetta.parsecache.default_cache_dir` is used.
+        max_size : int
+            Maximum total size of results in the cache, in bytes.
+            Default is 1 GiB.
+        """
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        if max_size < 1:
+            raise ValueError(f"``max_size`` must be a positive integer, but was: {max_size}")
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.max_size = max_size
+        self._connection: Optional[sqlite3.Connection] = None
+        # process that opened ``_connection``; SQLite connections must not be used after a fork
+        self._pid: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"crowsetta.parsecache.ParseCache(cache_dir='{self.cache_dir}', max_size={self.max_size})"
+
+    def __reduce__(self):
+        # connections cannot be pickled, e.g. when the cache is sent to worker processes.
+        # Instead each process gets one instance for each cache,
+        # that opens its own connection the first time it is used
+        return _get_instance, (self.cache_dir, self.max_size)
+
+    @property
+    def db_path(self) -> pathlib.Path:
+        """Path to the SQLite database where results are saved."""
+        return self.cache_dir / PARSE_CACHE_FILENAME
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection to the database, opening it the first time"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # don't close a connection inherited from a parent process; just stop using it
+                self._connection = None
+            if self._connection is None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # autocommit mode, so that we control transactions with explicit BEGIN statements
+                connection = sqlite3.connect(
+                    self.db_path, timeout=60.0, check_same_thread=False, isolation_level=None
+                )
+                # write-ahead logging lets readers in other processes work while one process writes
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+                # keep the total size in its own table so we don't have to sum sizes every time we add a result
+                connection.execute("CREATE TABLE IF NOT EXISTS total_size (id INTEGER PRIMARY KEY, size INTEGER)")
+                connection.execute("INSERT OR IGNORE INTO total_size VALUES (0, 0)")
+                self._connection = connection
+                self._pid = os.getpid()
+            return self._connection
+
+    def close(self) -> None:
+        """Close the connection to the database.
+
+        The cache can still be used after calling this method;
+        the connection is opened again the next time it is needed.
+        """
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def make_key(annot_path: PathLike, format_name: str, args: tuple = (), kwargs: Optional[dict] = None) -> str:
+        """Make the key for the result of parsing an annotation file.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path, crowsetta.archive.ArchiveMember
+            Path to annotation file, or a member of an archive.
+        format_name : str
+            Name of the annotation format.
+        args : tuple
+            Positional arguments passed to ``from_file``.
+        kwargs : dict, optional
+            Keyword arguments passed to ``from_file``.
+
+        Returns
+        -------
+        key : str
+            A hash of the absolute path to the file, its size and
+            modification time, the format name, the arguments,
+            and the version of crowsetta.
+            For a member of an archive, the size and modification time
+            are those of the archive.
+
+        Raises
+        ------
+        FileNotFoundError
+            If ``annot_path`` does not exist.
+        TypeError
+            If ``annot_path`` is not a path, e.g. if it is bytes or a file object.
+        """
+        if not is_path(annot_path):
+            raise TypeError(f"Can only make keys for paths, but ``annot_path`` was: {type(annot_path)}")
+        if isinstance(annot_path, archive.ArchiveMember):
+            path = os.path.join(os.path.abspath(annot_path.archive_path), annot_path.name)
+            stat_result = os.stat(annot_path.archive_path)
+        else:
+            path = os.path.abspath(os.fsdecode(annot_path))
+            stat_result = os.stat(path)
+        kwargs = sorted((kwargs or {}).items())
+        key_str = repr((path, stat_result.st_size, stat_result.st_mtime_ns, format_name, args, kwargs, __version__))
+        return hashlib.sha256(key_str.encode("utf-8", errors="surrogateescape")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a result from the cache.
+
+        Parameters
+        ----------
+        key : str
+            Key made with :meth:`~crowsetta.parsecache.ParseCache.make_key`.
+
+        Returns
+        -------
+        result : object, None
+            The cached result, or None if there is no result for ``key``.
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT value, last_access FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > LAST_ACCESS_RESOLUTION:
+                connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+        try:
+            return pickle.loads(zlib.decompress(row[0]))
+        except Exception:
+            # e.g. the result was pickled from a class that has since changed; treat it as missing
+            self.delete(key)
+            return None
+
+    def put(self, key: str, result: Any) -> None:
+        """Add a result to the cache.
+
+        If the total size of results is then larger than
+        ``max_size``, the least recently used results are removed.
+
+        Parameters
+        ----------
+        key : str
+            Key made with :meth:`~crowsetta.parsecache.ParseCache.make_key`.
+        result : object
+            Result of parsing an annotation file.
+            Results that cannot be pickled are not added.
+        """
+        try:
+            pickled = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # e.g. a format that keeps a file open to read from lazily; just don't cache it
+            return
+        value = zlib.compress(pickled, COMPRESS_LEVEL)
+        size = len(value)
+        if size > self.max_size:
+            return
+        with self._lock:
+            connection = self._connect()
+            # IMMEDIATE takes the write lock now, so that the total size stays consistent across processes
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+                old_size = row[0] if row is not None else 0
+                connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, value, size, time.time())
+                )
+                connection.execute("UPDATE total_size SET size = size + ? WHERE id = 0", (size - old_size,))
+                (total_size,) = connection.execute("SELECT size FROM total_size WHERE id = 0").fetchone()
+                if total_size > self.max_size:
+                    self._evict(connection, total_size)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _evict(self, connection: sqlite3.Connection, total_size: int) -> None:
+        """Remove least recently used results until total size
+        is at most ``EVICT_TO_FRACTION`` of ``max_size``.
+        Must be called inside a transaction."""
+        to_free = total_size - int(self.max_size * EVICT_TO_FRACTION)
+        freed = 0
+        keys = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY last_access"):
+            keys.append((key,))
+            freed += size
+            if freed >= to_free:
+                break
+        connection.executemany("DELETE FROM results WHERE key = ?", keys)
+        connection.execute("UPDATE total_size SET size = size - ? WHERE id = 0", (freed,))
+
+    def delete(self, key: str) -> None:
+        """Remove a result from the cache, if it is there.
+
+        Parameters
+        ----------
+        key : str
+            Key made with :meth:`~crowsetta.parsecache.ParseCache.make_key`.
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                    connection.execute("UPDATE total_size SET size = size - ? WHERE id = 0", (row[0],))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        """Remove all results from the cache."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute("DELETE FROM results")
+                connection.execute("UPDATE total_size SET size = 0 WHERE id = 0")
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            (n_results,) = self._connect().execute("SELECT COUNT(*) FROM results").fetchone()
+        return n_results
+
+    @property
+    def size(self) -> int:
+        """Total size of results in the cache, in bytes."""
+        with self._lock:
+            (size,) = self._connect().execute("SELECT size FROM total_size WHERE id = 0").fetchone()
+        return size
+
+    def load(self, format_class, format_name: str, annot_path: PathLike, *args, **kwargs) -> Any:
+        """Load an annotation file, getting the result from the cache if it is there,
+        and otherwise parsing the file and adding the result to the cache.
+
+        Parameters
+        ----------
+        format_class : class
+            Class that represents the annotation format.
+        format_name : str
+            Name of the annotation format.
+        annot_path : str, pathlib.Path, crowsetta.archive.ArchiveMember, bytes, file object
+            Path to annotation file, or a member of an archive.
+            Other sources of annotations, e.g. bytes or file objects,
+            are parsed without using the cache.
+        *args, **kwargs
+            Passed to the ``from_file`` method of ``format_class``.
+
+        Returns
+        -------
+        result : object
+            Instance of ``format_class``.
+        """
+        if not is_path(annot_path):
+            return format_class.from_file(annot_path, *args, **kwargs)
+        try:
+            key = self.make_key(annot_path, format_name, args, kwargs)
+        except (OSError, ValueError):
+            # let ``from_file`` raise its usual error for a file that does not exist
+            return format_class.from_file(annot_path, *args, **kwargs)
+        result = self.get(key)
+        if result is None:
+            result = format_class.from_file(annot_path, *args, **kwargs)
+            self.put(key, result)
+        return result
+
+
+def _get_instance(cache_dir: pathlib.Path, max_size: int) -> ParseCache:
+    """Get the instance of :class:`~crowsetta.parsecache.ParseCache`
+    for ``cache_dir`` and ``max_size`` in this process,
+    making it the first time. Used to unpickle instances."""
+    with _INSTANCES_LOCK:
+        key = (pathlib.Path(cache_dir), max_size)
+        if key not in _INSTANCES:
+            _INSTANCES[key] = ParseCache(cache_dir=cache_dir, max_size=max_size)
+        return _INSTANCES[key]
+
+
+class MemoryCacheInfo(NamedTuple):
+    """Statistics for a :class:`~crowsetta.parsecache.MemoryCache`,
+    like those returned by the ``cache_info`` method
+    of functions decorated with :func:`functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    max_entries: Optional[int]
+    max_bytes: Optional[int]
+    entries: int
+    nbytes: int
+
+
+class MemoryCache:
+    """An in-memory least-recently-used (LRU) cache
+    of parsed annotation files and of their conversions,
+    e.g. to :class:`crowsetta.Annotation`.
+
+    Each result is kept with the size and modification time
+    of the file it was loaded from, and it is only returned
+    if the file has not changed since then.
+    The cache can be bounded by the number of entries, by their total size in bytes,
+    or by both. By default, results are kept pickled, and each time
+    a result is returned it is unpickled, so that it can be modified
+    without changing the result in the cache.
+    Results that cannot be pickled are not added to the cache.
+    To skip unpickling, for applications that do not modify results,
+    make a cache with ``copy=False``, that returns the same object every time.
+
+    The cache is thread-safe.
+
+    Attributes
+    ----------
+    max_entries : int, None
+        Maximum number of entries.
+    max_bytes : int, None
+        Maximum total size of entries, in bytes,
+        estimated from the size of each result when pickled.
+    copy : bool
+        If True, a copy of each result is returned.
+    hits : int
+        Number of times a result was found in the cache.
+    misses : int
+        Number of times a result was not found in the cache.
+
+    Examples
+    --------
+    >>> cache = crowsetta.parsecache.MemoryCache(max_bytes=100 * 2**20)
+    >>> scribe = crowsetta.Transcriber(format='textgrid', memory_cache=cache)
+    """
+
+    def __init__(
+        self, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES, max_bytes: Optional[int] = None, copy: bool = True
+    ):
+        """Initialize a new :class:`~crowsetta.parsecache.MemoryCache` instance.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of entries. Default is 128.
+            If None, the number of entries is not bounded.
+        max_bytes : int, optional
+            Maximum total size of entries, in bytes,
+            estimated from the size of each result when pickled.
+            Default is None, in which case the size is not bounded.
+        copy : bool
+            If True, the default, results are kept pickled,
+            and a new copy of a result is unpickled each time it is returned.
+            If False, the same object is returned every time,
+            which is faster, but then results must not be modified,
+            because any changes are returned by later calls.
+        """
+        for name, val in (("max_entries", max_entries), ("max_bytes", max_bytes)):
+            if val is not None and val < 1:
+                raise ValueError(f"``{name}`` must be a positive integer or None, but was: {val}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        # maps key -> (size of file, modification time of file, result or pickled result, nbytes of result)
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return (
+            f"crowsetta.parsecache.MemoryCache(max_entries={self.max_entries}, max_bytes={self.max_bytes}, "
+            f"copy={self.copy})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cache_info(self) -> MemoryCacheInfo:
+        """Get statistics for this cache: hits, misses, and current size.
+
+        Returns
+        -------
+        info : crowsetta.parsecache.MemoryCacheInfo
+        """
+        with self._lock:
+            return MemoryCacheInfo(
+                self.hits, self.misses, self.max_entries, self.max_bytes, len(self._entries), self._nbytes
+            )
+
+    def cache_clear(self) -> None:
+        """Remove all entries from the cache, and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get_or_load(self, key: tuple, annot_path: PathLike, load: Callable[[], Any]) -> Any:
+        """Get a result from the cache,
+        or load it by calling ``load`` and add it to the cache.
+
+        Parameters
+        ----------
+        key : tuple
+            Hashable key for the result, e.g. the path to the file
+            and the arguments used to load it.
+        annot_path : str, pathlib.Path
+            Path to the annotation file that the result was loaded from.
+            The result in the cache is only returned
+            if the size and modification time of this file have not changed.
+            If ``annot_path`` is not a path, e.g. if it is bytes or a file object,
+            the result is always loaded, and is not added to the cache.
+        load : callable
+            Called with no arguments to load the result
+            if it is not in the cache.
+
+        Returns
+        -------
+        result : object
+            A new copy of the result if ``copy`` is True.
+        """
+        if not is_path(annot_path) or isinstance(annot_path, archive.ArchiveMember):
+            return load()
+        try:
+            stat_result = os.stat(annot_path)
+        except (OSError, ValueError):
+            # let ``load`` raise its usual error for a file that does not exist
+            return load()
+        file_id = (stat_result.st_size, stat_result.st_mtime_ns)
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = entry is not None and entry[:2] == file_id
+            if hit:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[2]
+            else:
+                self.misses += 1
+        if hit:
+            # unpickle outside the lock, so that other threads can get results at the same time
+            return pickle.loads(value) if self.copy else value
+
+        # load outside the lock, so that other threads can get results while this one parses a file
+        result = load()
+        value, nbytes = result, 0
+        if self.copy or self.max_bytes is not None:
+            try:
+                pickled = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # we can't copy the result or estimate its size, so we don't add it to the cache
+                return result
+            nbytes = len(pickled)
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return result
+            if self.copy:
+                value = pickled
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._nbytes -= old_entry[3]
+            self._entries[key] = (*file_id, value, nbytes)
+            self._nbytes += nbytes
+            while (self.max_entries is not None and len(self._entries) > self.max_entries) or (
+                self.max_bytes is not None and self._nbytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted[3]
+        return result
@@ -0,0 +1,287 @@
+"""Module with a two-stage pipeline that loads many annotation files,
+used by :meth:`crowsetta.Transcriber.iter_from_files`
+when it is called with ``readahead``.
+
+Loading a file with the ``from_file`` method of a format class
+first waits for the file to be read, and then parses it;
+when files are on networked or spinning storage, the time spent waiting
+on reads can be as long as the time spent parsing.
+The pipeline overlaps the two: a thread pool reads the raw bytes
+of files ahead of the file currently being parsed,
+and a pool of worker processes or threads parses the bytes
+that have already been read, with format classes that accept buffers,
+see :mod:`crowsetta.formats.source`.
+
+Both stages are bounded, so memory use does not grow with the number of files.
+At most ``readahead`` files are read ahead of the files being parsed,
+and at most two chunks of files per parse worker are pending.
+When results are consumed more slowly than they are loaded,
+the parse stage stops submitting chunks, and then
+the read stage stops reading files, until the consumer catches up.
+The time spent in each stage is recorded in a
+:class:`~crowsetta.pipeline.PipelineStats`.
+
+Examples
+--------
+>>> scribe = crowsetta.Transcriber(format='textgrid')
+>>> stats = crowsetta.pipeline.PipelineStats()
+>>> annots = scribe.from_files(textgrid_paths, convert='to_annot', readahead=64, stats=stats)  # doctest: +SKIP
+>>> print(stats)  # doctest: +SKIP
+"""
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import attr
+
+from . import archive, parsecache
+from .typing import PathLike
+
+# returned by ``next`` when there are no more paths
+_DONE = object()
+
+
+@attr.define
+class PipelineStats:
+    """Counts and timing for the stages of the pipeline
+    that loads files in :meth:`crowsetta.Transcriber.iter_from_files`.
+
+    An instance passed as the ``stats`` argument is updated
+    while the iterator returned by that method runs.
+    Times are in seconds.
+
+    Attributes
+    ----------
+    n_files : int
+        Number of files loaded.
+    n_bytes : int
+        Number of bytes read.
+    read_time : float
+        Time spent reading files, summed over read workers.
+    parse_time : float
+        Time spent parsing and converting files, summed over parse workers.
+    read_wait_time : float
+        Time that the pipeline waited for files to be read,
+        before it could submit them to the parse stage.
+        If this is large compared to ``elapsed``,
+        loading is bound by I/O, and more ``io_workers``
+        or a larger ``readahead`` may help.
+    parse_wait_time : float
+        Time that the pipeline waited for files to be parsed,
+        before it could return their results.
+        If this is large compared to ``elapsed``,
+        loading is bound by parsing, and more ``workers`` may help.
+    elapsed : float
+        Time from when the first file was read
+        until the last result was returned,
+        not counting time spent by the caller between results.
+    """
+
+    n_files: int = 0
+    n_bytes: int = 0
+    read_time: float = 0.0
+    parse_time: float = 0.0
+    read_wait_time: float = 0.0
+    parse_wait_time: float = 0.0
+    elapsed: float = 0.0
+
+    def __str__(self):
+        return (
+            f"loaded {self.n_files} files ({self.n_bytes / 1e6:.1f} MB) in {self.elapsed:.3f} s; "
+            f"read {self.read_time:.3f} s, parse {self.parse_time:.3f} s, "
+            f"waited on reads {self.read_wait_time:.3f} s, waited on parsing {self.parse_wait_time:.3f} s"
+        )
+
+
+def read_file(annot_path: Union[PathLike, archive.ArchiveMember]) -> Tuple[bytes, float]:
+    """Read all the bytes of a file, or of a member of an archive,
+    and return them with the time it took to read them, in seconds.
+    Used by the read stage of the pipeline."""
+    start = time.perf_counter()
+    if isinstance(annot_path, archive.ArchiveMember):
+        data = archive.read_member(annot_path)
+    else:
+        with open(annot_path, "rb") as fp:
+            data = fp.read()
+    return data, time.perf_counter() - start
+
+
+def _load_buffer(format_class, format_name, cache, annot_path, data, args, kwargs):
+    """Load an annotation file from bytes that were already read,
+    using ``cache`` if it is not None.
+    If ``format_class`` is None, the format is detected from the bytes."""
+    # avoid circular imports
+    from . import formats
+    from .transcriber import _check_accepts_buffers
+
+    if data is None:
+        # the file could not be read, so let ``from_file`` raise its usual error
+        source = annot_path
+    else:
+        name = annot_path.path if isinstance(annot_path, archive.ArchiveMember) else annot_path
+        # one source for detecting the format and loading, that both read from the start of the buffer
+        source = formats.source.AnnotSource(data, name=name)
+    if format_class is None:
+        format_name = formats.detect(source)
+        format_class = formats.by_name(format_name)
+    if isinstance(annot_path, archive.ArchiveMember):
+        _check_accepts_buffers(format_class, format_name)
+    elif not formats.source.accepts_buffers(format_class):
+        # the file was still read into the OS page cache, so reading it again is fast
+        source = annot_path
+    if cache is None or not parsecache.is_path(annot_path):
+        return format_class.from_file(source, *args, **kwargs)
+    try:
+        key = cache.make_key(annot_path, format_name, args, kwargs)
+    except (OSError, ValueError):
+        return format_class.from_file(source, *args, **kwargs)
+    result = cache.get(key)
+    if result is None:
+        result = format_class.from_file(source, *args, **kwargs)
+        cache.put(key, result)
+    return result
+
+
+def _parse_chunk(
+    format_class, format_name, cache, chunk, args, kwargs, convert, convert_kwargs
+) -> Tuple[list, float]:
+    """Parse a chunk of files that were already read, and optionally convert them.
+
+    Helper function called by the parse stage of the pipeline,
+    defined at the module level so that it can be sent to worker processes.
+    ``chunk`` is a list of ``(annot_path, data)`` tuples,
+    where ``data`` is None if the file could not be read.
+    Returns the results, with the time it took to get them, in seconds.
+    """
+    start = time.perf_counter()
+    results = []
+    for annot_path, data in chunk:
+        result = _load_buffer(format_class, format_name, cache, annot_path, data, args, kwargs)
+        if convert is not None:
+            result = getattr(result, convert)(**convert_kwargs)
+        results.append(result)
+    return results, time.perf_counter() - start
+
+
+def imap_pipelined(
+    parse_chunk: Callable[[List[Tuple[PathLike, bytes]]], Tuple[list, float]],
+    annot_paths: Iterable[PathLike],
+    workers: int,
+    executor: Union[str, concurrent.futures.Executor],
+    chunksize: int,
+    readahead: int,
+    io_workers: int,
+    stats: Optional[PipelineStats] = None,
+) -> Iterator[Any]:
+    """Read files ahead with a pool of threads, parse them concurrently
+    with ``parse_chunk``, and yield the results for each file in order.
+
+    Parameters
+    ----------
+    parse_chunk : callable
+        That takes a list of ``(annot_path, data)`` tuples,
+        and returns a list with one result for each file,
+        and the time it took, like a :func:`functools.partial`
+        of :func:`crowsetta.pipeline._parse_chunk`.
+        Must be picklable to be used with worker processes.
+    annot_paths : iterable
+        Of paths to files.
+    workers : int
+        Number of parse workers. If 1, files are parsed
+        in the current thread, while other files are read ahead.
+    executor : str, concurrent.futures.Executor
+        Either 'process', 'thread', or an executor
+        that is used as is, and not shut down.
+    chunksize : int
+        Number of files parsed by a worker in each task.
+        Chunks are never larger than ``readahead``.
+    readahead : int
+        Maximum number of files read ahead of the files being parsed.
+    io_workers : int
+        Number of threads that read files.
+    stats : crowsetta.pipeline.PipelineStats, optional
+        Updated with counts and timing as files are loaded.
+    """
+    # avoid circular imports
+    from .transcriber import _make_pool
+
+    if stats is None:
+        stats = PipelineStats()
+    pool, shutdown = _make_pool(workers, executor)
+    io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="crowsetta-read")
+    annot_paths = iter(annot_paths)
+    max_pending = 2 * workers
+    # futures for reads, as ``(annot_path, future)``, and for parsed chunks, in the order of ``annot_paths``
+    reads = collections.deque()
+    parses = collections.deque()
+    start = time.perf_counter()
+
+    def wait_for_parse(future):
+        wait_start = time.perf_counter()
+        results, parse_time = future.result()
+        stats.parse_wait_time += time.perf_counter() - wait_start
+        return results, parse_time
+
+    def emit(results, parse_time):
+        nonlocal start
+        stats.parse_time += parse_time
+        stats.n_files += len(results)
+        stats.elapsed = time.perf_counter() - start
+        yield from results
+        # don't count the time that the caller spends between results
+        start = time.perf_counter() - stats.elapsed
+
+    try:
+        exhausted = False
+        while True:
+            # read stage: keep up to ``readahead`` files being read
+            while not exhausted and len(reads) < readahead:
+                annot_path = next(annot_paths, _DONE)
+                if annot_path is _DONE:
+                    exhausted = True
+                elif not parsecache.is_path(annot_path):
+                    # e.g. bytes or a file object, that is parsed as it is, without reading it ahead
+                    reads.append((annot_path, None))
+                else:
+                    reads.append((annot_path, io_pool.submit(read_file, annot_path)))
+            if not reads:
+                break
+
+            chunk = []
+            while reads and len(chunk) < chunksize:
+                annot_path, future = reads.popleft()
+                wait_start = time.perf_counter()
+                try:
+                    data, read_time = future.result() if future is not None else (None, 0.0)
+                except OSError:
+                    # raise the error when the iterator reaches this file, not before
+                    data, read_time = None, 0.0
+                stats.read_wait_time += time.perf_counter() - wait_start
+                stats.read_time += read_time
+                stats.n_bytes += len(data) if data is not None else 0
+                chunk.append((annot_path, data))
+
+            # parse stage
+            if pool is None:
+                yield from emit(*parse_chunk(chunk))
+                continue
+            if len(parses) >= max_pending:
+                # back-pressure: wait for the oldest chunk before submitting another
+                yield from emit(*wait_for_parse(parses.popleft()))
+            parses.append(pool.submit(parse_chunk, chunk))
+
+        while parses:
+            yield from emit(*wait_for_parse(parses.popleft()))
+    finally:
+        for _, future in reads:
+            # sources that are not paths are not read ahead, so they have no future
+            if future is not None:
+                future.cancel()
+        for future in parses:
+            future.cancel()
+        io_pool.shutdown(wait=True)
+        if shutdown:
+            pool.shutdown(wait=True)
@@ -167,6 +167,14 @@ class Sequence:
     def __setattr__(self, key, value):
         raise TypeError("Sequence objects are immutable.")
 
+    def __reduce__(self):
+        # pickle only the arrays, not the segments, that are made from the arrays again when unpickling.
+        # This makes sequences much more compact to send between processes
+        return (
+            _sequence_from_arrays,
+            (self._labels, self._onsets_s, self._offsets_s, self._onset_samples, self._offset_samples),
+        )
+
     def __lt__(self, other):
         raise NotImplementedError
 
@@ -469,3 +477,39 @@ class Sequence:
                 seq_dict[a_key] = None
 
         return seq_dict
+
+
+def _sequence_from_arrays(labels, onsets_s, offsets_s, onset_samples, offset_samples) -> Sequence:
+    """Make a :class:`~crowsetta.Sequence` from arrays that were already validated,
+    without validating them again. Used to unpickle sequences.
+
+    Segments are made the same way :meth:`~crowsetta.Sequence.from_keyword` makes them,
+    but without calling the validators of :class:`~crowsetta.Segment`, that are much slower
+    than making the segments.
+    """
+    new_segment = object.__new__
+    segments = []
+    for label, onset_s, offset_s, onset_sample, offset_sample in zip(
+        labels.tolist(), onsets_s, offsets_s, onset_samples.tolist(), offset_samples.tolist()
+    ):
+        segment = new_segment(Segment)
+        segment.__dict__.update(
+            label=str(label),
+            onset_s=onset_s,
+            offset_s=offset_s,
+            onset_sample=onset_sample,
+            offset_sample=offset_sample,
+        )
+        segments.append(segment)
+
+    seq = object.__new__(Sequence)
+    for name, value in (
+        ("_segments", tuple(segments)),
+        ("_onsets_s", onsets_s),
+        ("_offsets_s", offsets_s),
+        ("_onset_samples", onset_samples),
+        ("_offset_samples", offset_samples),
+        ("_labels", labels),
+    ):
+        object.__setattr__(seq, name, value)
+    return seq
@@ -0,0 +1,558 @@
+"""Module with a store of annotations in an SQLite database,
+:class:`~crowsetta.store.AnnotationStore`,
+for corpora of annotations that are too big to keep in memory.
+
+Annotations are added to the store once, e.g. after loading them with
+:class:`crowsetta.Transcriber`, and can then be queried
+without loading every annotation file again.
+The database has tables of annotations, sequences, segments and bounding boxes,
+with indexes on labels, on ``notated_path`` and ``annot_path``,
+and on the onsets and offsets of segments,
+so that finding annotations with a label or with segments in a range of time
+only reads the rows that match, instead of the whole corpus.
+Bounding boxes are also indexed with the
+`R*Tree module <https://www.sqlite.org/rtree.html>`_ of SQLite,
+that finds boxes in a range of time and frequency,
+if the version of SQLite that Python was built with includes the module.
+
+Queries are generators that yield one :class:`crowsetta.Annotation`,
+:class:`crowsetta.Sequence` or :class:`crowsetta.BBox` at a time,
+so that only the results being used are kept in memory.
+
+Examples
+--------
+>>> scribe = crowsetta.Transcriber(format='notmat')
+>>> annots = scribe.from_files(notmat_paths, convert='to_annot')  # doctest: +SKIP
+>>> with crowsetta.store.AnnotationStore('corpus.sqlite3') as store:  # doctest: +SKIP
+...     store.add(annots)
+...     for annot in store.iter_annots(label='i', start=1.0, stop=2.0):
+...         print(annot.notated_path)
+"""
+from __future__ import annotations
+
+import os
+import pathlib
+import sqlite3
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .annotation import Annotation
+from .bbox import BBox
+from .sequence import Sequence
+from .typing import PathLike
+
+# number of rows inserted with each call to ``executemany`` when adding annotations
+DEFAULT_BATCH_SIZE = 10000
+
+_TABLES = (
+    "CREATE TABLE IF NOT EXISTS annotations ("
+    "id INTEGER PRIMARY KEY, annot_path TEXT NOT NULL, notated_path TEXT, "
+    "kind TEXT NOT NULL, seq_is_list INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS sequences (id INTEGER PRIMARY KEY, annotation_id INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS segments ("
+    "id INTEGER PRIMARY KEY, sequence_id INTEGER NOT NULL, label TEXT NOT NULL, "
+    "onset_s REAL, offset_s REAL, onset_sample INTEGER, offset_sample INTEGER)",
+    "CREATE TABLE IF NOT EXISTS bboxes ("
+    "id INTEGER PRIMARY KEY, annotation_id INTEGER NOT NULL, label TEXT NOT NULL, "
+    "onset REAL NOT NULL, offset REAL NOT NULL, low_freq REAL NOT NULL, high_freq REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS annotations_annot_path ON annotations (annot_path)",
+    "CREATE INDEX IF NOT EXISTS annotations_notated_path ON annotations (notated_path)",
+    "CREATE INDEX IF NOT EXISTS sequences_annotation_id ON sequences (annotation_id)",
+    "CREATE INDEX IF NOT EXISTS segments_sequence_id ON segments (sequence_id)",
+    "CREATE INDEX IF NOT EXISTS segments_label ON segments (label)",
+    "CREATE INDEX IF NOT EXISTS segments_onset_offset ON segments (onset_s, offset_s)",
+    "CREATE INDEX IF NOT EXISTS bboxes_annotation_id ON bboxes (annotation_id)",
+    "CREATE INDEX IF NOT EXISTS bboxes_label ON bboxes (label)",
+)
+# R*Tree index of bounding boxes, keyed by the id of the box in ``bboxes``
+_RTREE = "CREATE VIRTUAL TABLE IF NOT EXISTS bboxes_rtree USING rtree(id, onset, offset, low_freq, high_freq)"
+# used instead of the R*Tree when SQLite was built without the module
+_BBOX_INDEX = "CREATE INDEX IF NOT EXISTS bboxes_onset_offset ON bboxes (onset, offset)"
+
+
+def _column(values: list, dtype: type) -> Optional[np.ndarray]:
+    """Convert the values of a column of segments to an array,
+    or to None if every value is missing,
+    like the arrays of :meth:`crowsetta.Sequence.as_dict` for units that were not specified."""
+    if values and all(value is None for value in values):
+        return None
+    return np.asarray(values, dtype=dtype)
+
+
+class AnnotationStore:
+    """A store of annotations in an SQLite database,
+    that can be queried by label, path and time
+    without loading the annotations into memory.
+
+    Attributes
+    ----------
+    db_path : str, pathlib.Path
+        Path to the SQLite database, or ``':memory:'``
+        for a database that is only kept in memory.
+    has_rtree : bool
+        True if bounding boxes are indexed with the R*Tree module of SQLite.
+        False if SQLite was built without the module, in which case
+        boxes are indexed by onset and offset.
+
+    Examples
+    --------
+    >>> store = crowsetta.store.AnnotationStore('corpus.sqlite3')  # doctest: +SKIP
+    >>> store.import_generic_seq('corpus.csv')  # doctest: +SKIP
+    >>> seqs = list(store.iter_seqs(notated_path='bird1.wav'))  # doctest: +SKIP
+    >>> store.close()  # doctest: +SKIP
+    """
+
+    def __init__(self, db_path: PathLike = ":memory:"):
+        """Initialize a new :class:`~crowsetta.store.AnnotationStore` instance.
+
+        Parameters
+        ----------
+        db_path : str, pathlib.Path
+            Path to the SQLite database.
+            Created if it does not exist.
+            Default is ``':memory:'``, a database that is only kept in memory,
+            and is discarded when the store is closed.
+        """
+        self.db_path = db_path
+        # autocommit mode, so that we control transactions with explicit BEGIN statements
+        self._connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        if os.fsdecode(db_path) != ":memory:":
+            # write-ahead logging lets other processes query the store while annotations are added
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in _TABLES:
+            self._connection.execute(statement)
+        try:
+            self._connection.execute(_RTREE)
+            self.has_rtree = True
+        except sqlite3.OperationalError:
+            # "no such module: rtree"
+            self._connection.execute(_BBOX_INDEX)
+            self.has_rtree = False
+
+    def __repr__(self):
+        return f"crowsetta.store.AnnotationStore(db_path='{self.db_path}')"
+
+    def __enter__(self) -> "AnnotationStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (n_annots,) = self._connection.execute("SELECT COUNT(*) FROM annotations").fetchone()
+        return n_annots
+
+    def add(self, annots: Union[Annotation, Iterable[Annotation]], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Add annotations to the store.
+
+        Annotations are added in one transaction,
+        so that if adding any annotation fails, none are added.
+        Rows are inserted in batches with ``executemany``,
+        so ``annots`` can be a generator that yields more annotations
+        than fit in memory.
+
+        Parameters
+        ----------
+        annots : crowsetta.Annotation, iterable
+            A :class:`crowsetta.Annotation`, or an iterable of them,
+            e.g. the :class:`list` returned by
+            :meth:`crowsetta.Transcriber.from_files` with ``convert='to_annot'``.
+        batch_size : int
+            Number of rows to insert into each table at once.
+            Default is ``DEFAULT_BATCH_SIZE``.
+
+        Returns
+        -------
+        n_annots : int
+            Number of annotations added.
+        """
+        if isinstance(annots, Annotation):
+            annots = [annots]
+        if batch_size < 1:
+            raise ValueError(f"``batch_size`` must be a positive integer, but was: {batch_size}")
+
+        with self._lock:
+            connection = self._connection
+            # IMMEDIATE takes the write lock now, so no other process can take the ids we assign
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # assign ids ourselves, so rows of all tables can be inserted with ``executemany``
+                annot_id, seq_id, bbox_id = (
+                    connection.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                    for table in ("annotations", "sequences", "bboxes")
+                )
+                rows = {"annotations": [], "sequences": [], "segments": [], "bboxes": []}
+                n_annots = 0
+                for annot in annots:
+                    annot_id += 1
+                    n_annots += 1
+                    notated_path = str(annot.notated_path) if annot.notated_path is not None else None
+                    if hasattr(annot, "seq"):
+                        seqs = annot.seq if isinstance(annot.seq, list) else [annot.seq]
+                        rows["annotations"].append(
+                            (annot_id, str(annot.annot_path), notated_path, "seq", isinstance(annot.seq, list))
+                        )
+                        for seq in seqs:
+                            seq_id += 1
+                            rows["sequences"].append((seq_id, annot_id))
+                            rows["segments"].extend(
+                                (seq_id, segment.label, segment.onset_s, segment.offset_s,
+                                 segment.onset_sample, segment.offset_sample)
+                                for segment in seq.segments
+                            )
+                    else:
+                        rows["annotations"].append((annot_id, str(annot.annot_path), notated_path, "bboxes", False))
+                        for bbox in getattr(annot, "bboxes", []):
+                            bbox_id += 1
+                            rows["bboxes"].append(
+                                (bbox_id, annot_id, str(bbox.label), bbox.onset, bbox.offset,
+                                 bbox.low_freq, bbox.high_freq)
+                            )
+                    if max(len(table_rows) for table_rows in rows.values()) >= batch_size:
+                        self._insert(rows)
+                self._insert(rows)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return n_annots
+
+    def _insert(self, rows: dict) -> None:
+        """Insert batches of rows into each table, and empty the batches.
+        Must be called inside a transaction."""
+        connection = self._connection
+        connection.executemany("INSERT INTO annotations VALUES (?, ?, ?, ?, ?)", rows["annotations"])
+        connection.executemany("INSERT INTO sequences VALUES (?, ?)", rows["sequences"])
+        connection.executemany(
+            "INSERT INTO segments (sequence_id, label, onset_s, offset_s, onset_sample, offset_sample) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows["segments"],
+        )
+        connection.executemany("INSERT INTO bboxes VALUES (?, ?, ?, ?, ?, ?, ?)", rows["bboxes"])
+        if self.has_rtree:
+            connection.executemany(
+                "INSERT INTO bboxes_rtree VALUES (?, ?, ?, ?, ?)",
+                [(row[0], row[3], row[4], row[5], row[6]) for row in rows["bboxes"]],
+            )
+        for table_rows in rows.values():
+            table_rows.clear()
+
+    @staticmethod
+    def _segment_conditions(
+        label: Optional[str], start: Optional[float], stop: Optional[float]
+    ) -> Tuple[List[str], list]:
+        """Get the conditions on the ``segments`` table, aliased as ``s``,
+        for segments with ``label`` that overlap the time from ``start`` to ``stop``"""
+        conditions, params = [], []
+        if label is not None:
+            conditions.append("s.label = ?")
+            params.append(str(label))
+        if stop is not None:
+            conditions.append("s.onset_s < ?")
+            params.append(stop)
+        if start is not None:
+            conditions.append("s.offset_s > ?")
+            params.append(start)
+        return conditions, params
+
+    def _bbox_conditions(
+        self,
+        label: Optional[str],
+        start: Optional[float],
+        stop: Optional[float],
+        low_freq: Optional[float] = None,
+        high_freq: Optional[float] = None,
+    ) -> Tuple[List[str], list]:
+        """Get the conditions on the ``bboxes`` table, aliased as ``b``,
+        for boxes with ``label`` that overlap the time from ``start`` to ``stop``
+        and the frequencies from ``low_freq`` to ``high_freq``"""
+        conditions, params = [], []
+        if label is not None:
+            conditions.append("b.label = ?")
+            params.append(str(label))
+        ranges = [
+            (column, op, value)
+            for column, op, value in (
+                ("onset", "<", stop),
+                ("offset", ">", start),
+                ("low_freq", "<", high_freq),
+                ("high_freq", ">", low_freq),
+            )
+            if value is not None
+        ]
+        if ranges and self.has_rtree:
+            # the R*Tree stores coordinates as 32-bit floats, rounded outwards,
+            # so it finds a superset of the boxes, that the conditions below narrow to the exact matches
+            rtree_conditions = [f"r.{column} {op}= ?" for column, op, _ in ranges]
+            conditions.append(f"b.id IN (SELECT r.id FROM bboxes_rtree r WHERE {' AND '.join(rtree_conditions)})")
+            params.extend(value for _, _, value in ranges)
+        for column, op, value in ranges:
+            conditions.append(f"b.{column} {op} ?")
+            params.append(value)
+        return conditions, params
+
+    def _annot_query(
+        self,
+        annot_path: Optional[PathLike],
+        notated_path: Optional[PathLike],
+        label: Optional[str],
+        start: Optional[float],
+        stop: Optional[float],
+    ) -> Tuple[str, list]:
+        """Get a query for the annotations that match all the arguments that are not None"""
+        conditions, params = [], []
+        if annot_path is not None:
+            conditions.append("a.annot_path = ?")
+            params.append(str(annot_path))
+        if notated_path is not None:
+            conditions.append("a.notated_path = ?")
+            params.append(str(notated_path))
+        segment_conditions, segment_params = self._segment_conditions(label, start, stop)
+        if segment_conditions:
+            bbox_conditions, bbox_params = self._bbox_conditions(label, start, stop)
+            conditions.append(
+                "(a.id IN (SELECT q.annotation_id FROM segments s JOIN sequences q ON s.sequence_id = q.id "
+                f"WHERE {' AND '.join(segment_conditions)}) "
+                f"OR a.id IN (SELECT b.annotation_id FROM bboxes b WHERE {' AND '.join(bbox_conditions)}))"
+            )
+            params.extend([*segment_params, *bbox_params])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f"SELECT a.id, a.annot_path, a.notated_path, a.kind, a.seq_is_list FROM annotations a{where}", params
+
+    def _iter_rows(self, query: str, params: list) -> Iterator[tuple]:
+        """Generator that yields the rows returned by a query,
+        reading them from the database in batches as they are needed"""
+        with self._lock:
+            cursor = self._connection.execute(query, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(256)
+            if not rows:
+                return
+            yield from rows
+
+    def _load_seq(self, seq_id: int) -> Sequence:
+        """Make the :class:`crowsetta.Sequence` with id ``seq_id`` from its segments"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT label, onset_s, offset_s, onset_sample, offset_sample FROM segments "
+                "WHERE sequence_id = ? ORDER BY id",
+                (seq_id,),
+            ).fetchall()
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in range(5)]
+        kwargs = {"labels": np.asarray(columns[0], dtype=str)}
+        for name, values, dtype in zip(
+            ("onsets_s", "offsets_s", "onset_samples", "offset_samples"), columns[1:], (float, float, int, int)
+        ):
+            column = _column(values, dtype)
+            if column is not None:
+                kwargs[name] = column
+        return Sequence.from_keyword(**kwargs)
+
+    def _load_bboxes(self, annot_id: int) -> List[BBox]:
+        """Make the :class:`crowsetta.BBox` instances of the annotation with id ``annot_id``"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT onset, offset, low_freq, high_freq, label FROM bboxes WHERE annotation_id = ? ORDER BY id",
+                (annot_id,),
+            ).fetchall()
+        return [
+            BBox(onset=onset, offset=offset, low_freq=low_freq, high_freq=high_freq, label=label)
+            for onset, offset, low_freq, high_freq, label in rows
+        ]
+
+    def iter_annots(
+        self,
+        annot_path: Optional[PathLike] = None,
+        notated_path: Optional[PathLike] = None,
+        label: Optional[str] = None,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+    ) -> Iterator[Annotation]:
+        """Generator that yields the annotations in the store
+        that match a query, in the order they were added.
+
+        Annotations match if they match all the arguments that are specified.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path, optional
+            Path to the file the annotation was loaded from.
+        notated_path : str, pathlib.Path, optional
+            Path to the file that the annotation annotates.
+        label : str, optional
+            Label of a segment or bounding box in the annotation.
+        start : float, optional
+            Start of a range of time, in seconds. If specified,
+            only annotations with a segment or bounding box that ends after
+            ``start`` match. Segments that only have onsets and offsets
+            in samples do not match ranges of time.
+        stop : float, optional
+            End of a range of time, in seconds. If specified,
+            only annotations with a segment or bounding box that starts before
+            ``stop`` match.
+            If ``label`` is also specified, the same segment or bounding box
+            must have the label and be in the range of time.
+
+        Yields
+        ------
+        annot : crowsetta.Annotation
+        """
+        query, params = self._annot_query(annot_path, notated_path, label, start, stop)
+        rows = self._iter_rows(f"{query} ORDER BY a.id", params)
+        for annot_id, annot_path_, notated_path_, kind, seq_is_list in rows:
+            if kind == "seq":
+                with self._lock:
+                    seq_ids = [
+                        seq_id for (seq_id,) in self._connection.execute(
+                            "SELECT id FROM sequences WHERE annotation_id = ? ORDER BY id", (annot_id,)
+                        )
+                    ]
+                seqs = [self._load_seq(seq_id) for seq_id in seq_ids]
+                yield Annotation(
+                    annot_path=annot_path_, notated_path=notated_path_, seq=seqs if seq_is_list else seqs[0]
+                )
+            else:
+                yield Annotation(annot_path=annot_path_, notated_path=notated_path_, bboxes=self._load_bboxes(annot_id))
+
+    def iter_seqs(
+        self,
+        notated_path: Optional[PathLike] = None,
+        label: Optional[str] = None,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+    ) -> Iterator[Sequence]:
+        """Generator that yields the sequences in the store
+        with a segment that matches a query, in the order they were added.
+
+        Parameters
+        ----------
+        notated_path : str, pathlib.Path, optional
+            Path to the file that the annotation with the sequence annotates.
+        label : str, optional
+            Label of a segment in the sequence.
+        start : float, optional
+            Start of a range of time, in seconds. If specified,
+            only sequences with a segment that ends after ``start`` match.
+        stop : float, optional
+            End of a range of time, in seconds. If specified,
+            only sequences with a segment that starts before ``stop`` match.
+
+        Yields
+        ------
+        seq : crowsetta.Sequence
+        """
+        conditions, params = self._segment_conditions(label, start, stop)
+        query = "SELECT q.id FROM sequences q"
+        where = []
+        if notated_path is not None:
+            query += " JOIN annotations a ON q.annotation_id = a.id"
+            where.append("a.notated_path = ?")
+            params.insert(0, str(notated_path))
+        if conditions:
+            where.append(f"q.id IN (SELECT s.sequence_id FROM segments s WHERE {' AND '.join(conditions)})")
+        if where:
+            query += f" WHERE {' AND '.join(where)}"
+        for (seq_id,) in self._iter_rows(f"{query} ORDER BY q.id", params):
+            yield self._load_seq(seq_id)
+
+    def iter_bboxes(
+        self,
+        label: Optional[str] = None,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+        low_freq: Optional[float] = None,
+        high_freq: Optional[float] = None,
+    ) -> Iterator[BBox]:
+        """Generator that yields the bounding boxes in the store
+        that match a query, in the order they were added.
+
+        If :attr:`~crowsetta.store.AnnotationStore.has_rtree` is True,
+        boxes in a range of time and frequency are found with the R*Tree index.
+
+        Parameters
+        ----------
+        label : str, optional
+            Label of the bounding box.
+        start, stop : float, optional
+            Range of time, in seconds. If specified, only boxes
+            that overlap the range match.
+        low_freq, high_freq : float, optional
+            Range of frequencies, in Hz. If specified, only boxes
+            that overlap the range match.
+
+        Yields
+        ------
+        bbox : crowsetta.BBox
+        """
+        conditions, params = self._bbox_conditions(label, start, stop, low_freq, high_freq)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT b.onset, b.offset, b.low_freq, b.high_freq, b.label FROM bboxes b{where} ORDER BY b.id"
+        for onset, offset, low_freq_, high_freq_, label_ in self._iter_rows(query, params):
+            yield BBox(onset=onset, offset=offset, low_freq=low_freq_, high_freq=high_freq_, label=label_)
+
+    def import_generic_seq(self, annot_path: PathLike, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Add the annotations in a csv file in ``'generic-seq'`` format to the store.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path
+            Path to a csv file in ``'generic-seq'`` format.
+        batch_size : int
+            Number of rows to insert into each table at once.
+            Default is ``DEFAULT_BATCH_SIZE``.
+
+        Returns
+        -------
+        n_annots : int
+            Number of annotations added.
+        """
+        from .formats.seq.generic import GenericSeq
+
+        return self.add(GenericSeq.from_file(annot_path).to_annot(), batch_size=batch_size)
+
+    def export_generic_seq(
+        self,
+        annot_path: PathLike,
+        notated_path: Optional[PathLike] = None,
+        label: Optional[str] = None,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+    ) -> int:
+        """Write sequence-like annotations in the store
+        to a csv file in ``'generic-seq'`` format.
+
+        Parameters
+        ----------
+        annot_path : str, pathlib.Path
+            Path including filename of csv file to write to,
+            will be created (or overwritten if it exists already).
+        notated_path, label, start, stop : optional
+            Query for the annotations to write,
+            see :meth:`~crowsetta.store.AnnotationStore.iter_annots`.
+            Default is None, in which case all sequence-like annotations are written.
+
+        Returns
+        -------
+        n_annots : int
+            Number of annotations written.
+        """
+        from .formats.seq.generic import GenericSeq
+
+        annots = [
+            annot
+            for annot in self.iter_annots(notated_path=notated_path, label=label, start=start, stop=stop)
+            if hasattr(annot, "seq")
+        ]
+        GenericSeq.from_annot(annots).to_file(pathlib.Path(annot_path))
+        return len(annots)
@@ -1,6 +1,121 @@
+import collections
+import concurrent.futures
+import functools
 import inspect
+import itertools
+import os
 import warnings
-from typing import Union
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+from . import archive
+from .typing import PathLike
+
+CONVERT_METHODS = ("to_annot", "to_seq", "to_bbox")
+
+
+def _from_file(format_class, format_name, cache, annot_path, args, kwargs):
+    """Load an annotation file, using ``cache`` if it is not None.
+    If ``format_class`` is None, the format is detected from the file."""
+    if format_class is None:
+        # avoid circular imports
+        from . import formats
+
+        if not isinstance(annot_path, (str, os.PathLike, archive.ArchiveMember)):
+            # wrap file objects once, so they are read from the same position
+            # to detect the format and then to load the file
+            annot_path = formats.source.as_source(annot_path)
+        format_name = formats.detect(annot_path)
+        format_class = formats.by_name(format_name)
+    if isinstance(annot_path, archive.ArchiveMember):
+        _check_accepts_buffers(format_class, format_name)
+    if cache is not None:
+        return cache.load(format_class, format_name, annot_path, *args, **kwargs)
+    return format_class.from_file(annot_path, *args, **kwargs)
+
+
+def _check_accepts_buffers(format_class, format_name) -> None:
+    """Check that a format can load a member of an archive,
+    i.e. that its ``from_file`` method accepts buffers."""
+    # avoid circular imports
+    from . import formats
+
+    if not formats.source.accepts_buffers(format_class):
+        raise ValueError(
+            f"Cannot load members of archives in format '{format_name}', "
+            "because its ``from_file`` method does not accept file objects, only paths"
+        )
+
+
+def _load_chunk(format_class, format_name, cache, annot_paths, args, kwargs, convert, convert_kwargs) -> list:
+    """Load a chunk of annotation files, and optionally convert them.
+
+    Helper function called by :meth:`crowsetta.Transcriber.iter_from_files`,
+    defined at the module level so that it can be sent to worker processes.
+    Each chunk is one task, and the results for a chunk
+    are sent back to the parent process together.
+    """
+    results = []
+    for annot_path in annot_paths:
+        result = _from_file(format_class, format_name, cache, annot_path, args, kwargs)
+        if convert is not None:
+            result = getattr(result, convert)(**convert_kwargs)
+        results.append(result)
+    return results
+
+
+def _make_pool(workers, executor):
+    """Get the pool of workers for ``workers`` and ``executor``,
+    and whether it should be shut down when it is no longer used.
+    The pool is None if ``workers`` is 1 and ``executor`` is not
+    an instance of :class:`concurrent.futures.Executor`,
+    in which case work is done in the current thread."""
+    if isinstance(executor, concurrent.futures.Executor):
+        return executor, False
+    elif workers == 1:
+        return None, False
+    elif executor == "process":
+        return concurrent.futures.ProcessPoolExecutor(max_workers=workers), True
+    else:
+        return concurrent.futures.ThreadPoolExecutor(max_workers=workers), True
+
+
+def _imap_chunks(function, items, workers, executor, chunksize) -> Iterator[Any]:
+    """Apply ``function`` to chunks of ``items`` concurrently,
+    and yield the results for each item in order.
+
+    ``function`` takes a list of items and returns a list of results,
+    one for each item. It must be picklable to be used with worker processes,
+    e.g. a module-level function or a :func:`functools.partial` of one.
+    Only a limited number of chunks are submitted ahead of the chunk
+    whose results are currently being yielded.
+    Used by :meth:`crowsetta.Transcriber.iter_from_files`
+    and by the command-line interface, :mod:`crowsetta.cli`.
+    """
+    pool, shutdown = _make_pool(workers, executor)
+    if pool is None:
+        for item in items:
+            yield from function([item])
+        return
+
+    items = iter(items)
+    # keep a few chunks pending for each worker, so workers are never idle
+    # but results do not pile up if the caller processes them slowly
+    max_pending = 2 * workers
+    pending = collections.deque()
+    try:
+        while True:
+            chunk = list(itertools.islice(items, chunksize))
+            if chunk:
+                pending.append(pool.submit(function, chunk))
+            if pending and (len(pending) >= max_pending or not chunk):
+                yield from pending.popleft().result()
+            elif not chunk:
+                break
+    finally:
+        for future in pending:
+            future.cancel()
+        if shutdown:
+            pool.shutdown(wait=True)
 
 
 class Transcriber:
@@ -33,7 +148,9 @@ class Transcriber:
         If a string, name of annotation format that the
         :class:`~crowsetta.Transcriber` will use.
         Must be one of the shorthand string names returned by
-        :func:`crowsetta.formats.as_list`.
+        :func:`crowsetta.formats.as_list`, or 'auto',
+        in which case the format of each file is detected
+        when it is loaded.
         If a class, must be one of the classes in
         :mod:`crowsetta.formats` that the shorthand strings refer to.
         You can register your own class using
@@ -43,9 +160,24 @@ class Transcriber:
         registered as either
         :class:`crowsetta.interface.seq.SeqLike` or
         :class:`crowsetta.interface.bbox.BBoxLike`.
+    cache : crowsetta.parsecache.ParseCache, None
+        Persistent on-disk cache of parsed files,
+        or None if files are always parsed.
+    memory_cache : crowsetta.parsecache.MemoryCache, None
+        In-memory cache of loaded files and their conversions,
+        or None if results are not kept in memory.
+
     Methods
     -------
     from_file : Loads annotations from a file
+    from_files : Loads annotations from many files concurrently
+    iter_from_files : Loads annotations from many files concurrently,
+        and returns an iterator over them
+    from_archive : Loads annotations from the files in a zip or tar archive
+    iter_from_archive : Loads annotations from the files in a zip or tar archive,
+        and returns an iterator over them
+    lazy_from_files : Makes lazy annotations for many files,
+        that are only parsed when they are used
 
     Examples
     --------
@@ -87,9 +219,32 @@ class Transcriber:
     >>> annots = [scribe.from_file(notmat_path).to_annot() for notmat_path in notmat_paths]
     >>> generic_seq = crowsetta.formats.seq.GenericSeq(annots)
     >>> generic_seq.to_csv('./data/bfsongrepo/notmats.csv')
+
+    The same set of annotations can be loaded and converted concurrently,
+    in a pool of worker processes, with the
+    :meth:`~crowsetta.Transcriber.from_files` method.
+
+    >>> annots = scribe.from_files(notmat_paths, convert='to_annot', workers=8)
+
+    Files in different formats can be loaded with one
+    :class:`~crowsetta.Transcriber`, by detecting the format of each file.
+
+    >>> scribe = crowsetta.Transcriber(format='auto')
+    >>> annots = scribe.from_files(annot_paths, convert='to_annot')
+
+    Files can be loaded directly from a zip or tar archive,
+    without extracting it first.
+
+    >>> scribe = crowsetta.Transcriber(format='notmat')
+    >>> annots = scribe.from_archive('./data/bfsongrepo.tar.gz', convert='to_annot', workers=8)
     """
 
-    def __init__(self, format: "Union[str, crowsetta.interface.SeqLike, crowsetta.interface.BBoxLike]"):  # noqa: F821
+    def __init__(
+        self,
+        format: "Union[str, crowsetta.interface.SeqLike, crowsetta.interface.BBoxLike]",  # noqa: F821
+        cache: "Union[bool, str, os.PathLike, crowsetta.parsecache.ParseCache, None]" = None,  # noqa: F821
+        memory_cache: "Union[bool, int, crowsetta.parsecache.MemoryCache, None]" = None,  # noqa: F821
+    ):
         """Initialize a new :class:`crowsetta.Transcriber` instance.
 
         Parameters
@@ -98,7 +253,9 @@ class Transcriber:
             If a string, name of annotation format that the
             :class:`~crowsetta.Transcriber` will use.
             Must be one of the shorthand string names returned by
-            :func:`crowsetta.formats.as_list`.
+            :func:`crowsetta.formats.as_list`, or 'auto'.
+            If 'auto', the format of each file is detected
+            when it is loaded, with :func:`crowsetta.formats.detect`.
             If a class, must be one of the classes in
             :mod:`crowsetta.formats` that the shorthand strings refer to.
             You can register your own class using
@@ -108,11 +265,32 @@ class Transcriber:
             registered as either
             :class:`crowsetta.interface.seq.SeqLike` or
             :class:`crowsetta.interface.bbox.BBoxLike`.
+        cache : bool, str, pathlib.Path, crowsetta.parsecache.ParseCache, optional
+            Persistent on-disk cache of parsed files, so that files
+            that have not changed since they were last loaded
+            are not parsed again. See :mod:`crowsetta.parsecache`.
+            If True, use a cache in the default directory,
+            returned by :func:`crowsetta.parsecache.default_cache_dir`.
+            If a path, use a cache in that directory.
+            Default is None, in which case files are always parsed.
+        memory_cache : bool, int, crowsetta.parsecache.MemoryCache, optional
+            In-memory least-recently-used cache of files loaded with
+            :meth:`~crowsetta.Transcriber.from_file` and of their conversions,
+            so that loading a file again that has not changed is just a lookup
+            in a :class:`dict`. See :class:`crowsetta.parsecache.MemoryCache`.
+            If True, use a cache with at most 128 entries.
+            If an int, use a cache with at most that many entries.
+            Each result is a new copy that can be modified, unless the cache
+            is a :class:`~crowsetta.parsecache.MemoryCache` made with ``copy=False``.
+            Default is None, in which case no results are kept in memory.
         """
         # avoid circular imports
-        from . import formats, interface
+        from . import formats, interface, parsecache
 
-        if isinstance(format, str):
+        if format == "auto":
+            # format is detected from each file when it is loaded
+            _format_class = None
+        elif isinstance(format, str):
             if format not in formats.FORMATS:
                 raise ValueError(f"Format name '{format}' not recognized." f"Valid format names:\n{formats.as_list()}")
             if format == "csv":
@@ -135,12 +313,40 @@ class Transcriber:
             raise ValueError(f"Invalid value for ``format``: {format}")
         self.format = format
         self._format_class = _format_class
+        # name used in keys of the parse cache
+        self._format_name = format if isinstance(format, str) else f"{format.__module__}.{format.__qualname__}"
+
+        if cache is None or cache is False:
+            cache = None
+        elif cache is True:
+            cache = parsecache.ParseCache()
+        elif isinstance(cache, (str, os.PathLike)):
+            cache = parsecache.ParseCache(cache_dir=cache)
+        elif not isinstance(cache, parsecache.ParseCache):
+            raise TypeError(
+                "``cache`` must be a bool, a path, or a ``crowsetta.parsecache.ParseCache``, "
+                f"but type was: {type(cache)}"
+            )
+        self.cache = cache
+
+        if memory_cache is None or memory_cache is False:
+            memory_cache = None
+        elif memory_cache is True:
+            memory_cache = parsecache.MemoryCache()
+        elif isinstance(memory_cache, int):
+            memory_cache = parsecache.MemoryCache(max_entries=memory_cache)
+        elif not isinstance(memory_cache, parsecache.MemoryCache):
+            raise TypeError(
+                "``memory_cache`` must be a bool, an int, or a ``crowsetta.parsecache.MemoryCache``, "
+                f"but type was: {type(memory_cache)}"
+            )
+        self.memory_cache = memory_cache
 
     def __repr__(self):
         return f"crowsetta.Transcriber(format='{self.format}')"
 
     def from_file(
-        self, annot_path, *args, **kwargs
+        self, annot_path, *args, convert: Optional[str] = None, convert_kwargs: Optional[dict] = None, **kwargs
     ) -> "Union[crowsetta.interface.SeqLike,crowsetta.interface.BBoxLike]":  # noqa: F821
         """Load annotations from a file.
 
@@ -148,12 +354,27 @@ class Transcriber:
         ----------
         annot_path : str, pathlib.Path
             Path to file containing annotations.
+        *args
+            Positional arguments passed to the ``from_file`` method
+            of the class referred to by ``self.format``.
+        convert : str, optional
+            Name of a method used to convert the loaded instance:
+            one of {'to_annot', 'to_seq', 'to_bbox'}.
+            Default is None, in which case the loaded instance is returned.
+            If this :class:`~crowsetta.Transcriber` has a ``memory_cache``,
+            the converted result is cached as well.
+        convert_kwargs : dict, optional
+            Keyword arguments passed to the ``convert`` method.
+        **kwargs
+            Keyword arguments passed to the ``from_file`` method
+            of the class referred to by ``self.format``.
 
         Returns
         -------
         annotations : class-instance
             An instance of the class referred to by ``self.format``,
-            with annotations loaded from ``annot_path``
+            with annotations loaded from ``annot_path``,
+            or, if ``convert`` is specified, the value returned by that method.
 
         Examples
         --------
@@ -198,5 +419,424 @@ class Transcriber:
         >>> annots = [scribe.from_file(notmat_path).to_annot() for notmat_path in notmat_paths]
         >>> generic_seq = crowsetta.formats.seq.GenericSeq(annots)
         >>> generic_seq.to_csv('./data/bfsongrepo/notmats.csv')
+
+        An example of caching files in memory,
+        e.g. for an application that loads the same files repeatedly.
+
+        >>> scribe = crowsetta.Transcriber('notmat', memory_cache=True)
+        >>> annot = scribe.from_file(notmat_paths[0], convert='to_annot')
+        >>> annot = scribe.from_file(notmat_paths[0], convert='to_annot')  # from cache
+        >>> scribe.memory_cache.cache_info()
+        MemoryCacheInfo(hits=1, misses=2, max_entries=128, max_bytes=None, entries=2, nbytes=0)
         """
-        return self._format_class.from_file(annot_path, *args, **kwargs)
+        self._validate_convert(convert)
+        if convert_kwargs is None:
+            convert_kwargs = {}
+
+        def load():
+            return _from_file(self._format_class, self._format_name, self.cache, annot_path, args, kwargs)
+
+        def load_and_convert(load):
+            result = load()
+            if convert is not None:
+                result = getattr(result, convert)(**convert_kwargs)
+            return result
+
+        if self.memory_cache is None:
+            return load_and_convert(load)
+        try:
+            key = (self._format_name, os.path.abspath(os.fsdecode(annot_path)), args, tuple(sorted(kwargs.items())))
+            convert_key = (convert, tuple(sorted(convert_kwargs.items())))
+            hash((key, convert_key))
+        except TypeError:
+            # arguments that are not hashable can't be part of a key, so we don't cache
+            return load_and_convert(load)
+
+        def load_cached():
+            return self.memory_cache.get_or_load((key, (None, ())), annot_path, load)
+
+        if convert is None:
+            return load_cached()
+        # look up the converted result first, so a hit is a single lookup;
+        # if it is a miss, the loaded instance may still be in the cache
+        return self.memory_cache.get_or_load((key, convert_key), annot_path, lambda: load_and_convert(load_cached))
+
+    def _validate_convert(self, convert: Optional[str]) -> None:
+        """Validate the ``convert`` argument to methods that load files"""
+        if convert is not None:
+            if convert not in CONVERT_METHODS:
+                raise ValueError(f"``convert`` must be one of {CONVERT_METHODS}, but was: {convert}")
+            # when the format is detected from each file, we can't check until a file is loaded
+            if self._format_class is not None and not callable(getattr(self._format_class, convert, None)):
+                raise ValueError(f"Format '{self.format}' does not have a method ``{convert}``")
+
+    def from_files(
+        self,
+        annot_paths: Iterable,
+        *args,
+        convert: Optional[str] = None,
+        convert_kwargs: Optional[dict] = None,
+        workers: Optional[int] = None,
+        executor: Union[str, concurrent.futures.Executor] = "process",
+        chunksize: int = 16,
+        readahead: Optional[int] = None,
+        io_workers: int = 4,
+        stats: "Optional[crowsetta.pipeline.PipelineStats]" = None,  # noqa: F821
+        **kwargs,
+    ) -> List[Any]:
+        """Load annotations from many files concurrently,
+        and optionally convert them at the same time.
+
+        Files are loaded by a pool of workers,
+        and results are returned in the same order as ``annot_paths``.
+        This method calls :meth:`~crowsetta.Transcriber.iter_from_files`
+        and returns all the results as a :class:`list`;
+        see that method for a description of the parameters.
+
+        Returns
+        -------
+        results : list
+            With one element for each path in ``annot_paths``:
+            an instance of the class referred to by ``self.format``,
+            or, if ``convert`` is specified, the value returned by that method.
+
+        Examples
+        --------
+        >>> import pathlib
+        >>> import crowsetta
+        >>> notmat_paths = sorted(pathlib.Path('./data/bfsongrepo').glob('*.not.mat'))
+        >>> scribe = crowsetta.Transcriber('notmat')
+        >>> annots = scribe.from_files(notmat_paths, convert='to_annot', workers=8)
+
+        Overlap reading files with parsing them,
+        e.g. for files on networked storage.
+
+        >>> stats = crowsetta.pipeline.PipelineStats()
+        >>> annots = scribe.from_files(notmat_paths, convert='to_annot', workers=8, readahead=64, stats=stats)
+        >>> print(stats)  # doctest: +SKIP
+        """
+        return list(
+            self.iter_from_files(
+                annot_paths,
+                *args,
+                convert=convert,
+                convert_kwargs=convert_kwargs,
+                workers=workers,
+                executor=executor,
+                chunksize=chunksize,
+                readahead=readahead,
+                io_workers=io_workers,
+                stats=stats,
+                **kwargs,
+            )
+        )
+
+    def iter_from_files(
+        self,
+        annot_paths: Iterable,
+        *args,
+        convert: Optional[str] = None,
+        convert_kwargs: Optional[dict] = None,
+        workers: Optional[int] = None,
+        executor: Union[str, concurrent.futures.Executor] = "process",
+        chunksize: int = 16,
+        readahead: Optional[int] = None,
+        io_workers: int = 4,
+        stats: "Optional[crowsetta.pipeline.PipelineStats]" = None,  # noqa: F821
+        **kwargs,
+    ) -> Iterator[Any]:
+        """Load annotations from many files concurrently,
+        and return an iterator over them, in the same order as ``annot_paths``.
+
+        Paths are split into chunks of ``chunksize`` files,
+        and each chunk is loaded by one worker.
+        Only a limited number of chunks are loaded ahead of the chunk
+        that the iterator is currently returning results from,
+        so results can be processed as they are loaded,
+        without holding all of them in memory at once.
+
+        Parameters
+        ----------
+        annot_paths : iterable
+            Of paths to files containing annotations.
+            Can be any iterable, including a generator.
+        *args
+            Positional arguments passed to the ``from_file`` method
+            of the class referred to by ``self.format``.
+        convert : str, optional
+            Name of a method used to convert each loaded instance:
+            one of {'to_annot', 'to_seq', 'to_bbox'}.
+            Files are converted by the same worker that loads them,
+            and only the converted result is returned.
+            Default is None, in which case the loaded instances are returned.
+        convert_kwargs : dict, optional
+            Keyword arguments passed to the ``convert`` method.
+        workers : int, optional
+            Number of workers. Default is None,
+            in which case the number of CPUs is used.
+            If 1, files are loaded one at a time in the current process,
+            without starting any workers.
+        executor : str, concurrent.futures.Executor
+            Either 'process', to load files in worker processes,
+            'thread', to load them in worker threads,
+            or an instance of :class:`concurrent.futures.Executor`
+            that is used as is, and not shut down.
+            Default is 'process'. Processes are faster for formats
+            whose parsing is done in Python, e.g. TextGrid files;
+            threads avoid the cost of sending results between processes.
+        chunksize : int
+            Number of files loaded by a worker in each task.
+            Default is 16.
+        readahead : int, optional
+            Maximum number of files to read ahead of the files being parsed.
+            If specified, files are loaded by a two-stage pipeline:
+            a pool of ``io_workers`` threads reads the bytes of files,
+            while the pool of ``workers`` parses files that were already read,
+            so that waiting on reads overlaps with parsing.
+            See :mod:`crowsetta.pipeline`.
+            Default is None, in which case each worker
+            reads and then parses each file.
+        io_workers : int
+            Number of threads that read files, when ``readahead`` is specified.
+            Default is 4.
+        stats : crowsetta.pipeline.PipelineStats, optional
+            Updated with counts and the time spent in each stage
+            while files are loaded, when ``readahead`` is specified.
+        **kwargs
+            Keyword arguments passed to the ``from_file`` method
+            of the class referred to by ``self.format``.
+
+        Returns
+        -------
+        results : iterator
+            That yields an instance of the class referred to by ``self.format``,
+            or, if ``convert`` is specified, the value returned by that method,
+            for each path in ``annot_paths``, in order.
+
+        Notes
+        -----
+        Any error raised while loading or converting a file
+        is raised by the iterator when it reaches that file.
+        When worker processes are used, results are sent back
+        to the parent process as one pickle per chunk,
+        and with ``readahead``, the bytes of the files in each chunk
+        are sent to a worker process the same way.
+        :class:`crowsetta.Sequence` instances are pickled as arrays,
+        without their segments, to make them compact.
+
+        Examples
+        --------
+        >>> import pathlib
+        >>> import crowsetta
+        >>> textgrid_paths = sorted(pathlib.Path('./data/textgrids').glob('*.TextGrid'))
+        >>> scribe = crowsetta.Transcriber('textgrid')
+        >>> for annot in scribe.iter_from_files(textgrid_paths, convert='to_annot', workers=8):
+        ...     print(annot.notated_path)
+        """
+        self._validate_convert(convert)
+        if convert_kwargs is None:
+            convert_kwargs = {}
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"``workers`` must be a positive integer, but was: {workers}")
+        if chunksize < 1:
+            raise ValueError(f"``chunksize`` must be a positive integer, but was: {chunksize}")
+        if readahead is not None and readahead < 1:
+            raise ValueError(f"``readahead`` must be a positive integer, but was: {readahead}")
+        if io_workers < 1:
+            raise ValueError(f"``io_workers`` must be a positive integer, but was: {io_workers}")
+        if stats is not None and readahead is None:
+            raise ValueError("``stats`` are only recorded when ``readahead`` is specified")
+
+        if not (isinstance(executor, concurrent.futures.Executor) or executor in ("process", "thread")):
+            raise ValueError(
+                "``executor`` must be 'process', 'thread', or an instance of "
+                f"concurrent.futures.Executor, but was: {executor}"
+            )
+        # validate arguments above when this method is called, not when iteration starts
+        return self._iter_from_files(
+            annot_paths,
+            args,
+            kwargs,
+            convert,
+            convert_kwargs,
+            workers,
+            executor,
+            chunksize,
+            readahead,
+            io_workers,
+            stats,
+        )
+
+    def from_archive(self, archive_path: PathLike, *args, **kwargs) -> List[Any]:
+        """Load annotations from the files in a zip or tar archive concurrently,
+        without extracting the archive.
+
+        This method calls :meth:`~crowsetta.Transcriber.iter_from_archive`
+        and returns all the results as a :class:`list`;
+        see that method for a description of the parameters.
+
+        Examples
+        --------
+        >>> scribe = crowsetta.Transcriber('textgrid')
+        >>> annots = scribe.from_archive('./data/textgrids.zip', convert='to_annot', workers=8)
+        """
+        return list(self.iter_from_archive(archive_path, *args, **kwargs))
+
+    def iter_from_archive(self, archive_path: PathLike, *args, **kwargs) -> Iterator[Any]:
+        """Load annotations from the files in a zip or tar archive concurrently,
+        without extracting the archive,
+        and return an iterator over them, in the order they are stored in the archive.
+
+        The files loaded are the members of the archive with the extension
+        of the format of this :class:`~crowsetta.Transcriber`,
+        including members compressed with gzip, bzip2 or xz,
+        or all the members if the format is 'auto'.
+        Each worker reads members with its own handle to the archive.
+        See :mod:`crowsetta.archive`.
+
+        Parameters
+        ----------
+        archive_path : str, pathlib.Path
+            Path to a zip or tar archive, that may be compressed,
+            e.g. a .tar.gz file.
+        *args, **kwargs
+            Passed to :meth:`~crowsetta.Transcriber.iter_from_files`,
+            including the arguments that control the pool of workers
+            and the ``from_file`` method of the class referred to by ``self.format``.
+
+        Returns
+        -------
+        results : iterator
+            That yields an instance of the class referred to by ``self.format``,
+            or, if ``convert`` is specified, the value returned by that method,
+            for each file in the archive. The ``annot_path`` of each is
+            the path to the file as if the archive were a directory,
+            i.e. ``archive_path / name``.
+
+        Examples
+        --------
+        >>> scribe = crowsetta.Transcriber('textgrid')
+        >>> for annot in scribe.iter_from_archive('./data/textgrids.tar.gz', convert='to_annot', workers=8):
+        ...     print(annot.annot_path)
+        """
+        ext = getattr(self._format_class, "ext", None) if self._format_class is not None else None
+        members = archive.list_members(archive_path, ext=ext)
+        # close the handle opened to list the members before any workers start,
+        # so that worker processes forked from this one do not inherit it
+        archive.close_handles()
+        # validate arguments when this method is called, not when iteration starts
+        results = self.iter_from_files(members, *args, **kwargs)
+
+        def iter_results():
+            try:
+                yield from results
+            finally:
+                # close the handle opened to list the members, and any opened to load them in this thread
+                archive.close_handles()
+
+        return iter_results()
+
+    def lazy_from_files(
+        self, annot_paths: Iterable[PathLike], *args, notated_paths: Optional[Iterable[PathLike]] = None, **kwargs
+    ) -> "List[crowsetta.lazy.LazyAnnotation]":  # noqa: F821
+        """Make lazy annotations for many files, without parsing the files.
+
+        Each file is parsed the first time its annotations are used,
+        or, to parse many files concurrently, with :func:`crowsetta.lazy.load`.
+        See :mod:`crowsetta.lazy`.
+
+        Parameters
+        ----------
+        annot_paths : iterable
+            Of paths to files containing annotations.
+        *args
+            Positional arguments passed to the ``from_file`` method
+            of the class referred to by ``self.format``.
+        notated_paths : iterable, optional
+            Of paths to the files that each file in ``annot_paths`` annotates,
+            if they are known without parsing the annotation files.
+            Default is None, in which case the ``notated_path``
+            of each lazy annotation is the one of the loaded annotation.
+        **kwargs
+            Keyword arguments passed to the ``from_file`` method
+            of the class referred to by ``self.format``.
+
+        Returns
+        -------
+        lazy_annots : list
+            Of :class:`crowsetta.lazy.LazyAnnotation`,
+            one for each path in ``annot_paths``, that are loaded with this
+            :class:`~crowsetta.Transcriber`, so they use its caches.
+
+        Examples
+        --------
+        >>> scribe = crowsetta.Transcriber('notmat')
+        >>> lazy_annots = scribe.lazy_from_files(notmat_paths)
+        >>> small = [lazy_annot for lazy_annot in lazy_annots if lazy_annot.size < 2**16]
+        >>> crowsetta.lazy.load(small, workers=8)
+        """
+        # avoid circular imports
+        from .lazy import LazyAnnotation
+
+        annot_paths = list(annot_paths)
+        if notated_paths is None:
+            notated_paths = [None] * len(annot_paths)
+        else:
+            notated_paths = list(notated_paths)
+            if len(notated_paths) != len(annot_paths):
+                raise ValueError(
+                    f"``notated_paths`` must have one path for each path in ``annot_paths``, "
+                    f"but there were {len(notated_paths)} notated paths and {len(annot_paths)} annotation paths"
+                )
+        return [
+            LazyAnnotation(annot_path, self, notated_path=notated_path, args=args, kwargs=kwargs)
+            for annot_path, notated_path in zip(annot_paths, notated_paths)
+        ]
+
+    def _iter_from_files(
+        self,
+        annot_paths,
+        args,
+        kwargs,
+        convert,
+        convert_kwargs,
+        workers,
+        executor,
+        chunksize,
+        readahead,
+        io_workers,
+        stats,
+    ) -> Iterator[Any]:
+        """Generator that implements :meth:`~crowsetta.Transcriber.iter_from_files`"""
+        if readahead is not None:
+            # avoid circular imports
+            from . import pipeline
+
+            parse_chunk = functools.partial(
+                pipeline._parse_chunk,
+                self._format_class,
+                self._format_name,
+                self.cache,
+                args=args,
+                kwargs=kwargs,
+                convert=convert,
+                convert_kwargs=convert_kwargs,
+            )
+            yield from pipeline.imap_pipelined(
+                parse_chunk, annot_paths, workers, executor, chunksize, readahead, io_workers, stats
+            )
+            return
+
+        load_chunk = functools.partial(
+            _load_chunk,
+            self._format_class,
+            self._format_name,
+            self.cache,
+            args=args,
+            kwargs=kwargs,
+            convert=convert,
+            convert_kwargs=convert_kwargs,
+        )
+        yield from _imap_chunks(load_chunk, annot_paths, workers, executor, chunksize)
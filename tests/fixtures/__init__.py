@@ -1,3 +1,4 @@
+from .annotation import *
 from .audbbox import *
 from .audseq import *
 from .bbox import *
@@ -5,6 +6,7 @@ from .birdsongrec import *
 from .csv import *
 from .data import *
 from .example_user_format import *
+from .matv73 import *
 from .notmat import *
 from .raven import *
 from .segment import *
@@ -0,0 +1,18 @@
+import pytest
+
+import crowsetta
+
+
+@pytest.fixture
+def seq_annots(notmat_paths):
+    """Sequence-like annotations, converted from .not.mat files"""
+    return [crowsetta.formats.seq.NotMat.from_file(notmat_path).to_annot() for notmat_path in notmat_paths[:4]]
+
+
+@pytest.fixture
+def bbox_annots(raven_txt_files, raven_dataset_annot_col):
+    """Bounding box annotations, converted from Raven .txt files"""
+    return [
+        crowsetta.formats.bbox.Raven.from_file(raven_txt_file, annot_col=raven_dataset_annot_col).to_annot()
+        for raven_txt_file in raven_txt_files[:2]
+    ]
@@ -0,0 +1,65 @@
+"""Helper for writing MATLAB v7.3 .mat files in tests,
+with the same layout that MATLAB uses,
+so we can test loading them without needing MATLAB"""
+import numpy as np
+import pytest
+
+MATV73_HEADER = b"MATLAB 7.3 MAT-file, Platform: GLNXA64, Created on: Mon Jan  1 00:00:00 2024 HDF5 schema 1.00 ."
+
+
+def _write_var(h5py, group, name, value, struct_array=False):
+    """Write a variable the way MATLAB does:
+    strings as char arrays, dicts as structs, lists as cell arrays
+    (or as struct arrays, if ``struct_array`` is True and items are dicts),
+    and anything else as an array of doubles"""
+    if isinstance(value, str):
+        if value:
+            data = np.frombuffer(value.encode("utf-16-le"), dtype="<u2").reshape(-1, 1)
+            dataset = group.create_dataset(name, data=data)
+        else:
+            dataset = group.create_dataset(name, data=np.array([0, 0], dtype=np.uint64))
+            dataset.attrs["MATLAB_empty"] = np.uint8(1)
+        dataset.attrs["MATLAB_class"] = np.bytes_("char")
+    elif isinstance(value, dict):
+        subgroup = group.create_group(name)
+        subgroup.attrs["MATLAB_class"] = np.bytes_("struct")
+        for field, field_value in value.items():
+            _write_var(h5py, subgroup, field, field_value)
+    elif isinstance(value, list):
+        refs_group = group.file.require_group("#refs#")
+        if struct_array:
+            subgroup = group.create_group(name)
+            subgroup.attrs["MATLAB_class"] = np.bytes_("struct")
+            for field in value[0]:
+                refs = []
+                for item in value:
+                    ref_name = str(len(refs_group))
+                    _write_var(h5py, refs_group, ref_name, item[field])
+                    refs.append(refs_group[ref_name].ref)
+                subgroup.create_dataset(field, data=np.array(refs, dtype=h5py.ref_dtype).reshape(-1, 1))
+        else:
+            refs = []
+            for item in value:
+                ref_name = str(len(refs_group))
+                _write_var(h5py, refs_group, ref_name, item)
+                refs.append(refs_group[ref_name].ref)
+            dataset = group.create_dataset(name, data=np.array(refs, dtype=h5py.ref_dtype).reshape(-1, 1))
+            dataset.attrs["MATLAB_class"] = np.bytes_("cell")
+    else:
+        # MATLAB arrays are column-major, so a 1 x N row vector is saved with shape (N, 1)
+        dataset = group.create_dataset(name, data=np.atleast_2d(np.asarray(value, dtype=float)).T)
+        dataset.attrs["MATLAB_class"] = np.bytes_("double")
+
+
+def write_matv73(mat_path, variables, struct_arrays=()):
+    """Write a :class:`dict` of variables to a MATLAB v7.3 .mat file.
+
+    Names of variables in ``struct_arrays`` that are lists of dicts
+    are saved as struct arrays instead of cell arrays of structs."""
+    h5py = pytest.importorskip("h5py")
+    with h5py.File(mat_path, "w", userblock_size=512) as mat_file:
+        for name, value in variables.items():
+            _write_var(h5py, mat_file, name, value, struct_array=name in struct_arrays)
+    # header in the userblock, like a v5 header with version 0x0200
+    with open(mat_path, "r+b") as fp:
+        fp.write(MATV73_HEADER.ljust(116) + b"\x00" * 8 + b"\x00\x02" + b"IM")
@@ -1,6 +1,10 @@
 import pytest
+import scipy.io
+
+import crowsetta
 
 from .data import TEST_DATA_ROOT
+from .matv73 import write_matv73
 
 NOTMATS_ROOT = TEST_DATA_ROOT / "cbins/gy6or6/032312"
 
@@ -23,3 +27,27 @@ def notmat_paths(notmats_root):
 @pytest.fixture(params=NOTMATS)
 def a_notmat_path(request):
     return request.param
+
+
+@pytest.fixture
+def a_notmat_v73_path(a_notmat_path, tmp_path):
+    """A copy of a .not.mat file, saved as a MATLAB v7.3 file"""
+    notmat_dict = scipy.io.loadmat(a_notmat_path, squeeze_me=True)
+    notmat_dict = {key: val for key, val in notmat_dict.items() if not key.startswith("__")}
+    notmat_v73_path = tmp_path / a_notmat_path.name
+    write_matv73(notmat_v73_path, notmat_dict)
+    return notmat_v73_path
+
+
+@pytest.fixture
+def count_parsed(monkeypatch):
+    """Count the number of times that NotMat files are parsed"""
+    parsed = []
+    from_file = crowsetta.formats.seq.NotMat.from_file
+
+    def from_file_counts(*args, **kwargs):
+        parsed.append(args)
+        return from_file(*args, **kwargs)
+
+    monkeypatch.setattr(crowsetta.formats.seq.NotMat, "from_file", from_file_counts)
+    return parsed
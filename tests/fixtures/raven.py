@@ -37,3 +37,55 @@ def raven_dataset_annot_col():
 @pytest.fixture
 def raven_txt_file_with_no_rows():
     return RAVEN_TXT_FILE_WITH_NO_ROWS
+
+
+RAVEN_MULTI_FILE_COLUMNS = [
+    "Selection",
+    "View",
+    "Channel",
+    "Begin Time (s)",
+    "End Time (s)",
+    "Low Freq (Hz)",
+    "High Freq (Hz)",
+    "Begin File",
+    "File Offset (s)",
+    "Annotation",
+]
+
+
+def make_raven_multi_file_rows(n_files=4, n_per_file=3, file_dur=60.0):
+    """Make rows of a Raven selection table that spans ``n_files`` audio files,
+    each ``file_dur`` seconds long, with ``n_per_file`` selections in each file"""
+    rows = []
+    for file_num in range(n_files):
+        for selection_num in range(n_per_file):
+            file_offset = 1.0 + 10.0 * selection_num
+            begin_time = file_num * file_dur + file_offset
+            rows.append(
+                [
+                    len(rows) + 1,
+                    "Spectrogram 1",
+                    1,
+                    begin_time,
+                    begin_time + 0.5,
+                    1000.0 + selection_num,
+                    5000.0 + selection_num,
+                    f"rec_{file_num:03}.wav",
+                    file_offset,
+                    f"call{selection_num}",
+                ]
+            )
+    return rows
+
+
+@pytest.fixture
+def raven_multi_file_txt(tmp_path):
+    """Raven selection table that spans multiple audio files,
+    with 'Begin File' and 'File Offset (s)' columns"""
+    txt_path = tmp_path / "multi_file.Table.1.selections.txt"
+    rows = make_raven_multi_file_rows()
+    with txt_path.open("w") as fp:
+        fp.write("\t".join(RAVEN_MULTI_FILE_COLUMNS) + "\n")
+        for row in rows:
+            fp.write("\t".join(str(val) for val in row) + "\n")
+    return txt_path
@@ -1,6 +1,60 @@
+import numpy as np
 import pytest
+import scipy.io
+
+from .matv73 import write_matv73
 
 
 @pytest.fixture
 def yarden_annot_mat(test_data_root):
     return test_data_root / "audio_wav_annot_yarden" / "llb16_annotation_May_2019_alexa_4TF.mat"
+
+
+YARDEN_ELEMENT_FIELDS = ("segAbsStartTimes", "segFileStartTimes", "segFileEndTimes", "segType", "fs")
+
+
+def make_yarden_synthetic_songs(n_songs=12):
+    """Make annotations for songs with the same fields as those saved by SongAnnotationGUI.
+    Includes songs with only one segment, and songs with different sampling rates."""
+    rng = np.random.default_rng(42)
+    songs = []
+    for song_ind in range(n_songs):
+        n_segments = song_ind % 4 + 1
+        onsets_s = np.sort(rng.random(n_segments)) * 10
+        songs.append(
+            {
+                "segAbsStartTimes": onsets_s,
+                "segFileStartTimes": onsets_s,
+                "segFileEndTimes": onsets_s + 0.005,
+                "segType": rng.integers(0, 10, n_segments).astype(float),
+                "fs": 32000.0 if song_ind % 2 else 48000.0,
+            }
+        )
+    keys = [f"song{song_ind}.wav" for song_ind in range(n_songs)]
+    return keys, songs
+
+
+@pytest.fixture(scope="session")
+def yarden_synthetic_annot_mat(tmp_path_factory):
+    """A small .mat file with the same structure as those saved by SongAnnotationGUI:
+    a cell array of filenames, ``keys``, and a cell array of 1x1 structs, ``elements``."""
+    keys, songs = make_yarden_synthetic_songs()
+    elements = np.empty(len(songs), dtype=object)
+    for song_ind, song in enumerate(songs):
+        element = np.empty((1, 1), dtype=[(field, "O") for field in YARDEN_ELEMENT_FIELDS])
+        element[0, 0] = tuple(song[field] for field in YARDEN_ELEMENT_FIELDS)
+        elements[song_ind] = element
+    annot_path = tmp_path_factory.mktemp("yarden") / "synthetic_annotation.mat"
+    scipy.io.savemat(annot_path, {"keys": np.array(keys, dtype=object), "elements": elements})
+    return annot_path
+
+
+@pytest.fixture(scope="session", params=["cell", "struct"])
+def yarden_synthetic_annot_mat_v73(request, tmp_path_factory):
+    """The same annotations as ``yarden_synthetic_annot_mat``, saved as a MATLAB v7.3 file,
+    with ``elements`` either a cell array of structs or a struct array"""
+    keys, songs = make_yarden_synthetic_songs()
+    annot_path = tmp_path_factory.mktemp("yarden") / f"synthetic_annotation_v73_{request.param}.mat"
+    struct_arrays = ("elements",) if request.param == "struct" else ()
+    write_matv73(annot_path, {"keys": keys, "elements": songs}, struct_arrays=struct_arrays)
+    return annot_path
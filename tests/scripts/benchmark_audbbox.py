@@ -0,0 +1,50 @@
+"""
+benchmarks loading and saving Audacity extended label tracks
+with ``crowsetta.formats.bbox.AudBBox``, for files with increasing numbers of labels,
+like those exported from spectrogram views with many boxes.
+
+Run with ``python tests/scripts/benchmark_audbbox.py``.
+"""
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+import crowsetta
+
+N_LABELS = (100, 10_000, 100_000)
+N_REPEATS = 5
+
+
+def make_audbbox_txt(dst_dir, n_labels):
+    """Save a txt file in Audacity extended label track format with ``n_labels`` labels"""
+    rng = np.random.default_rng(42)
+    begin_times = np.cumsum(rng.uniform(0.01, 0.5, size=n_labels))
+    end_times = begin_times + rng.uniform(0.01, 0.2, size=n_labels)
+    low_freqs = rng.uniform(500.0, 4000.0, size=n_labels)
+    high_freqs = low_freqs + rng.uniform(100.0, 4000.0, size=n_labels)
+    labels = rng.choice(list("abcdefghij"), size=n_labels)
+    txt_path = Path(dst_dir) / f"labels_{n_labels}.txt"
+    with txt_path.open("w") as fp:
+        for begin, end, label, low, high in zip(begin_times, end_times, labels, low_freqs, high_freqs):
+            fp.write(f"{begin:f}\t{end:f}\t{label}\n\\\t{low:f}\t{high:f}\n")
+    return txt_path
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"{'n labels':>10} {'from_file (ms)':>16} {'to_file (ms)':>14}")
+        for n_labels in N_LABELS:
+            txt_path = make_audbbox_txt(tmp_dir, n_labels)
+            audbbox = crowsetta.formats.bbox.AudBBox.from_file(txt_path)
+            out_path = Path(tmp_dir) / "out.txt"
+            from_file_time = min(
+                timeit.repeat(lambda: crowsetta.formats.bbox.AudBBox.from_file(txt_path), number=1, repeat=N_REPEATS)
+            )
+            to_file_time = min(timeit.repeat(lambda: audbbox.to_file(out_path), number=1, repeat=N_REPEATS))
+            print(f"{n_labels:>10} {from_file_time * 1e3:>16.3f} {to_file_time * 1e3:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+benchmarks parsing Annotation.xml files from the BirdsongRecognition dataset
+with ``crowsetta.formats.seq.birdsongrec.parse_xml``, that streams the file into flat arrays,
+against ``birdsongrec.parse_xml``, that parses the whole file into a tree
+and then creates one object per sequence and per syllable.
+
+Reports time and peak memory use, measured with ``tracemalloc``,
+for copies of the test Annotation.xml with the sequences repeated
+to make files of increasing size.
+
+Run with ``python tests/scripts/benchmark_birdsongrec.py``.
+"""
+import re
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import birdsongrec
+
+import crowsetta
+
+HERE = Path(__file__).parent
+TEST_DATA = HERE.joinpath("..", "data_for_tests")
+XML_PATH = TEST_DATA / "birdsongrec/Bird0/Annotation.xml"
+
+N_REPEATS = (1, 10, 100)
+
+
+def make_xml_with_repeats(dst_dir, n_repeats):
+    """Save a copy of the test Annotation.xml with its sequences repeated ``n_repeats`` times"""
+    xml_str = XML_PATH.read_text()
+    sequences = "".join(re.findall(r"<Sequence>.*?</Sequence>", xml_str, flags=re.DOTALL))
+    head, tail = xml_str.split("<Sequence>", 1)[0], "</Sequences>\n"
+    xml_path = Path(dst_dir) / f"Annotation_{n_repeats}.xml"
+    with xml_path.open("w") as fp:
+        fp.write(head)
+        for _ in range(n_repeats):
+            fp.write(sequences)
+        fp.write(tail)
+    return xml_path
+
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    tic = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - tic
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(
+            f"{'file size (MB)':>16} {'birdsongrec (s)':>16} {'birdsongrec (MB)':>17} "
+            f"{'crowsetta (s)':>14} {'crowsetta (MB)':>15}"
+        )
+        for n_repeats in N_REPEATS:
+            xml_path = make_xml_with_repeats(tmp_dir, n_repeats)
+            _, birdsongrec_time, birdsongrec_peak = measure(
+                birdsongrec.parse_xml, xml_path, concat_seqs_into_songs=True
+            )
+            _, crowsetta_time, crowsetta_peak = measure(
+                crowsetta.formats.seq.birdsongrec.parse_xml, xml_path, concat_seqs_into_songs=True
+            )
+            file_size = xml_path.stat().st_size / 1e6
+            print(
+                f"{file_size:>16.2f} {birdsongrec_time:>16.3f} {birdsongrec_peak:>17.1f} "
+                f"{crowsetta_time:>14.3f} {crowsetta_peak:>15.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
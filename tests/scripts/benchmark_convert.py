@@ -0,0 +1,69 @@
+"""
+benchmarks converting between annotation formats
+directly with array adapters, with ``crowsetta.formats.adapters.convert``,
+compared with converting through ``crowsetta.Annotation``
+with ``to_annot`` and ``from_annot``,
+for annotations with increasing numbers of segments and bounding boxes.
+
+Run with ``python tests/scripts/benchmark_convert.py``.
+"""
+import pathlib
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import crowsetta
+
+N_ROWS = (100, 10_000, 100_000)
+N_REPEATS = 5
+
+
+def make_raven(n_rows):
+    rng = np.random.default_rng(42)
+    begin_times = np.cumsum(rng.uniform(0.01, 0.5, size=n_rows))
+    low_freqs = rng.uniform(500.0, 4000.0, size=n_rows)
+    df = pd.DataFrame(
+        {
+            "begin_time_s": begin_times,
+            "end_time_s": begin_times + rng.uniform(0.01, 0.2, size=n_rows),
+            "low_freq_hz": low_freqs,
+            "high_freq_hz": low_freqs + rng.uniform(100.0, 4000.0, size=n_rows),
+            "annotation": pd.array(rng.choice(list("abcdefghij"), size=n_rows), dtype="string"),
+        }
+    )
+    return crowsetta.formats.bbox.Raven(df=df, annot_path=pathlib.Path("selections.txt"), annot_col="Species")
+
+
+def make_audseq(n_rows):
+    rng = np.random.default_rng(42)
+    start_times = np.cumsum(rng.uniform(0.01, 0.5, size=n_rows))
+    return crowsetta.formats.seq.AudSeq(
+        start_times=start_times,
+        end_times=start_times + rng.uniform(0.005, 0.01, size=n_rows),
+        labels=rng.choice(list("abcdefghij"), size=n_rows),
+        annot_path=pathlib.Path("labels.txt"),
+    )
+
+
+def main():
+    print(f"{'conversion':>22} {'n rows':>8} {'annotation (ms)':>16} {'adapters (ms)':>14}")
+    for description, make, to_class in (
+        ("raven -> aud-bbox", make_raven, crowsetta.formats.bbox.AudBBox),
+        ("aud-seq -> simple-seq", make_audseq, crowsetta.formats.seq.SimpleSeq),
+    ):
+        for n_rows in N_ROWS:
+            format_obj = make(n_rows)
+            annot_time = min(
+                timeit.repeat(lambda: to_class.from_annot(format_obj.to_annot()), number=1, repeat=N_REPEATS)
+            )
+            adapter_time = min(
+                timeit.repeat(
+                    lambda: crowsetta.formats.adapters.convert(format_obj, to_class), number=1, repeat=N_REPEATS
+                )
+            )
+            print(f"{description:>22} {n_rows:>8} {annot_time * 1e3:>16.3f} {adapter_time * 1e3:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+benchmarks loading .not.mat files with ``crowsetta.formats.seq.notmat.load_notmat``,
+that only reads the variables needed for annotations,
+against ``evfuncs.load_notmat``, that reads every variable in the file.
+
+Run with ``python tests/scripts/benchmark_notmat.py``.
+"""
+import tempfile
+import timeit
+from pathlib import Path
+
+import evfuncs
+import numpy as np
+import scipy.io
+
+import crowsetta
+
+HERE = Path(__file__).parent
+TEST_DATA = HERE.joinpath("..", "data_for_tests")
+NOTMAT_PATH = TEST_DATA / "cbins/gy6or6/032312/gy6or6_baseline_230312_0808.138.cbin.not.mat"
+
+# sizes of an extra array saved in the file, in number of float64 elements
+EXTRA_SIZES = (0, 10_000, 1_000_000, 10_000_000)
+N_REPEATS = 5
+
+
+def make_notmat_with_extra_var(dst_dir, extra_size):
+    """Save a copy of the test .not.mat with an extra array,
+    like one added with the ``other_vars`` argument to ``NotMat.to_file``"""
+    notmat_dict = scipy.io.loadmat(NOTMAT_PATH, squeeze_me=True)
+    notmat_dict = {key: val for key, val in notmat_dict.items() if not key.startswith("__")}
+    notmat_dict["pitches"] = np.random.default_rng().random(extra_size)
+    notmat_path = Path(dst_dir) / f"extra_{extra_size}.cbin.not.mat"
+    scipy.io.savemat(notmat_path, notmat_dict)
+    return notmat_path
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"{'extra var size':>16} {'file size (MB)':>16} {'evfuncs (ms)':>14} {'crowsetta (ms)':>16}")
+        for extra_size in EXTRA_SIZES:
+            notmat_path = make_notmat_with_extra_var(tmp_dir, extra_size)
+            evfuncs_time = min(
+                timeit.repeat(lambda: evfuncs.load_notmat(notmat_path), number=1, repeat=N_REPEATS)
+            )
+            crowsetta_time = min(
+                timeit.repeat(
+                    lambda: crowsetta.formats.seq.notmat.load_notmat(notmat_path), number=1, repeat=N_REPEATS
+                )
+            )
+            file_size = notmat_path.stat().st_size / 1e6
+            print(
+                f"{extra_size:>16} {file_size:>16.2f} {evfuncs_time * 1e3:>14.3f} {crowsetta_time * 1e3:>16.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+benchmarks loading many annotation files with ``crowsetta.Transcriber.from_files``,
+with and without ``readahead``, i.e. with the two-stage pipeline in ``crowsetta.pipeline``
+that overlaps reading files with parsing them, and prints the time spent in each stage.
+
+Run with ``python tests/scripts/benchmark_pipeline.py``.
+Use ``--n-files`` to change how many files are loaded (copies of the test data are loaded repeatedly),
+and ``--root`` to load copies of the test data from another directory,
+e.g. one on networked storage, where the pipeline makes the most difference.
+"""
+import argparse
+import itertools
+import shutil
+import time
+from pathlib import Path
+
+import crowsetta
+
+HERE = Path(__file__).parent
+TEST_DATA = HERE.joinpath("..", "data_for_tests")
+FORMAT_GLOBS = {
+    "notmat": "cbins/gy6or6/032312/*.not.mat",
+    "textgrid": "textgrid/calhoun-et-al-2022/**/*.TextGrid",
+}
+
+
+def main(n_files, root, workers, readahead):
+    print(f"{'format':>10} {'readahead':>10} {'time (s)':>10} {'files/s':>10}")
+    for format_name, glob in FORMAT_GLOBS.items():
+        annot_paths = sorted(TEST_DATA.glob(glob))
+        if root is not None:
+            # copy the test data, so it is read from ``root``
+            format_root = Path(root) / format_name
+            format_root.mkdir(parents=True, exist_ok=True)
+            annot_paths = [Path(shutil.copy(annot_path, format_root)) for annot_path in annot_paths]
+        annot_paths = list(itertools.islice(itertools.cycle(annot_paths), n_files))
+        scribe = crowsetta.Transcriber(format=format_name)
+
+        for readahead_ in (None, readahead):
+            stats = crowsetta.pipeline.PipelineStats() if readahead_ is not None else None
+            tic = time.perf_counter()
+            scribe.from_files(
+                annot_paths, convert="to_annot", workers=workers, chunksize=32, readahead=readahead_, stats=stats
+            )
+            elapsed = time.perf_counter() - tic
+            print(f"{format_name:>10} {str(readahead_):>10} {elapsed:>10.2f} {n_files / elapsed:>10.0f}")
+            if stats is not None:
+                print(f"{'':>10} {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-files", type=int, default=5_000)
+    parser.add_argument("--root", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--readahead", type=int, default=256)
+    args = parser.parse_args()
+    main(args.n_files, args.root, args.workers, args.readahead)
@@ -0,0 +1,80 @@
+"""
+benchmarks loading Raven selection tables with ``crowsetta.formats.bbox.Raven.from_file``,
+that only reads the columns needed for annotations,
+against reading every column with ``pandas.read_csv``,
+for tables with increasing numbers of measurement columns.
+
+Run with ``python tests/scripts/benchmark_raven.py``.
+"""
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import crowsetta
+
+N_ROWS = 100_000
+N_MEASUREMENT_COLUMNS = (0, 20, 60)
+N_REPEATS = 3
+
+
+def make_raven_txt(dst_dir, n_measurement_columns):
+    """Save a Raven selection table with ``N_ROWS`` rows and extra measurement columns"""
+    rng = np.random.default_rng(42)
+    begin_times = np.cumsum(rng.uniform(0.01, 0.5, size=N_ROWS))
+    low_freqs = rng.uniform(500.0, 4000.0, size=N_ROWS)
+    columns = {
+        "Selection": np.arange(1, N_ROWS + 1),
+        "View": "Spectrogram 1",
+        "Channel": 1,
+        "Begin Time (s)": begin_times,
+        "End Time (s)": begin_times + rng.uniform(0.01, 0.2, size=N_ROWS),
+        "Low Freq (Hz)": low_freqs,
+        "High Freq (Hz)": low_freqs + rng.uniform(100.0, 4000.0, size=N_ROWS),
+    }
+    for column_num in range(n_measurement_columns):
+        columns[f"Measurement {column_num}"] = rng.uniform(size=N_ROWS)
+    columns["Annotation"] = rng.choice(["EATO", "WOTH", "BCCH"], size=N_ROWS)
+    txt_path = Path(dst_dir) / f"table_{n_measurement_columns}.Table.1.selections.txt"
+    pd.DataFrame(columns).to_csv(txt_path, sep="\t", index=False)
+    return txt_path
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(
+            f"{'n columns':>10} {'read_csv (ms)':>14} {'from_file (ms)':>15} "
+            f"{'read_csv (MB)':>14} {'from_file (MB)':>15}"
+        )
+        for n_measurement_columns in N_MEASUREMENT_COLUMNS:
+            txt_path = make_raven_txt(tmp_dir, n_measurement_columns)
+
+            def read_csv():
+                return pd.read_csv(txt_path, sep="\t")
+
+            def from_file():
+                return crowsetta.formats.bbox.Raven.from_file(txt_path)
+
+            read_csv_time = min(timeit.repeat(read_csv, number=1, repeat=N_REPEATS))
+            from_file_time = min(timeit.repeat(from_file, number=1, repeat=N_REPEATS))
+            read_csv_mem = peak_memory(read_csv) / 1e6
+            from_file_mem = peak_memory(from_file) / 1e6
+            print(
+                f"{n_measurement_columns + 8:>10} {read_csv_time * 1e3:>14.1f} {from_file_time * 1e3:>15.1f} "
+                f"{read_csv_mem:>14.1f} {from_file_mem:>15.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
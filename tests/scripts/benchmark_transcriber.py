@@ -0,0 +1,53 @@
+"""
+benchmarks loading many annotation files and converting them to ``crowsetta.Annotation``s
+with ``crowsetta.Transcriber.from_files``, using increasing numbers of worker processes,
+against loading them one at a time with ``crowsetta.Transcriber.from_file``.
+
+Run with ``python tests/scripts/benchmark_transcriber.py``.
+Use ``--n-files`` to change how many files are loaded (copies of the test data are loaded repeatedly).
+"""
+import argparse
+import itertools
+import os
+import time
+from pathlib import Path
+
+import crowsetta
+
+HERE = Path(__file__).parent
+TEST_DATA = HERE.joinpath("..", "data_for_tests")
+FORMAT_GLOBS = {
+    "notmat": "cbins/gy6or6/032312/*.not.mat",
+    "textgrid": "textgrid/calhoun-et-al-2022/**/*.TextGrid",
+}
+
+
+def main(n_files):
+    max_workers = os.cpu_count() or 1
+    workers_list = sorted({1, *[2**power for power in range(max_workers.bit_length()) if 2**power <= max_workers]})
+    print(f"{'format':>10} {'workers':>8} {'time (s)':>10} {'files/s':>10} {'speedup':>8}")
+    for format_name, glob in FORMAT_GLOBS.items():
+        annot_paths = sorted(TEST_DATA.glob(glob))
+        annot_paths = list(itertools.islice(itertools.cycle(annot_paths), n_files))
+        scribe = crowsetta.Transcriber(format=format_name)
+
+        tic = time.perf_counter()
+        [scribe.from_file(annot_path).to_annot() for annot_path in annot_paths]
+        serial_time = time.perf_counter() - tic
+        print(f"{format_name:>10} {'loop':>8} {serial_time:>10.2f} {n_files / serial_time:>10.0f} {1.0:>8.2f}")
+
+        for workers in workers_list:
+            tic = time.perf_counter()
+            scribe.from_files(annot_paths, convert="to_annot", workers=workers, executor="process", chunksize=32)
+            elapsed = time.perf_counter() - tic
+            print(
+                f"{format_name:>10} {workers:>8} {elapsed:>10.2f} "
+                f"{n_files / elapsed:>10.0f} {serial_time / elapsed:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-files", type=int, default=5_000)
+    args = parser.parse_args()
+    main(args.n_files)
@@ -0,0 +1,128 @@
+import bz2
+import gzip
+import io
+import lzma
+import tarfile
+import zipfile
+
+import pytest
+
+import crowsetta
+from crowsetta.archive import ArchiveMember
+
+
+def make_archive(archive_path, annot_paths, compress=None):
+    """Make a zip or tar archive with ``annot_paths`` in a directory 'annot',
+    optionally compressing each file with one of ``crowsetta.archive.COMPRESSIONS``"""
+    members = {}
+    for annot_path in annot_paths:
+        name = f"annot/{annot_path.name}"
+        data = annot_path.read_bytes()
+        if compress is not None:
+            name += compress
+            data = crowsetta.archive.COMPRESSIONS[compress].compress(data)
+        members[name] = data
+
+    if archive_path.suffix == ".zip":
+        with zipfile.ZipFile(archive_path, "w") as zip_file:
+            for name, data in members.items():
+                zip_file.writestr(name, data)
+    else:
+        with tarfile.open(archive_path, "w:gz" if archive_path.suffix == ".gz" else "w") as tar_file:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar_file.addfile(info, fileobj=io.BytesIO(data))
+    return list(members)
+
+
+@pytest.mark.parametrize("archive_name", ["notmats.zip", "notmats.tar", "notmats.tar.gz"])
+def test_list_and_read_members(notmat_paths, tmp_path, archive_name):
+    archive_path = tmp_path / archive_name
+    names = make_archive(archive_path, notmat_paths[:3])
+    members = crowsetta.archive.list_members(archive_path, ext=".not.mat")
+    assert members == [ArchiveMember(archive_path, name) for name in names]
+    assert crowsetta.archive.list_members(archive_path, ext=".TextGrid") == []
+    for member, notmat_path in zip(members, notmat_paths):
+        assert member.path == archive_path / "annot" / notmat_path.name
+        assert crowsetta.archive.read_member(member) == notmat_path.read_bytes()
+    with pytest.raises(FileNotFoundError):
+        crowsetta.archive.read_member(ArchiveMember(archive_path, "annot/not-a-member.not.mat"))
+    crowsetta.archive.close_handles()
+
+
+def test_open_archive_raises(notmat_paths):
+    with pytest.raises(ValueError):
+        crowsetta.archive.open_archive(notmat_paths[0])
+
+
+def test_from_file_member(textgrid_paths, tmp_path):
+    archive_path = tmp_path / "textgrids.zip"
+    make_archive(archive_path, textgrid_paths[:1], compress=".gz")
+    (member,) = crowsetta.archive.list_members(archive_path, ext=".TextGrid")
+    textgrid = crowsetta.formats.seq.TextGrid.from_file(member)
+    assert textgrid.annot_path == archive_path / "annot" / textgrid_paths[0].name
+    assert textgrid.to_annot().seq == crowsetta.formats.seq.TextGrid.from_file(textgrid_paths[0]).to_annot().seq
+    crowsetta.archive.close_handles()
+
+
+@pytest.mark.parametrize("compress", [".gz", ".bz2", ".xz"])
+def test_from_file_compressed(audseq_paths, tmp_path, compress):
+    an_audseq_path = audseq_paths[0]
+    compressed_path = tmp_path / (an_audseq_path.name + compress)
+    open_compressed = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}[compress]
+    with open_compressed(compressed_path, "wb") as fp:
+        fp.write(an_audseq_path.read_bytes())
+    audseq = crowsetta.formats.seq.AudSeq.from_file(compressed_path)
+    assert audseq.annot_path == tmp_path / an_audseq_path.name
+    assert audseq.to_seq() == crowsetta.formats.seq.AudSeq.from_file(an_audseq_path).to_seq()
+
+
+@pytest.mark.parametrize(
+    "archive_name, executor, workers, readahead",
+    [
+        ("notmats.zip", "thread", 1, None),
+        ("notmats.zip", "thread", 2, None),
+        ("notmats.tar.gz", "process", 2, None),
+        ("notmats.tar", "thread", 2, 4),
+    ],
+)
+def test_transcriber_from_archive(notmat_paths, tmp_path, archive_name, executor, workers, readahead):
+    archive_path = tmp_path / archive_name
+    make_archive(archive_path, notmat_paths)
+    scribe = crowsetta.Transcriber(format="notmat")
+    annots = scribe.from_archive(
+        archive_path, convert="to_annot", workers=workers, executor=executor, chunksize=2, readahead=readahead
+    )
+    expected = [scribe.from_file(notmat_path, convert="to_annot") for notmat_path in notmat_paths]
+    assert [annot.annot_path for annot in annots] == [
+        archive_path / "annot" / notmat_path.name for notmat_path in notmat_paths
+    ]
+    assert [annot.seq for annot in annots] == [annot.seq for annot in expected]
+
+
+def test_process_workers_do_not_share_handles(notmat_paths, tmp_path):
+    # many members, so that workers forked from this process read them at the same time
+    archive_path = tmp_path / "notmats.zip"
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for ind in range(20):
+            for notmat_path in notmat_paths:
+                zip_file.writestr(f"annot/{ind}/{notmat_path.name}", notmat_path.read_bytes())
+    scribe = crowsetta.Transcriber(format="notmat")
+    expected = [scribe.from_file(notmat_path, convert="to_seq") for notmat_path in notmat_paths] * 20
+    assert scribe.from_archive(archive_path, convert="to_seq", workers=4, executor="process", chunksize=1) == expected
+
+    # workers inherit handles this process opened before the pool started
+    members = crowsetta.archive.list_members(archive_path)
+    assert scribe.from_files(members, convert="to_seq", workers=4, executor="process", chunksize=1) == expected
+    crowsetta.archive.close_handles()
+
+
+def test_transcriber_from_archive_auto_and_cache(audseq_paths, notmat_paths, tmp_path):
+    archive_path = tmp_path / "annots.zip"
+    make_archive(archive_path, [*audseq_paths[:1], *notmat_paths[:1]])
+    scribe = crowsetta.Transcriber(format="auto", cache=tmp_path / "cache")
+    results = scribe.from_archive(archive_path, workers=1)
+    assert [type(result) for result in results] == [crowsetta.formats.seq.AudSeq, crowsetta.formats.seq.NotMat]
+    assert len(scribe.cache) == 2
+    assert scribe.from_archive(archive_path, workers=1) == results
@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pytest
+import soundfile
+
+import crowsetta.audioinfo
+
+
+@pytest.fixture(autouse=True)
+def clear_audioinfo_cache():
+    crowsetta.audioinfo.clear_cache()
+    yield
+    crowsetta.audioinfo.disable_persistent_cache()
+    crowsetta.audioinfo.clear_cache()
+    crowsetta.audioinfo.set_max_entries()
+
+
+@pytest.fixture
+def a_wav_path(tmp_path):
+    wav_path = tmp_path / "audio.wav"
+    soundfile.write(wav_path, np.zeros((16000, 2)), samplerate=32000)
+    return wav_path
+
+
+def test_info(a_wav_path):
+    audio_info = crowsetta.audioinfo.info(a_wav_path)
+    assert audio_info == crowsetta.audioinfo.AudioInfo(samplerate=32000, frames=16000, channels=2)
+    assert audio_info.duration == 0.5
+    # second call gets the same instance from the cache
+    assert crowsetta.audioinfo.info(str(a_wav_path)) is audio_info
+
+
+def test_info_file_changed(a_wav_path):
+    audio_info = crowsetta.audioinfo.info(a_wav_path)
+    soundfile.write(a_wav_path, np.zeros(8000), samplerate=16000)
+    stat_result = os.stat(a_wav_path)
+    # make sure modification time changes, even on file systems with coarse timestamps
+    os.utime(a_wav_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+    new_audio_info = crowsetta.audioinfo.info(a_wav_path)
+    assert new_audio_info != audio_info
+    assert new_audio_info.samplerate == 16000
+
+
+def test_info_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        crowsetta.audioinfo.info(tmp_path / "does-not-exist.wav")
+    not_audio_path = tmp_path / "not-audio.wav"
+    not_audio_path.write_text("not audio")
+    with pytest.raises(RuntimeError):
+        crowsetta.audioinfo.info(not_audio_path)
+
+
+def test_prefetch(birdsong_rec_wav_path, tmp_path):
+    wav_paths = sorted(birdsong_rec_wav_path.glob("*.wav"))
+    audio_infos = crowsetta.audioinfo.prefetch(wav_paths + [tmp_path / "does-not-exist.wav"], max_workers=4)
+    assert len(audio_infos) == len(wav_paths) + 1
+    assert audio_infos[-1] is None
+    for wav_path, audio_info in zip(wav_paths, audio_infos):
+        assert audio_info.samplerate == soundfile.info(wav_path).samplerate
+        assert crowsetta.audioinfo.info(wav_path) is audio_info
+
+
+def test_persistent_cache(a_wav_path, tmp_path):
+    cache_path = tmp_path / "cache" / "audio-info.sqlite3"
+    assert crowsetta.audioinfo.enable_persistent_cache(cache_path) == cache_path
+    audio_info = crowsetta.audioinfo.info(a_wav_path)
+    crowsetta.audioinfo.disable_persistent_cache()
+    crowsetta.audioinfo.clear_cache()
+
+    # overwrite file so it is no longer readable by soundfile, but with the same size and modification time,
+    # so the only way to get info for it is from the persistent cache
+    stat_result = os.stat(a_wav_path)
+    a_wav_path.write_bytes(b"\x00" * stat_result.st_size)
+    os.utime(a_wav_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    crowsetta.audioinfo.enable_persistent_cache(cache_path)
+    assert crowsetta.audioinfo.info(a_wav_path) == audio_info
+
+
+def test_max_entries(tmp_path):
+    wav_paths = []
+    for ind in range(3):
+        wav_path = tmp_path / f"audio{ind}.wav"
+        soundfile.write(wav_path, np.zeros(100), samplerate=16000)
+        wav_paths.append(wav_path)
+    crowsetta.audioinfo.set_max_entries(2)
+    crowsetta.audioinfo.prefetch(wav_paths[:2])
+    # the first file is used again, so it is the most recently used
+    crowsetta.audioinfo.info(wav_paths[0])
+    crowsetta.audioinfo.info(wav_paths[2])
+    assert list(crowsetta.audioinfo._CACHE) == [os.path.abspath(wav_paths[ind]) for ind in (0, 2)]
+
+    crowsetta.audioinfo.set_max_entries(1)
+    assert list(crowsetta.audioinfo._CACHE) == [os.path.abspath(wav_paths[2])]
+    crowsetta.audioinfo.set_max_entries(None)
+    crowsetta.audioinfo.prefetch(wav_paths)
+    assert len(crowsetta.audioinfo._CACHE) == 3
+    with pytest.raises(ValueError):
+        crowsetta.audioinfo.set_max_entries(0)
+
+
+def test_persistent_cache_after_eviction(a_wav_path, tmp_path, monkeypatch):
+    crowsetta.audioinfo.enable_persistent_cache(tmp_path / "audio-info.sqlite3")
+    crowsetta.audioinfo.set_max_entries(1)
+    audio_info = crowsetta.audioinfo.info(a_wav_path)
+    other_wav_path = tmp_path / "other.wav"
+    soundfile.write(other_wav_path, np.zeros(100), samplerate=16000)
+    crowsetta.audioinfo.info(other_wav_path)
+    assert os.path.abspath(a_wav_path) not in crowsetta.audioinfo._CACHE
+
+    def raises(*args, **kwargs):
+        raise AssertionError("header was read again")
+
+    # an entry that was removed from memory is found in the persistent cache
+    monkeypatch.setattr(soundfile, "info", raises)
+    assert crowsetta.audioinfo.info(a_wav_path) == audio_info
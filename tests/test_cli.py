@@ -0,0 +1,182 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import crowsetta
+import crowsetta.cli
+
+
+@pytest.mark.parametrize(
+    "workers, executor",
+    [
+        (1, "process"),
+        (2, "thread"),
+        (2, "process"),
+    ],
+)
+def test_convert_notmat_to_generic_seq(notmats_root, notmat_paths, tmp_path, capsys, workers, executor):
+    status = crowsetta.cli.main(
+        [
+            "convert",
+            str(notmats_root),
+            "--from",
+            "notmat",
+            "--to",
+            "generic-seq",
+            "-o",
+            str(tmp_path),
+            "-j",
+            str(workers),
+            "--executor",
+            executor,
+        ]
+    )
+    assert status == 0
+    assert f"converted {len(notmat_paths)} files" in capsys.readouterr().err
+    for notmat_path in notmat_paths:
+        csv_path = tmp_path / notmat_path.name.replace(".not.mat", ".csv")
+        annots = crowsetta.formats.seq.GenericSeq.from_file(csv_path).to_annot()
+        assert [annot.seq for annot in annots] == [crowsetta.formats.seq.NotMat.from_file(notmat_path).to_annot().seq]
+
+
+def test_convert_with_adapters_rounds_times(notmat_paths, tmp_path):
+    # 'notmat' to 'simple-seq' is converted with adapters, 'notmat' to 'generic-seq' is not
+    for to_format in ("simple-seq", "generic-seq"):
+        status = crowsetta.cli.main(
+            ["convert", str(notmat_paths[0]), "--from", "notmat", "--to", to_format, "-o", str(tmp_path / to_format)]
+        )
+        assert status == 0
+    csv_name = notmat_paths[0].name.replace(".not.mat", ".csv")
+    simple = crowsetta.formats.seq.SimpleSeq.from_file(tmp_path / "simple-seq" / csv_name)
+    (annot,) = crowsetta.formats.seq.GenericSeq.from_file(tmp_path / "generic-seq" / csv_name).to_annot()
+    assert simple.to_seq(round_times=False) == annot.seq
+
+
+def test_convert_raven_to_aud_bbox(raven_root, raven_txt_files, raven_dataset_annot_col, tmp_path):
+    status = crowsetta.cli.main(
+        [
+            "convert",
+            str(raven_root / "**" / "*.txt"),
+            "--from",
+            "raven",
+            "--to",
+            "aud-bbox",
+            "--from-option",
+            f"annot_col={raven_dataset_annot_col}",
+            "-o",
+            str(tmp_path),
+            "--on-error",
+            "skip",
+            "-q",
+        ]
+    )
+    # one file in the dataset has no rows
+    assert status == 1
+    for raven_txt_file in raven_txt_files:
+        raven = crowsetta.formats.bbox.Raven.from_file(raven_txt_file, annot_col=raven_dataset_annot_col)
+        audbbox = crowsetta.formats.bbox.AudBBox.from_file(tmp_path / raven_txt_file.name)
+        assert audbbox.to_annot().bboxes == raven.to_annot().bboxes
+
+
+def test_on_error_stop(raven_txt_file_with_no_rows, raven_txt_files, tmp_path, capsys):
+    inputs = [str(raven_txt_file_with_no_rows), *[str(path) for path in raven_txt_files]]
+    status = crowsetta.cli.main(
+        ["convert", *inputs, "--from", "raven", "--to", "aud-bbox", "-o", str(tmp_path), "-j", "1"]
+    )
+    assert status == 1
+    err = capsys.readouterr().err
+    assert "stopping" in err
+    assert "converted 0 files" in err
+    assert not list(tmp_path.iterdir())
+
+
+def test_max_errors(tmp_path, notmat_paths, capsys):
+    invalid_paths = []
+    for ind in range(3):
+        invalid_path = tmp_path / f"invalid{ind}.not.mat"
+        invalid_path.write_text("not a mat file")
+        invalid_paths.append(str(invalid_path))
+    args = ["--from", "notmat", "--to", "simple-seq", "--on-error", "skip", "--max-errors", "2", "-j", "1"]
+    status = crowsetta.cli.main(["convert", *invalid_paths, *args])
+    assert status == 1
+    assert "2 failed" in capsys.readouterr().err
+
+
+def test_incremental(notmat_paths, tmp_path, capsys):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for notmat_path in notmat_paths:
+        shutil.copy(notmat_path, input_dir)
+    args = ["convert", str(input_dir), "--from", "notmat", "--to", "aud-seq", "-j", "1", "--incremental"]
+
+    assert crowsetta.cli.main(args) == 0
+    assert len(list(input_dir.glob("*.txt"))) == len(notmat_paths)
+    capsys.readouterr()
+
+    assert crowsetta.cli.main(args) == 0
+    err = capsys.readouterr().err
+    assert "converted 0 files" in err
+    assert f"skipped {len(notmat_paths)} up to date" in err
+
+    # make one input newer than its output
+    input_path = sorted(input_dir.glob("*.not.mat"))[0]
+    output_stat = os.stat(input_dir / input_path.name.replace(".not.mat", ".txt"))
+    os.utime(input_path, (output_stat.st_atime + 10, output_stat.st_mtime + 10))
+    assert crowsetta.cli.main(args) == 0
+    err = capsys.readouterr().err
+    assert "converted 1 files" in err
+    assert f"skipped {len(notmat_paths) - 1} up to date" in err
+
+
+def test_several_annotations_are_numbered(notmat_paths, tmp_path):
+    annots = [crowsetta.formats.seq.NotMat.from_file(notmat_path).to_annot() for notmat_path in notmat_paths[:3]]
+    generic_path = tmp_path / "annots.csv"
+    crowsetta.formats.seq.GenericSeq(annots=annots).to_file(generic_path)
+    output_dir = tmp_path / "simple"
+    status = crowsetta.cli.main(
+        ["convert", str(generic_path), "--from", "auto", "--to", "simple-seq", "-o", str(output_dir), "-j", "1"]
+    )
+    assert status == 0
+    for ind, annot in enumerate(annots):
+        simple = crowsetta.formats.seq.SimpleSeq.from_file(output_dir / f"annots.{ind}.csv")
+        assert simple.to_seq() == annot.seq
+
+
+def test_auto(audbbox_paths, tmp_path):
+    for audbbox_path in audbbox_paths:
+        shutil.copy(audbbox_path, tmp_path)
+    output_dir = tmp_path / "raven"
+    status = crowsetta.cli.main(["convert", str(tmp_path), "--from", "auto", "--to", "raven", "-o", str(output_dir)])
+    assert status == 0
+    assert sorted(path.name for path in output_dir.iterdir()) == sorted(path.name for path in audbbox_paths)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        # would overwrite inputs, since both formats have the same extension
+        ["--from", "aud-bbox", "--to", "raven"],
+        # can't be made from annotations
+        ["--from", "aud-bbox", "--to", "timit", "-o", "out"],
+        ["--from", "not-a-format", "--to", "raven", "-o", "out"],
+    ],
+)
+def test_invalid_args_raise(audbbox_paths, args):
+    with pytest.raises(SystemExit) as exc_info:
+        crowsetta.cli.main(["convert", str(audbbox_paths[0]), *args])
+    assert exc_info.value.code == 2
+
+
+def test_no_files_raises(tmp_path):
+    with pytest.raises(SystemExit):
+        crowsetta.cli.main(["convert", str(tmp_path / "*.not.mat"), "--from", "notmat", "--to", "aud-seq"])
+
+
+def test_python_m_crowsetta():
+    result = subprocess.run(
+        [sys.executable, "-m", "crowsetta", "convert", "--help"], capture_output=True, text=True, check=True
+    )
+    assert "--incremental" in result.stdout
@@ -0,0 +1,134 @@
+import attr
+import numpy as np
+import pytest
+
+import crowsetta
+from crowsetta.formats import adapters
+
+
+def test_declared_adapters():
+    for name in crowsetta.formats.as_list():
+        format_class = crowsetta.formats.by_name(name)
+        adapter = adapters.get_adapter(format_class)
+        if adapter is None:
+            continue
+        assert sorted(column.field for column in adapter.columns) == sorted(adapters.FIELDS[adapter.kind])
+        # columns are attributes, or in a DataFrame that is an attribute
+        fields = attr.fields_dict(format_class)
+        if adapter.frame is None:
+            assert all(column.name in fields for column in adapter.columns)
+        else:
+            assert adapter.frame in fields
+        assert adapter.notated_path in fields
+
+
+@pytest.fixture
+def no_annotations(monkeypatch):
+    """Make converting to or from annotations raise, to test that adapters are used instead"""
+
+    def raises(*args, **kwargs):
+        raise AssertionError("converted through Annotation")
+
+    for name in ("aud-bbox", "raven", "aud-seq", "simple-seq", "notmat", "timit"):
+        format_class = crowsetta.formats.by_name(name)
+        monkeypatch.setattr(format_class, "to_annot", raises)
+        if hasattr(format_class, "from_annot"):
+            monkeypatch.setattr(format_class, "from_annot", raises)
+
+
+def test_raven_to_aud_bbox(a_raven_txt_file, raven_dataset_annot_col):
+    raven = crowsetta.formats.bbox.Raven.from_file(a_raven_txt_file, annot_col=raven_dataset_annot_col)
+    expected = crowsetta.formats.bbox.AudBBox.from_annot(raven.to_annot())
+    audbbox = adapters.convert(raven, "aud-bbox")
+    assert isinstance(audbbox, crowsetta.formats.bbox.AudBBox)
+    assert audbbox.df.equals(expected.df)
+    assert audbbox.annot_path == raven.annot_path
+
+
+def test_aud_bbox_to_raven(an_audbbox_path, tmp_path, no_annotations):
+    audbbox = crowsetta.formats.bbox.AudBBox.from_file(an_audbbox_path)
+    raven = adapters.convert(audbbox, crowsetta.formats.bbox.Raven)
+    assert raven.annot_col == "Annotation"
+    annot_path = tmp_path / "selections.txt"
+    raven.to_file(annot_path)
+    raven_written = crowsetta.formats.bbox.Raven.from_file(annot_path, annot_col="Annotation")
+    np.testing.assert_array_equal(raven_written.df["annotation"].values, audbbox.df["label"].values)
+    np.testing.assert_allclose(raven_written.df["begin_time_s"].values, audbbox.df["begin_time_s"].values)
+    assert adapters.convert(audbbox, "raven", annot_col="Species").annot_col == "Species"
+
+
+@pytest.mark.parametrize("to_format", ["aud-seq", "simple-seq"])
+def test_notmat_to_seq_formats(a_notmat_path, to_format):
+    notmat = crowsetta.formats.seq.NotMat.from_file(a_notmat_path)
+    converted = adapters.convert(notmat, to_format)
+    assert isinstance(converted, crowsetta.formats.by_name(to_format))
+    assert converted.to_seq() == notmat.to_seq()
+    assert converted.notated_path == notmat.audio_path
+
+
+@pytest.mark.parametrize("round_times", [True, False])
+@pytest.mark.parametrize("to_format", ["aud-seq", "simple-seq"])
+def test_adapters_match_annotations(notmat_paths, to_format, round_times):
+    to_class = crowsetta.formats.by_name(to_format)
+    for notmat_path in notmat_paths:
+        notmat = crowsetta.formats.seq.NotMat.from_file(notmat_path)
+        converted = adapters.convert(notmat, to_format, round_times=round_times)
+        expected = to_class.from_annot(notmat.to_annot(round_times=round_times))
+        assert converted.to_seq(round_times=False) == expected.to_seq(round_times=False)
+
+
+def test_aud_seq_to_simple_seq(audseq_paths, no_annotations):
+    audseq = crowsetta.formats.seq.AudSeq.from_file(audseq_paths[0])
+    simple = adapters.convert(audseq, "simple-seq")
+    np.testing.assert_array_equal(simple.onsets_s, np.around(audseq.start_times, decimals=3))
+    np.testing.assert_array_equal(simple.offsets_s, np.around(audseq.end_times, decimals=3))
+    np.testing.assert_array_equal(simple.labels, audseq.labels)
+    simple = adapters.convert(audseq, "simple-seq", round_times=False)
+    np.testing.assert_array_equal(simple.onsets_s, audseq.start_times)
+    np.testing.assert_array_equal(simple.offsets_s, audseq.end_times)
+
+
+def test_timit_samples(kaggle_phn_paths):
+    timit = crowsetta.formats.seq.Timit.from_file(kaggle_phn_paths[0])
+    # sampling rate is read from the audio file
+    arrays = adapters.to_arrays(timit)
+    np.testing.assert_allclose(arrays["onsets_s"], timit.begin_samples / 16000)
+
+    simple = adapters.convert(timit, "simple-seq", samplerate=16000)
+    # sequences from timit also have onsets and offsets in samples, so compare times and labels
+    seq, timit_seq = simple.to_seq(), timit.to_seq(samplerate=16000)
+    np.testing.assert_array_equal(seq.onsets_s, timit_seq.onsets_s)
+    np.testing.assert_array_equal(seq.offsets_s, timit_seq.offsets_s)
+    np.testing.assert_array_equal(seq.labels, timit_seq.labels)
+    simple = adapters.convert(timit, "simple-seq", samplerate=16000, round_times=False)
+    timit_converted = adapters.convert(simple, "timit", samplerate=16000)
+    np.testing.assert_array_equal(timit_converted.begin_samples, timit.begin_samples)
+    np.testing.assert_array_equal(timit_converted.end_samples, timit.end_samples)
+
+
+def test_samples_without_samplerate_raises(a_notmat_path):
+    notmat = crowsetta.formats.seq.NotMat.from_file(a_notmat_path)
+    timit = adapters.convert(notmat, "timit", samplerate=32000)
+    timit.audio_path = None
+    with pytest.raises(ValueError, match="samplerate"):
+        adapters.to_arrays(timit)
+
+
+def test_convert_falls_back_to_annotation(a_notmat_path):
+    notmat = crowsetta.formats.seq.NotMat.from_file(a_notmat_path)
+    assert not adapters.can_convert(crowsetta.formats.seq.NotMat, crowsetta.formats.seq.TextGrid)
+    textgrid = adapters.convert(notmat, "textgrid")
+    assert isinstance(textgrid, crowsetta.formats.seq.TextGrid)
+    assert textgrid.to_seq() == notmat.to_seq()
+
+
+def test_convert_seq_to_bbox_raises(a_notmat_path):
+    notmat = crowsetta.formats.seq.NotMat.from_file(a_notmat_path)
+    assert not adapters.can_convert(crowsetta.formats.seq.NotMat, crowsetta.formats.bbox.AudBBox)
+    with pytest.raises(ValueError):
+        adapters.convert(notmat, "aud-bbox")
+
+
+def test_from_arrays_missing_field_raises():
+    with pytest.raises(ValueError, match="missing fields"):
+        adapters.from_arrays(crowsetta.formats.seq.SimpleSeq, {"onsets_s": np.array([0.1])}, annot_path="annot.csv")
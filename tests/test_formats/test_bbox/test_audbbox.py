@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pandera
 import pytest
@@ -23,6 +24,32 @@ def test_txt_to_records(an_audbbox_path):
     assert len(records) == len(lines) / 2
 
 
+def test_txt_to_columns(an_audbbox_path):
+    columns = crowsetta.formats.bbox.audbbox.txt_to_columns(an_audbbox_path)
+    records = crowsetta.formats.bbox.audbbox.txt_to_records(an_audbbox_path)
+    assert list(columns.keys()) == list(crowsetta.formats.bbox.audbbox.COLUMNS)
+    for key, column in columns.items():
+        assert isinstance(column, np.ndarray)
+        assert column.tolist() == [record[key] for record in records]
+
+
+def test_txt_to_columns_extra_fields(tmp_path):
+    # lines with more fields than expected should be parsed the same way, ignoring extra fields
+    txt_path = tmp_path / "extra.txt"
+    txt_path.write_text("0.5\t1.0\ta\textra\n\\\t100.0\t200.0\n1.5\t2.0\tb\n\\\t300.0\t400.0\n")
+    columns = crowsetta.formats.bbox.audbbox.txt_to_columns(txt_path)
+    assert columns["begin_time_s"].tolist() == [0.5, 1.5]
+    assert columns["label"].tolist() == ["a", "b"]
+    assert columns["high_freq_hz"].tolist() == [200.0, 400.0]
+
+
+def test_txt_to_columns_missing_fields_raises(tmp_path):
+    txt_path = tmp_path / "missing.txt"
+    txt_path.write_text("0.5\t1.0\n\\\t100.0\t200.0\textra\n")
+    with pytest.raises(ValueError):
+        crowsetta.formats.bbox.audbbox.txt_to_columns(txt_path)
+
+
 def test_df_to_lines(an_audbbox_path, tmp_path):
     # ---- test set-up
     # we test by round-trip; df_to_audbbox_txt should be the inverse of:
@@ -41,6 +68,15 @@ def test_df_to_lines(an_audbbox_path, tmp_path):
     assert records_test == records
 
 
+@pytest.mark.parametrize("block_size", [1, 3, 8192])
+def test_write_fp(an_audbbox_path, tmp_path, block_size):
+    audbbox = crowsetta.formats.bbox.AudBBox.from_file(annot_path=an_audbbox_path)
+    test_txt_path = tmp_path / "test.txt"
+    with test_txt_path.open("w") as fp:
+        crowsetta.formats.bbox.audbbox.write_fp(fp, audbbox.df, block_size=block_size)
+    assert test_txt_path.read_text() == "".join(crowsetta.formats.bbox.audbbox.df_to_lines(audbbox.df))
+
+
 class TestAudBBoxSchema:
     def test_aud_bbox_schema_df(self, an_audbbox_path):
         records = crowsetta.formats.bbox.audbbox.txt_to_records(an_audbbox_path)
@@ -105,3 +141,12 @@ def test_to_file(an_audbbox_path, tmp_path):
     txt_df = crowsetta.formats.bbox.audbbox.AudBBoxSchema.validate(txt_df)
 
     pd.testing.assert_frame_equal(txt_df, expected_df)
+
+
+def test_from_annot(a_raven_txt_file, raven_dataset_annot_col, tmp_path):
+    annot = crowsetta.formats.bbox.Raven.from_file(a_raven_txt_file, annot_col=raven_dataset_annot_col).to_annot()
+    audbbox = crowsetta.formats.bbox.AudBBox.from_annot(annot)
+    assert isinstance(audbbox, crowsetta.formats.bbox.AudBBox)
+    annot_path = tmp_path / "raven.txt"
+    audbbox.to_file(annot_path)
+    assert crowsetta.formats.bbox.AudBBox.from_file(annot_path).to_annot().bboxes == annot.bboxes
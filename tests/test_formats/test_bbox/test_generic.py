@@ -0,0 +1,88 @@
+import io
+import sys
+
+import pandas as pd
+import pandera
+import pytest
+
+import crowsetta
+from crowsetta.formats.bbox import GenericBBox
+
+
+@pytest.fixture
+def bbox_annots(bbox_annots, audbbox_paths):
+    """Bounding box annotations from Raven files, and from Audacity files"""
+    audbboxes = [crowsetta.formats.bbox.AudBBox.from_file(audbbox_path).to_annot() for audbbox_path in audbbox_paths]
+    return [*bbox_annots, *audbboxes]
+
+
+def test_from_annot(bbox_annots):
+    generic = GenericBBox.from_annot(bbox_annots)
+    assert isinstance(generic, GenericBBox)
+    assert list(generic.df.columns) == list(crowsetta.formats.bbox.generic.COLUMNS)
+    assert len(generic.df) == sum(len(annot.bboxes) for annot in bbox_annots)
+    assert generic.df["annotation"].unique().tolist() == list(range(len(bbox_annots)))
+    assert generic.to_bbox() == [annot.bboxes for annot in bbox_annots]
+    for annot, expected in zip(generic.to_annot(), bbox_annots):
+        assert annot.bboxes == expected.bboxes
+        assert annot.annot_path == expected.annot_path
+        assert annot.notated_path == expected.notated_path
+    assert GenericBBox.from_annot(bbox_annots[0]).to_bbox() == [bbox_annots[0].bboxes]
+
+
+def test_from_annot_seq_raises(notmat_paths):
+    annot = crowsetta.formats.seq.NotMat.from_file(notmat_paths[0]).to_annot()
+    with pytest.raises(ValueError):
+        GenericBBox.from_annot(annot)
+
+
+def test_csv_round_trip(bbox_annots, tmp_path):
+    annot_path = tmp_path / "bboxes.csv"
+    generic = GenericBBox.from_annot(bbox_annots)
+    generic.to_file(annot_path)
+    loaded = GenericBBox.from_file(annot_path)
+    pd.testing.assert_frame_equal(loaded.df, generic.df)
+    assert loaded.to_bbox() == generic.to_bbox()
+    assert crowsetta.formats.detect(annot_path) == "generic-bbox"
+
+    # loads from a buffer, and with another extension
+    buffer = io.BytesIO(annot_path.read_bytes())
+    buffer.name = "bboxes.csv"
+    pd.testing.assert_frame_equal(GenericBBox.from_file(buffer).df, generic.df)
+    txt_path = tmp_path / "bboxes.txt"
+    txt_path.write_bytes(annot_path.read_bytes())
+    with pytest.raises(ValueError):
+        GenericBBox.from_file(txt_path)
+    pd.testing.assert_frame_equal(GenericBBox.from_file(txt_path, validate_ext=False).df, generic.df)
+
+
+def test_from_file_raises(bbox_annots, tmp_path):
+    df = GenericBBox.from_annot(bbox_annots).df
+    annot_path = tmp_path / "bboxes.csv"
+    # rows of each annotation must be contiguous
+    df.iloc[::-1].to_csv(annot_path, index=False)
+    with pytest.raises(ValueError):
+        GenericBBox.from_file(annot_path)
+    df.drop(columns="low_freq_hz").to_csv(annot_path, index=False)
+    with pytest.raises(pandera.errors.SchemaError):
+        GenericBBox.from_file(annot_path)
+
+
+def test_parquet_round_trip(bbox_annots, tmp_path):
+    pytest.importorskip("pyarrow")
+    annot_path = tmp_path / "bboxes.parquet"
+    generic = GenericBBox.from_annot(bbox_annots)
+    generic.to_file(annot_path)
+    loaded = GenericBBox.from_file(annot_path)
+    pd.testing.assert_frame_equal(loaded.df, generic.df)
+    assert crowsetta.formats.detect(annot_path) == "generic-bbox"
+
+
+def test_parquet_raises_without_pyarrow(bbox_annots, tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "fastparquet", None)
+    with pytest.raises(ImportError, match="crowsetta\\[parquet\\]"):
+        GenericBBox.from_annot(bbox_annots).to_file(tmp_path / "bboxes.parquet")
+    (tmp_path / "bboxes.parquet").write_bytes(b"PAR1")
+    with pytest.raises(ImportError, match="crowsetta\\[parquet\\]"):
+        GenericBBox.from_file(tmp_path / "bboxes.parquet")
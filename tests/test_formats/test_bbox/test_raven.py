@@ -1,3 +1,8 @@
+import io
+import pathlib
+import platform
+
+import numpy as np
 import pandas as pd
 import pandera
 import pytest
@@ -64,3 +69,143 @@ def test_to_raven(a_raven_txt_file, raven_dataset_annot_col, tmp_path):
     df_txt = pd.read_csv(a_raven_txt_file, sep="\t")
     df_out = pd.read_csv(annot_out_path, sep="\t")
     assert df_txt.equals(df_out)
+
+
+def test_from_file_loads_only_used_columns(a_raven_txt_file, raven_dataset_annot_col):
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=a_raven_txt_file, annot_col=raven_dataset_annot_col)
+    assert list(raven.df.columns) == ["begin_time_s", "end_time_s", "low_freq_hz", "high_freq_hz", "annotation"]
+
+
+@pytest.mark.parametrize(
+    "usecols",
+    [
+        ["Selection"],
+        ["Selection", "Channel"],
+        "View",
+    ],
+)
+def test_from_file_usecols(a_raven_txt_file, raven_dataset_annot_col, usecols):
+    raven = crowsetta.formats.bbox.Raven.from_file(
+        annot_path=a_raven_txt_file, annot_col=raven_dataset_annot_col, usecols=usecols
+    )
+    if isinstance(usecols, str):
+        usecols = [usecols]
+    df_txt = pd.read_csv(a_raven_txt_file, sep="\t")
+    for column in usecols:
+        assert column in raven.df.columns
+        assert raven.df[column].equals(df_txt[column])
+
+
+def test_from_file_missing_annot_col_raises(a_raven_txt_file):
+    with pytest.raises(pandera.errors.SchemaError):
+        crowsetta.formats.bbox.Raven.from_file(annot_path=a_raven_txt_file, annot_col="not-a-column")
+
+
+def test_full_df(a_raven_txt_file, raven_dataset_annot_col):
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=a_raven_txt_file, annot_col=raven_dataset_annot_col)
+    full_df = raven.full_df
+    assert full_df.equals(pd.read_csv(a_raven_txt_file, sep="\t"))
+    # full table is cached after it is read the first time
+    assert raven.full_df is full_df
+
+
+def test_to_file_changed_values(a_raven_txt_file, raven_dataset_annot_col, tmp_path):
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=a_raven_txt_file, annot_col=raven_dataset_annot_col)
+    raven.df["begin_time_s"] = raven.df["begin_time_s"] + 1.0
+    annot_out_path = tmp_path / a_raven_txt_file.name
+    raven.to_file(annot_path=annot_out_path)
+
+    df_txt = pd.read_csv(a_raven_txt_file, sep="\t")
+    df_out = pd.read_csv(annot_out_path, sep="\t")
+    assert list(df_out.columns) == list(df_txt.columns)
+    np.testing.assert_allclose(df_out["Begin Time (s)"].values, df_txt["Begin Time (s)"].values + 1.0)
+    assert df_out["Selection"].equals(df_txt["Selection"])
+
+
+def test_to_file_rows_sorted_or_removed(a_raven_txt_file, raven_dataset_annot_col, tmp_path):
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=a_raven_txt_file, annot_col=raven_dataset_annot_col)
+    # sort so that rows are in a different order, then remove one
+    raven.df = raven.df.sort_values("begin_time_s", ascending=False).iloc[1:]
+    annot_out_path = tmp_path / a_raven_txt_file.name
+    raven.to_file(annot_path=annot_out_path)
+
+    df_txt = pd.read_csv(a_raven_txt_file, sep="\t")
+    df_out = pd.read_csv(annot_out_path, sep="\t")
+    assert list(df_out.columns) == list(df_txt.columns)
+    # each row is written with the other columns of the same row in the table
+    expected = df_txt.loc[raven.df.index].reset_index(drop=True)
+    pd.testing.assert_frame_equal(df_out, expected)
+
+
+def test_to_file_index_changed_warns(a_raven_txt_file, raven_dataset_annot_col, tmp_path):
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=a_raven_txt_file, annot_col=raven_dataset_annot_col)
+    # a row that is not in the Selection Table
+    raven.df = pd.concat([raven.df, raven.df.iloc[:1]], ignore_index=True)
+    annot_out_path = tmp_path / a_raven_txt_file.name
+    with pytest.warns(UserWarning, match="Selection"):
+        raven.to_file(annot_path=annot_out_path)
+    # only the columns that were loaded are written
+    df_out = pd.read_csv(annot_out_path, sep="\t")
+    assert len(df_out) == len(raven.df)
+    assert "Selection" not in df_out.columns
+
+
+@pytest.mark.skipif(platform.python_implementation() != "CPython", reason="relies on CPython not copying bytes")
+def test_from_file_buffer_does_not_copy(a_raven_txt_file, raven_dataset_annot_col):
+    data = a_raven_txt_file.read_bytes()
+    buffer = io.BytesIO(data)
+    buffer.name = a_raven_txt_file.name
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=buffer, annot_col=raven_dataset_annot_col)
+    assert raven._full_df_source.buffer.getvalue() is data
+    buffer.close()
+    assert raven.full_df.equals(pd.read_csv(a_raven_txt_file, sep="\t"))
+
+
+@pytest.mark.parametrize("audio_dir", [None, "audio"])
+def test_to_annot_by_file(raven_multi_file_txt, audio_dir):
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=raven_multi_file_txt)
+    annots = raven.to_annot(by_file=True, audio_dir=audio_dir)
+    df_txt = pd.read_csv(raven_multi_file_txt, sep="\t")
+    begin_files = df_txt["Begin File"].unique()
+    assert isinstance(annots, list)
+    assert len(annots) == len(begin_files)
+    for annot, begin_file in zip(annots, begin_files):
+        assert isinstance(annot, crowsetta.Annotation)
+        if audio_dir is None:
+            assert annot.notated_path.name == begin_file
+        else:
+            assert annot.notated_path == pathlib.Path(audio_dir) / begin_file
+        file_df = df_txt[df_txt["Begin File"] == begin_file]
+        assert len(annot.bboxes) == len(file_df)
+        np.testing.assert_allclose([bbox.onset for bbox in annot.bboxes], file_df["File Offset (s)"].values)
+        np.testing.assert_allclose(
+            [bbox.offset for bbox in annot.bboxes],
+            file_df["File Offset (s)"].values + file_df["End Time (s)"].values - file_df["Begin Time (s)"].values,
+        )
+        np.testing.assert_allclose([bbox.low_freq for bbox in annot.bboxes], file_df["Low Freq (Hz)"].values)
+        assert [bbox.label for bbox in annot.bboxes] == file_df["Annotation"].tolist()
+
+
+def test_to_annot_by_file_not_contiguous(raven_multi_file_txt):
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=raven_multi_file_txt)
+    expected = raven.to_annot(by_file=True)
+    # interleave rows from different files
+    raven.df = raven.df.iloc[np.argsort(np.arange(len(raven.df)) % 3, kind="stable")].reset_index(drop=True)
+    annots = raven.to_annot(by_file=True)
+    assert annots == expected
+
+
+def test_to_annot_by_file_raises(a_raven_txt_file, raven_dataset_annot_col):
+    raven = crowsetta.formats.bbox.Raven.from_file(annot_path=a_raven_txt_file, annot_col=raven_dataset_annot_col)
+    with pytest.raises(ValueError):
+        raven.to_annot(by_file=True)
+
+
+def test_from_annot(an_audbbox_path, tmp_path):
+    annot = crowsetta.formats.bbox.AudBBox.from_file(an_audbbox_path).to_annot()
+    raven = crowsetta.formats.bbox.Raven.from_annot(annot, annot_col="Species")
+    assert isinstance(raven, crowsetta.formats.bbox.Raven)
+    annot_path = tmp_path / "aud-bbox.txt"
+    raven.to_file(annot_path)
+    raven_written = crowsetta.formats.bbox.Raven.from_file(annot_path, annot_col="Species")
+    assert raven_written.to_annot().bboxes == annot.bboxes
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import crowsetta.formats.delimited
+
+
+@pytest.mark.parametrize(
+    "text, delimiter, header, expected_names, expected_columns",
+    [
+        ("1.0\t2.0\ta\n3.0\t4.0\tb\n", "\t", False, None, [("1.0", "3.0"), ("2.0", "4.0"), ("a", "b")]),
+        ('x,y\n1,"a, b"\n\n2,c\n', ",", True, ["x", "y"], [("1", "2"), ("a, b", "c")]),
+        ("x,y\n", ",", True, ["x", "y"], [(), ()]),
+    ],
+)
+def test_read_columns(tmp_path, text, delimiter, header, expected_names, expected_columns):
+    path = tmp_path / "annot.txt"
+    path.write_text(text)
+    column_names, columns = crowsetta.formats.delimited.read_columns(path, delimiter=delimiter, header=header)
+    assert column_names == expected_names
+    assert columns == expected_columns
+
+
+@pytest.mark.parametrize(
+    "text, header, n_columns",
+    [
+        ("", False, None),
+        ("1,2,3\n4,5\n", False, None),
+        ("1,2\n3,4\n", False, 3),
+        ("x,x\n1,2\n", True, None),
+        ("x,y\n1,2,3\n", True, None),
+    ],
+)
+def test_read_columns_raises(tmp_path, text, header, n_columns):
+    path = tmp_path / "annot.txt"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        crowsetta.formats.delimited.read_columns(path, header=header, n_columns=n_columns)
+
+
+def test_to_arrays():
+    np.testing.assert_array_equal(crowsetta.formats.delimited.to_float_array(("0.5", "1")), np.array([0.5, 1.0]))
+    np.testing.assert_array_equal(crowsetta.formats.delimited.to_int_array(("0", "16000")), np.array([0, 16000]))
+    np.testing.assert_array_equal(crowsetta.formats.delimited.to_str_array(("a", "b")), np.array(["a", "b"]))
+    for column in (("0.5", ""), ("0.5", "nan"), ("0.5", "a")):
+        with pytest.raises(ValueError):
+            crowsetta.formats.delimited.to_float_array(column)
+    with pytest.raises(ValueError):
+        crowsetta.formats.delimited.to_int_array(("0", "0.5"))
+    # values that pandas reads as missing values, so that formats fall back to loading files with pandas
+    for column in (("a", ""), ("a", "NA"), ("nan",), ("None", "b"), ("a", "<NA>")):
+        with pytest.raises(ValueError):
+            crowsetta.formats.delimited.to_str_array(column)
+    np.testing.assert_array_equal(crowsetta.formats.delimited.to_str_array(("na", "Na")), np.array(["na", "Na"]))
+
+
+def _raise_value_error(*args, **kwargs):
+    raise ValueError
+
+
+@pytest.mark.parametrize("use_pandas", [False, True])
+@pytest.mark.parametrize(
+    "labels, expected_labels",
+    [
+        (("01", "2"), ["1", "2"]),
+        (("01", "2.50"), ["1.0", "2.5"]),
+        (("-0", "+7"), ["0", "7"]),
+        (("01", "a"), ["01", "a"]),
+        (("True", "false"), ["True", "False"]),
+        (("1", "True"), ["1", "True"]),
+        (("99999999999999999999", "1"), ["99999999999999999999", "1"]),
+    ],
+)
+@pytest.mark.parametrize(
+    "format_name, filename, template, labels_attr",
+    [
+        ("aud-seq", "annot.txt", "0.1\t0.2\t{}\n0.3\t0.4\t{}\n", "labels"),
+        ("simple-seq", "annot.csv", "onset_s,offset_s,label\n0.1,0.2,{}\n0.3,0.4,{}\n", "labels"),
+        ("timit", "annot.phn", "0 1600 {}\n1600 3200 {}\n", "text"),
+    ],
+)
+def test_labels_match_pandas(
+    format_name, filename, template, labels_attr, labels, expected_labels, use_pandas, tmp_path, monkeypatch
+):
+    """Test that the fast path and the fallback to pandas give the same labels"""
+    if use_pandas:
+        monkeypatch.setattr(crowsetta.formats.delimited, "read_columns", _raise_value_error)
+    annot_path = tmp_path / filename
+    annot_path.write_text(template.format(*labels))
+    annot = crowsetta.formats.by_name(format_name).from_file(annot_path)
+    assert [str(label) for label in getattr(annot, labels_attr)] == expected_labels
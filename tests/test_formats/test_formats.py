@@ -6,7 +6,9 @@ import crowsetta
 
 BUILTIN_FORMATS = (
     crowsetta.formats.seq.BirdsongRec,
+    crowsetta.formats.bbox.GenericBBox,
     crowsetta.formats.seq.GenericSeq,
+    crowsetta.formats.jsonl.JsonLines,
     crowsetta.formats.seq.NotMat,
     crowsetta.formats.bbox.Raven,
     crowsetta.formats.seq.SimpleSeq,
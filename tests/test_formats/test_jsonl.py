@@ -0,0 +1,110 @@
+import io
+import sys
+
+import pytest
+
+import crowsetta
+from crowsetta.formats import jsonl
+from crowsetta.formats.jsonl import JsonLines
+
+
+@pytest.mark.parametrize("json_backend", [None, "json", "orjson"])
+def test_round_trip(seq_annots, bbox_annots, tmp_path, json_backend):
+    annots = [*seq_annots, *bbox_annots]
+    annot_path = tmp_path / "annotations.jsonl"
+    JsonLines.from_annot(annots).to_file(annot_path, json_backend=json_backend)
+    assert len(annot_path.read_bytes().splitlines()) == len(annots)
+    jsonl_ = JsonLines.from_file(annot_path, json_backend=json_backend)
+    assert jsonl_.to_annot() == annots
+    assert JsonLines.from_annot(seq_annots).to_seq() == [annot.seq for annot in seq_annots]
+    assert JsonLines.from_annot(bbox_annots).to_bbox() == [annot.bboxes for annot in bbox_annots]
+    with pytest.raises(ValueError):
+        jsonl_.to_seq()
+    with pytest.raises(ValueError):
+        jsonl_.to_bbox()
+
+
+def test_multiple_seqs_and_samples(tmp_path):
+    seqs = [
+        crowsetta.Sequence.from_keyword(labels="ab", onset_samples=[0, 100], offset_samples=[50, 150]),
+        crowsetta.Sequence.from_keyword(labels="c", onsets_s=[0.5], offsets_s=[1.0]),
+    ]
+    annot = crowsetta.Annotation(annot_path="bird1.csv", notated_path="bird1.wav", seq=seqs)
+    data = b"".join(jsonl.iter_lines([annot]))
+    (loaded,) = jsonl.iter_annots(crowsetta.formats.source.AnnotSource(data, name="bird1.jsonl"))
+    assert loaded == annot
+    assert loaded.seq[0].onset_samples.tolist() == [0, 100]
+
+
+def test_append_and_tail(seq_annots, tmp_path, monkeypatch):
+    # read backwards in small blocks, so reading the last lines takes several reads
+    monkeypatch.setattr(jsonl, "_TAIL_BLOCK_SIZE", 64)
+    annot_path = tmp_path / "annotations.jsonl"
+    for annot in seq_annots:
+        JsonLines.from_annot(annot).to_file(annot_path, append=True)
+    assert JsonLines.from_file(annot_path).to_annot() == seq_annots
+    assert jsonl.tail(annot_path) == seq_annots[-1:]
+    assert jsonl.tail(annot_path, n=2) == seq_annots[-2:]
+    assert jsonl.tail(annot_path, n=100) == seq_annots
+    with pytest.raises(ValueError):
+        jsonl.tail(annot_path, n=0)
+
+
+def test_truncated(seq_annots, tmp_path):
+    annot_path = tmp_path / "annotations.jsonl"
+    assert jsonl.write_annots(iter(seq_annots), annot_path) == len(seq_annots)
+    data = annot_path.read_bytes()
+    # cut off the last line, as if the writer was stopped
+    annot_path.write_bytes(data[:-20])
+    assert list(jsonl.iter_annots(annot_path)) == seq_annots[:-1]
+    assert jsonl.tail(annot_path) == seq_annots[-2:-1]
+    with pytest.raises(ValueError):
+        list(jsonl.iter_annots(annot_path, strict=True))
+    # appending removes the partial line first
+    jsonl.write_annots(seq_annots[-1:], annot_path, append=True)
+    assert jsonl.tail(annot_path) == seq_annots[-1:]
+    assert list(jsonl.iter_annots(annot_path, strict=True)) == seq_annots
+
+    # a line that is not valid before the end of the file is an error
+    annot_path.write_bytes(b"{}\n" + data)
+    with pytest.raises(ValueError, match="line 1"):
+        list(jsonl.iter_annots(annot_path))
+
+
+def test_append_after_truncated(notmat_paths, tmp_path):
+    annots = [crowsetta.formats.seq.NotMat.from_file(notmat_path).to_annot() for notmat_path in notmat_paths[:11]]
+    annot_path = tmp_path / "annotations.jsonl"
+    jsonl.write_annots(annots[:10], annot_path)
+    annot_path.write_bytes(annot_path.read_bytes()[:-40])
+    jsonl.write_annots(annots[10:], annot_path, append=True)
+    assert list(jsonl.iter_annots(annot_path)) == annots[:9] + annots[10:]
+
+    # a valid last line without a newline is kept
+    annot_path.write_bytes(annot_path.read_bytes().rstrip(b"\n"))
+    jsonl.write_annots(annots[:1], annot_path, append=True)
+    assert list(jsonl.iter_annots(annot_path, strict=True)) == annots[:9] + annots[10:] + annots[:1]
+
+    # a file with only a partial line
+    annot_path.write_bytes(b'{"annot_pa')
+    jsonl.write_annots(annots[:1], annot_path, append=True)
+    assert list(jsonl.iter_annots(annot_path, strict=True)) == annots[:1]
+
+
+def test_write_annots_file_object(bbox_annots):
+    buffer = io.BytesIO()
+    assert jsonl.write_annots((annot for annot in bbox_annots), buffer) == len(bbox_annots)
+    buffer.name = "annotations.jsonl"
+    buffer.seek(0)
+    assert JsonLines.from_file(buffer).to_annot() == bbox_annots
+    buffer.seek(0)
+    assert crowsetta.formats.detect(buffer) == "jsonl"
+
+
+def test_get_backend(monkeypatch):
+    with pytest.raises(ValueError):
+        jsonl.get_backend("simplejson")
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    with pytest.raises(ImportError):
+        jsonl.get_backend("orjson")
+    loads, dumps = jsonl.get_backend()
+    assert loads(dumps({"labels": ["ä"]})) == {"labels": ["ä"]}
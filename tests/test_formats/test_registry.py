@@ -0,0 +1,133 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import crowsetta
+import crowsetta.formats.registry
+
+PLUGIN_MODULE = '''
+import pathlib
+from typing import ClassVar
+
+import attr
+
+import crowsetta
+
+
+@crowsetta.interface.SeqLike.register
+@attr.define
+class PluginSeq:
+    name: ClassVar[str] = "plugin-seq"
+    ext: ClassVar[str] = ".plugin"
+
+    labels: list
+    annot_path: pathlib.Path
+
+    @classmethod
+    def from_file(cls, annot_path):
+        return cls(labels=pathlib.Path(annot_path).read_text().split(), annot_path=pathlib.Path(annot_path))
+
+    def to_seq(self):
+        n = len(self.labels)
+        return crowsetta.Sequence.from_keyword(
+            labels=self.labels, onsets_s=[float(i) for i in range(n)], offsets_s=[i + 0.5 for i in range(n)]
+        )
+
+    def to_annot(self):
+        return crowsetta.Annotation(annot_path=self.annot_path, seq=self.to_seq())
+'''
+
+
+@pytest.fixture
+def plugin_dir(tmp_path):
+    """A directory with a plugin module, and the metadata of a distribution
+    that declares its format with an entry point, as if it were installed"""
+    plugin_dir = tmp_path / "site-packages"
+    plugin_dir.mkdir()
+    (plugin_dir / "crowsetta_test_plugin.py").write_text(PLUGIN_MODULE)
+    dist_info = plugin_dir / "crowsetta_test_plugin-0.1.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: crowsetta-test-plugin\nVersion: 0.1\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[crowsetta.formats]\n"
+        "plugin-seq = crowsetta_test_plugin:PluginSeq\n"
+        "notmat = crowsetta_test_plugin:PluginSeq\n"
+        "missing = crowsetta_test_plugin_missing:Missing\n"
+    )
+    return plugin_dir
+
+
+@pytest.fixture
+def plugin_registry(plugin_dir, monkeypatch):
+    monkeypatch.syspath_prepend(str(plugin_dir))
+    monkeypatch.delitem(sys.modules, "crowsetta_test_plugin", raising=False)
+    return crowsetta.formats.registry.FormatRegistry(
+        {"notmat": crowsetta.formats.registry.FormatSpec("crowsetta.formats.seq.notmat", "NotMat", (".not.mat",))},
+        entry_point_group=crowsetta.formats.registry.ENTRY_POINT_GROUP,
+    )
+
+
+def test_entry_point_specs(plugin_dir, monkeypatch):
+    monkeypatch.syspath_prepend(str(plugin_dir))
+    specs = crowsetta.formats.registry.entry_point_specs()
+    assert specs["plugin-seq"] == crowsetta.formats.registry.FormatSpec("crowsetta_test_plugin", "PluginSeq")
+
+
+def test_plugin_loaded_lazily(plugin_registry):
+    with pytest.warns(UserWarning, match="already registered"):
+        assert "plugin-seq" in plugin_registry
+    assert not plugin_registry.is_loaded("plugin-seq")
+    assert "crowsetta_test_plugin" not in sys.modules
+
+    format_class = plugin_registry["plugin-seq"]
+    assert "crowsetta_test_plugin" in sys.modules
+    assert format_class.__name__ == "PluginSeq"
+    assert plugin_registry.is_loaded("plugin-seq")
+    assert plugin_registry.ext("plugin-seq") == (".plugin",)
+    # the format registered first takes precedence over the entry point with the same name
+    assert plugin_registry["notmat"] is crowsetta.formats.seq.NotMat
+
+
+def test_registered_names_do_not_read_entry_points(plugin_registry, monkeypatch):
+    def entry_point_specs_raises(*args, **kwargs):
+        raise AssertionError("entry points were read")
+
+    monkeypatch.setattr(crowsetta.formats.registry, "entry_point_specs", entry_point_specs_raises)
+    assert "notmat" in plugin_registry
+    assert plugin_registry.ext("notmat") == (".not.mat",)
+    with pytest.raises(AssertionError):
+        list(plugin_registry)
+
+
+def test_plugin_that_cannot_be_imported_raises(plugin_registry):
+    with pytest.warns(UserWarning):
+        assert "missing" in plugin_registry
+    with pytest.raises(ImportError, match="missing"):
+        plugin_registry["missing"]
+
+
+def test_plugin_with_transcriber(plugin_dir, tmp_path):
+    """test the entry point group in a new interpreter, as it would be used after installing a plugin"""
+    annot_path = tmp_path / "annot.plugin"
+    annot_path.write_text("a b c")
+    script = textwrap.dedent(
+        f"""
+        import sys
+        import warnings
+
+        import crowsetta
+
+        warnings.simplefilter("ignore")
+        assert "plugin-seq" in crowsetta.formats.as_list()
+        assert "crowsetta_test_plugin" not in sys.modules
+        scribe = crowsetta.Transcriber(format="plugin-seq")
+        annot = scribe.from_file({str(annot_path)!r}).to_annot()
+        assert list(annot.seq.labels) == ["a", "b", "c"]
+        assert "crowsetta_test_plugin" in sys.modules
+        """
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(plugin_dir), *sys.path]))
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)
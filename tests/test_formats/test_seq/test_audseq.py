@@ -104,3 +104,44 @@ def test_to_file(an_audseq_path, tmp_path):
     csv_path = tmp_path / an_audseq_path.name
     audseq.to_file(annot_path=csv_path)
     assert filecmp.cmp(an_audseq_path, csv_path)
+
+
+def test_from_file_matches_pandas(an_audseq_path):
+    audseq = crowsetta.formats.seq.AudSeq.from_file(annot_path=an_audseq_path)
+    audseq_df = pd.read_csv(an_audseq_path, sep="\t", header=None)
+    np.testing.assert_array_equal(audseq.start_times, audseq_df[0].values)
+    np.testing.assert_array_equal(audseq.end_times, audseq_df[1].values)
+    np.testing.assert_array_equal(audseq.labels, audseq_df[2].values.astype(str))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # missing label in second row
+        "0.1\t0.2\ta\n0.3\t0.4\t\n",
+        # labels that pandas reads as missing values
+        "0.1\t0.2\ta\n0.3\t0.4\tNA\n",
+        "0.1\t0.2\tn/a\n",
+        "0.1\t0.2\tNULL\n",
+    ],
+)
+def test_from_file_invalid_raises(text, tmp_path):
+    annot_path = tmp_path / "invalid.txt"
+    annot_path.write_text(text)
+    with pytest.raises(pandera.errors.SchemaError):
+        crowsetta.formats.seq.AudSeq.from_file(annot_path=annot_path)
+
+
+def test_from_annot(notmat_paths, tmp_path):
+    annot = crowsetta.formats.seq.NotMat.from_file(notmat_paths[0]).to_annot()
+    audseq = crowsetta.formats.seq.AudSeq.from_annot(annot)
+    assert isinstance(audseq, crowsetta.formats.seq.AudSeq)
+    annot_path = tmp_path / "notmat.txt"
+    audseq.to_file(annot_path)
+    assert crowsetta.formats.seq.AudSeq.from_file(annot_path).to_annot().seq == annot.seq
+
+
+def test_from_annot_bbox_raises(audbbox_paths):
+    annot = crowsetta.formats.bbox.AudBBox.from_file(audbbox_paths[0]).to_annot()
+    with pytest.raises(ValueError):
+        crowsetta.formats.seq.AudSeq.from_annot(annot)
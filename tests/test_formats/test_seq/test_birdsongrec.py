@@ -1,4 +1,5 @@
 """test functions in birdsongrec module"""
+import birdsongrec
 import numpy as np
 import pytest
 import soundfile
@@ -177,3 +178,58 @@ def test_to_annot_round_times_false(test_data_root, birdsong_rec_xml_file, birds
 
     assert np.all(np.allclose(onsets_s_from_to_annot, onsets_s_from_birdsongrec))
     assert np.all(np.allclose(offsets_s_from_to_annot, offsets_s_from_birdsongrec))
+
+
+def assert_sequences_equal(sequences, expected_sequences):
+    assert len(sequences) == len(expected_sequences)
+    for seq, expected_seq in zip(sequences, expected_sequences):
+        assert (seq.wav_file, seq.position, seq.length) == (
+            expected_seq.wav_file,
+            expected_seq.position,
+            expected_seq.length,
+        )
+        assert [(syl.position, syl.length, syl.label) for syl in seq.syls] == [
+            (syl.position, syl.length, syl.label) for syl in expected_seq.syls
+        ]
+
+
+@pytest.mark.parametrize(
+    "concat_seqs_into_songs",
+    [
+        True,
+        False,
+    ],
+)
+def test_parse_xml(birdsong_rec_xml_file, concat_seqs_into_songs):
+    sequence_arrays = crowsetta.formats.seq.birdsongrec.parse_xml(
+        birdsong_rec_xml_file, concat_seqs_into_songs=concat_seqs_into_songs
+    )
+    assert isinstance(sequence_arrays, crowsetta.formats.seq.birdsongrec.SequenceArrays)
+    expected_sequences = birdsongrec.parse_xml(birdsong_rec_xml_file, concat_seqs_into_songs=concat_seqs_into_songs)
+    assert_sequences_equal(sequence_arrays, expected_sequences)
+    assert_sequences_equal(sequence_arrays[-2:], expected_sequences[-2:])
+    with pytest.raises(IndexError):
+        sequence_arrays[len(expected_sequences)]
+
+
+def test_sequence_arrays_from_sequences(birdsong_rec_xml_file):
+    expected_sequences = birdsongrec.parse_xml(birdsong_rec_xml_file, concat_seqs_into_songs=False)
+    sequence_arrays = crowsetta.formats.seq.birdsongrec.SequenceArrays.from_sequences(expected_sequences)
+    assert sequence_arrays == crowsetta.formats.seq.birdsongrec.parse_xml(
+        birdsong_rec_xml_file, concat_seqs_into_songs=False
+    )
+    assert sequence_arrays.concat_into_songs() == crowsetta.formats.seq.birdsongrec.parse_xml(
+        birdsong_rec_xml_file, concat_seqs_into_songs=True
+    )
+
+
+def test_to_seq_from_list_of_sequences(birdsong_rec_xml_file, birdsong_rec_wav_path):
+    birdsongrec_from_file = crowsetta.formats.seq.BirdsongRec.from_file(
+        annot_path=birdsong_rec_xml_file, wav_path=birdsong_rec_wav_path
+    )
+    birdsongrec_from_list = crowsetta.formats.seq.BirdsongRec(
+        sequences=birdsongrec.parse_xml(birdsong_rec_xml_file, concat_seqs_into_songs=True),
+        annot_path=birdsong_rec_xml_file,
+        wav_path=birdsong_rec_wav_path,
+    )
+    assert birdsongrec_from_list.to_annot() == birdsongrec_from_file.to_annot()
@@ -475,3 +475,14 @@ class TestGenericSeqClass:
         df_compare = pd.read_csv(timit_phn_as_generic_seq_csv)
         df_compare = crowsetta.formats.seq.generic.GenericSeqSchema.validate(df_compare)
         pd.testing.assert_frame_equal(df_created, df_compare)
+
+    def test_from_annot(self, notmat_paths, tmp_path):
+        annots = [crowsetta.formats.seq.NotMat.from_file(notmat_path).to_annot() for notmat_path in notmat_paths]
+        generic = crowsetta.formats.seq.GenericSeq.from_annot(annots)
+        assert generic.annots == annots
+        assert crowsetta.formats.seq.GenericSeq.from_annot(annots[0]).annots == annots[:1]
+        annot_path = tmp_path / "notmat.csv"
+        generic.to_file(annot_path)
+        assert [annot.seq for annot in crowsetta.formats.seq.GenericSeq.from_file(annot_path).annots] == [
+            annot.seq for annot in annots
+        ]
@@ -0,0 +1,111 @@
+"""test functions and classes in matv73 module"""
+import pickle
+
+import numpy as np
+import pytest
+
+import crowsetta.formats.seq.matv73
+
+from ...fixtures.matv73 import write_matv73
+
+h5py = pytest.importorskip("h5py")
+
+
+@pytest.fixture
+def matv73_path(tmp_path):
+    mat_path = tmp_path / "test.mat"
+    write_matv73(
+        mat_path,
+        {
+            "scalar": 3.0,
+            "vector": np.arange(5.0),
+            "text": "abc",
+            "empty_text": "",
+            "cell": ["a", np.arange(3.0), {"field": 1.0}],
+            "struct": {"name": "bird0", "values": np.arange(2.0)},
+            "struct_array": [{"x": 1.0, "y": "a"}, {"x": np.arange(2.0), "y": "bc"}],
+        },
+        struct_arrays=("struct_array",),
+    )
+    return mat_path
+
+
+def test_is_matv73(matv73_path, a_notmat_path, tmp_path):
+    assert crowsetta.formats.seq.matv73.is_matv73(matv73_path)
+    assert not crowsetta.formats.seq.matv73.is_matv73(a_notmat_path)
+    not_mat_path = tmp_path / "not_a.mat"
+    not_mat_path.write_text("not a .mat file")
+    assert not crowsetta.formats.seq.matv73.is_matv73(not_mat_path)
+
+
+def test_read(matv73_path):
+    with crowsetta.formats.seq.matv73.open_file(matv73_path) as mat_file:
+        read = crowsetta.formats.seq.matv73.read
+        assert read(mat_file["scalar"]) == 3.0
+        np.testing.assert_array_equal(read(mat_file["vector"]), np.arange(5.0))
+        assert read(mat_file["text"]) == "abc"
+        assert read(mat_file["empty_text"]) == ""
+
+        cell = read(mat_file["cell"])
+        assert isinstance(cell, crowsetta.formats.seq.matv73.CellArray)
+        assert len(cell) == 3
+        assert cell[0] == "a"
+        np.testing.assert_array_equal(cell[-2], np.arange(3.0))
+        assert isinstance(cell[2], crowsetta.formats.seq.matv73.Struct)
+        assert dict(cell[2]) == {"field": 1.0}
+        assert cell[[2, 0]][1] == "a"
+        with pytest.raises(IndexError):
+            cell[3]
+
+        struct = read(mat_file["struct"])
+        assert isinstance(struct, crowsetta.formats.seq.matv73.Struct)
+        assert set(struct) == {"name", "values"}
+        assert struct["name"] == "bird0"
+
+        struct_array = read(mat_file["struct_array"])
+        assert isinstance(struct_array, crowsetta.formats.seq.matv73.StructArray)
+        assert len(struct_array) == 2
+        assert struct_array[0]["y"] == "a"
+        np.testing.assert_array_equal(struct_array[1]["x"], np.arange(2.0))
+        assert [record["y"] for record in struct_array[:]] == ["a", "bc"]
+
+
+def test_read_all(matv73_path):
+    read_all = crowsetta.formats.seq.matv73.read_all
+    with crowsetta.formats.seq.matv73.open_file(matv73_path) as mat_file:
+        cell = read_all(mat_file["cell"])
+        struct = read_all(mat_file["struct"])
+        struct_array = read_all(mat_file["struct_array"])
+    # values are still usable after the file is closed
+    assert isinstance(cell, np.ndarray) and cell.dtype == object
+    assert cell[0] == "a"
+    np.testing.assert_array_equal(cell[1], np.arange(3.0))
+    assert cell[2] == {"field": 1.0}
+    assert struct["name"] == "bird0"
+    np.testing.assert_array_equal(struct["values"], np.arange(2.0))
+    assert [record["y"] for record in struct_array] == ["a", "bc"]
+
+
+def test_pickle_lazy(matv73_path):
+    with crowsetta.formats.seq.matv73.open_file(matv73_path) as mat_file:
+        read = crowsetta.formats.seq.matv73.read
+        cell = pickle.loads(pickle.dumps(read(mat_file["cell"])))
+        struct = pickle.loads(pickle.dumps(read(mat_file["struct"])))
+        struct_array = pickle.loads(pickle.dumps(read(mat_file["struct_array"])))
+    # lazy containers are read when pickled, and unpickled as arrays and dicts
+    assert isinstance(cell, np.ndarray)
+    assert cell[2] == {"field": 1.0}
+    assert isinstance(struct, dict)
+    assert struct["name"] == "bird0"
+    assert [record["y"] for record in struct_array] == ["a", "bc"]
+
+
+def test_struct_array_reads_references_once(matv73_path):
+    with crowsetta.formats.seq.matv73.open_file(matv73_path) as mat_file:
+        struct_array = crowsetta.formats.seq.matv73.read(mat_file["struct_array"])
+        assert [record["y"] for record in struct_array] == ["a", "bc"]
+        # references for a field are read once for all the elements
+        assert set(struct_array._refs) == {"y"}
+        refs = struct_array._refs["y"]
+        assert struct_array[1]["y"] == "bc"
+        assert struct_array._refs["y"] is refs
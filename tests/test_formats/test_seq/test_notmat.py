@@ -20,6 +20,41 @@ def test_from_file_str(a_notmat_path):
     assert isinstance(notmat, crowsetta.formats.seq.NotMat)
 
 
+@pytest.mark.parametrize(
+    "other_vars",
+    [
+        None,
+        ("Fs",),
+        ("Fs", "fname"),
+    ],
+)
+def test_load_notmat(a_notmat_path, other_vars):
+    notmat_dict = crowsetta.formats.seq.notmat.load_notmat(a_notmat_path, other_vars)
+
+    expected_vars = ["onsets", "offsets", "labels"]
+    if other_vars is not None:
+        expected_vars.extend(other_vars)
+    assert sorted(key for key in notmat_dict if not key.startswith("__")) == sorted(expected_vars)
+
+    evfuncs_dict = evfuncs.load_notmat(a_notmat_path)
+    for var in expected_vars:
+        if isinstance(evfuncs_dict[var], np.ndarray):
+            assert np.array_equal(notmat_dict[var], evfuncs_dict[var])
+        else:
+            assert notmat_dict[var] == evfuncs_dict[var]
+
+
+def test_load_notmat_missing_var_raises(a_notmat_path):
+    with pytest.raises(ValueError):
+        crowsetta.formats.seq.notmat.load_notmat(a_notmat_path, other_vars=("not_a_var",))
+
+
+def test_from_file_other_vars(a_notmat_path):
+    notmat = crowsetta.formats.seq.NotMat.from_file(annot_path=a_notmat_path, other_vars=("Fs", "fname"))
+    assert list(notmat.other_vars.keys()) == ["Fs", "fname"]
+    assert notmat == crowsetta.formats.seq.NotMat.from_file(annot_path=a_notmat_path)
+
+
 def test_to_seq(a_notmat_path):
     notmat = crowsetta.formats.seq.NotMat.from_file(annot_path=a_notmat_path)
     seq = notmat.to_seq()
@@ -110,3 +145,14 @@ def test_to_file(tmp_path, a_notmat_path):
             assert np.allclose(notmat_dict[key], notmat_made[key], atol=1e-3, rtol=1e-3)
         else:
             assert notmat_dict[key] == notmat_made[key]
+
+
+def test_from_file_matv73(a_notmat_path, a_notmat_v73_path):
+    pytest.importorskip("h5py")
+    notmat = crowsetta.formats.seq.NotMat.from_file(a_notmat_path, other_vars=("Fs", "fname"))
+    notmat_v73 = crowsetta.formats.seq.NotMat.from_file(a_notmat_v73_path, other_vars=("Fs", "fname"))
+    np.testing.assert_array_equal(notmat_v73.onsets, notmat.onsets)
+    np.testing.assert_array_equal(notmat_v73.offsets, notmat.offsets)
+    np.testing.assert_array_equal(notmat_v73.labels, notmat.labels)
+    assert notmat_v73.other_vars == notmat.other_vars
+    assert notmat_v73.to_seq() == notmat.to_seq()
@@ -112,3 +112,38 @@ def test_to_file(a_simple_csv_path, tmp_path):
     csv_path = tmp_path / a_simple_csv_path.name
     simple.to_file(annot_path=csv_path)
     assert filecmp.cmp(a_simple_csv_path, csv_path)
+
+
+def test_from_file_matches_pandas(a_simple_csv_path):
+    simple = crowsetta.formats.seq.SimpleSeq.from_file(annot_path=a_simple_csv_path)
+    simple_df = pd.read_csv(a_simple_csv_path)
+    np.testing.assert_array_equal(simple.onsets_s, simple_df["onset_s"].values)
+    np.testing.assert_array_equal(simple.offsets_s, simple_df["offset_s"].values)
+    np.testing.assert_array_equal(simple.labels, simple_df["label"].values.astype(str))
+
+
+def test_from_file_columns_map(tmp_path):
+    annot_path = tmp_path / "annot.csv"
+    annot_path.write_text("begin,end,name\n0.1,0.2,a\n0.3,0.4,b\n")
+    simple = crowsetta.formats.seq.SimpleSeq.from_file(
+        annot_path=annot_path, columns_map={"begin": "onset_s", "end": "offset_s", "name": "label"}
+    )
+    np.testing.assert_array_equal(simple.onsets_s, np.array([0.1, 0.3]))
+    np.testing.assert_array_equal(simple.labels, np.array(["a", "b"]))
+
+
+def test_from_file_invalid_raises(tmp_path):
+    annot_path = tmp_path / "invalid.csv"
+    # time that is not a number in second row
+    annot_path.write_text("onset_s,offset_s,label\n0.1,0.2,a\n0.3,end,b\n")
+    with pytest.raises(pandera.errors.SchemaError):
+        crowsetta.formats.seq.SimpleSeq.from_file(annot_path=annot_path)
+
+
+def test_from_annot(notmat_paths, tmp_path):
+    annot = crowsetta.formats.seq.NotMat.from_file(notmat_paths[0]).to_annot()
+    simple = crowsetta.formats.seq.SimpleSeq.from_annot(annot)
+    assert isinstance(simple, crowsetta.formats.seq.SimpleSeq)
+    annot_path = tmp_path / "notmat.csv"
+    simple.to_file(annot_path)
+    assert crowsetta.formats.seq.SimpleSeq.from_file(annot_path).to_annot().seq == annot.seq
@@ -127,3 +127,48 @@ def test_to_annot_round_times_false(a_textgrid_path):
 
     assert np.all(np.allclose(annot.seq.onsets_s, onsets_s))
     assert np.all(np.allclose(annot.seq.offsets_s, offsets_s))
+
+
+@pytest.mark.parametrize('short', [True, False])
+def test_to_file(a_parse_textgrid_path, keep_empty, short, tmp_path):
+    textgrid = crowsetta.formats.seq.TextGrid.from_file(annot_path=a_parse_textgrid_path, keep_empty=keep_empty)
+    textgrid_path = tmp_path / 'test.TextGrid'
+    textgrid.to_file(textgrid_path, short=short)
+
+    # gaps get filled with empty intervals when writing, so compare without them
+    textgrid_written = crowsetta.formats.seq.TextGrid.from_file(annot_path=textgrid_path)
+    textgrid_source = crowsetta.formats.seq.TextGrid.from_file(annot_path=a_parse_textgrid_path)
+    assert textgrid_written.tiers == textgrid_source.tiers
+    assert textgrid_written.xmin == textgrid_source.xmin
+    assert textgrid_written.xmax == textgrid_source.xmax
+
+    # writing what we wrote gives back exactly the same file
+    textgrid_bytes = textgrid_path.read_bytes()
+    crowsetta.formats.seq.TextGrid.from_file(annot_path=textgrid_path, keep_empty=True).to_file(
+        textgrid_path, short=short
+    )
+    assert textgrid_path.read_bytes() == textgrid_bytes
+
+
+def test_from_annot(a_textgrid_path, tmp_path):
+    textgrid = crowsetta.formats.seq.TextGrid.from_file(annot_path=a_textgrid_path)
+    annot = textgrid.to_annot(round_times=False)
+
+    textgrid_from_annot = crowsetta.formats.seq.TextGrid.from_annot(annot)
+    assert isinstance(textgrid_from_annot, crowsetta.formats.seq.TextGrid)
+    textgrid_path = tmp_path / 'test.TextGrid'
+    textgrid_from_annot.to_file(textgrid_path)
+
+    annot_written = crowsetta.formats.seq.TextGrid.from_file(annot_path=textgrid_path).to_annot(round_times=False)
+    assert annot_written.seq == annot.seq
+
+
+def test_from_seq_tier_names():
+    seq = crowsetta.Sequence.from_keyword(
+        labels=np.array(['a', 'b']), onsets_s=np.array([0.5, 1.5]), offsets_s=np.array([1.0, 2.0])
+    )
+    textgrid = crowsetta.formats.seq.TextGrid.from_seq([seq, seq], annot_path='test.TextGrid',
+                                                       tier_names=['syllables', 'notes'])
+    assert textgrid.tier_names == ['syllables', 'notes']
+    assert textgrid.xmax == 2.0
+    assert textgrid.to_seq(round_times=False) == [seq, seq]
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+import crowsetta.formats.seq.textgrid.parse
+import crowsetta.formats.seq.textgrid.write
+from crowsetta.formats.seq.textgrid.classes import Interval, IntervalTier, Point, PointTier
+
+
+@pytest.mark.parametrize(
+    'vals, expected_strs',
+    [
+        ([0.0, 1.0, 2.5], ['0', '1', '2.5']),
+        ([0.1 + 0.2], ['0.30000000000000004']),
+        ([1e-05, 2.5e-07], ['0.00001', '0.00000025']),
+        ([123456789.0], ['123456789']),
+    ]
+)
+def test_format_floats(vals, expected_strs):
+    out = crowsetta.formats.seq.textgrid.write.format_floats(np.array(vals))
+    assert out == expected_strs
+    assert [float(val_str) for val_str in out] == vals
+
+
+def test_format_floats_raises():
+    with pytest.raises(ValueError):
+        crowsetta.formats.seq.textgrid.write.format_floats(np.array([1.0, np.nan]))
+
+
+def test_escape_strs():
+    out = crowsetta.formats.seq.textgrid.write.escape_strs(np.array(['a', 'say "hi"', '']))
+    assert out == ['a', 'say ""hi""', '']
+
+
+def test_escape_strs_raises():
+    with pytest.raises(ValueError):
+        crowsetta.formats.seq.textgrid.write.escape_strs(np.array(['a\nb']))
+
+
+@pytest.mark.parametrize(
+    'xmin, xmax, starts, ends, texts, expected_starts, expected_ends, expected_texts',
+    [
+        (
+            0.0, 3.0, [1.0], [2.0], ['a'],
+            [0.0, 1.0, 2.0], [1.0, 2.0, 3.0], ['', 'a', ''],
+        ),
+        (
+            0.0, 3.0, [0.0, 1.5], [1.0, 3.0], ['a', 'b'],
+            [0.0, 1.0, 1.5], [1.0, 1.5, 3.0], ['a', '', 'b'],
+        ),
+        (
+            0.0, 2.0, [0.0, 1.0], [1.0, 2.0], ['a', 'b'],
+            [0.0, 1.0], [1.0, 2.0], ['a', 'b'],
+        ),
+        (
+            0.0, 2.0, [], [], [],
+            [0.0], [2.0], [''],
+        ),
+    ]
+)
+def test_fill_gaps(xmin, xmax, starts, ends, texts, expected_starts, expected_ends, expected_texts):
+    out_starts, out_ends, out_texts = crowsetta.formats.seq.textgrid.write.fill_gaps(
+        xmin, xmax, np.array(starts, dtype=float), np.array(ends, dtype=float), np.array(texts, dtype=object)
+    )
+    assert np.array_equal(out_starts, np.array(expected_starts))
+    assert np.array_equal(out_ends, np.array(expected_ends))
+    assert out_texts.tolist() == expected_texts
+
+
+@pytest.mark.parametrize('short', [True, False])
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-16'])
+def test_write_round_trip(tmp_path, short, encoding):
+    tg = {
+        'xmin': 0.0,
+        'xmax': 2.4360509767904546,
+        'tiers': [
+            PointTier(
+                name='Tones', xmin=0.0, xmax=2.4360509767904546,
+                points=[Point(number=0.4351780385722748, mark='L+H*'), Point(number=1.244041566788134, mark='H-')]
+            ),
+            IntervalTier(
+                name='with "quotes"', xmin=0.0, xmax=2.4360509767904546,
+                intervals=[
+                    Interval(xmin=0.0, xmax=0.051451575248407266, text='PRES'),
+                    Interval(xmin=0.051451575248407266, xmax=0.6407379583230295, text='"Sione"'),
+                    Interval(xmin=0.6407379583230295, xmax=2.4360509767904546, text='ʔ'),
+                ]
+            ),
+        ]
+    }
+    textgrid_path = tmp_path / 'test.TextGrid'
+    crowsetta.formats.seq.textgrid.write.write(tg, textgrid_path, short=short, encoding=encoding)
+    out = crowsetta.formats.seq.textgrid.parse.parse(textgrid_path, keep_empty=True)
+    assert out == tg
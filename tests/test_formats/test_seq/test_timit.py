@@ -1,5 +1,6 @@
 import filecmp
 
+import numpy as np
 import pandas as pd
 import pandera
 import pytest
@@ -51,3 +52,27 @@ def test_to_timit(a_transcript_path, tmp_path):
     annot_path = tmp_path / a_transcript_path.name
     phn.to_file(annot_path=annot_path)
     assert filecmp.cmp(a_transcript_path, annot_path)
+
+
+def test_from_file_matches_pandas(a_transcript_path):
+    timit = crowsetta.formats.seq.Timit.from_file(annot_path=a_transcript_path)
+    transcript_df = pd.read_csv(a_transcript_path, sep=" ", header=None)
+    np.testing.assert_array_equal(timit.begin_samples, transcript_df[0].values)
+    np.testing.assert_array_equal(timit.end_samples, transcript_df[1].values)
+    np.testing.assert_array_equal(timit.text, transcript_df[2].values.astype(str))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # sample number that is not an integer in second row
+        "0 3050 h#\n3050 4559.5 sh\n",
+        # label that pandas reads as a missing value
+        "0 3050 h#\n3050 4559 NA\n",
+    ],
+)
+def test_from_file_invalid_raises(text, tmp_path):
+    annot_path = tmp_path / "invalid.phn"
+    annot_path.write_text(text)
+    with pytest.raises(pandera.errors.SchemaError):
+        crowsetta.formats.seq.Timit.from_file(annot_path=annot_path)
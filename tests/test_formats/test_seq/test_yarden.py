@@ -1,4 +1,6 @@
 """test functions in yarden module"""
+import pickle
+
 import numpy as np
 import pytest
 
@@ -91,3 +93,104 @@ def test_to_annot_round_times_false(test_data_root, yarden_annot_mat):
         offsets_s = crowsetta.formats.seq.yarden._cast_to_arr(offsets_s)
         assert np.all(np.allclose(annot.seq.onsets_s, onsets_s))
         assert np.all(np.allclose(annot.seq.offsets_s, offsets_s))
+
+
+def test_annotations_to_arrays(yarden_synthetic_annot_mat):
+    yarden = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat)
+    onsets_s, offsets_s, onset_samples, offset_samples, labels, bounds = (
+        crowsetta.formats.seq.yarden.annotations_to_arrays(yarden.annotations)
+    )
+    assert len(bounds) == len(yarden.annotations) + 1
+    for annotation, start, stop in zip(yarden.annotations, bounds[:-1], bounds[1:]):
+        expected_onsets_s = crowsetta.formats.seq.yarden._cast_to_arr(annotation["segFileStartTimes"].tolist())
+        expected_labels = crowsetta.formats.seq.yarden._cast_to_arr(annotation["segType"].tolist())
+        samp_freq = annotation["fs"].tolist()
+        np.testing.assert_array_equal(onsets_s[start:stop], expected_onsets_s)
+        np.testing.assert_array_equal(onset_samples[start:stop], np.round(expected_onsets_s * samp_freq).astype(int))
+        np.testing.assert_array_equal(labels[start:stop], [str(label) for label in expected_labels])
+
+
+@pytest.mark.parametrize(
+    "indices",
+    [
+        [0],
+        [3, 1],
+        [5, 5],
+        -1,
+        slice(2, 6),
+    ],
+)
+def test_to_seq_indices(yarden_synthetic_annot_mat, indices):
+    all_seqs = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat).to_seq()
+
+    yarden = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat)
+    seqs = yarden.to_seq(indices=indices)
+    expected_inds = np.arange(len(all_seqs))[indices]
+    assert seqs == [all_seqs[ind] for ind in np.atleast_1d(expected_inds)]
+    # only the requested songs are decoded
+    assert len(yarden._seqs) == len(np.unique(expected_inds))
+
+
+def test_to_seq_cached(yarden_synthetic_annot_mat, monkeypatch):
+    yarden = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat)
+    seqs = yarden.to_seq(indices=[1, 2])
+    assert len(yarden._seqs) == 2
+
+    def raises(*args, **kwargs):
+        raise AssertionError("decoded again")
+
+    monkeypatch.setattr(crowsetta.formats.seq.yarden, "annotations_to_arrays", raises)
+    seqs_again = yarden.to_seq(indices=[1, 2])
+    assert seqs_again == seqs
+    # each call returns new sequences, so changing one does not change the cache
+    assert seqs_again[0] is not seqs[0]
+    seqs[0].onsets_s[:] = -1.0
+    np.testing.assert_array_equal(yarden.to_seq(indices=[1])[0].onsets_s, seqs_again[0].onsets_s)
+    assert not np.array_equal(seqs_again[0].onsets_s, seqs[0].onsets_s)
+    monkeypatch.undo()
+    # different rounding is cached separately
+    yarden.to_seq(round_times=False, indices=[1])
+    assert len(yarden._seqs) == 3
+
+
+def test_to_annot_indices(yarden_synthetic_annot_mat):
+    yarden = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat)
+    annots = yarden.to_annot(indices=[4, 0])
+    assert [annot.notated_path.name for annot in annots] == ["song4.wav", "song0.wav"]
+    assert [annot.seq for annot in annots] == yarden.to_seq(indices=[4, 0])
+
+
+def test_to_seq_indices_raises(yarden_synthetic_annot_mat):
+    yarden = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat)
+    with pytest.raises(IndexError):
+        yarden.to_seq(indices=[len(yarden.annotations)])
+    with pytest.raises(TypeError):
+        yarden.to_seq(indices=[0.5])
+
+
+def test_from_file_matv73(yarden_synthetic_annot_mat, yarden_synthetic_annot_mat_v73):
+    pytest.importorskip("h5py")
+    yarden = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat)
+    yarden_v73 = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat_v73)
+    assert list(yarden_v73.audio_paths) == list(yarden.audio_paths)
+    assert yarden_v73.to_seq(indices=[5, 0]) == yarden.to_seq(indices=[5, 0])
+    assert yarden_v73.to_seq() == yarden.to_seq()
+    assert [annot.notated_path for annot in yarden_v73.to_annot()] == [
+        annot.notated_path for annot in yarden.to_annot()
+    ]
+
+
+def test_from_file_matv73_pickle(yarden_synthetic_annot_mat_v73):
+    pytest.importorskip("h5py")
+    yarden_v73 = crowsetta.formats.seq.SongAnnotationGUI.from_file(annot_path=yarden_synthetic_annot_mat_v73)
+    # nothing is read until it is accessed
+    assert isinstance(yarden_v73.annotations, crowsetta.formats.seq.matv73._LazyArray)
+    assert isinstance(yarden_v73.audio_paths, crowsetta.formats.seq.matv73.CellArray)
+    # everything is read when pickled, e.g. to send annotations from worker processes
+    unpickled = pickle.loads(pickle.dumps(yarden_v73))
+    assert isinstance(unpickled.annotations, np.ndarray)
+    assert list(unpickled.audio_paths) == list(yarden_v73.audio_paths)
+    assert unpickled.to_seq() == yarden_v73.to_seq()
+    scribe = crowsetta.Transcriber(format="yarden")
+    (from_process,) = scribe.from_files([yarden_synthetic_annot_mat_v73], workers=2, executor="process")
+    assert from_process.to_seq() == yarden_v73.to_seq()
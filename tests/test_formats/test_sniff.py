@@ -0,0 +1,165 @@
+import codecs
+import shutil
+from typing import ClassVar
+
+import pytest
+
+import crowsetta
+import crowsetta.formats.sniff
+
+
+@pytest.mark.parametrize(
+    "fixture_name, expected_format",
+    [
+        ("audbbox_paths", "aud-bbox"),
+        ("audseq_paths", "aud-seq"),
+        ("raven_txt_files", "raven"),
+        ("simple_csv_paths", "simple-seq"),
+        ("notmat_as_generic_seq_csv", "generic-seq"),
+        ("birdsong_rec_xml_file", "birdsong-recognition-dataset"),
+        ("kaggle_phn_paths", "timit"),
+        ("textgrid_paths", "textgrid"),
+        ("notmat_paths", "notmat"),
+        ("yarden_synthetic_annot_mat", "yarden"),
+    ],
+)
+def test_detect(fixture_name, expected_format, request):
+    annot_paths = request.getfixturevalue(fixture_name)
+    if not isinstance(annot_paths, list):
+        annot_paths = [annot_paths]
+    for annot_path in annot_paths:
+        assert crowsetta.formats.detect(annot_path) == expected_format
+        assert crowsetta.formats.detect(str(annot_path)) == expected_format
+
+
+def test_detect_matv73(a_notmat_v73_path, yarden_synthetic_annot_mat_v73):
+    assert crowsetta.formats.detect(a_notmat_v73_path) == "notmat"
+    assert crowsetta.formats.detect(yarden_synthetic_annot_mat_v73) == "yarden"
+
+
+def test_detect_wrd(a_wrd_path):
+    assert crowsetta.formats.detect(a_wrd_path) == "timit"
+
+
+def test_detect_only_reads_head(audseq_paths, monkeypatch):
+    """test that only the start of a file is read"""
+    sizes = []
+    open_ = open
+
+    class RecordRead:
+        def __init__(self, fp):
+            self.fp = fp
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.fp.close()
+
+        def read(self, size=-1):
+            sizes.append(size)
+            return self.fp.read(size)
+
+    monkeypatch.setattr(crowsetta.formats.source, "open", lambda *args: RecordRead(open_(*args)), raising=False)
+    crowsetta.formats.detect(audseq_paths[0])
+    assert sizes == [crowsetta.formats.sniff.SNIFF_SIZE + 1]
+
+
+def test_detect_all(notmat_as_generic_seq_csv):
+    candidates = crowsetta.formats.detect_all(notmat_as_generic_seq_csv)
+    assert candidates[0] == ("generic-seq", crowsetta.formats.sniff.CERTAIN)
+    confidences = [confidence for _, confidence in candidates]
+    assert confidences == sorted(confidences, reverse=True)
+    assert all(confidence > 0.0 for confidence in confidences)
+
+
+@pytest.mark.parametrize(
+    "filename, text",
+    [
+        ("annot.txt", "some notes about a recording\n"),
+        ("annot.txt", ""),
+        ("annot.csv", "1,2\n3,4\n"),
+        ("annot.json", '{"onsets": [1, 2]}'),
+    ],
+)
+def test_detect_raises(tmp_path, filename, text):
+    annot_path = tmp_path / filename
+    annot_path.write_text(text)
+    assert crowsetta.formats.detect_all(annot_path) == []
+    with pytest.raises(ValueError):
+        crowsetta.formats.detect(annot_path)
+
+
+def test_detect_registered_format(tmp_path):
+    @crowsetta.interface.SeqLike.register
+    class Custom:
+        name: ClassVar[str] = "custom-sniff"
+        ext: ClassVar[str] = ".txt"
+
+        @classmethod
+        def sniff(cls, file_head):
+            if file_head.lines and file_head.lines[0] == "# custom":
+                return crowsetta.formats.sniff.CERTAIN
+            return crowsetta.formats.sniff.NOT
+
+    annot_path = tmp_path / "annot.txt"
+    annot_path.write_text("# custom\n0.5\t1.0\ta\n")
+    crowsetta.formats.register_format(Custom)
+    try:
+        assert crowsetta.formats.detect(annot_path) == "custom-sniff"
+    finally:
+        del crowsetta.formats.FORMATS["custom-sniff"]
+
+
+def test_file_head_truncated(tmp_path):
+    annot_path = tmp_path / "annot.txt"
+    annot_path.write_text("".join(f"{ind}.0\t{ind}.5\tlabel{ind}\n" for ind in range(100)))
+    file_head = crowsetta.formats.sniff.FileHead(annot_path, sniff_size=35)
+    assert file_head.truncated
+    assert len(file_head.head) == 35
+    # last line is cut off, so it is dropped
+    assert file_head.lines == ["0.0\t0.5\tlabel0", "1.0\t1.5\tlabel1"]
+    assert file_head.rows("\t") == [["0.0", "0.5", "label0"], ["1.0", "1.5", "label1"]]
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16"])
+def test_file_head_text(a_textgrid_path, tmp_path, encoding):
+    text = a_textgrid_path.read_bytes().decode(
+        "utf-16" if a_textgrid_path.read_bytes().startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)) else "utf-8"
+    )
+    annot_path = tmp_path / a_textgrid_path.name
+    annot_path.write_text(text, encoding=encoding)
+    file_head = crowsetta.formats.sniff.FileHead(annot_path)
+    assert text.lstrip("\ufeff").startswith(file_head.text)
+    assert crowsetta.formats.detect(annot_path) == "textgrid"
+
+
+def test_file_head_binary(tmp_path, a_notmat_path):
+    annot_path = tmp_path / "annot.txt"
+    shutil.copy(a_notmat_path, annot_path)
+    file_head = crowsetta.formats.sniff.FileHead(annot_path)
+    assert file_head.text is None
+    assert file_head.lines == []
+    assert crowsetta.formats.detect_all(annot_path) == []
+
+
+def test_mat_variables(a_notmat_path, audseq_paths):
+    file_head = crowsetta.formats.sniff.FileHead(a_notmat_path)
+    assert {"onsets", "offsets", "labels"} <= file_head.mat_variables
+    assert crowsetta.formats.sniff.FileHead(audseq_paths[0]).mat_variables is None
+
+
+@pytest.mark.parametrize(
+    "value, expected_number, expected_integer",
+    [
+        ("0.5", True, False),
+        ("-1e-3", True, False),
+        (".5", True, False),
+        ("8529", True, True),
+        ("label", False, False),
+        ("", False, False),
+    ],
+)
+def test_is_number(value, expected_number, expected_integer):
+    assert crowsetta.formats.sniff.is_number(value) is expected_number
+    assert crowsetta.formats.sniff.is_integer(value) is expected_integer
@@ -0,0 +1,223 @@
+import io
+import pathlib
+
+import pytest
+
+import crowsetta
+from crowsetta.formats.source import AnnotSource, as_source
+
+
+def to_buffer(annot_path):
+    """Read a file into a :class:`io.BytesIO` named with its path"""
+    buffer = io.BytesIO(pathlib.Path(annot_path).read_bytes())
+    buffer.name = str(annot_path)
+    return buffer
+
+
+def test_annot_source_path(notmat_paths):
+    a_notmat_path = notmat_paths[0]
+    source = AnnotSource(str(a_notmat_path))
+    assert source.is_path
+    assert source.path == a_notmat_path
+    assert source.read_bytes() == a_notmat_path.read_bytes()
+    assert as_source(source) is source
+    assert source.in_memory() is source
+
+
+def test_annot_source_buffer(audseq_paths):
+    an_audseq_path = audseq_paths[0]
+    buffer = to_buffer(an_audseq_path)
+    # read from the position the buffer was at, every time it is opened
+    buffer.seek(3)
+    source = AnnotSource(buffer)
+    assert not source.is_path
+    assert source.path == an_audseq_path
+    with source.open_text() as fp:
+        fp.read()
+    assert source.read_bytes() == an_audseq_path.read_bytes()[3:]
+    # the buffer is not closed when text is read from it
+    assert not buffer.closed
+
+    in_memory = source.in_memory()
+    buffer.close()
+    assert in_memory.read_bytes() == an_audseq_path.read_bytes()[3:]
+
+
+def test_annot_source_not_seekable(audseq_paths):
+    an_audseq_path = audseq_paths[0]
+
+    class NotSeekable(io.RawIOBase):
+        name = str(an_audseq_path)
+
+        def __init__(self):
+            self._buffer = io.BytesIO(an_audseq_path.read_bytes())
+
+        def readable(self):
+            return True
+
+        def readinto(self, b):
+            return self._buffer.readinto(b)
+
+    source = AnnotSource(NotSeekable())
+    assert source.read_bytes() == source.read_bytes() == an_audseq_path.read_bytes()
+
+
+@pytest.mark.parametrize("to_data", [bytes, bytearray, memoryview])
+def test_annot_source_bytes(audseq_paths, to_data):
+    an_audseq_path = audseq_paths[0]
+    source = AnnotSource(to_data(an_audseq_path.read_bytes()), name=an_audseq_path.name)
+    assert not source.is_path
+    assert source.path == pathlib.Path(an_audseq_path.name)
+    assert source.read_bytes() == an_audseq_path.read_bytes()
+
+
+def test_annot_source_text(audseq_paths):
+    an_audseq_path = audseq_paths[0]
+    with open(an_audseq_path, "r") as fp:
+        source = AnnotSource(fp)
+    assert source.path == an_audseq_path
+    assert source.read_bytes() == an_audseq_path.read_bytes()
+    source = AnnotSource(io.StringIO(an_audseq_path.read_text()), name=an_audseq_path)
+    assert source.read_bytes() == an_audseq_path.read_bytes()
+
+
+def test_annot_source_name(audseq_paths):
+    an_audseq_path = audseq_paths[0]
+    source = AnnotSource(to_buffer(an_audseq_path), name="bird1.txt")
+    assert source.path == pathlib.Path("bird1.txt")
+    assert AnnotSource(source, name="bird2.txt").path == pathlib.Path("bird2.txt")
+    assert source.path == pathlib.Path("bird1.txt")
+
+
+@pytest.mark.parametrize(
+    "make_unnamed",
+    [
+        bytes,
+        memoryview,
+        io.BytesIO,
+        lambda data: io.StringIO(data.decode("utf-8")),
+    ],
+)
+def test_annot_source_unnamed(make_unnamed, audseq_paths):
+    data = audseq_paths[0].read_bytes()
+    source = AnnotSource(make_unnamed(data))
+    assert not source.has_name
+    assert source.path == pathlib.Path(crowsetta.formats.source.UNNAMED)
+    assert source.read_bytes() == data
+    assert not source.in_memory().has_name
+    assert AnnotSource(source, name="bird1.txt").has_name
+
+    # the extension of a source without a name is not validated
+    for validate_ext in (True, False):
+        audseq = crowsetta.formats.seq.AudSeq.from_file(make_unnamed(data), validate_ext=validate_ext)
+        assert audseq.annot_path == pathlib.Path(crowsetta.formats.source.UNNAMED)
+        assert audseq.to_seq() == crowsetta.formats.seq.AudSeq.from_file(audseq_paths[0]).to_seq()
+    with pytest.raises(ValueError):
+        crowsetta.formats.seq.AudSeq.from_file(AnnotSource(data, name="bird1.csv"))
+
+
+def test_detect_unnamed(audseq_paths):
+    data = audseq_paths[0].read_bytes()
+    assert crowsetta.formats.detect(data) == "aud-seq"
+    buffer = io.BytesIO(b"ignored" + data)
+    buffer.read(len(b"ignored"))
+    audseq = crowsetta.Transcriber(format="auto").from_file(buffer)
+    assert isinstance(audseq, crowsetta.formats.seq.AudSeq)
+    assert audseq.to_seq() == crowsetta.formats.seq.AudSeq.from_file(audseq_paths[0]).to_seq()
+
+
+def test_annot_source_raises(audseq_paths):
+    with pytest.raises(ValueError):
+        AnnotSource(audseq_paths[0], name="bird1.txt")
+    with pytest.raises(TypeError):
+        AnnotSource(1)
+
+
+@pytest.mark.parametrize(
+    "format_name, fixture_name, kwargs",
+    [
+        ("aud-bbox", "audbbox_paths", {}),
+        ("aud-seq", "audseq_paths", {}),
+        ("birdsong-recognition-dataset", "birdsong_rec_xml_file", {}),
+        ("generic-seq", "notmat_as_generic_seq_csv", {}),
+        ("notmat", "notmat_paths", {}),
+        ("raven", "raven_txt_files", {"annot_col": "Species"}),
+        ("simple-seq", "simple_csv_paths", {}),
+        ("textgrid", "textgrid_paths", {}),
+        ("timit", "kaggle_phn_paths", {}),
+        ("yarden", "yarden_synthetic_annot_mat", {}),
+    ],
+)
+def test_from_file_buffer(format_name, fixture_name, kwargs, request):
+    annot_path = request.getfixturevalue(fixture_name)
+    if isinstance(annot_path, list):
+        annot_path = annot_path[0]
+    format_class = crowsetta.formats.by_name(format_name)
+    assert crowsetta.formats.source.accepts_buffers(format_class)
+    from_path = format_class.from_file(annot_path, **kwargs)
+    from_buffer = format_class.from_file(to_buffer(annot_path), **kwargs)
+    if format_name != "generic-seq":
+        assert from_buffer.annot_path == pathlib.Path(annot_path)
+    assert repr(from_buffer.to_annot()) == repr(from_path.to_annot())
+
+
+@pytest.mark.parametrize(
+    "format_name, fixture_name, kwargs",
+    [
+        ("aud-seq", "audseq_paths", {}),
+        ("notmat", "notmat_paths", {}),
+        ("raven", "raven_txt_files", {"annot_col": "Species"}),
+        ("textgrid", "textgrid_paths", {}),
+    ],
+)
+def test_from_file_bytes_and_text(format_name, fixture_name, kwargs, request):
+    annot_path = request.getfixturevalue(fixture_name)[0]
+    format_class = crowsetta.formats.by_name(format_name)
+    expected = format_class.from_file(annot_path, **kwargs)
+    data = annot_path.read_bytes()
+    sources = [
+        AnnotSource(data, name=annot_path),
+        AnnotSource(memoryview(data), name=annot_path),
+    ]
+    if format_name != "notmat":
+        # text file objects are encoded as UTF-8
+        text = data.decode("utf-16") if data.startswith((b"\xff\xfe", b"\xfe\xff")) else data.decode()
+        sources.append(AnnotSource(io.StringIO(text), name=annot_path))
+    for source in sources:
+        from_source = format_class.from_file(source, **kwargs)
+        assert from_source.annot_path == annot_path
+        assert repr(from_source.to_annot()) == repr(expected.to_annot())
+
+
+def test_yarden_v73_buffer_closed(yarden_synthetic_annot_mat_v73):
+    buffer = to_buffer(yarden_synthetic_annot_mat_v73)
+    yarden = crowsetta.formats.seq.SongAnnotationGUI.from_file(buffer)
+    # variables in v7.3 files are read when they are accessed, after the buffer is closed
+    buffer.close()
+    expected = crowsetta.formats.seq.SongAnnotationGUI.from_file(yarden_synthetic_annot_mat_v73)
+    assert yarden.to_seq() == expected.to_seq()
+
+
+def test_from_file_buffer_validates_ext(audseq_paths):
+    an_audseq_path = audseq_paths[0]
+    buffer = to_buffer(an_audseq_path)
+    buffer.name = "annotations.csv"
+    with pytest.raises(ValueError):
+        crowsetta.formats.seq.AudSeq.from_file(buffer)
+    # unless the check is turned off
+    audseq = crowsetta.formats.seq.AudSeq.from_file(buffer, validate_ext=False)
+    assert audseq.annot_path == pathlib.Path("annotations.csv")
+
+
+def test_raven_full_df_buffer_closed(raven_txt_files, raven_dataset_annot_col):
+    a_raven_txt_file = raven_txt_files[0]
+    buffer = to_buffer(a_raven_txt_file)
+    raven = crowsetta.formats.bbox.Raven.from_file(buffer, annot_col=raven_dataset_annot_col)
+    buffer.close()
+    expected = crowsetta.formats.bbox.Raven.from_file(a_raven_txt_file, annot_col=raven_dataset_annot_col)
+    assert raven.full_df.equals(expected.full_df)
+
+
+def test_detect_buffer(raven_txt_files, notmat_paths):
+    assert crowsetta.formats.detect(to_buffer(raven_txt_files[0])) == "raven"
+    assert crowsetta.formats.detect(to_buffer(notmat_paths[0])) == "notmat"
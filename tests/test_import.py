@@ -0,0 +1,109 @@
+"""Tests that importing crowsetta does not import the dependencies of formats.
+
+Each test runs in a new interpreter, since other tests
+will already have imported format modules in this one.
+"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+import crowsetta
+
+HEAVY_MODULES = ("pandas", "pandera", "scipy", "soundfile", "evfuncs", "birdsongrec", "h5py")
+FORMAT_MODULES = (
+    "crowsetta.formats.bbox.audbbox",
+    "crowsetta.formats.bbox.raven",
+    "crowsetta.formats.seq.audseq",
+    "crowsetta.formats.seq.birdsongrec",
+    "crowsetta.formats.seq.generic",
+    "crowsetta.formats.seq.notmat",
+    "crowsetta.formats.seq.simple",
+    "crowsetta.formats.seq.textgrid.textgrid",
+    "crowsetta.formats.seq.timit",
+    "crowsetta.formats.seq.yarden",
+)
+
+
+def imported_after(code: str) -> dict:
+    """Run ``code`` in a new interpreter, and return which of
+    ``HEAVY_MODULES`` and format modules were imported afterwards"""
+    script = (
+        f"import sys\n{code}\n"
+        "import json\n"
+        "print(json.dumps({name: name in sys.modules for name in sys.argv[1:]}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, *HEAVY_MODULES, *FORMAT_MODULES],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_import_crowsetta():
+    imported = imported_after("import crowsetta")
+    assert not any(imported.values()), [name for name, is_imported in imported.items() if is_imported]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import crowsetta; crowsetta.formats.as_list()",
+        "import crowsetta; 'notmat' in crowsetta.formats.FORMATS",
+        "import crowsetta; crowsetta.Transcriber(format='auto')",
+        "import crowsetta; crowsetta.Annotation(annot_path='a.txt', seq=crowsetta.Sequence.from_keyword("
+        "labels=['a'], onsets_s=[0.], offsets_s=[1.]))",
+    ],
+)
+def test_no_format_imported(code):
+    imported = imported_after(code)
+    assert not any(imported.values()), [name for name, is_imported in imported.items() if is_imported]
+
+
+def test_by_name_imports_one_format():
+    imported = imported_after("import crowsetta; crowsetta.formats.by_name('textgrid')")
+    assert imported["crowsetta.formats.seq.textgrid.textgrid"]
+    assert not imported["pandas"]
+    assert not imported["crowsetta.formats.seq.notmat"]
+
+
+def test_builtin_format_does_not_read_entry_points():
+    """test that using a built-in format does not read entry points for plugins,
+    so startup does not get slower as plugins are installed"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, crowsetta; crowsetta.Transcriber(format='textgrid'); "
+            "print('importlib.metadata' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_registry():
+    for name in crowsetta.formats.as_list():
+        format_class = crowsetta.formats.by_name(name)
+        assert format_class.name == name
+        assert crowsetta.formats.FORMATS.is_loaded(name)
+        # extensions in the static registry match the class
+        ext = (format_class.ext,) if isinstance(format_class.ext, str) else format_class.ext
+        assert crowsetta.formats.FORMATS.ext(name) == tuple(ext)
+
+
+def test_lazy_attributes():
+    assert crowsetta.formats.seq.NotMat is crowsetta.formats.by_name("notmat")
+    assert crowsetta.formats.bbox.Raven is crowsetta.formats.by_name("raven")
+    assert crowsetta.formats.seq.matv73.is_matv73 is not None
+    assert "NotMat" in dir(crowsetta.formats.seq)
+    assert "seq" in dir(crowsetta.formats)
+    with pytest.raises(AttributeError):
+        crowsetta.formats.seq.NotAFormat
+    with pytest.raises(AttributeError):
+        crowsetta.formats.not_a_module
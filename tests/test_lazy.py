@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+import crowsetta
+from crowsetta import LazyAnnotation
+
+
+def test_lazy_annotation(notmat_paths, count_parsed):
+    notmat_path = notmat_paths[0]
+    lazy_annot = LazyAnnotation(notmat_path, format="notmat")
+    assert isinstance(lazy_annot, crowsetta.Annotation)
+    assert lazy_annot.annot_path == notmat_path
+    assert lazy_annot.format == "notmat"
+    assert lazy_annot.size == os.stat(notmat_path).st_size
+    assert lazy_annot.mtime == os.stat(notmat_path).st_mtime
+    assert not lazy_annot.loaded
+    assert "loaded=False" in repr(lazy_annot)
+    assert count_parsed == []
+
+    expected = crowsetta.formats.seq.NotMat.from_file(notmat_path).to_annot()
+    count_parsed.clear()
+    assert lazy_annot.seq == expected.seq
+    assert lazy_annot.loaded
+    assert not hasattr(lazy_annot, "bboxes")
+    assert lazy_annot.notated_path == expected.notated_path
+    assert lazy_annot == expected
+    # the file is only parsed once
+    assert len(count_parsed) == 1
+
+
+def test_lazy_annotation_bboxes(raven_txt_files, raven_dataset_annot_col):
+    scribe = crowsetta.Transcriber(format="raven")
+    lazy_annot = LazyAnnotation(raven_txt_files[0], scribe, kwargs={"annot_col": raven_dataset_annot_col})
+    assert lazy_annot.scribe is scribe
+    expected = scribe.from_file(raven_txt_files[0], annot_col=raven_dataset_annot_col).to_annot()
+    assert lazy_annot.bboxes == expected.bboxes
+    assert not hasattr(lazy_annot, "seq")
+    # a lazy annotation can be converted to other formats like any annotation
+    generic = crowsetta.formats.bbox.GenericBBox.from_annot([lazy_annot])
+    assert generic.to_bbox() == [expected.bboxes]
+
+
+def test_lazy_annotation_raises(notmat_as_generic_seq_csv):
+    lazy_annot = LazyAnnotation(notmat_as_generic_seq_csv, format="generic-seq")
+    with pytest.raises(ValueError):
+        lazy_annot.seq
+
+
+def test_lazy_from_files_and_load(notmat_paths, count_parsed):
+    scribe = crowsetta.Transcriber(format="notmat")
+    notated_paths = [notmat_path.parent / notmat_path.name.replace(".not.mat", "") for notmat_path in notmat_paths]
+    lazy_annots = scribe.lazy_from_files(notmat_paths, notated_paths=notated_paths)
+    assert [lazy_annot.annot_path for lazy_annot in lazy_annots] == notmat_paths
+    # filter without parsing
+    filtered = [lazy_annot for lazy_annot in lazy_annots if lazy_annot.notated_path in notated_paths[::2]]
+    assert len(filtered) == len(notated_paths[::2])
+    assert count_parsed == []
+
+    crowsetta.lazy.load(filtered, workers=1)
+    assert len(count_parsed) == len(filtered)
+    assert all(lazy_annot.loaded for lazy_annot in filtered)
+    assert not any(lazy_annot.loaded for lazy_annot in lazy_annots[1::2])
+    expected = [scribe.from_file(notmat_path, convert="to_annot") for notmat_path in notmat_paths[::2]]
+    assert [lazy_annot.seq for lazy_annot in filtered] == [annot.seq for annot in expected]
+    # loading again does not parse files that were already loaded
+    count_parsed.clear()
+    crowsetta.lazy.load(filtered)
+    assert count_parsed == []
+
+    with pytest.raises(ValueError):
+        scribe.lazy_from_files(notmat_paths, notated_paths=notated_paths[:1])
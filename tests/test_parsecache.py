@@ -0,0 +1,354 @@
+import concurrent.futures
+import io
+import os
+import pickle
+import shutil
+import threading
+
+import numpy as np
+import pytest
+
+import crowsetta.parsecache
+
+
+@pytest.fixture
+def parse_cache(tmp_path):
+    cache = crowsetta.parsecache.ParseCache(cache_dir=tmp_path / "parse-cache")
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def a_notmat_copy(a_notmat_path, tmp_path):
+    notmat_path = tmp_path / a_notmat_path.name
+    shutil.copy(a_notmat_path, notmat_path)
+    return notmat_path
+
+
+def _touch_later(path):
+    """Change modification time, even on file systems with coarse timestamps"""
+    stat_result = os.stat(path)
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+def test_put_get(parse_cache, a_notmat_copy):
+    key = parse_cache.make_key(a_notmat_copy, "notmat")
+    assert parse_cache.get(key) is None
+    notmat = crowsetta.formats.seq.NotMat.from_file(a_notmat_copy)
+    parse_cache.put(key, notmat)
+    cached = parse_cache.get(key)
+    assert cached.annot_path == notmat.annot_path
+    np.testing.assert_array_equal(cached.onsets, notmat.onsets)
+    np.testing.assert_array_equal(cached.labels, notmat.labels)
+    assert len(parse_cache) == 1
+    assert parse_cache.size > 0
+    assert parse_cache.db_path.exists()
+
+
+def test_make_key(a_notmat_copy):
+    key = crowsetta.parsecache.ParseCache.make_key(a_notmat_copy, "notmat")
+    assert key == crowsetta.parsecache.ParseCache.make_key(str(a_notmat_copy), "notmat", (), {})
+    assert key != crowsetta.parsecache.ParseCache.make_key(a_notmat_copy, "yarden")
+    assert key != crowsetta.parsecache.ParseCache.make_key(a_notmat_copy, "notmat", kwargs={"annot_col": "a"})
+    _touch_later(a_notmat_copy)
+    assert key != crowsetta.parsecache.ParseCache.make_key(a_notmat_copy, "notmat")
+    with pytest.raises(FileNotFoundError):
+        crowsetta.parsecache.ParseCache.make_key(a_notmat_copy.parent / "does-not-exist.not.mat", "notmat")
+
+
+def test_transcriber_cache(parse_cache, a_notmat_copy, monkeypatch):
+    scribe = crowsetta.Transcriber(format="notmat", cache=parse_cache)
+    notmat = scribe.from_file(a_notmat_copy)
+
+    def from_file_raises(*args, **kwargs):
+        raise AssertionError("file was parsed instead of loaded from cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(crowsetta.formats.seq.NotMat, "from_file", from_file_raises)
+        cached = scribe.from_file(a_notmat_copy)
+    assert cached.to_annot() == notmat.to_annot()
+
+    # parsed again after file changes
+    _touch_later(a_notmat_copy)
+    parsed = []
+    from_file = crowsetta.formats.seq.NotMat.from_file
+
+    def from_file_counts(*args, **kwargs):
+        parsed.append(args)
+        return from_file(*args, **kwargs)
+
+    with monkeypatch.context() as m:
+        m.setattr(crowsetta.formats.seq.NotMat, "from_file", from_file_counts)
+        scribe.from_file(a_notmat_copy)
+    assert len(parsed) == 1
+    assert len(parse_cache) == 2
+
+
+@pytest.mark.parametrize("cache", [True, "dir", False, None])
+def test_transcriber_cache_arg(cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(crowsetta.parsecache, "default_cache_dir", lambda: tmp_path / "default")
+    if cache == "dir":
+        cache = tmp_path / "dir"
+    scribe = crowsetta.Transcriber(format="notmat", cache=cache)
+    if cache is True:
+        assert scribe.cache.cache_dir == tmp_path / "default"
+    elif cache:
+        assert scribe.cache.cache_dir == cache
+    else:
+        assert scribe.cache is None
+
+
+def test_transcriber_cache_arg_raises():
+    with pytest.raises(TypeError):
+        crowsetta.Transcriber(format="notmat", cache=42)
+
+
+def test_from_files_cache(parse_cache, notmat_paths):
+    scribe = crowsetta.Transcriber(format="notmat", cache=parse_cache)
+    annots = scribe.from_files(notmat_paths, convert="to_annot", workers=2, executor="process", chunksize=2)
+    # results were added to the cache by worker processes
+    assert len(parse_cache) == len(notmat_paths)
+    cached_annots = scribe.from_files(notmat_paths, convert="to_annot", workers=1)
+    assert cached_annots == annots
+
+
+def test_lru_eviction(tmp_path, notmat_paths, monkeypatch):
+    monkeypatch.setattr(crowsetta.parsecache, "LAST_ACCESS_RESOLUTION", -1.0)
+    value_size = len(
+        crowsetta.parsecache.zlib.compress(pickle.dumps(np.arange(1000), protocol=pickle.HIGHEST_PROTOCOL), 1)
+    )
+    cache = crowsetta.parsecache.ParseCache(cache_dir=tmp_path, max_size=int(value_size * 3.5))
+    keys = [f"key{ind}" for ind in range(4)]
+    for key in keys[:3]:
+        cache.put(key, np.arange(1000))
+    # access first key, so second key is least recently used
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[3], np.arange(1000))
+    assert cache.get(keys[1]) is None
+    for key in (keys[0], keys[2], keys[3]):
+        assert cache.get(key) is not None
+    assert cache.size <= cache.max_size
+    (summed_size,) = cache._connect().execute("SELECT SUM(size) FROM results").fetchone()
+    assert cache.size == summed_size
+
+
+def test_get_updates_last_access_once_a_minute(parse_cache):
+    parse_cache.put("key", np.arange(1000))
+    connection = parse_cache._connect()
+    (last_access,) = connection.execute("SELECT last_access FROM results WHERE key = 'key'").fetchone()
+    # getting a result that was just used does not write to the database
+    total_changes = connection.total_changes
+    assert parse_cache.get("key") is not None
+    assert connection.total_changes == total_changes
+    connection.execute("UPDATE results SET last_access = ? WHERE key = 'key'", (last_access - 120.0,))
+    assert parse_cache.get("key") is not None
+    (new_last_access,) = connection.execute("SELECT last_access FROM results WHERE key = 'key'").fetchone()
+    assert new_last_access >= last_access
+
+
+def test_result_that_cannot_be_pickled_is_not_cached(parse_cache):
+    parse_cache.put("key", threading.Lock())
+    assert len(parse_cache) == 0
+
+
+def test_delete_clear(parse_cache):
+    parse_cache.put("key1", [1, 2, 3])
+    parse_cache.put("key2", [4, 5, 6])
+    parse_cache.delete("key1")
+    assert parse_cache.get("key1") is None
+    assert parse_cache.get("key2") == [4, 5, 6]
+    parse_cache.clear()
+    assert len(parse_cache) == 0
+    assert parse_cache.size == 0
+
+
+def test_pickle(parse_cache):
+    parse_cache.put("key", "value")
+    unpickled = pickle.loads(pickle.dumps(parse_cache))
+    assert unpickled.cache_dir == parse_cache.cache_dir
+    assert unpickled.get("key") == "value"
+    # unpickling again in the same process gives the same instance
+    assert pickle.loads(pickle.dumps(parse_cache)) is unpickled
+
+
+def _put_many(cache_dir, max_size, worker_ind):
+    cache = crowsetta.parsecache.ParseCache(cache_dir=cache_dir, max_size=max_size)
+    for ind in range(50):
+        cache.put(f"{worker_ind}-{ind}", np.full(100, ind))
+        cache.get(f"{worker_ind}-{ind // 2}")
+    cache.close()
+
+
+def test_concurrent_writers(tmp_path):
+    max_size = 20_000
+    with concurrent.futures.ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_put_many, [tmp_path] * 4, [max_size] * 4, range(4)))
+    cache = crowsetta.parsecache.ParseCache(cache_dir=tmp_path, max_size=max_size)
+    (summed_size,) = cache._connect().execute("SELECT SUM(size) FROM results").fetchone()
+    assert cache.size == summed_size
+    assert 0 < cache.size <= max_size
+    cache.close()
+
+
+def test_transcriber_memory_cache(a_notmat_copy, count_parsed):
+    scribe = crowsetta.Transcriber(format="notmat", memory_cache=True)
+    notmat = scribe.from_file(a_notmat_copy)
+    assert scribe.from_file(a_notmat_copy).to_annot() == notmat.to_annot()
+    assert scribe.from_file(str(a_notmat_copy)).to_annot() == notmat.to_annot()
+    assert len(count_parsed) == 1
+    info = scribe.memory_cache.cache_info()
+    assert (info.hits, info.misses, info.entries) == (2, 1, 1)
+
+    # parsed again after file changes
+    _touch_later(a_notmat_copy)
+    reparsed = scribe.from_file(a_notmat_copy)
+    assert reparsed is not notmat
+    assert len(count_parsed) == 2
+    assert len(scribe.memory_cache) == 1
+
+
+def test_transcriber_memory_cache_convert(a_notmat_copy, count_parsed):
+    scribe = crowsetta.Transcriber(format="notmat", memory_cache=True)
+    annot = scribe.from_file(a_notmat_copy, convert="to_annot")
+    assert annot == crowsetta.formats.seq.NotMat.from_file(a_notmat_copy).to_annot()
+    assert scribe.from_file(a_notmat_copy, convert="to_annot") == annot
+    # the instance that was converted is cached too
+    notmat = scribe.from_file(a_notmat_copy)
+    seq = scribe.from_file(a_notmat_copy, convert="to_seq")
+    assert seq == notmat.to_seq()
+    # a different conversion is another entry
+    misses = scribe.memory_cache.cache_info().misses
+    scribe.from_file(a_notmat_copy, convert="to_seq", convert_kwargs={"round_times": False})
+    assert scribe.memory_cache.cache_info().misses == misses + 1
+    # parsed once by the Transcriber, and once for the comparison with ``annot``
+    assert len(count_parsed) == 2
+    assert len(scribe.memory_cache) == 4
+
+
+def test_transcriber_memory_cache_convert_raises(a_notmat_copy):
+    scribe = crowsetta.Transcriber(format="notmat", memory_cache=True)
+    with pytest.raises(ValueError):
+        scribe.from_file(a_notmat_copy, convert="to_dataframe")
+    with pytest.raises(ValueError):
+        scribe.from_file(a_notmat_copy, convert="to_bbox")
+
+
+@pytest.mark.parametrize("memory_cache", [True, 8, False, None])
+def test_transcriber_memory_cache_arg(memory_cache):
+    scribe = crowsetta.Transcriber(format="notmat", memory_cache=memory_cache)
+    if memory_cache is True:
+        assert scribe.memory_cache.max_entries == crowsetta.parsecache.DEFAULT_MAX_ENTRIES
+    elif memory_cache:
+        assert scribe.memory_cache.max_entries == memory_cache
+    else:
+        assert scribe.memory_cache is None
+
+
+def test_transcriber_memory_cache_arg_raises():
+    with pytest.raises(TypeError):
+        crowsetta.Transcriber(format="notmat", memory_cache="yes")
+    with pytest.raises(ValueError):
+        crowsetta.parsecache.MemoryCache(max_entries=0)
+
+
+def test_memory_cache_in_front_of_parse_cache(parse_cache, a_notmat_copy):
+    scribe = crowsetta.Transcriber(format="notmat", cache=parse_cache, memory_cache=True)
+    notmat = scribe.from_file(a_notmat_copy)
+    assert len(parse_cache) == 1
+    assert scribe.from_file(a_notmat_copy).to_annot() == notmat.to_annot()
+    assert scribe.memory_cache.cache_info().hits == 1
+
+
+def test_memory_cache_max_entries(notmat_paths, count_parsed):
+    scribe = crowsetta.Transcriber(format="notmat", memory_cache=2)
+    for notmat_path in notmat_paths[:3]:
+        scribe.from_file(notmat_path)
+    # access second path, so third path is most recently used
+    scribe.from_file(notmat_paths[1])
+    assert len(count_parsed) == 3
+    scribe.from_file(notmat_paths[0])
+    assert len(count_parsed) == 4
+    # third path was evicted
+    scribe.from_file(notmat_paths[2])
+    assert len(count_parsed) == 5
+    assert len(scribe.memory_cache) == 2
+
+
+def test_memory_cache_returns_copies(a_notmat_copy):
+    scribe = crowsetta.Transcriber(format="notmat", memory_cache=True)
+    annot = scribe.from_file(a_notmat_copy, convert="to_annot")
+    expected_labels = annot.seq.labels.copy()
+    annot.seq.labels[0] = "modified"
+    annot.notated_path = None
+    cached = scribe.from_file(a_notmat_copy, convert="to_annot")
+    assert cached is not annot
+    np.testing.assert_array_equal(cached.seq.labels, expected_labels)
+    assert cached.notated_path is not None
+
+
+def test_memory_cache_copy_false(a_notmat_copy):
+    cache = crowsetta.parsecache.MemoryCache(copy=False)
+    scribe = crowsetta.Transcriber(format="notmat", memory_cache=cache)
+    notmat = scribe.from_file(a_notmat_copy)
+    assert scribe.from_file(a_notmat_copy) is notmat
+    assert cache.cache_info().nbytes == 0
+
+
+def test_memory_cache_result_that_cannot_be_pickled(a_notmat_copy):
+    lock = threading.Lock()
+    for copy in (True, False):
+        cache = crowsetta.parsecache.MemoryCache(copy=copy)
+        assert cache.get_or_load(("lock",), a_notmat_copy, lambda: lock) is lock
+        # a result that cannot be copied is not cached
+        assert len(cache) == (0 if copy else 1)
+
+
+def test_memory_cache_max_bytes(a_notmat_copy):
+    value_size = len(pickle.dumps(np.arange(1000), protocol=pickle.HIGHEST_PROTOCOL))
+    cache = crowsetta.parsecache.MemoryCache(max_entries=None, max_bytes=int(value_size * 2.5))
+    for ind in range(3):
+        cache.get_or_load((ind,), a_notmat_copy, lambda: np.arange(1000))
+    assert len(cache) == 2
+    assert cache.cache_info().nbytes == value_size * 2
+    # results larger than the cache are never added
+    cache.get_or_load(("big",), a_notmat_copy, lambda: np.arange(10_000))
+    assert len(cache) == 2
+    cache.cache_clear()
+    assert cache.cache_info() == crowsetta.parsecache.MemoryCacheInfo(0, 0, None, int(value_size * 2.5), 0, 0)
+
+
+def test_memory_cache_threads(notmat_paths):
+    scribe = crowsetta.Transcriber(format="notmat", memory_cache=4)
+    paths = notmat_paths * 8
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        annots = list(executor.map(lambda path: scribe.from_file(path, convert="to_annot"), paths))
+    expected = [crowsetta.formats.seq.NotMat.from_file(path).to_annot() for path in paths]
+    assert annots == expected
+    info = scribe.memory_cache.cache_info()
+    assert info.hits + info.misses >= len(paths)
+    assert info.entries <= 4
+
+
+def test_sources_that_are_not_paths_are_not_cached(parse_cache, notmat_paths):
+    notmat_path = notmat_paths[0]
+    data = notmat_path.read_bytes()
+    scribe = crowsetta.Transcriber(format="notmat", cache=parse_cache, memory_cache=True)
+    expected = scribe.from_file(notmat_path, convert="to_seq")
+    assert len(parse_cache) == 1
+
+    with notmat_path.open("rb") as fp:
+        sources = [
+            crowsetta.formats.source.AnnotSource(data, name=notmat_path.name),
+            crowsetta.formats.source.AnnotSource(io.BytesIO(data), name=notmat_path.name),
+            fp,
+        ]
+        for source in sources:
+            assert scribe.from_file(source, convert="to_seq") == expected
+        fp.seek(0)
+        for source in sources[:2]:
+            source.buffer.seek(0)
+        assert scribe.from_files(sources, convert="to_seq", workers=1, readahead=2) == [expected] * 3
+    assert len(parse_cache) == 1
+    assert scribe.memory_cache.cache_info().entries == 2
+    with pytest.raises(TypeError):
+        parse_cache.make_key(data, "notmat")
@@ -0,0 +1,118 @@
+import os
+
+import pytest
+
+import crowsetta
+
+
+@pytest.mark.parametrize(
+    "executor, workers, chunksize",
+    [
+        ("thread", 1, 1),
+        ("thread", 2, 3),
+        ("process", 2, 4),
+    ],
+)
+def test_from_files_readahead(notmat_paths, executor, workers, chunksize):
+    scribe = crowsetta.Transcriber(format="notmat")
+    stats = crowsetta.pipeline.PipelineStats()
+    annots = scribe.from_files(
+        notmat_paths,
+        convert="to_annot",
+        workers=workers,
+        executor=executor,
+        chunksize=chunksize,
+        readahead=4,
+        io_workers=2,
+        stats=stats,
+    )
+    assert annots == [scribe.from_file(notmat_path).to_annot() for notmat_path in notmat_paths]
+    assert stats.n_files == len(notmat_paths)
+    assert stats.n_bytes == sum(os.path.getsize(notmat_path) for notmat_path in notmat_paths)
+    assert stats.parse_time > 0
+    assert stats.elapsed > 0
+    assert f"loaded {len(notmat_paths)} files" in str(stats)
+
+
+def test_readahead_is_bounded(notmat_paths):
+    pulled = []
+
+    def paths():
+        for notmat_path in notmat_paths:
+            pulled.append(notmat_path)
+            yield notmat_path
+
+    scribe = crowsetta.Transcriber(format="notmat")
+    results = scribe.iter_from_files(paths(), workers=1, chunksize=1, readahead=2)
+    first = next(results)
+    assert first.annot_path == notmat_paths[0]
+    assert len(pulled) <= 3
+    assert len([first, *results]) == len(notmat_paths)
+
+
+def test_readahead_auto(audseq_paths, notmat_paths, raven_txt_files, raven_dataset_annot_col):
+    annot_paths = [*audseq_paths[:2], *notmat_paths[:2]]
+    scribe = crowsetta.Transcriber(format="auto")
+    results = scribe.from_files(annot_paths, workers=2, executor="thread", chunksize=2, readahead=4)
+    assert [type(result).name for result in results] == ["aud-seq", "aud-seq", "notmat", "notmat"]
+    # keyword arguments are passed to the detected format
+    (raven,) = scribe.from_files(raven_txt_files[:1], annot_col=raven_dataset_annot_col, workers=1, readahead=1)
+    assert isinstance(raven, crowsetta.formats.bbox.Raven)
+
+
+class PathOnlyNotMat(crowsetta.formats.seq.NotMat):
+    """A format whose ``from_file`` method only accepts paths"""
+
+    ACCEPTS_BUFFERS = False
+
+    @classmethod
+    def from_file(cls, annot_path, *args, **kwargs):
+        assert isinstance(annot_path, (str, os.PathLike))
+        return super().from_file(annot_path, *args, **kwargs)
+
+
+def test_readahead_format_without_buffers(notmat_paths):
+    scribe = crowsetta.Transcriber(format=PathOnlyNotMat)
+    results = scribe.from_files(notmat_paths, workers=2, executor="thread", readahead=4)
+    assert [result.annot_path for result in results] == notmat_paths
+
+
+def test_readahead_cache(notmat_paths, tmp_path):
+    scribe = crowsetta.Transcriber(format="notmat", cache=tmp_path)
+    first = scribe.from_files(notmat_paths, workers=1, readahead=4)
+    assert len(scribe.cache) == len(notmat_paths)
+    second = scribe.from_files(notmat_paths, workers=1, readahead=4)
+    assert second == first
+
+
+def test_readahead_raises_when_file_raises(tmp_path, notmat_paths):
+    scribe = crowsetta.Transcriber(format="notmat")
+    notmat_paths = [*notmat_paths[:2], tmp_path / "does-not-exist.not.mat"]
+    results = scribe.iter_from_files(notmat_paths, workers=2, executor="thread", chunksize=1, readahead=2)
+    assert isinstance(next(results), crowsetta.formats.seq.NotMat)
+    assert isinstance(next(results), crowsetta.formats.seq.NotMat)
+    with pytest.raises(FileNotFoundError):
+        next(results)
+
+
+def buffer_sources(annot_paths):
+    return [
+        crowsetta.formats.source.AnnotSource(annot_path.read_bytes(), name=annot_path.name)
+        for annot_path in annot_paths
+    ]
+
+
+def test_readahead_buffers_close_early(audseq_paths):
+    scribe = crowsetta.Transcriber(format="aud-seq")
+    results = scribe.iter_from_files(buffer_sources(audseq_paths), workers=2, chunksize=1, readahead=8)
+    assert isinstance(next(results), crowsetta.formats.seq.AudSeq)
+    # closing before every file is loaded cancels the files that were queued, without raising
+    results.close()
+
+
+def test_readahead_buffers_raise_parse_error(audseq_paths):
+    scribe = crowsetta.Transcriber(format="aud-seq")
+    # the error is raised while other files are still queued
+    sources = [crowsetta.formats.source.AnnotSource(b"0.1\t0.2", name="bad.txt"), *buffer_sources(audseq_paths)]
+    with pytest.raises(ValueError):
+        scribe.from_files(sources, workers=1, chunksize=1, readahead=8)
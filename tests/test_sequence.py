@@ -1,3 +1,6 @@
+import pickle
+
+import attr
 import numpy as np
 import pytest
 
@@ -231,3 +234,32 @@ def test_hash():
 def test_seq_is_immutable(a_seq):
     with pytest.raises(TypeError):
         a_seq.labels = np.asarray(["a", "b", "c", "d", "d"])
+
+
+@pytest.mark.parametrize(
+    "seq_kwargs",
+    [
+        dict(labels="abc", onsets_s=np.array([0.1, 0.5, 0.9]), offsets_s=np.array([0.3, 0.7, 1.1])),
+        dict(
+            labels="abc", onset_samples=np.array([16005, 17925, 19837]), offset_samples=np.array([17602, 19520, 21435])
+        ),
+        dict(
+            labels=["1", "22", "333"],
+            onsets_s=np.array([0.1, 0.5, 0.9]),
+            offsets_s=np.array([0.3, 0.7, 1.1]),
+            onset_samples=np.array([3200, 16000, 28800]),
+            offset_samples=np.array([9600, 22400, 35200]),
+        ),
+    ],
+)
+def test_pickle(seq_kwargs):
+    seq = Sequence.from_keyword(**seq_kwargs)
+    seq_unpickled = pickle.loads(pickle.dumps(seq))
+    assert seq_unpickled == seq
+    for seg, seg_unpickled in zip(seq.segments, seq_unpickled.segments):
+        assert seg_unpickled == seg
+        assert [type(val) for val in attr.astuple(seg_unpickled)] == [type(val) for val in attr.astuple(seg)]
+    for attr_name in ("labels", "onsets_s", "offsets_s", "onset_samples", "offset_samples"):
+        np.testing.assert_array_equal(getattr(seq_unpickled, attr_name), getattr(seq, attr_name))
+    with pytest.raises(TypeError):
+        seq_unpickled.labels = "xyz"
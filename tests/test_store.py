@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+import crowsetta
+from crowsetta.store import AnnotationStore
+
+
+@pytest.fixture
+def store(seq_annots, bbox_annots):
+    store = AnnotationStore()
+    store.add([*seq_annots, *bbox_annots])
+    yield store
+    store.close()
+
+
+def test_add_iter_annots(store, seq_annots, bbox_annots):
+    annots = [*seq_annots, *bbox_annots]
+    assert len(store) == len(annots)
+    assert list(store.iter_annots()) == annots
+    assert list(store.iter_seqs()) == [annot.seq for annot in seq_annots]
+    assert list(store.iter_bboxes()) == [bbox for annot in bbox_annots for bbox in annot.bboxes]
+
+
+def test_query_by_path_label_and_time(store, seq_annots, bbox_annots):
+    annot = seq_annots[1]
+    assert list(store.iter_annots(annot_path=annot.annot_path)) == [annot]
+    assert list(store.iter_annots(notated_path=annot.notated_path)) == [annot]
+    assert list(store.iter_seqs(notated_path=annot.notated_path)) == [annot.seq]
+
+    label = annot.seq.labels[0]
+    expected = [annot_ for annot_ in seq_annots if label in annot_.seq.labels.tolist()]
+    assert list(store.iter_annots(label=label)) == expected
+    assert list(store.iter_seqs(label=label)) == [annot_.seq for annot_ in expected]
+    assert list(store.iter_annots(label="not-a-label")) == []
+
+    start, stop = 1.0, 1.5
+    expected = [
+        annot_ for annot_ in seq_annots
+        if np.any((annot_.seq.onsets_s < stop) & (annot_.seq.offsets_s > start))
+    ] + [
+        annot_ for annot_ in bbox_annots
+        if any(bbox.onset < stop and bbox.offset > start for bbox in annot_.bboxes)
+    ]
+    assert list(store.iter_annots(start=start, stop=stop)) == expected
+    # the same segment must have the label and be in the range of time
+    segment = annot.seq.segments[0]
+    assert annot in list(store.iter_annots(label=segment.label, start=segment.onset_s, stop=segment.offset_s))
+    other_label = next(label_ for label_ in annot.seq.labels if label_ != segment.label)
+    matches = list(store.iter_seqs(label=other_label, start=segment.onset_s, stop=segment.offset_s))
+    assert annot.seq not in matches
+
+
+def test_query_bboxes(store, bbox_annots):
+    bboxes = [bbox for annot in bbox_annots for bbox in annot.bboxes]
+    start, stop, low_freq, high_freq = 5.0, 20.0, 2000.0, 4000.0
+    expected = [
+        bbox for bbox in bboxes
+        if bbox.onset < stop and bbox.offset > start and bbox.low_freq < high_freq and bbox.high_freq > low_freq
+    ]
+    assert expected
+    assert list(store.iter_bboxes(start=start, stop=stop, low_freq=low_freq, high_freq=high_freq)) == expected
+    label = bboxes[0].label
+    assert list(store.iter_bboxes(label=label)) == [bbox for bbox in bboxes if bbox.label == label]
+
+
+def test_without_rtree(bbox_annots, monkeypatch):
+    # SQLite built without the R*Tree module raises this error when making the virtual table
+    monkeypatch.setattr(crowsetta.store, "_RTREE", "CREATE VIRTUAL TABLE bboxes_rtree USING not_a_module(id)")
+    with AnnotationStore() as store:
+        assert not store.has_rtree
+        store.add(bbox_annots)
+        bboxes = [bbox for annot in bbox_annots for bbox in annot.bboxes]
+        assert list(store.iter_bboxes(start=5.0, stop=20.0)) == [
+            bbox for bbox in bboxes if bbox.onset < 20.0 and bbox.offset > 5.0
+        ]
+
+
+def test_add_batches_and_persist(seq_annots, tmp_path):
+    db_path = tmp_path / "corpus.sqlite3"
+    with AnnotationStore(db_path) as store:
+        # a generator, added in batches smaller than one annotation
+        assert store.add((annot for annot in seq_annots), batch_size=3) == len(seq_annots)
+        assert store.add(seq_annots[0]) == 1
+    with AnnotationStore(db_path) as store:
+        assert list(store.iter_annots()) == [*seq_annots, seq_annots[0]]
+        with pytest.raises(ValueError):
+            store.add(seq_annots, batch_size=0)
+
+
+def test_add_rolls_back(seq_annots):
+    def annots():
+        yield from seq_annots
+        raise RuntimeError("loading failed")
+
+    with AnnotationStore() as store:
+        with pytest.raises(RuntimeError):
+            store.add(annots(), batch_size=1)
+        assert len(store) == 0
+        assert list(store.iter_seqs()) == []
+
+
+def test_multiple_seqs_and_samples():
+    seqs = [
+        crowsetta.Sequence.from_keyword(labels="ab", onset_samples=[0, 100], offset_samples=[50, 150]),
+        crowsetta.Sequence.from_keyword(labels="c", onsets_s=[0.5], offsets_s=[1.0]),
+    ]
+    annot = crowsetta.Annotation(annot_path="bird1.csv", notated_path="bird1.wav", seq=seqs)
+    with AnnotationStore() as store:
+        store.add(annot)
+        (loaded,) = store.iter_annots()
+        assert loaded == annot
+        assert loaded.seq[0].onset_samples.tolist() == [0, 100]
+        assert loaded.seq[0].as_dict()["onsets_s"] is None
+        # segments with only samples are not in ranges of time
+        assert list(store.iter_seqs(start=0.0, stop=2.0)) == seqs[1:]
+
+
+def test_generic_seq_import_export(store, seq_annots, tmp_path):
+    csv_path = tmp_path / "corpus.csv"
+    label = seq_annots[0].seq.labels[0]
+    expected = [annot for annot in seq_annots if label in annot.seq.labels.tolist()]
+    assert store.export_generic_seq(csv_path, label=label) == len(expected)
+    with AnnotationStore() as store_:
+        assert store_.import_generic_seq(csv_path) == len(expected)
+        assert list(store_.iter_seqs()) == [annot.seq for annot in expected]
+
+
+def test_query_uses_indexes(store):
+    # queries by label and time search indexes instead of scanning every segment
+    for query, params, index in (
+        ("SELECT id FROM segments WHERE label = ?", ("a",), "segments_label"),
+        ("SELECT id FROM segments WHERE onset_s < ? AND offset_s > ?", (2.0, 1.0), "segments_onset_offset"),
+    ):
+        plan = store._connection.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        assert any(index in row[-1] for row in plan)
@@ -1,5 +1,7 @@
+import concurrent.futures
 import importlib
 
+import numpy as np
 import pytest
 
 import crowsetta
@@ -78,3 +80,133 @@ def test_repr(format):
     scribe = crowsetta.Transcriber(format=format)
     repr_ = repr(scribe)
     assert repr_ == f"crowsetta.Transcriber(format='{format}')"
+
+
+@pytest.mark.parametrize(
+    "executor, workers, chunksize",
+    [
+        ("process", 2, 1),
+        ("process", 2, 4),
+        ("thread", 3, 2),
+        ("thread", 1, 16),
+    ],
+)
+@pytest.mark.parametrize("convert", [None, "to_annot"])
+def test_from_files(notmat_paths, executor, workers, chunksize, convert):
+    notmat_paths = notmat_paths
+    scribe = crowsetta.Transcriber(format="notmat")
+    results = scribe.from_files(
+        notmat_paths, convert=convert, workers=workers, executor=executor, chunksize=chunksize
+    )
+    assert len(results) == len(notmat_paths)
+    for notmat_path, result in zip(notmat_paths, results):
+        expected = scribe.from_file(notmat_path)
+        if convert is None:
+            assert isinstance(result, crowsetta.formats.seq.NotMat)
+            assert result.annot_path == expected.annot_path
+            np.testing.assert_array_equal(result.onsets, expected.onsets)
+        else:
+            assert result == expected.to_annot()
+
+
+def test_from_files_kwargs(a_raven_txt_file, raven_dataset_annot_col):
+    scribe = crowsetta.Transcriber(format="raven")
+    annots = scribe.from_files(
+        [a_raven_txt_file] * 3, annot_col=raven_dataset_annot_col, convert="to_annot", workers=2, executor="thread"
+    )
+    expected = scribe.from_file(a_raven_txt_file, annot_col=raven_dataset_annot_col).to_annot()
+    assert all(annot.bboxes == expected.bboxes for annot in annots)
+
+
+def test_from_files_convert_kwargs(a_notmat_path):
+    scribe = crowsetta.Transcriber(format="notmat")
+    (seq,) = scribe.from_files(
+        [a_notmat_path], convert="to_seq", convert_kwargs={"round_times": False}, workers=1
+    )
+    assert seq == scribe.from_file(a_notmat_path).to_seq(round_times=False)
+
+
+def test_from_files_executor_instance(notmat_paths):
+    scribe = crowsetta.Transcriber(format="notmat")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        annots = scribe.from_files(notmat_paths, convert="to_annot", workers=2, executor=executor)
+        # executor passed in should not be shut down
+        assert executor.submit(len, annots).result() == len(notmat_paths)
+
+
+def test_iter_from_files(notmat_paths):
+    scribe = crowsetta.Transcriber(format="notmat")
+    # use a generator to test that any iterable works
+    results = scribe.iter_from_files(
+        (path for path in notmat_paths), convert="to_annot", workers=2, chunksize=2
+    )
+    assert not isinstance(results, list)
+    first = next(results)
+    assert first == scribe.from_file(notmat_paths[0]).to_annot()
+    assert len([first, *results]) == len(notmat_paths)
+
+
+def test_iter_from_files_raises_when_file_raises(tmp_path, notmat_paths):
+    scribe = crowsetta.Transcriber(format="notmat")
+    notmat_paths = [*notmat_paths[:2], tmp_path / "does-not-exist.not.mat"]
+    results = scribe.iter_from_files(notmat_paths, workers=2, chunksize=1)
+    assert isinstance(next(results), crowsetta.formats.seq.NotMat)
+    assert isinstance(next(results), crowsetta.formats.seq.NotMat)
+    with pytest.raises(FileNotFoundError):
+        next(results)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"convert": "to_file"},
+        {"convert": "to_bbox"},
+        {"workers": 0},
+        {"chunksize": 0},
+        {"executor": "cluster"},
+        {"readahead": 0},
+        {"readahead": 4, "io_workers": 0},
+        {"stats": crowsetta.pipeline.PipelineStats()},
+    ],
+)
+def test_iter_from_files_raises(a_notmat_path, kwargs):
+    scribe = crowsetta.Transcriber(format="notmat")
+    with pytest.raises(ValueError):
+        scribe.iter_from_files([a_notmat_path], **kwargs)
+
+
+def test_auto_from_file(
+    audseq_paths, audbbox_paths, raven_txt_files, raven_dataset_annot_col, notmat_paths, textgrid_paths
+):
+    scribe = crowsetta.Transcriber(format="auto")
+    for annot_path, expected_class in (
+        (audseq_paths[0], crowsetta.formats.seq.AudSeq),
+        (audbbox_paths[0], crowsetta.formats.bbox.AudBBox),
+        (notmat_paths[0], crowsetta.formats.seq.NotMat),
+        (textgrid_paths[0], crowsetta.formats.seq.TextGrid),
+    ):
+        assert isinstance(scribe.from_file(annot_path), expected_class)
+    # keyword arguments are passed to the detected format
+    raven = scribe.from_file(raven_txt_files[0], annot_col=raven_dataset_annot_col)
+    assert isinstance(raven, crowsetta.formats.bbox.Raven)
+
+
+def test_auto_from_files(audseq_paths, notmat_paths, textgrid_paths):
+    annot_paths = [*audseq_paths[:3], *notmat_paths[:3], *textgrid_paths[:3]]
+    scribe = crowsetta.Transcriber(format="auto")
+    annots = scribe.from_files(annot_paths, convert="to_annot", workers=2, executor="thread", chunksize=2)
+    expected = [
+        crowsetta.Transcriber(format=format_name).from_file(annot_path).to_annot()
+        for format_name, paths in (("aud-seq", audseq_paths[:3]), ("notmat", notmat_paths[:3]))
+        for annot_path in paths
+    ]
+    assert annots[:6] == expected
+    assert all(isinstance(annot, crowsetta.Annotation) for annot in annots[6:])
+
+
+def test_auto_from_file_raises(tmp_path):
+    annot_path = tmp_path / "notes.txt"
+    annot_path.write_text("some notes about a recording\n")
+    scribe = crowsetta.Transcriber(format="auto")
+    with pytest.raises(ValueError):
+        scribe.from_file(annot_path)